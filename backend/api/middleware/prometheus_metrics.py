@@ -22,9 +22,33 @@ API_ACTIVE_REQUESTS = Gauge(
 )
 
 # Métricas para cache e Celery
-CACHE_HITS = Counter("redis_cache_hits", "Cache hits", ["key"])
-CACHE_MISSES = Counter("redis_cache_misses", "Cache misses", ["key"])
-POPULAR_DATA_ACCESSES = Counter("popular_data_accesses", "Acessos a dados populares", ["key"])
+# Rótulos de cardinalidade limitada: nunca a chave completa (cada
+# coordenada/período criaria uma série). Popularidade por chave fica no
+# sketch top-k (backend.infrastructure.cache.hot_keys).
+CACHE_SOURCES = ("nasa_power", "met_norway", "nws", "openmeteo", "eto")
+# "stale": servido do Redis após o soft TTL, com renovação em segundo plano
+CACHE_TIERS = ("l1", "redis", "stale", "postgres")
+
+CACHE_HITS = Counter(
+    "redis_cache_hits", "Cache hits", ["source", "tier"]
+)
+CACHE_MISSES = Counter(
+    "redis_cache_misses", "Cache misses", ["source"]
+)
+CACHE_ERRORS = Counter(
+    "redis_cache_errors", "Falhas de operações de cache",
+    ["source", "operation"]
+)
+CACHE_LATENCY = Histogram(
+    "redis_cache_latency_seconds",
+    "Latência das operações de cache por camada",
+    ["tier", "operation", "outcome"],
+    buckets=(0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+             0.1, 0.25, 0.5, 1.0)
+)
+POPULAR_DATA_ACCESSES = Counter(
+    "popular_data_accesses", "Acessos a dados populares", ["source"]
+)
 CELERY_TASK_DURATION = Histogram(
     "celery_task_duration_seconds",
     "Duração de tarefas Celery",
@@ -35,3 +59,8 @@ CELERY_TASKS_TOTAL = Counter(
     "Total de tarefas executadas",
     ["task_name", "status"]
 )
+
+
+def cache_source_label(source: str) -> str:
+    """Rótulo 'source' limitado a CACHE_SOURCES (demais → 'other')."""
+    return source if source in CACHE_SOURCES else "other"
@@ -3,12 +3,17 @@ Rotas da API para gerenciamento de fontes de dados climáticos.
 """
 
 from datetime import datetime
-from typing import Dict, List
+from typing import Dict, List, Tuple
 
 from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel, Field
 
 from ..services.climate_source_manager import ClimateSourceManager
+from ..services.source_grid import describe_snap
+from ..services.source_health import all_source_health
+
+# Limite de pontos por consulta de cobertura em lote
+MAX_COVERAGE_POINTS = 20000
 
 router = APIRouter(
     prefix="/api/v1/climate/sources",
@@ -30,6 +35,21 @@ class AvailableSourcesResponse(BaseModel):
     fusion_sources: List[str] = Field(
         ..., description="IDs das fontes para fusão"
     )
+    grid_snapping: Dict[str, Dict] = Field(
+        default_factory=dict,
+        description="Ajuste das coordenadas à grade nativa de cada fonte"
+    )
+
+
+class CoverageBatchRequest(BaseModel):
+    """Coordenadas para consulta de cobertura em lote."""
+    coordinates: List[Tuple[float, float]] = Field(
+        ..., max_length=MAX_COVERAGE_POINTS,
+        description="Pares (lat, long)"
+    )
+    exclude_non_commercial: bool = Field(
+        default=False, description="Exclui fontes CC-BY-NC"
+    )
 
 
 class ValidationResponse(BaseModel):
@@ -73,10 +93,38 @@ async def get_available_sources(
         "location": {"lat": lat, "long": long},
         "available_sources": sources,
         "default_mode": "fusion",
-        "fusion_sources": realtime_sources
+        "fusion_sources": realtime_sources,
+        "grid_snapping": {
+            s["id"]: describe_snap(s["id"], lat, long) for s in sources
+        }
     }
 
 
+@router.post(
+    "/available/batch",
+    summary="Fontes disponíveis para muitas localizações",
+    description="""
+    Retorna as fontes que cobrem cada coordenada (footprints poligonais),
+    numa única consulta vetorizada. Útil para jobs em lote e overlays.
+    """
+)
+async def get_available_sources_batch(request: CoverageBatchRequest) -> Dict:
+    """Lista fontes disponíveis para N localizações."""
+    for lat, long in request.coordinates:
+        if not (-90 <= lat <= 90) or not (-180 <= long <= 180):
+            raise HTTPException(
+                status_code=400,
+                detail=f"Coordenadas inválidas: {lat}, {long}"
+            )
+
+    manager = ClimateSourceManager()
+    sources = manager.get_available_sources_many(
+        request.coordinates,
+        exclude_non_commercial=request.exclude_non_commercial
+    )
+    return {"count": len(sources), "sources": sources}
+
+
 @router.get(
     "/validate-period",
     response_model=ValidationResponse,
@@ -164,6 +212,22 @@ async def get_validation_info() -> Dict:
     return manager.get_validation_info()
 
 
+@router.get(
+    "/health",
+    summary="Saúde das fontes externas",
+    description="""
+    Estado do circuit breaker, taxa de erro, latências (p50/p99) e
+    timeout adaptativo de cada fonte já consultada por este processo.
+    """
+)
+async def get_sources_health() -> Dict:
+    """Retorna o modelo de saúde das fontes climáticas."""
+    return {
+        "sources": all_source_health(),
+        "timestamp": datetime.now().isoformat()
+    }
+
+
 @router.get(
     "/info/{source_id}",
     summary="Detalhes de uma fonte específica",
@@ -4,13 +4,20 @@ Estas rotas são consumidas pelo frontend Dash e não são expostas diretamente
 ao usuário.
 """
 
+import asyncio
 from datetime import datetime, timedelta
 from typing import Optional, Dict, List, Union, Any
 from fastapi import APIRouter, HTTPException
 from loguru import logger
-
-from backend.core.eto_calculation.eto_calculation import calculate_eto_pipeline
-from backend.api.services.openmeteo import get_openmeteo_elevation
+from pydantic import BaseModel, Field
+
+from backend.core.eto_calculation.eto_calculation import (
+    calculate_eto_pipeline, get_cached_eto_result)
+from backend.api.services.openmeteo import (MAX_BULK_ELEVATION_POINTS,
+                                            get_openmeteo_elevation,
+                                            get_openmeteo_elevations)
+from backend.api.services.source_grid import describe_snap
+from backend.infrastructure.cache.popularity import get_popularity_tracker
 from utils.logging import configure_logging
 
 configure_logging()
@@ -48,7 +55,9 @@ async def calculate_eto_endpoint(
         cidade (str, optional): Cidade para modo MATOPIBA
 
     Returns:
-        Dict com resultado do cálculo de ETo e possíveis avisos
+        Dict com resultado do cálculo de ETo, possíveis avisos e metadata
+        (inclui o ajuste das coordenadas à grade nativa da fonte e se o
+        resultado veio do cache)
     """
     try:
         # Validação de coordenadas
@@ -120,18 +129,36 @@ async def calculate_eto_endpoint(
                 detail="Formato de data inválido. Use YYYY-MM-DD."
             )
 
-        task = calculate_eto_pipeline.apply_async(kwargs={
-            "lat": lat,
-            "lng": lng,
-            "elevation": float(elevation),
-            "database": database,
-            "d_inicial": start_date,
-            "d_final": end_date,
-            "estado": estado if estado else "",
-            "cidade": cidade if cidade else ""
-        })
-        result, warnings = task.get()
-        return {"data": result, "warnings": warnings}
+        # Alimenta o ranking usado pelo pre-fetch adaptativo
+        if database == "nasa_power":
+            await get_popularity_tracker().record(lat, lng)
+
+        # Resultado já calculado: dispensa a task
+        cached = await get_cached_eto_result(
+            lat, lng, float(elevation), database, start_date, end_date
+        )
+        if cached is not None:
+            result, warnings = cached
+        else:
+            task = calculate_eto_pipeline.apply_async(kwargs={
+                "lat": lat,
+                "lng": lng,
+                "elevation": float(elevation),
+                "database": database,
+                "d_inicial": start_date,
+                "d_final": end_date,
+                "estado": estado if estado else "",
+                "cidade": cidade if cidade else ""
+            })
+            result, warnings = task.get()
+        return {
+            "data": result,
+            "warnings": warnings,
+            "metadata": {
+                "grid_snapping": describe_snap(database, lat, lng),
+                "cache": "hit" if cached is not None else "miss"
+            }
+        }
 
     except HTTPException as e:
         logger.error(f"Erro de validação: {e.detail}")
@@ -179,4 +206,47 @@ async def get_elevation(
         return {"data": None, "warnings": [], "error": e.detail}
     except Exception as e:
         logger.error(f"Erro ao obter elevação: {str(e)}")
-        return {"data": None, "warnings": [], "error": str(e)}
\ No newline at end of file
+        return {"data": None, "warnings": [], "error": str(e)}
+
+
+class Coordinate(BaseModel):
+    """Par de coordenadas para consulta em lote."""
+    lat: float = Field(..., ge=-90, le=90)
+    lng: float = Field(..., ge=-180, le=180)
+
+
+class BulkElevationRequest(BaseModel):
+    """Lista de coordenadas (duplicatas permitidas)."""
+    coordinates: List[Coordinate] = Field(
+        ..., max_length=MAX_BULK_ELEVATION_POINTS
+    )
+
+
+@eto_router.post("/elevation/bulk")
+async def get_elevation_bulk(
+    request: BulkElevationRequest
+) -> Dict[str, Union[Dict[str, Any], List[str], str, None]]:
+    """
+    Endpoint para obter elevação de muitas coordenadas numa única chamada.
+
+    Coordenadas são ajustadas à grade do DEM e deduplicadas; valores vêm
+    da grade local, do cache Redis e, só para o restante, da API
+    Open-Meteo em lotes máximos.
+
+    Args:
+        request: Até MAX_BULK_ELEVATION_POINTS coordenadas.
+
+    Returns:
+        Dict: Elevações na ordem de entrada (None se indisponível) e avisos.
+    """
+    try:
+        coordinates = [(c.lat, c.lng) for c in request.coordinates]
+        # Função síncrona (Redis/requests): executa fora do event loop
+        elevations, warnings = await asyncio.to_thread(
+            get_openmeteo_elevations, coordinates
+        )
+        return {"data": {"elevations": elevations}, "warnings": warnings}
+
+    except Exception as e:
+        logger.error(f"Erro ao obter elevações em lote: {str(e)}")
+        return {"data": None, "warnings": [], "error": str(e)}
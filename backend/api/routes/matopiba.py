@@ -3,23 +3,48 @@ Rotas API para previsões MATOPIBA.
 
 Este módulo implementa:
 - GET /api/matopiba/forecasts: Retorna previsões completas do Redis
+- GET /api/matopiba/forecasts/{city_code}: Previsão de uma cidade
+- GET /api/matopiba/arrays/{variable}/{day}: Uma variável/dia para todas
+  as cidades (mapa de calor)
+- GET /api/matopiba/rasters/{variable}/{day}.png: Overlay interpolado
+  (IDW) de uma variável/dia, gerado pela task
+- GET /api/matopiba/rasters/{variable}/{day}/legend: Limites e legenda
+  de valores do overlay
 - GET /api/matopiba/metadata: Retorna apenas metadata (status, próxima atualização)
 - POST /api/matopiba/refresh: Força atualização manual (admin apenas)
 
+Os dados ficam no layout por run de matopiba_store: cada leitura busca
+só as chaves de que precisa. /forecasts resolve o run publicado (GET) e
+lê o resto num pipeline; serve a resposta pré-codificada pela task
+(br/gzip/identity) com ETag por codificação; If-None-Match igual → 304.
+Com
+?since=<run_id> do run anterior, serve só o delta calculado pela task.
+Com filtros (variables, day, uf, codes, bbox), monta a resposta dos
+arrays por variável/dia pré-calculados, sem ler as cidades.
+
 Autor: EVAonline Team
 Data: 2025-10-09
 """
 
 import json
 import os
+import time
 from datetime import datetime
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Set, Tuple
+from uuid import uuid4
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import (APIRouter, HTTPException, Query, Request, Response,
+                     status)
+from fastapi.concurrency import run_in_threadpool
 from loguru import logger
-from redis import Redis
+from redis import ConnectionPool, Redis
 from redis.exceptions import RedisError
 
+from backend.infrastructure.cache.matopiba_store import (MatopibaRunStore,
+                                                         array_field,
+                                                         select_positions)
+from backend.infrastructure.cache.revalidation import should_refresh_early
+
 # Configuração
 REDIS_PASSWORD = os.getenv("REDIS_PASSWORD", "")  # Vazio por padrão para dev local
 REDIS_HOST = os.getenv("REDIS_HOST", "localhost")
@@ -32,8 +57,13 @@ if REDIS_PASSWORD:
 else:
     REDIS_URL = f"redis://{REDIS_HOST}:{REDIS_PORT}/{REDIS_DB}"
 
-REDIS_KEY_FORECASTS = "matopiba:forecasts:latest"
-REDIS_KEY_METADATA = "matopiba:metadata:latest"
+# Frescor do run desde a publicação (mesmo da task); depois dele o run é
+# servido "stale" enquanto a task recalcula em segundo plano
+CACHE_TTL_SECONDS = 6 * 3600
+DEFAULT_BUILD_SECONDS = 120.0
+
+# Pool compartilhado pelas requisições (conexões reaproveitadas)
+REDIS_POOL = ConnectionPool.from_url(REDIS_URL, decode_responses=False)
 
 # Router para endpoints MATOPIBA
 matopiba_router = APIRouter(
@@ -44,28 +74,311 @@ matopiba_router = APIRouter(
 
 def get_redis_client() -> Redis:
     """
-    Cria conexão Redis.
+    Cliente Redis sobre REDIS_POOL.
+    
+    Não conecta nem faz PING: a conexão do pool é obtida no primeiro
+    comando (falhas viram 503 em _latest_run / _read_forecasts).
     
     Returns:
-        Cliente Redis conectado
+        Cliente Redis
+    """
+    return Redis(connection_pool=REDIS_POOL)
+
+
+def _cache_unavailable(e: Exception) -> HTTPException:
+    logger.error("Erro ao conectar Redis: %s", e)
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Serviço de cache indisponível. Tente novamente em instantes."
+    )
+
+
+def _fresh_seconds(meta: Dict) -> Optional[float]:
+    """Segundos de frescor restantes do run (None: sem publicação)."""
+    if meta.get('published_at') is None:
+        return None
+    return CACHE_TTL_SECONDS - (time.time() - meta['published_at'])
+
+
+def _revalidate(redis_client: Redis, fresh: Optional[float],
+                build_seconds: float) -> bool:
+    """
+    Stale-while-revalidate do run de previsões.
     
-    Raises:
-        HTTPException: Se conexão falhar
+    Dispara a task de atualização (uma vez, via lock) se o run passou
+    do frescor ou, antes disso, pela renovação antecipada (XFetch). O
+    lock é tomado com o id da task enfileirada, que o libera ao terminar.
+    
+    Args:
+        fresh: Ver _fresh_seconds
+    
+    Returns:
+        bool: True se o run está stale
     """
+    if fresh is None:
+        return False
+    stale = fresh <= 0
+    if stale or should_refresh_early(fresh, build_seconds):
+        try:
+            task_id = uuid4().hex
+            if MatopibaRunStore(redis_client).acquire_refresh(task_id):
+                from backend.infrastructure.celery.tasks.matopiba_forecast_task import \
+                    update_matopiba_forecasts
+                update_matopiba_forecasts.apply_async(task_id=task_id)
+                logger.info(
+                    "🔄 Atualização MATOPIBA disparada (stale=%s)", stale
+                )
+        except Exception as e:
+            logger.warning("Falha ao disparar renovação MATOPIBA: %s", e)
+    return stale
+
+
+def _accepted_encodings(header: Optional[str]) -> Set[str]:
+    """Codificações de Accept-Encoding (q=0 = recusada)."""
+    accepted = set()
+    for part in (header or "").split(","):
+        name, *params = [p.strip() for p in part.split(";")]
+        q = 1.0
+        for param in params:
+            if param.startswith("q="):
+                try:
+                    q = float(param[2:])
+                except ValueError:
+                    q = 0.0
+        if name and q > 0:
+            accepted.add(name.lower())
+    if "*" in accepted:
+        accepted |= {"br", "gzip"}
+    return accepted
+
+
+def _etag_matches(header: Optional[str], etag: str) -> bool:
+    """If-None-Match contém o ETag (comparação fraca)."""
+    if not header:
+        return False
+    tags = [t.strip() for t in header.split(",")]
+    return "*" in tags or etag in (t[2:] if t.startswith("W/") else t
+                                   for t in tags)
+
+
+def _precoded_response(request: Request, run_id: str, part: str,
+                       precoded: Dict,
+                       headers: Dict[str, str]) -> Optional[Response]:
+    """
+    Resposta com os bytes pré-codificados (payload ou delta).
+    
+    Args:
+        precoded: Parte lida por MatopibaRunStore.read_run
+    
+    Returns:
+        Response 200/304, ou None se a parte não existe
+    """
+    encoding, body = precoded["encoding"], precoded["body"]
+    if body is None:
+        return None
+    headers = {**headers, "ETag": precoded["etag"]}
+    if _etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED,
+                        headers=headers)
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    logger.info(
+        "✅ Cache retornado: run %s %s pré-codificado (%s, %d bytes)",
+        run_id, part, encoding, len(body)
+    )
+    return Response(content=body, media_type="application/json",
+                    headers=headers)
+
+
+def _list_param(values: Optional[List[str]]) -> Optional[List[str]]:
+    """Parâmetro repetido e/ou separado por vírgulas (None: ausente)."""
+    if not values:
+        return None
+    return [v.strip() for item in values for v in item.split(",")
+            if v.strip()]
+
+
+def _parse_bbox(bbox: Optional[str]
+                ) -> Optional[Tuple[float, float, float, float]]:
+    """bbox 'oeste,sul,leste,norte' (graus)."""
+    if bbox is None:
+        return None
     try:
-        client = Redis.from_url(REDIS_URL, decode_responses=False)
-        client.ping()
-        return client
-    except RedisError as e:
-        logger.error("Erro ao conectar Redis: %s", e)
+        west, south, east, north = (float(v) for v in bbox.split(","))
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="bbox deve ser 'oeste,sul,leste,norte' (graus)"
+        )
+    if west > east or south > north:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="bbox inválido: oeste > leste ou sul > norte"
+        )
+    return west, south, east, north
+
+
+def _projected_forecasts(
+    redis_client: Redis,
+    store: MatopibaRunStore,
+    run_id: str,
+    meta: Dict,
+    ttl_seconds: int,
+    variables: Optional[List[str]],
+    days: Optional[List[str]],
+    ufs: Optional[List[str]],
+    codes: Optional[List[str]],
+    bbox: Optional[Tuple[float, float, float, float]]
+) -> Dict:
+    """
+    Previsões filtradas, a partir do index e dos arrays variável/dia.
+    
+    Returns:
+        Dict colunar: {"run_id", "codes", "names", "uf", "lat", "lon",
+        "values": {variável: {dia: [valores na ordem de codes]}},
+        "metadata"}
+    
+    Raises:
+        HTTPException 404: Variável ou dia inexistente no run
+    """
+    index = store.index(run_id)
+    if index is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Index do run {run_id} não encontrado"
+        )
+    variables = variables or index["variables"]
+    days = days or index["dates"]
+    unknown = ([v for v in variables if v not in index["variables"]]
+               + [d for d in days if d not in index["dates"]])
+    if unknown:
         raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="Serviço de cache indisponível. Tente novamente em instantes."
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=(
+                f"Sem dados de {', '.join(unknown)} no run {run_id}. "
+                f"Variáveis: {', '.join(index['variables'])}; "
+                f"dias: {', '.join(index['dates'])}"
+            )
         )
 
+    positions = select_positions(index, ufs=ufs, codes=codes, bbox=bbox)
+    arrays = store.arrays(
+        run_id, [array_field(v, d) for v in variables for d in days]
+    )
+    values = {}
+    for var in variables:
+        values[var] = {}
+        for day in days:
+            column = arrays.get(array_field(var, day))
+            values[var][day] = [column[i] if column else None
+                                for i in positions]
+
+    return {
+        "run_id": run_id,
+        **{name: [index[name][i] for i in positions]
+           for name in ("codes", "names", "uf", "lat", "lon")},
+        "values": values,
+        "metadata": _run_metadata(redis_client, run_id, meta, ttl_seconds),
+    }
+
+
+def _no_run() -> HTTPException:
+    logger.warning("Cache MATOPIBA vazio")
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail=(
+            "Previsões ainda não disponíveis. "
+            "Aguarde a primeira atualização (executada a cada 6h: 00h, 06h, 12h, 18h)."
+        )
+    )
+
+
+def _latest_run(store: MatopibaRunStore):
+    """
+    Run publicado e seu meta.
+    
+    'latest' só aponta para runs completos (ver matopiba_store).
+    
+    Raises:
+        HTTPException 503: Se nenhum run foi publicado ainda ou o Redis
+        está indisponível
+    """
+    try:
+        run_id = store.latest_run()
+        meta = store.meta(run_id) if run_id else None
+    except RedisError as e:
+        raise _cache_unavailable(e)
+    if not meta:
+        raise _no_run()
+    return run_id, meta
+
+
+def _read_forecasts(store: MatopibaRunStore, since: Optional[str],
+                    accepted: Optional[Set[str]]):
+    """
+    Run publicado e o que /forecasts serve dele, em duas idas ao Redis:
+    GET de 'latest' e um pipeline (ver MatopibaRunStore.read_run).
+    
+    Args:
+        accepted: Codificações aceitas; None (projeção) lê só meta e TTL
+    
+    Returns:
+        Tuple: (run_id, snapshot)
+    
+    Raises:
+        HTTPException 503: Sem run publicado ou Redis indisponível
+    """
+    try:
+        run_id = store.latest_run()
+        if not run_id:
+            raise _no_run()
+        if accepted is None:
+            snapshot = store.read_run(run_id)
+        elif since == run_id:
+            # Cliente já tem o run: resposta 304, sem os bytes
+            snapshot = store.read_run(run_id, ["payload"])
+        else:
+            parts = ["payload", "delta"] if since else ["payload"]
+            snapshot = store.read_run(run_id, parts, accepted)
+    except RedisError as e:
+        raise _cache_unavailable(e)
+    if not snapshot["meta"]:
+        raise _no_run()
+    return run_id, snapshot
+
+
+def _run_metadata(redis_client: Redis, run_id: str, meta: Dict,
+                  ttl_seconds: int) -> Dict:
+    """Metadata do run com TTL, progresso e estado stale."""
+    metadata = dict(meta['metadata'])
+    metadata['run_id'] = run_id
+    metadata['progress'] = meta['progress']
+    metadata['ttl_seconds'] = ttl_seconds
+    metadata['ttl_minutes'] = round(ttl_seconds / 60, 1)
+    metadata['stale'] = _revalidate(
+        redis_client,
+        _fresh_seconds(meta),
+        metadata.get('build_seconds', DEFAULT_BUILD_SECONDS)
+    )
+    return metadata
+
 
 @matopiba_router.get("/forecasts")
-async def get_matopiba_forecasts() -> Dict:
+async def get_matopiba_forecasts(
+    request: Request,
+    since: Optional[str] = Query(
+        None, description="run_id já carregado pelo cliente (delta)"
+    ),
+    variables: Optional[List[str]] = Query(
+        None, description="Variáveis (ex: ETo_EVAonline,T2M_MAX)"
+    ),
+    day: Optional[List[str]] = Query(None, description="Dias (YYYY-MM-DD)"),
+    uf: Optional[List[str]] = Query(None, description="Estados (TO, MA...)"),
+    codes: Optional[List[str]] = Query(None, description="Códigos IBGE"),
+    bbox: Optional[str] = Query(
+        None, description="Recorte 'oeste,sul,leste,norte' (graus)"
+    )
+):
     """
     Retorna previsões meteorológicas completas para MATOPIBA.
     
@@ -106,45 +419,120 @@ async def get_matopiba_forecasts() -> Dict:
                 "next_update": "2025-10-09T06:00:00",
                 "n_cities": 337,
                 "success_rate": 100.0,
+                "run_id": "20251009T000000",
+                "progress": {"written": 337, "expected": 337,
+                             "complete": true},
+                "stale": false,
                 "version": "1.0.0"
             }
         }
     
+    Após 6h da publicação o run continua sendo servido stale enquanto a
+    atualização roda em segundo plano; o run seguinte só aparece quando
+    completo (troca atômica do ponteiro 'latest').
+    
+    Run completo: bytes pré-codificados pela task, conforme
+    Accept-Encoding (br > gzip > identity), com ETag (um por
+    codificação) e Cache-Control; If-None-Match igual ao ETag → 304 sem
+    corpo. TTL e estado stale vão nos headers X-Cache-TTL e X-Stale (o
+    corpo é fixo por run). Run sem resposta pré-codificada: resposta
+    montada das cidades, com metadata.ttl_seconds e metadata.stale.
+    
+    ?since=<run_id>:
+    - igual ao run publicado → 304
+    - igual ao run anterior → só o delta (header X-Delta-Since):
+      {"run_id", "since", "tolerance", "changed": {código: cidade
+      parcial}, "removed": [códigos], "removed_days": [dias],
+      "validation", "metadata"}; cidade parcial traz só dias/variáveis
+      que mudaram mais que a tolerância (cidade nova vem inteira)
+    - outro (antigo/desconhecido) → resposta completa
+    
+    Filtros (listas repetidas ou separadas por vírgula): variables, day,
+    uf, codes, bbox. Com qualquer um deles a resposta é colunar, montada
+    só dos arrays pedidos (since não se aplica):
+        {"run_id", "codes", "names", "uf", "lat", "lon",
+         "values": {variável: {dia: [valores na ordem de codes]}},
+         "metadata"}
+    Só variáveis numéricas; sem validation. Variável/dia inexistente →
+    404; bbox malformado → 400.
+    
     Raises:
-        HTTPException 503: Se cache estiver vazio ou expirado
+        HTTPException 503: Se nenhum run foi publicado ainda
         HTTPException 500: Se houver erro ao processar dados
     """
     try:
         logger.info("GET /api/matopiba/forecasts")
         
         redis_client = get_redis_client()
+        store = MatopibaRunStore(redis_client)
         
-        # Verificar se cache existe
-        if not redis_client.exists(REDIS_KEY_FORECASTS):
-            logger.warning("Cache MATOPIBA vazio")
-            raise HTTPException(
-                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                detail=(
-                    "Previsões ainda não disponíveis. "
-                    "Aguarde a primeira atualização (executada a cada 6h: 00h, 06h, 12h, 18h)."
-                )
+        # Projeção/filtros: só index + arrays pedidos
+        filters = {
+            "variables": _list_param(variables),
+            "days": _list_param(day),
+            "ufs": _list_param(uf),
+            "codes": _list_param(codes),
+            "bbox": _parse_bbox(bbox),
+        }
+        projected = any(value is not None for value in filters.values())
+        accepted = (None if projected else
+                    _accepted_encodings(request.headers.get("accept-encoding")))
+        run_id, snapshot = await run_in_threadpool(_read_forecasts, store,
+                                                   since, accepted)
+        meta, ttl_seconds = snapshot["meta"], snapshot["ttl"]
+        if projected:
+            return await run_in_threadpool(
+                _projected_forecasts, redis_client, store, run_id, meta,
+                ttl_seconds, **filters
+            )
+        
+        # Resposta pré-codificada (run completo)
+        payload = snapshot["payload"]
+        if payload["etag"]:
+            fresh = _fresh_seconds(meta)
+            stale = _revalidate(
+                redis_client, fresh,
+                float(payload["build_seconds"] or 0.0)
+                or DEFAULT_BUILD_SECONDS
             )
+            fresh = fresh or 0
+            headers = {
+                "Vary": "Accept-Encoding",
+                "Cache-Control": f"public, max-age={max(int(fresh), 0)}",
+                "X-Run-Id": run_id,
+                "X-Cache-TTL": str(ttl_seconds),
+                "X-Stale": str(stale).lower(),
+            }
+            if since == run_id:
+                return Response(status_code=status.HTTP_304_NOT_MODIFIED,
+                                headers=headers)
+            delta = snapshot.get("delta")
+            if delta and delta["since"] == since:
+                response = _precoded_response(
+                    request, run_id, "delta", delta,
+                    {**headers, "X-Delta-Since": since}
+                )
+                if response is not None:
+                    return response
+            response = _precoded_response(request, run_id, "payload",
+                                          payload, headers)
+            if response is not None:
+                return response
         
         # Obter dados do cache
         try:
-            cache_data_raw = redis_client.get(REDIS_KEY_FORECASTS)
-            # Os dados estão salvos como JSON, não Pickle
-            cache_data = json.loads(cache_data_raw)
-            
-            # Adicionar TTL ao metadata
-            ttl_seconds = redis_client.ttl(REDIS_KEY_FORECASTS)
-            cache_data['metadata']['ttl_seconds'] = ttl_seconds
-            cache_data['metadata']['ttl_minutes'] = round(ttl_seconds / 60, 1)
+            cache_data = {
+                'forecasts': store.cities(run_id),
+                'validation': meta['validation'],
+                'metadata': _run_metadata(redis_client, run_id, meta,
+                                          ttl_seconds)
+            }
             
             logger.info(
-                "✅ Cache retornado: %d cidades, TTL: %d min",
-                cache_data['metadata']['n_cities'],
-                ttl_seconds / 60
+                "✅ Cache retornado: run %s, %d cidades, TTL: %d min",
+                run_id,
+                len(cache_data['forecasts']),
+                cache_data['metadata']['ttl_seconds'] / 60
             )
             
             return cache_data
@@ -166,6 +554,147 @@ async def get_matopiba_forecasts() -> Dict:
         )
 
 
+@matopiba_router.get("/forecasts/{city_code}")
+def get_matopiba_city_forecast(city_code: str) -> Dict:
+    """
+    Retorna a previsão de uma cidade (um HGET, sem carregar as demais).
+    
+    Síncrona: o FastAPI a executa no threadpool, pois MatopibaRunStore
+    usa o Redis síncrono (não bloqueia o event loop).
+    
+    Args:
+        city_code: Código IBGE da cidade
+    
+    Returns:
+        Dict: {"run_id", "city_code", "city_info", "forecast"}
+    
+    Raises:
+        HTTPException 503: Se não há run publicado
+        HTTPException 404: Se a cidade não existe no run
+    """
+    store = MatopibaRunStore(get_redis_client())
+    run_id, _ = _latest_run(store)
+    city = store.cities(run_id, [city_code]).get(city_code)
+    if city is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Cidade {city_code} não encontrada no run {run_id}"
+        )
+    return {"run_id": run_id, "city_code": city_code, **city}
+
+
+@matopiba_router.get("/arrays/{variable}/{day}")
+def get_matopiba_array(variable: str, day: str) -> Dict:
+    """
+    Retorna uma variável/dia para todas as cidades (array pré-calculado).
+    
+    Síncrona (threadpool), como /forecasts/{city_code}.
+    
+    Args:
+        variable: Variável (ex: ETo_EVAonline, T2M_MAX)
+        day: Dia (YYYY-MM-DD)
+    
+    Returns:
+        Dict: {"run_id", "variable", "day", "codes", "lat", "lon",
+        "values"}, listas na mesma ordem (None = sem valor)
+    
+    Raises:
+        HTTPException 503: Se não há run publicado
+        HTTPException 404: Se variável/dia não existe no run
+    """
+    store = MatopibaRunStore(get_redis_client())
+    run_id, _ = _latest_run(store)
+    values = store.array(run_id, variable, day)
+    index = store.index(run_id) if values is not None else None
+    if index is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Sem dados de {variable} em {day} no run {run_id}"
+        )
+    return {
+        "run_id": run_id,
+        "variable": variable,
+        "day": day,
+        "codes": index["codes"],
+        "lat": index["lat"],
+        "lon": index["lon"],
+        "values": values,
+    }
+
+
+@matopiba_router.get("/rasters/{variable}/{day}.png")
+def get_matopiba_raster(variable: str, day: str, request: Request):
+    """
+    Overlay PNG interpolado de uma variável/dia (L.imageOverlay).
+    
+    Gerado uma vez por run; posicionar com os bounds de
+    /rasters/{variable}/{day}/legend. ETag fixo por run (304 se igual,
+    só se o raster existe no run). Síncrona (threadpool), como
+    /forecasts/{city_code}.
+    
+    Raises:
+        HTTPException 503: Se não há run publicado
+        HTTPException 404: Se não há raster da variável/dia no run
+    """
+    redis_client = get_redis_client()
+    store = MatopibaRunStore(redis_client)
+    run_id, meta = _latest_run(store)
+    etag = f'"{run_id}-{variable}-{day}"'
+    fresh = _fresh_seconds(meta) or 0
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={max(int(fresh), 0)}",
+        "X-Run-Id": run_id,
+    }
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        # HEXISTS: confirma o raster sem trazer o PNG
+        if store.has_raster(run_id, variable, day):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED,
+                            headers=headers)
+        png = None
+    else:
+        png = store.raster(run_id, variable, day)
+    if png is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Sem raster de {variable} em {day} no run {run_id}"
+        )
+    return Response(content=png, media_type="image/png", headers=headers)
+
+
+@matopiba_router.get("/rasters/{variable}/{day}/legend")
+def get_matopiba_raster_legend(variable: str, day: str,
+                               request: Request) -> Dict:
+    """
+    Legenda do overlay de uma variável/dia (síncrona, threadpool).
+    
+    Returns:
+        Dict: {"run_id", "variable", "day", "url", "bounds" ([[sul, oeste],
+        [norte, leste]]), "vmin", "vmax", "colors" ([[posição, cor]]),
+        "n_points"}
+    
+    Raises:
+        HTTPException 503: Se não há run publicado
+        HTTPException 404: Se não há raster da variável/dia no run
+    """
+    store = MatopibaRunStore(get_redis_client())
+    run_id, _ = _latest_run(store)
+    legend = store.legend(run_id, variable, day)
+    if legend is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Sem raster de {variable} em {day} no run {run_id}"
+        )
+    return {
+        "run_id": run_id,
+        "variable": variable,
+        "day": day,
+        "url": str(request.url_for("get_matopiba_raster",
+                                   variable=variable, day=day)),
+        **legend,
+    }
+
+
 @matopiba_router.get("/metadata")
 async def get_matopiba_metadata() -> Dict:
     """
@@ -193,9 +722,12 @@ async def get_matopiba_metadata() -> Dict:
         logger.info("GET /api/matopiba/metadata")
         
         redis_client = get_redis_client()
+        store = MatopibaRunStore(redis_client)
         
         # Verificar se cache existe
-        if not redis_client.exists(REDIS_KEY_METADATA):
+        run_id = store.latest_run()
+        meta = store.meta(run_id) if run_id else None
+        if not meta:
             return {
                 "status": "EMPTY",
                 "message": "Aguardando primeira atualização",
@@ -209,11 +741,12 @@ async def get_matopiba_metadata() -> Dict:
         
         # Obter metadata
         try:
-            metadata_raw = redis_client.get(REDIS_KEY_METADATA)
-            metadata = json.loads(metadata_raw)
+            metadata = dict(meta['metadata'])
             
             # Adicionar TTL
-            ttl_seconds = redis_client.ttl(REDIS_KEY_METADATA)
+            ttl_seconds = store.ttl(run_id)
+            metadata['run_id'] = run_id
+            metadata['progress'] = meta['progress']
             metadata['ttl_seconds'] = ttl_seconds
             metadata['ttl_minutes'] = round(ttl_seconds / 60, 1)
             metadata['status'] = 'ACTIVE'
@@ -231,6 +764,8 @@ async def get_matopiba_metadata() -> Dict:
     
     except HTTPException:
         raise
+    except RedisError as e:
+        raise _cache_unavailable(e)
     except Exception as e:
         logger.exception("Erro inesperado em /metadata: %s", e)
         raise HTTPException(
@@ -259,8 +794,9 @@ async def get_matopiba_status() -> Dict:
         # Testar Redis
         try:
             redis_client = get_redis_client()
+            redis_client.ping()
             redis_status = "CONNECTED"
-        except HTTPException:
+        except RedisError:
             return {
                 "cache_status": "UNKNOWN",
                 "redis_status": "DISCONNECTED",
@@ -270,9 +806,11 @@ async def get_matopiba_status() -> Dict:
             }
         
         # Verificar cache
-        cache_exists = redis_client.exists(REDIS_KEY_FORECASTS)
+        store = MatopibaRunStore(redis_client)
+        run_id = store.latest_run()
+        meta = store.meta(run_id) if run_id else None
         
-        if not cache_exists:
+        if not meta:
             return {
                 "cache_status": "EMPTY",
                 "redis_status": redis_status,
@@ -281,22 +819,14 @@ async def get_matopiba_status() -> Dict:
                 "message": "Aguardando primeira atualização automática"
             }
         
-        # Obter metadata
-        metadata_raw = redis_client.get(REDIS_KEY_METADATA)
-        if metadata_raw:
-            metadata = json.loads(metadata_raw)
-            last_update = metadata.get('updated_at')
-            next_update = metadata.get('next_update')
-        else:
-            last_update = None
-            next_update = None
-        
+        metadata = meta['metadata']
         return {
             "cache_status": "ACTIVE",
             "redis_status": redis_status,
-            "last_update": last_update,
-            "next_update": next_update,
-            "ttl_minutes": round(redis_client.ttl(REDIS_KEY_FORECASTS) / 60, 1)
+            "run_id": run_id,
+            "last_update": metadata.get('updated_at'),
+            "next_update": metadata.get('next_update'),
+            "ttl_minutes": round(store.ttl(run_id) / 60, 1)
         }
     
     except Exception as e:
@@ -330,8 +860,8 @@ async def force_refresh_matopiba() -> Dict:
         from backend.infrastructure.celery.tasks.matopiba_forecast_task import \
             update_matopiba_forecasts
 
-        # Disparar task assíncrona
-        task = update_matopiba_forecasts.delay()
+        # Disparar task assíncrona (mesmo com o run publicado recente)
+        task = update_matopiba_forecasts.delay(force=True)
         
         logger.info("Task disparada: %s", task.id)
         
@@ -1,10 +1,12 @@
 """
 Serviços gerais da API (saúde, métricas, etc.).
 """
-from fastapi import APIRouter
+from fastapi import APIRouter, Query
 from prometheus_client import Counter, generate_latest
 from starlette.responses import Response
 
+from backend.infrastructure.cache.hot_keys import get_hot_keys
+
 # Criar router
 router = APIRouter(tags=["system"])
 
@@ -32,3 +34,19 @@ async def metrics():
     """
     REQUESTS.inc()
     return Response(generate_latest(), media_type="text/plain")
+
+
+@router.get("/debug/cache/hot-keys")
+async def cache_hot_keys(limit: int = Query(20, ge=1, le=500)):
+    """
+    Chaves de cache mais acessadas neste processo (sketch top-k).
+
+    A contagem real de cada chave está entre count - error e count.
+    """
+    sketch = get_hot_keys()
+    return {
+        "total_events": sketch.total,
+        "tracked_keys": len(sketch),
+        "capacity": sketch.capacity,
+        "keys": sketch.top(limit),
+    }
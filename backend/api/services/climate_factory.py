@@ -20,12 +20,18 @@ Uso:
 
 from typing import Optional
 
+import httpx
+import requests
 from loguru import logger
 
+from backend.api.services.http_cassette import (CASSETTE_MODES,
+                                                CassetteTransport)
+from backend.api.services.http_session import create_transport_session
 from backend.api.services.met_norway_client import METNorwayClient
 from backend.api.services.nasa_power_client import NASAPowerClient
 from backend.api.services.nws_client import NWSClient
 from backend.infrastructure.cache.climate_cache import ClimateCacheService
+from config.settings.app_settings import get_settings
 
 
 class ClimateClientFactory:
@@ -36,6 +42,9 @@ class ClimateClientFactory:
     - Singleton do serviço de cache (reutiliza conexão Redis)
     - Injeção automática de cache em todos os clientes
     - Método centralizado de cleanup
+    - Transporte HTTP configurável (CLIMATE_HTTP_MODE): APIs reais,
+      gravação/reprodução em disco ou servidor simulado, também para
+      os clientes legados baseados em ``requests``
     
     Exemplo:
         # Usar factory ao invés de instanciar diretamente
@@ -44,6 +53,7 @@ class ClimateClientFactory:
     """
     
     _cache_service: Optional[ClimateCacheService] = None
+    _mock_app = None
     
     @classmethod
     def get_cache_service(cls) -> ClimateCacheService:
@@ -61,6 +71,56 @@ class ClimateClientFactory:
             logger.info("✅ ClimateCacheService singleton criado")
         return cls._cache_service
     
+    @classmethod
+    def create_http_transport(cls) -> Optional[httpx.AsyncBaseTransport]:
+        """
+        Cria o transporte HTTP dos clientes conforme CLIMATE_HTTP_MODE.
+        
+        Um transporte por cliente (client.close() fecha o transporte);
+        gravações em disco e o app simulado são compartilhados.
+        
+        Modos:
+        - live: None (httpx usa a rede normalmente)
+        - record/replay/auto: CassetteTransport em CLIMATE_CASSETTE_DIR
+        - mock: ASGITransport do servidor simulado (sem rede)
+        
+        Returns:
+            Transporte httpx ou None para o padrão
+        """
+        settings = get_settings()
+        mode = settings.CLIMATE_HTTP_MODE.lower()
+        
+        if mode == "live":
+            return None
+        if mode in CASSETTE_MODES:
+            return CassetteTransport(settings.CLIMATE_CASSETTE_DIR, mode=mode)
+        if mode == "mock":
+            if cls._mock_app is None:
+                from backend.api.services.mock_climate_server import \
+                    create_mock_app
+                cls._mock_app = create_mock_app()
+                logger.info("🧪 Usando servidor climático simulado")
+            return httpx.ASGITransport(app=cls._mock_app)
+        raise ValueError(f"CLIMATE_HTTP_MODE inválido: {mode}")
+    
+    @classmethod
+    def create_requests_session(cls) -> Optional[requests.Session]:
+        """
+        Cria a sessão ``requests`` dos clientes legados (nasapower.py,
+        openmeteo.py) conforme CLIMATE_HTTP_MODE.
+        
+        Fora do modo live, cada requisição passa pelo mesmo transporte
+        de create_http_transport (cassettes ou servidor simulado).
+        
+        Returns:
+            Sessão configurada ou None para ``requests`` direto (live)
+        """
+        if get_settings().CLIMATE_HTTP_MODE.lower() == "live":
+            return None
+        # Valida o modo já na criação, não na primeira requisição
+        cls.create_http_transport()
+        return create_transport_session(cls.create_http_transport)
+    
     @classmethod
     def create_nasa_power(cls) -> NASAPowerClient:
         """
@@ -87,7 +147,9 @@ class ClimateClientFactory:
             await client.close()
         """
         cache = cls.get_cache_service()
-        client = NASAPowerClient(cache=cache)
+        client = NASAPowerClient(
+            cache=cache, transport=cls.create_http_transport()
+        )
         logger.debug("🌍 NASAPowerClient criado com cache injetado")
         return client
     
@@ -125,7 +187,9 @@ class ClimateClientFactory:
             await client.close()
         """
         cache = cls.get_cache_service()
-        client = METNorwayClient(cache=cache)
+        client = METNorwayClient(
+            cache=cache, transport=cls.create_http_transport()
+        )
         logger.debug("🇳🇴 METNorwayClient criado com cache injetado")
         return client
     
@@ -159,7 +223,9 @@ class ClimateClientFactory:
             await client.close()
         """
         cache = cls.get_cache_service()
-        client = NWSClient(cache=cache)
+        client = NWSClient(
+            cache=cache, transport=cls.create_http_transport()
+        )
         logger.debug("🇺🇸 NWSClient criado com cache injetado")
         return client
     
@@ -6,10 +6,12 @@ e gerencia a fusão de dados de múltiplas fontes.
 """
 
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
 
 from loguru import logger
 
+from backend.api.services.source_coverage import get_coverage_index
+
 
 class ClimateSourceManager:
     """Gerencia disponibilidade e seleção de fontes climáticas.
@@ -217,6 +219,8 @@ class ClimateSourceManager:
         self.enabled_sources = {
             key: value for key, value in self.SOURCES_CONFIG.items()
         }
+        # Footprints pré-compilados (compartilhado entre instâncias)
+        self.coverage = get_coverage_index(tuple(self.enabled_sources))
         logger.info(
             "ClimateSourceManager initialized with %d sources",
             len(self.enabled_sources)
@@ -238,9 +242,10 @@ class ClimateSourceManager:
             List[Dict]: Lista de fontes disponíveis com metadados
         """
         available = []
+        covered = self.coverage.sources_at(lat, long)
 
         for source_id, metadata in self.enabled_sources.items():
-            if self._is_point_covered(lat, long, metadata):
+            if source_id in covered:
                 available.append({
                     "id": source_id,
                     "name": metadata["name"],
@@ -308,6 +313,7 @@ class ClimateSourceManager:
             >>> # Exclui: openmeteo (non-commercial), nws_usa (fora bbox)
         """
         result = {}
+        covered = self.coverage.sources_at(lat, lon)
 
         for source_id, metadata in self.enabled_sources.items():
             # Filtrar fontes não-comerciais se solicitado
@@ -323,7 +329,7 @@ class ClimateSourceManager:
 
             # Verificar cobertura geográfica
             bbox = metadata.get("bbox")
-            is_covered = self._is_point_covered(lat, lon, metadata)
+            is_covered = source_id in covered
 
             # Verificar restrições de fusão e download
             restrictions = metadata.get("restrictions", {})
@@ -394,7 +400,7 @@ class ClimateSourceManager:
         self,
         lat: float,
         long: float,
-        metadata: Dict
+        source_id: str
     ) -> bool:
         """
         Verifica se um ponto está coberto pela fonte.
@@ -402,20 +408,47 @@ class ClimateSourceManager:
         Args:
             lat: Latitude
             long: Longitude
-            metadata: Metadados da fonte
+            source_id: ID da fonte
 
         Returns:
-            bool: True se ponto está coberto
+            bool: True se ponto está coberto (footprint poligonal)
         """
-        bbox = metadata.get("bbox")
+        return self.coverage.covers(source_id, lat, long)
 
-        # Cobertura global
-        if bbox is None:
-            return True
+    def get_available_sources_many(
+        self,
+        coordinates: Sequence[Tuple[float, float]],
+        exclude_non_commercial: bool = False
+    ) -> List[List[str]]:
+        """
+        Fontes disponíveis para muitas coordenadas de uma vez.
 
-        # Cobertura regional (bbox format: west, south, east, north)
-        west, south, east, north = bbox
-        return west <= long <= east and south <= lat <= north
+        Consulta vetorizada do índice de cobertura (memoizada por
+        célula), para jobs em lote e overlays de mapa.
+
+        Args:
+            coordinates: Pares (lat, long)
+            exclude_non_commercial: Se True, exclui fontes CC-BY-NC
+
+        Returns:
+            List[List[str]]: IDs das fontes por ponto, por prioridade
+        """
+        if not coordinates:
+            return []
+        lats, longs = zip(*coordinates)
+        allowed = sorted(
+            (
+                source_id for source_id, metadata
+                in self.enabled_sources.items()
+                if not (exclude_non_commercial
+                        and metadata.get("license") == "non_commercial")
+            ),
+            key=lambda source_id: self.enabled_sources[source_id]["priority"]
+        )
+        return [
+            [source_id for source_id in allowed if source_id in covered]
+            for covered in self.coverage.sources_many(lats, longs)
+        ]
 
     def validate_period(
         self,
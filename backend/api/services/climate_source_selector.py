@@ -1,8 +1,9 @@
 """
 Seletor inteligente de fonte climática baseado em coordenadas geográficas.
 
-Usa bounding boxes para decidir automaticamente a melhor API climática
-para cada localização, priorizando fontes regionais de alta qualidade.
+Usa o índice de cobertura (footprints poligonais, ver source_coverage)
+para decidir automaticamente a melhor API climática para cada
+localização, priorizando fontes regionais de alta qualidade.
 
 Estratégia de Seleção:
     1. Europa → MET Norway (melhor qualidade, tempo real)
@@ -19,9 +20,16 @@ Uso:
     # Obter cliente configurado
     client = ClimateSourceSelector.get_client(lat=48.8566, lon=2.3522)
     data = await client.get_forecast_data(...)
+    
+    # Todas as fontes do ponto (cache consultado em lote)
+    data = await ClimateSourceSelector.fetch_all_sources(
+        lat, lon, start_date, end_date
+    )
 """
 
-from typing import Literal, Union
+import asyncio
+from datetime import datetime
+from typing import Any, Dict, Literal, Sequence, Union
 
 from loguru import logger
 
@@ -29,6 +37,7 @@ from backend.api.services.climate_factory import ClimateClientFactory
 from backend.api.services.met_norway_client import METNorwayClient
 from backend.api.services.nasa_power_client import NASAPowerClient
 from backend.api.services.nws_client import NWSClient
+from backend.api.services.source_coverage import get_coverage_index
 
 # Type hints para fontes climáticas
 ClimateSource = Literal["nasa_power", "met_norway", "nws"]
@@ -42,7 +51,7 @@ class ClimateSourceSelector:
     Determina automaticamente a melhor API para buscar dados climáticos
     baseado nas coordenadas geográficas fornecidas.
     
-    Bounding Boxes:
+    Cobertura (footprints poligonais; bboxes abaixo são o envelope):
         - Europa: -25°W a 45°E, 35°N a 72°N (MET Norway)
         - USA: -125°W a -66°W, 24°N a 49°N (NWS)
         - Global: Qualquer coordenada (NASA POWER)
@@ -137,32 +146,30 @@ class ClimateSourceSelector:
     @classmethod
     def _is_in_europe(cls, lat: float, lon: float) -> bool:
         """
-        Verifica se coordenadas estão no bbox Europa.
+        Verifica se coordenadas estão no footprint Europa.
         
         Args:
             lat: Latitude
             lon: Longitude
         
         Returns:
-            True se dentro do bbox MET Norway
+            True se dentro do footprint MET Norway
         """
-        lon_min, lat_min, lon_max, lat_max = cls.EUROPE_BBOX
-        return (lon_min <= lon <= lon_max) and (lat_min <= lat <= lat_max)
+        return get_coverage_index().covers("met_norway", lat, lon)
     
     @classmethod
     def _is_in_usa(cls, lat: float, lon: float) -> bool:
         """
-        Verifica se coordenadas estão no bbox USA Continental.
+        Verifica se coordenadas estão no footprint USA Continental.
         
         Args:
             lat: Latitude
             lon: Longitude
         
         Returns:
-            True se dentro do bbox NWS
+            True se dentro do footprint NWS
         """
-        lon_min, lat_min, lon_max, lat_max = cls.USA_BBOX
-        return (lon_min <= lon <= lon_max) and (lat_min <= lat <= lat_max)
+        return get_coverage_index().covers("nws", lat, lon)
     
     @classmethod
     def get_client(cls, lat: float, lon: float) -> ClimateClient:
@@ -248,6 +255,103 @@ class ClimateSourceSelector:
         
         return sources
     
+    @classmethod
+    async def fetch_all_sources(
+        cls,
+        lat: float,
+        lon: float,
+        start_date: datetime,
+        end_date: datetime
+    ) -> Dict[ClimateSource, Any]:
+        """
+        Busca dados de TODAS as fontes disponíveis para coordenadas.
+        
+        Base para fusão multi-fonte: o cache é consultado para todas as
+        fontes num único round-trip (get_many), só as ausentes vão às
+        APIs (em paralelo) e os resultados são gravados num set_many.
+        
+        Args:
+            lat: Latitude
+            lon: Longitude
+            start_date: Data inicial
+            end_date: Data final
+        
+        Returns:
+            Dict {fonte: dados}; fontes com falha ficam de fora
+        """
+        sources = cls.get_all_sources(lat, lon)
+        cache = ClimateClientFactory.get_cache_service()
+        requests = [
+            (source, lat, lon, start_date, end_date) for source in sources
+        ]
+        hits, misses = await cache.get_many(requests)
+        results: Dict[ClimateSource, Any] = {
+            request[0]: data for request, data in hits.items()
+        }
+        
+        async def fetch(source: ClimateSource):
+            if source == "met_norway":
+                client = ClimateClientFactory.create_met_norway()
+            elif source == "nws":
+                client = ClimateClientFactory.create_nws()
+            else:
+                client = ClimateClientFactory.create_nasa_power()
+            try:
+                if source == "nasa_power":
+                    return await client.get_daily_data(
+                        lat, lon, start_date, end_date, use_cache=False
+                    )
+                return await client.get_forecast_data(
+                    lat, lon, start_date, end_date, use_cache=False
+                )
+            finally:
+                await client.close()
+        
+        missing = [request[0] for request in misses]
+        outcomes = await asyncio.gather(
+            *(fetch(source) for source in missing), return_exceptions=True
+        )
+        to_save = []
+        for source, outcome in zip(missing, outcomes):
+            if isinstance(outcome, Exception):
+                logger.warning(f"⚠️ {source} falhou em ({lat}, {lon}): "
+                               f"{outcome}")
+                continue
+            results[source] = outcome
+            to_save.append((source, lat, lon, start_date, end_date, outcome))
+        await cache.set_many(to_save)
+        
+        return results
+    
+    @classmethod
+    def select_sources_many(
+        cls,
+        lats: Sequence[float],
+        lons: Sequence[float]
+    ) -> list[ClimateSource]:
+        """
+        Seleciona a melhor fonte para N coordenadas de uma vez.
+        
+        Mesma prioridade de select_source(), com uma única consulta
+        vetorizada ao índice de cobertura.
+        
+        Args:
+            lats: Latitudes
+            lons: Longitudes
+        
+        Returns:
+            Fonte recomendada por ponto
+        """
+        selected = []
+        for covered in get_coverage_index().sources_many(lats, lons):
+            if "met_norway" in covered:
+                selected.append("met_norway")
+            elif "nws" in covered:
+                selected.append("nws")
+            else:
+                selected.append("nasa_power")
+        return selected
+    
     @classmethod
     def get_coverage_info(cls, lat: float, lon: float) -> dict:
         """
@@ -367,5 +471,4 @@ async def example_usage():
 
 
 if __name__ == "__main__":
-    import asyncio
     asyncio.run(example_usage())
@@ -0,0 +1,398 @@
+"""
+Grade de elevação local (offline) em tiles int16 mapeados em memória.
+
+Elimina a ida à rede a cada clique no mapa: a elevação é lida de tiles
+de um DEM pré-processado e interpolada bilinearmente. A API de elevação
+Open-Meteo fica apenas como fallback (pontos fora dos tiles).
+
+Organização em disco (ELEVATION_GRID_DIR, padrão data/elevation/):
+    index.json          Metadados dos tiles
+    <nome>.i16          Matriz int16 little-endian, linha 0 = lat_max (norte)
+
+Cada tile é uma grade regular de nós: o nó (r, c) fica em
+    lat = lat_max - r * step,  lon = lon_min + c * step
+Tiles vizinhos compartilham a linha/coluna de borda, então a
+interpolação é contínua entre eles. Os tiles de maior resolução têm
+prioridade (ex: DEM do Brasil ~90 m antes da grade global grosseira).
+
+Geração dos tiles: scripts/build_elevation_tiles.py
+
+Uso:
+    from backend.api.services.elevation_grid import get_elevation_grid
+
+    grid = get_elevation_grid()
+    elevation = grid.lookup(-15.7939, -47.8828)   # None se fora dos tiles
+"""
+
+import json
+import math
+import os
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from loguru import logger
+
+ELEVATION_GRID_DIR = os.getenv(
+    "ELEVATION_GRID_DIR",
+    str(Path(__file__).parent.parent.parent.parent / "data" / "elevation")
+)
+INDEX_FILE = "index.json"
+INDEX_VERSION = 1
+NODATA = -32768
+
+# Bloco calculado e vizinhos norte/oeste (pontos na borda compartilhada)
+_NEIGHBOUR_OFFSETS = ((0, 0), (-1, 0), (0, -1), (-1, -1))
+
+# Recorte do Brasil usado pelos tiles de alta resolução
+BRAZIL_BBOX = {
+    "lat_min": -34.0, "lat_max": 6.0, "lon_min": -74.0, "lon_max": -34.0
+}
+
+
+@dataclass(frozen=True)
+class TileInfo:
+    """Metadados de um tile (uma entrada de index.json)."""
+    file: str
+    lat_max: float
+    lon_min: float
+    step: float
+    rows: int
+    cols: int
+    nodata: int = NODATA
+
+    @property
+    def lat_min(self) -> float:
+        return self.lat_max - (self.rows - 1) * self.step
+
+    @property
+    def lon_max(self) -> float:
+        return self.lon_min + (self.cols - 1) * self.step
+
+
+class ElevationTile:
+    """Tile int16 mapeado em memória com interpolação bilinear."""
+
+    def __init__(self, directory: Path, info: TileInfo):
+        self.info = info
+        self.data = np.memmap(
+            directory / info.file,
+            dtype="<i2",
+            mode="r",
+            shape=(info.rows, info.cols),
+        )
+
+    def contains(self, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+        info = self.info
+        return (
+            (lats >= info.lat_min) & (lats <= info.lat_max)
+            & (lons >= info.lon_min) & (lons <= info.lon_max)
+        )
+
+    def sample(self, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+        """
+        Interpola bilinearmente pontos dentro do tile.
+
+        Nós sem dado (nodata) são ignorados e os pesos restantes
+        renormalizados; se os 4 vizinhos forem nodata, retorna NaN.
+        """
+        info = self.info
+        fr = (info.lat_max - lats) / info.step
+        fc = (lons - info.lon_min) / info.step
+        r0 = np.clip(np.floor(fr).astype(np.int64), 0, max(info.rows - 2, 0))
+        c0 = np.clip(np.floor(fc).astype(np.int64), 0, max(info.cols - 2, 0))
+        r1 = np.minimum(r0 + 1, info.rows - 1)
+        c1 = np.minimum(c0 + 1, info.cols - 1)
+        dr = np.clip(fr - r0, 0.0, 1.0)
+        dc = np.clip(fc - c0, 0.0, 1.0)
+
+        values = np.stack([
+            self.data[r0, c0], self.data[r0, c1],
+            self.data[r1, c0], self.data[r1, c1],
+        ]).astype(np.float64)
+        weights = np.stack([
+            (1 - dr) * (1 - dc), (1 - dr) * dc,
+            dr * (1 - dc), dr * dc,
+        ])
+        weights = np.where(values == info.nodata, 0.0, weights)
+        total = weights.sum(axis=0)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            result = (values * weights).sum(axis=0) / total
+        return np.where(total > 0, result, np.nan)
+
+    def contains_point(self, lat: float, lon: float) -> bool:
+        info = self.info
+        return (
+            info.lat_min <= lat <= info.lat_max
+            and info.lon_min <= lon <= info.lon_max
+        )
+
+    def sample_point(self, lat: float, lon: float) -> Optional[float]:
+        """Versão escalar de ``sample`` (sem overhead de arrays)."""
+        info = self.info
+        fr = (info.lat_max - lat) / info.step
+        fc = (lon - info.lon_min) / info.step
+        r0 = min(max(math.floor(fr), 0), max(info.rows - 2, 0))
+        c0 = min(max(math.floor(fc), 0), max(info.cols - 2, 0))
+        r1 = min(r0 + 1, info.rows - 1)
+        c1 = min(c0 + 1, info.cols - 1)
+        dr = min(max(fr - r0, 0.0), 1.0)
+        dc = min(max(fc - c0, 0.0), 1.0)
+
+        total = weighted = 0.0
+        for r, c, w in (
+            (r0, c0, (1 - dr) * (1 - dc)), (r0, c1, (1 - dr) * dc),
+            (r1, c0, dr * (1 - dc)), (r1, c1, dr * dc),
+        ):
+            value = int(self.data[r, c])
+            if value != info.nodata:
+                weighted += value * w
+                total += w
+        return weighted / total if total > 0 else None
+
+
+class _TileLayer:
+    """
+    Tiles de mesma origem/resolução indexados por bloco (busca O(1)).
+
+    Os tiles de uma camada são gerados em blocos regulares de
+    ``span = (tile_size - 1) * step`` graus, então o bloco de um ponto
+    é obtido por divisão inteira, sem varrer todos os tiles.
+    """
+
+    def __init__(self, tiles: List[ElevationTile]):
+        self.step = tiles[0].info.step
+        self.lat_top = max(t.info.lat_max for t in tiles)
+        self.lon_left = min(t.info.lon_min for t in tiles)
+        self.span = max(
+            (max(t.info.rows, t.info.cols) - 1) * self.step for t in tiles
+        ) or self.step
+        self.blocks: Dict[Tuple[int, int], ElevationTile] = {}
+        for tile in tiles:
+            key = (
+                round((self.lat_top - tile.info.lat_max) / self.span),
+                round((tile.info.lon_min - self.lon_left) / self.span),
+            )
+            self.blocks[key] = tile
+
+    def block_of(
+        self,
+        lats: np.ndarray,
+        lons: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Índices (linha, coluna) de bloco de cada ponto."""
+        rows = np.floor((self.lat_top - lats) / self.span).astype(np.int64)
+        cols = np.floor((lons - self.lon_left) / self.span).astype(np.int64)
+        return rows, cols
+
+    def find(self, lat: float, lon: float) -> Optional[ElevationTile]:
+        """Tile que contém o ponto (ou None)."""
+        row = math.floor((self.lat_top - lat) / self.span)
+        col = math.floor((lon - self.lon_left) / self.span)
+        for d_row, d_col in _NEIGHBOUR_OFFSETS:
+            tile = self.blocks.get((row + d_row, col + d_col))
+            if tile is not None and tile.contains_point(lat, lon):
+                return tile
+        return None
+
+    def sample(self, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+        """Elevação dos pontos (NaN onde a camada não cobre)."""
+        result = np.full(lats.shape, np.nan)
+        pending = np.ones(lats.shape, dtype=bool)
+        rows, cols = self.block_of(lats, lons)
+
+        # Pontos exatamente na borda sul/leste de um bloco só existem no
+        # bloco vizinho quando o bloco calculado não existe (borda da camada)
+        for d_row, d_col in _NEIGHBOUR_OFFSETS:
+            keys = set(zip(rows[pending].tolist(), cols[pending].tolist()))
+            for key in keys:
+                tile = self.blocks.get((key[0] + d_row, key[1] + d_col))
+                if tile is None:
+                    continue
+                mask = (
+                    pending & (rows == key[0]) & (cols == key[1])
+                    & tile.contains(lats, lons)
+                )
+                if mask.any():
+                    result[mask] = tile.sample(lats[mask], lons[mask])
+                    pending &= ~mask
+            if not pending.any():
+                break
+        return result
+
+
+class ElevationGrid:
+    """
+    Conjunto de tiles de elevação (camadas mais finas primeiro).
+
+    Attributes:
+        directory: Diretório com index.json e arquivos .i16
+        tiles: Tiles carregados (ordenados por resolução)
+    """
+
+    def __init__(self, directory: Union[str, Path] = ELEVATION_GRID_DIR):
+        self.directory = Path(directory)
+        self.tiles: List[ElevationTile] = []
+        self.layers: List[_TileLayer] = []
+
+        index_path = self.directory / INDEX_FILE
+        if not index_path.exists():
+            logger.warning(
+                f"Grade de elevação local ausente ({index_path}); "
+                "usando apenas a API Open-Meteo"
+            )
+            return
+
+        index = json.loads(index_path.read_text())
+        infos = sorted(
+            (TileInfo(**entry) for entry in index.get("tiles", [])),
+            key=lambda info: info.step
+        )
+        by_layer: Dict[str, List[ElevationTile]] = {}
+        for info in infos:
+            try:
+                tile = ElevationTile(self.directory, info)
+            except (OSError, ValueError) as e:
+                logger.error(f"Tile de elevação inválido {info.file}: {e}")
+                continue
+            self.tiles.append(tile)
+            by_layer.setdefault(info.file.rsplit("_r", 1)[0], []).append(tile)
+
+        self.layers = sorted(
+            (_TileLayer(tiles) for tiles in by_layer.values()),
+            key=lambda layer: layer.step
+        )
+        logger.info(
+            f"✅ Grade de elevação local: {len(self.tiles)} tiles em "
+            f"{len(self.layers)} camadas ({self.directory})"
+        )
+
+    @property
+    def available(self) -> bool:
+        return bool(self.tiles)
+
+    def lookup_many(
+        self,
+        lats: Sequence[float],
+        lons: Sequence[float]
+    ) -> np.ndarray:
+        """
+        Elevação (m) de vários pontos; NaN onde não há cobertura local.
+
+        Args:
+            lats: Latitudes
+            lons: Longitudes
+
+        Returns:
+            np.ndarray: Elevações (float64)
+        """
+        lats = np.asarray(lats, dtype=np.float64)
+        lons = np.asarray(lons, dtype=np.float64)
+        result = np.full(lats.shape, np.nan)
+
+        for layer in self.layers:
+            pending = np.isnan(result)
+            if not pending.any():
+                break
+            result[pending] = layer.sample(lats[pending], lons[pending])
+        return result
+
+    def lookup(self, lat: float, lon: float) -> Optional[float]:
+        """
+        Elevação (m) de um ponto, ou None se fora da cobertura local.
+        """
+        for layer in self.layers:
+            tile = layer.find(lat, lon)
+            if tile is None:
+                continue
+            value = tile.sample_point(lat, lon)
+            if value is not None:
+                return round(value, 1)
+        return None
+
+
+@lru_cache(maxsize=1)
+def get_elevation_grid() -> ElevationGrid:
+    """Grade de elevação compartilhada no processo (tiles abertos uma vez)."""
+    return ElevationGrid(ELEVATION_GRID_DIR)
+
+
+# ---------------------------------------------------------------------------
+# Geração de tiles
+# ---------------------------------------------------------------------------
+
+def _load_index(directory: Path) -> Dict:
+    index_path = directory / INDEX_FILE
+    if index_path.exists():
+        return json.loads(index_path.read_text())
+    return {"version": INDEX_VERSION, "tiles": []}
+
+
+def write_tiles(
+    elevation: np.ndarray,
+    lat_max: float,
+    lon_min: float,
+    step: float,
+    directory: Union[str, Path],
+    prefix: str,
+    tile_size: int = 1200,
+    nodata: int = NODATA
+) -> List[TileInfo]:
+    """
+    Divide uma matriz de elevação em tiles int16 e atualiza index.json.
+
+    Tiles vizinhos compartilham uma linha/coluna de borda. Tiles
+    existentes com o mesmo prefixo são substituídos.
+
+    Args:
+        elevation: Matriz (linhas norte→sul, colunas oeste→leste), em m;
+            NaN vira nodata
+        lat_max: Latitude da linha 0
+        lon_min: Longitude da coluna 0
+        step: Espaçamento da grade (graus)
+        directory: Diretório de saída
+        prefix: Prefixo dos arquivos (ex: 'brazil', 'global')
+        tile_size: Nós por lado de cada tile
+        nodata: Valor sentinela para ausência de dado
+
+    Returns:
+        List[TileInfo]: Tiles gravados
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    elevation = np.asarray(elevation, dtype=np.float64)
+    rows, cols = elevation.shape
+    stride = max(tile_size - 1, 1)
+
+    written = []
+    for r in range(0, max(rows - 1, 1), stride):
+        for c in range(0, max(cols - 1, 1), stride):
+            block = elevation[r:r + tile_size, c:c + tile_size]
+            data = np.where(
+                np.isnan(block), nodata,
+                np.clip(np.rint(block), -32767, 32767)
+            ).astype("<i2")
+            info = TileInfo(
+                file=f"{prefix}_r{r:06d}_c{c:06d}.i16",
+                lat_max=round(lat_max - r * step, 8),
+                lon_min=round(lon_min + c * step, 8),
+                step=step,
+                rows=data.shape[0],
+                cols=data.shape[1],
+                nodata=nodata,
+            )
+            data.tofile(directory / info.file)
+            written.append(info)
+
+    index = _load_index(directory)
+    index["tiles"] = [
+        entry for entry in index["tiles"]
+        if not entry["file"].startswith(f"{prefix}_")
+    ] + [asdict(info) for info in written]
+    (directory / INDEX_FILE).write_text(json.dumps(index, indent=1))
+
+    logger.info(f"💾 {len(written)} tiles '{prefix}' gravados em {directory}")
+    return written
@@ -0,0 +1,230 @@
+"""
+Gravação/reprodução (record/replay) de respostas HTTP das APIs climáticas.
+
+Transporte httpx que grava respostas upstream em disco (gzip) e as
+reproduz depois, permitindo rodar testes de throughput, benchmarks e
+testes de caos sem acesso às APIs reais.
+
+Modos:
+- record: sempre chama o upstream e grava (sobrescreve) a resposta
+- replay: responde apenas do disco; requisição não gravada → erro
+- auto: responde do disco se houver gravação, senão grava
+
+Formato em disco (um arquivo por requisição):
+    <cassette_dir>/<host>/<sha256>.json.gz
+    Conteúdo gzip: linha JSON de metadata + "\\n" + corpo bruto da resposta
+
+A identidade da requisição é (método, host, path, query ordenada, corpo);
+headers são ignorados (User-Agent, tokens etc. não mudam a resposta).
+
+Uso:
+    from backend.api.services.http_cassette import CassetteTransport
+
+    transport = CassetteTransport("data/cassettes", mode="auto")
+    client = NASAPowerClient(transport=transport)
+"""
+
+import gzip
+import hashlib
+import json
+from pathlib import Path
+from typing import Iterable, Optional, Union
+from urllib.parse import parse_qsl, urlencode
+
+import httpx
+from loguru import logger
+
+CASSETTE_MODES = ("record", "replay", "auto")
+
+# Headers de transporte que não fazem sentido reproduzir (o corpo é
+# gravado bruto, com o Content-Encoding original, e decodificado pelo
+# AsyncClient na reprodução)
+_DROPPED_HEADERS = {
+    "content-length",
+    "transfer-encoding",
+    "connection",
+}
+
+
+class CassetteMissError(httpx.TransportError):
+    """Requisição sem gravação correspondente em modo replay."""
+
+
+def request_fingerprint(
+    request: httpx.Request,
+    ignore_params: Iterable[str] = ()
+) -> str:
+    """
+    Calcula a identidade estável de uma requisição.
+
+    Args:
+        request: Requisição httpx
+        ignore_params: Parâmetros de query ignorados na comparação
+            (ex: parâmetros voláteis como timestamps)
+
+    Returns:
+        str: Hash SHA-256 (hex)
+    """
+    ignored = set(ignore_params)
+    query = sorted(
+        (k, v)
+        for k, v in parse_qsl(request.url.query.decode(), keep_blank_values=True)
+        if k not in ignored
+    )
+    body = request.content or b""
+
+    digest = hashlib.sha256()
+    digest.update(request.method.upper().encode())
+    digest.update(b"\0")
+    digest.update(request.url.host.encode())
+    digest.update(b"\0")
+    digest.update(request.url.path.encode())
+    digest.update(b"\0")
+    digest.update(urlencode(query).encode())
+    digest.update(b"\0")
+    digest.update(hashlib.sha256(body).digest())
+    return digest.hexdigest()
+
+
+class CassetteTransport(httpx.AsyncBaseTransport):
+    """
+    Transporte httpx assíncrono com gravação/reprodução em disco.
+
+    Attributes:
+        cassette_dir: Diretório raiz das gravações
+        mode: 'record', 'replay' ou 'auto'
+        hits: Requisições respondidas do disco
+        recorded: Respostas gravadas
+    """
+
+    def __init__(
+        self,
+        cassette_dir: Union[str, Path],
+        mode: str = "auto",
+        inner: Optional[httpx.AsyncBaseTransport] = None,
+        ignore_params: Iterable[str] = (),
+        record_statuses: Iterable[int] = range(200, 300)
+    ):
+        """
+        Inicializa o transporte.
+
+        Args:
+            cassette_dir: Diretório das gravações (criado se necessário)
+            mode: Modo de operação (ver CASSETTE_MODES)
+            inner: Transporte usado para chamar o upstream
+                (padrão: httpx.AsyncHTTPTransport)
+            ignore_params: Parâmetros de query fora da identidade
+            record_statuses: Status HTTP que são gravados (erros
+                transitórios como 429/5xx não são gravados por padrão)
+        """
+        if mode not in CASSETTE_MODES:
+            raise ValueError(
+                f"Modo inválido: {mode} (use {', '.join(CASSETTE_MODES)})"
+            )
+        self.cassette_dir = Path(cassette_dir)
+        self.mode = mode
+        self.ignore_params = tuple(ignore_params)
+        self.record_statuses = set(record_statuses)
+        self._inner = inner
+        self._owns_inner = inner is None
+        self.hits = 0
+        self.recorded = 0
+
+    def _get_inner(self) -> httpx.AsyncBaseTransport:
+        """Cria o transporte upstream sob demanda (replay não precisa)."""
+        if self._inner is None:
+            self._inner = httpx.AsyncHTTPTransport()
+        return self._inner
+
+    def path_for(self, request: httpx.Request) -> Path:
+        """Caminho do arquivo de gravação de uma requisição."""
+        key = request_fingerprint(request, self.ignore_params)
+        host = request.url.host or "_"
+        return self.cassette_dir / host / f"{key}.json.gz"
+
+    async def handle_async_request(
+        self,
+        request: httpx.Request
+    ) -> httpx.Response:
+        """Responde do disco ou do upstream, conforme o modo."""
+        path = self.path_for(request)
+
+        if self.mode != "record" and path.exists():
+            self.hits += 1
+            return self._load(path, request)
+
+        if self.mode == "replay":
+            raise CassetteMissError(
+                f"Sem gravação para {request.method} {request.url}",
+                request=request,
+            )
+
+        response = await self._get_inner().handle_async_request(request)
+        content = b"".join([chunk async for chunk in response.aiter_raw()])
+        await response.aclose()
+
+        if response.status_code in self.record_statuses:
+            self._save(path, request, response, content)
+            self.recorded += 1
+
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=self._clean_headers(response.headers),
+            content=content,
+            request=request,
+        )
+
+    async def aclose(self) -> None:
+        """
+        Fecha o transporte upstream.
+
+        O transporte criado internamente é recriado no próximo uso, então
+        a mesma instância pode servir vários ``async with AsyncClient``.
+        """
+        if self._inner is not None:
+            await self._inner.aclose()
+            if self._owns_inner:
+                self._inner = None
+
+    @staticmethod
+    def _clean_headers(headers: httpx.Headers) -> list:
+        return [
+            (k, v) for k, v in headers.items()
+            if k.lower() not in _DROPPED_HEADERS
+        ]
+
+    def _save(
+        self,
+        path: Path,
+        request: httpx.Request,
+        response: httpx.Response,
+        content: bytes
+    ) -> None:
+        """Grava resposta (metadata JSON + corpo bruto) com gzip."""
+        meta = {
+            "request": {"method": request.method, "url": str(request.url)},
+            "status_code": response.status_code,
+            "headers": self._clean_headers(response.headers),
+        }
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        with gzip.open(tmp_path, "wb") as f:
+            f.write(json.dumps(meta).encode())
+            f.write(b"\n")
+            f.write(content)
+        tmp_path.replace(path)
+        logger.debug(f"📼 Cassette gravado: {request.method} {request.url}")
+
+    @staticmethod
+    def _load(path: Path, request: httpx.Request) -> httpx.Response:
+        """Reconstrói a resposta a partir do arquivo gravado."""
+        with gzip.open(path, "rb") as f:
+            raw = f.read()
+        header, _, content = raw.partition(b"\n")
+        meta = json.loads(header)
+        return httpx.Response(
+            status_code=meta["status_code"],
+            headers=meta["headers"],
+            content=content,
+            request=request,
+        )
@@ -0,0 +1,116 @@
+"""
+Sessão ``requests`` sobre os transportes httpx das APIs climáticas.
+
+Os clientes legados síncronos (nasapower.py, openmeteo.py) usam
+``requests``; este adaptador os faz passar pelo mesmo transporte httpx
+escolhido por CLIMATE_HTTP_MODE (cassettes em disco ou servidor
+simulado), para que o pipeline de ETo rode offline como os clientes
+httpx.
+
+Uso:
+    from backend.api.services.climate_factory import ClimateClientFactory
+
+    session = ClimateClientFactory.create_requests_session()
+    api = NasaPowerAPI(start, end, long, lat, session=session)
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+import httpx
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+# Headers que não valem para o corpo já decodificado pelo httpx
+_DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+
+def _run_sync(coro):
+    """
+    Executa uma corrotina a partir de código síncrono.
+
+    O pipeline de ETo chama os clientes legados de dentro de uma rota
+    async: com um loop já rodando na thread, usa uma thread própria.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
+
+
+class TransportAdapter(BaseAdapter):
+    """
+    Adaptador ``requests`` que envia cada requisição por um transporte
+    httpx assíncrono.
+
+    Um transporte novo por requisição: cada chamada roda no seu próprio
+    loop, e transportes com conexões (upstream do modo record) não podem
+    ser reaproveitados entre loops.
+
+    Attributes:
+        transport_factory: Cria o transporte httpx de uma requisição
+    """
+
+    def __init__(
+        self,
+        transport_factory: Callable[[], httpx.AsyncBaseTransport]
+    ):
+        super().__init__()
+        self.transport_factory = transport_factory
+
+    async def _send(self, request: httpx.Request):
+        transport = self.transport_factory()
+        try:
+            response = await transport.handle_async_request(request)
+            response.request = request
+            await response.aread()
+            await response.aclose()
+            return response
+        finally:
+            await transport.aclose()
+
+    def send(self, request, stream=False, timeout=None, verify=True,
+             cert=None, proxies=None):
+        """Converte a requisição, envia pelo transporte e converte a volta."""
+        body = request.body or b""
+        if isinstance(body, str):
+            body = body.encode()
+        try:
+            response = _run_sync(self._send(httpx.Request(
+                request.method, request.url,
+                headers=dict(request.headers), content=body
+            )))
+        except httpx.TransportError as e:
+            raise requests.ConnectionError(e, request=request) from e
+
+        result = requests.Response()
+        result.status_code = response.status_code
+        result.reason = response.reason_phrase
+        result.headers = CaseInsensitiveDict({
+            k: v for k, v in response.headers.items()
+            if k.lower() not in _DROPPED_HEADERS
+        })
+        result._content = response.content
+        result.encoding = response.encoding
+        result.url = request.url
+        result.request = request
+        result.connection = self
+        return result
+
+    def close(self) -> None:
+        pass
+
+
+def create_transport_session(
+    transport_factory: Callable[[], httpx.AsyncBaseTransport]
+) -> requests.Session:
+    """Sessão ``requests`` com TransportAdapter para http e https."""
+    session = requests.Session()
+    adapter = TransportAdapter(transport_factory)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
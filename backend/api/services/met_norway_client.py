@@ -17,6 +17,12 @@ from typing import Dict, List, Optional
 import httpx
 from pydantic import BaseModel, Field
 
+from backend.api.services.source_coverage import get_coverage_index
+from backend.api.services.source_grid import SOURCE_GRIDS
+from backend.api.services.source_health import (HealthConfig,
+                                                get_source_health,
+                                                resilient_get)
+
 logger = logging.getLogger(__name__)
 
 
@@ -25,9 +31,10 @@ class METNorwayConfig(BaseModel):
     base_url: str = (
         "https://api.met.no/weatherapi/locationforecast/2.0/complete"
     )
-    timeout: int = 30
+    timeout: int = 30              # Orçamento total da chamada (s)
     retry_attempts: int = 3
-    retry_delay: float = 1.0
+    retry_delay: float = 1.0       # Base do backoff exponencial c/ jitter
+    hedge_requests: bool = False   # Requisição duplicada após o p95
     user_agent: str = (
         "EVAonline/1.0 "
         "(https://github.com/angelacunhasoares/EVAonline)"
@@ -81,10 +88,14 @@ class METNorwayClient:
     # Bounding box Europa (lon_min, lat_min, lon_max, lat_max)
     EUROPE_BBOX = (-25.0, 35.0, 45.0, 72.0)
     
+    # Grade nativa MEPS/MET Nordic (~2.5 km): cache e requisições usam o centro da célula
+    NATIVE_GRID = SOURCE_GRIDS["met_norway"]
+    
     def __init__(
         self,
         config: Optional[METNorwayConfig] = None,
-        cache: Optional[any] = None
+        cache: Optional[any] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None
     ):
         """
         Inicializa cliente MET Norway.
@@ -92,6 +103,8 @@ class METNorwayClient:
         Args:
             config: Configuração customizada (opcional)
             cache: ClimateCacheService (opcional, injetado via DI)
+            transport: Transporte httpx customizado (opcional, ex:
+                gravação/reprodução ou servidor simulado)
         """
         self.config = config or METNorwayConfig()
         
@@ -103,13 +116,27 @@ class METNorwayClient:
         
         self.client = httpx.AsyncClient(
             timeout=self.config.timeout,
-            headers=headers
+            headers=headers,
+            transport=transport
         )
         self.cache = cache  # Cache service opcional
+        
+        # Saúde compartilhada da fonte (circuit breaker + timeout adaptativo)
+        self.health = get_source_health(
+            "met_norway",
+            config=HealthConfig(
+                max_timeout=self.config.timeout,
+                backoff_base=self.config.retry_delay
+            ),
+            redis=getattr(cache, "redis", None)
+        )
     
     async def close(self):
-        """Fecha conexão HTTP."""
-        await self.client.aclose()
+        """Fecha conexão HTTP (após renovações de cache pendentes)."""
+        if self.cache:
+            await self.cache.run_after_refreshes(self.client.aclose)
+        else:
+            await self.client.aclose()
     
     def is_in_coverage(self, lat: float, lon: float) -> bool:
         """
@@ -120,24 +147,26 @@ class METNorwayClient:
             lon: Longitude
         
         Returns:
-            bool: True se dentro do bbox Europa
+            bool: True se dentro do footprint Europa
         """
-        lon_min, lat_min, lon_max, lat_max = self.EUROPE_BBOX
-        return (lon_min <= lon <= lon_max) and (lat_min <= lat <= lat_max)
+        # Footprint poligonal (bbox fica apenas como referência/exibição)
+        return get_coverage_index().covers("met_norway", lat, lon)
     
     async def get_forecast_data(
         self,
         lat: float,
         lon: float,
         start_date: Optional[datetime] = None,
-        end_date: Optional[datetime] = None
+        end_date: Optional[datetime] = None,
+        use_cache: bool = True
     ) -> List[METNorwayData]:
         """
         Busca dados de previsão meteorológica com cache inteligente.
         
         Fluxo:
         1. Valida cobertura (Europa bbox)
-        2. Tenta buscar do cache Redis (se disponível)
+        2. Tenta buscar do cache Redis (se disponível); dado stale é
+           servido enquanto renova em segundo plano
         3. Se cache MISS, busca da API MET Norway
         4. Processa dados horários
         5. Salva resultado no cache
@@ -147,6 +176,8 @@ class METNorwayClient:
             lon: Longitude (-180 a 180)
             start_date: Data inicial (default: agora)
             end_date: Data final (default: agora + 7 dias)
+            use_cache: False quando o chamador consulta/grava o cache em
+                lote (get_many/set_many)
             
         Returns:
             List[METNorwayData]: Dados horários de previsão
@@ -177,22 +208,30 @@ class METNorwayClient:
         if start_date > end_date:
             raise ValueError("start_date deve ser <= end_date")
         
-        # 1. Tenta buscar do cache (se disponível)
-        if self.cache:
-            cached_data = await self.cache.get(
-                source="met_norway",
-                lat=lat,
-                lon=lon,
-                start=start_date,
-                end=end_date
-            )
-            if cached_data:
-                logger.info(
-                    f"🎯 Cache HIT: MET Norway lat={lat}, lon={lon}"
+        # Mesma célula nativa → mesmos dados upstream
+        lat, lon = self.NATIVE_GRID.snap(lat, lon)
+        
+        # 1. Cache com stale-while-revalidate (API só em miss ou em
+        #    renovação em segundo plano)
+        if self.cache and use_cache:
+            return await self.cache.get_or_fetch(
+                "met_norway", lat, lon, start_date, end_date,
+                loader=lambda: self._fetch_forecast(
+                    lat, lon, start_date, end_date
                 )
-                return cached_data
+            )
         
-        # 2. Cache MISS - busca da API
+        # 2. Sem cache - busca da API
+        return await self._fetch_forecast(lat, lon, start_date, end_date)
+    
+    async def _fetch_forecast(
+        self,
+        lat: float,
+        lon: float,
+        start_date: datetime,
+        end_date: datetime
+    ) -> List[METNorwayData]:
+        """Busca e processa a previsão da API (coordenadas já ajustadas)."""
         logger.info(f"🌐 Buscando MET Norway API: lat={lat}, lon={lon}")
         
         # Parâmetros de requisição
@@ -201,50 +240,22 @@ class METNorwayClient:
             "lon": lon
         }
         
-        # Requisição com retry
-        for attempt in range(self.config.retry_attempts):
-            try:
-                logger.info(
-                    f"MET Norway request: lat={lat}, lon={lon} "
-                    f"(attempt {attempt + 1})"
-                )
-                
-                response = await self.client.get(
-                    self.config.base_url,
-                    params=params
-                )
-                response.raise_for_status()
-                
-                data = response.json()
-                parsed_data = self._parse_response(
-                    data, start_date, end_date
-                )
-                
-                # 3. Salva no cache (se disponível)
-                if self.cache and parsed_data:
-                    await self.cache.set(
-                        source="met_norway",
-                        lat=lat,
-                        lon=lon,
-                        start=start_date,
-                        end=end_date,
-                        data=parsed_data
-                    )
-                    logger.info(
-                        f"💾 Cache SAVE: MET Norway lat={lat}, lon={lon}"
-                    )
-                
-                return parsed_data
-                
-            except httpx.HTTPError as e:
-                logger.warning(
-                    f"MET Norway request failed (attempt {attempt + 1}): {e}"
-                )
-                if attempt == self.config.retry_attempts - 1:
-                    raise
-                await self._delay_retry()
+        # Requisição com circuit breaker, timeout adaptativo e backoff
+        logger.info(f"MET Norway request: lat={lat}, lon={lon}")
+        try:
+            response = await resilient_get(
+                self.client,
+                self.config.base_url,
+                self.health,
+                retry_attempts=self.config.retry_attempts,
+                hedge=self.config.hedge_requests,
+                params=params
+            )
+        except httpx.HTTPError as e:
+            logger.warning(f"MET Norway request failed: {e}")
+            raise
         
-        return []
+        return self._parse_response(response.json(), start_date, end_date)
     
     def _parse_response(
         self,
@@ -342,11 +353,6 @@ class METNorwayClient:
             logger.error(f"Erro ao processar resposta MET Norway: {e}")
             raise ValueError(f"Resposta MET Norway inválida: {e}")
     
-    async def _delay_retry(self):
-        """Aguarda antes de retry."""
-        import asyncio
-        await asyncio.sleep(self.config.retry_delay)
-    
     async def health_check(self) -> bool:
         """
         Verifica se API MET Norway está acessível.
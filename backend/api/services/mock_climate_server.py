@@ -0,0 +1,438 @@
+"""
+Servidor local simulado (mock) das APIs climáticas.
+
+Reproduz os endpoints usados pelos clientes em backend/api/services com
+dados sintéticos determinísticos (mesma coordenada/hora → mesmo valor),
+para testes de throughput, benchmarks e testes de caos offline.
+
+Endpoints simulados (roteamento só pelo path, qualquer host):
+- NASA POWER:  GET /api/temporal/daily/point
+- MET Norway:  GET /weatherapi/locationforecast/2.0/complete
+- NWS:         GET /points/{lat},{lon}
+               GET /gridpoints/{office}/{x},{y}/forecast/hourly
+- Open-Meteo:  GET /v1/forecast   (aceita lotes: latitude=a,b,c)
+- Elevação:    GET /v1/elevation  (aceita lotes)
+
+Falhas configuráveis por fonte (MockSourceConfig):
+- Latência (média + jitter)
+- Taxa de erro (HTTP 503)
+- Rate limit (token bucket → HTTP 429 com Retry-After)
+
+Uso in-process (sem rede, determinístico):
+    import httpx
+    from backend.api.services.mock_climate_server import create_mock_app
+
+    transport = httpx.ASGITransport(app=create_mock_app())
+    client = NASAPowerClient(transport=transport)
+
+Uso standalone (aponta base_url dos clientes para o servidor):
+    python -m backend.api.services.mock_climate_server --port 8099
+"""
+
+import asyncio
+import hashlib
+import math
+import os
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from fastapi import FastAPI, Query, Request
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, Field
+
+# Fontes simuladas e prefixos de path que as identificam
+MOCK_SOURCES = {
+    "nasa_power": ("/api/temporal/daily/point",),
+    "met_norway": ("/weatherapi/locationforecast/",),
+    "nws": ("/points/", "/gridpoints/"),
+    "openmeteo": ("/v1/forecast",),
+    "elevation": ("/v1/elevation",),
+}
+
+
+class MockSourceConfig(BaseModel):
+    """Comportamento simulado de uma fonte."""
+    latency_ms: float = Field(0.0, ge=0)
+    latency_jitter_ms: float = Field(0.0, ge=0)
+    error_rate: float = Field(0.0, ge=0, le=1)
+    rate_limit_per_second: Optional[float] = Field(None, gt=0)
+    rate_limit_burst: float = Field(10.0, gt=0)
+
+
+class MockServerConfig(BaseModel):
+    """
+    Configuração do servidor simulado.
+
+    Attributes:
+        default: Comportamento aplicado a todas as fontes
+        sources: Sobrescritas por fonte (chaves de MOCK_SOURCES)
+        seed: Semente do gerador de latência/erros (reprodutibilidade)
+    """
+    default: MockSourceConfig = MockSourceConfig()
+    sources: Dict[str, MockSourceConfig] = {}
+    seed: int = 42
+
+    def for_source(self, source: str) -> MockSourceConfig:
+        return self.sources.get(source, self.default)
+
+    @classmethod
+    def from_env(cls) -> "MockServerConfig":
+        """
+        Lê a configuração padrão de variáveis de ambiente:
+        MOCK_CLIMATE_LATENCY_MS, MOCK_CLIMATE_JITTER_MS,
+        MOCK_CLIMATE_ERROR_RATE, MOCK_CLIMATE_RATE_LIMIT,
+        MOCK_CLIMATE_RATE_BURST, MOCK_CLIMATE_SEED
+        """
+        rate_limit = os.getenv("MOCK_CLIMATE_RATE_LIMIT")
+        return cls(
+            default=MockSourceConfig(
+                latency_ms=float(os.getenv("MOCK_CLIMATE_LATENCY_MS", 0)),
+                latency_jitter_ms=float(os.getenv("MOCK_CLIMATE_JITTER_MS", 0)),
+                error_rate=float(os.getenv("MOCK_CLIMATE_ERROR_RATE", 0)),
+                rate_limit_per_second=float(rate_limit) if rate_limit else None,
+                rate_limit_burst=float(os.getenv("MOCK_CLIMATE_RATE_BURST", 10)),
+            ),
+            seed=int(os.getenv("MOCK_CLIMATE_SEED", 42)),
+        )
+
+
+class _RateLimiter:
+    """Token bucket síncrono: rejeita (em vez de esperar) sem tokens."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated_at = time.monotonic()
+
+    def try_acquire(self, cost: float = 1.0) -> float:
+        """Consome tokens; retorna 0 ou segundos até haver tokens."""
+        now = time.monotonic()
+        self._tokens = min(
+            self.capacity,
+            self._tokens + (now - self._updated_at) * self.rate
+        )
+        self._updated_at = now
+        cost = min(cost, self.capacity)
+        if self._tokens >= cost:
+            self._tokens -= cost
+            return 0.0
+        return (cost - self._tokens) / self.rate
+
+
+# ---------------------------------------------------------------------------
+# Dados sintéticos determinísticos
+# ---------------------------------------------------------------------------
+
+def _noise(*parts) -> float:
+    """Ruído determinístico em [-1, 1) a partir das partes."""
+    digest = hashlib.md5(":".join(map(str, parts)).encode()).digest()
+    return int.from_bytes(digest[:4], "little") / 2**31 - 1.0
+
+
+def synthetic_elevation(lat: float, lon: float) -> float:
+    """Elevação sintética (m) suave no espaço."""
+    value = 400 + 350 * math.sin(math.radians(lat) * 7) * math.cos(
+        math.radians(lon) * 5
+    )
+    return round(max(0.0, value), 1)
+
+
+def synthetic_hourly(lat: float, lon: float, ts: datetime) -> Dict[str, float]:
+    """Valores horários sintéticos em unidades Open-Meteo."""
+    doy = ts.timetuple().tm_yday
+    # Hora solar local aproximada
+    solar_hour = (ts.hour + lon / 15.0) % 24
+    season = math.cos(2 * math.pi * (doy - 15) / 365.25)
+    hemisphere = 1.0 if lat >= 0 else -1.0
+
+    base_temp = 28 - 0.35 * abs(lat) + 6 * season * hemisphere * abs(lat) / 45
+    diurnal = math.cos(math.pi * (solar_hour - 15) / 12)
+    temp = base_temp + 6 * diurnal + _noise(lat, lon, ts.date(), "t")
+
+    rh = min(100.0, max(10.0, 65 - 25 * diurnal + 5 * _noise(lat, lon, ts, "rh")))
+    es = 0.6108 * math.exp(17.27 * temp / (temp + 237.3))
+    ea = es * rh / 100
+    dew = 237.3 * math.log(ea / 0.6108) / (17.27 - math.log(ea / 0.6108))
+
+    sun = max(0.0, math.sin(math.pi * (solar_hour - 6) / 12))
+    cloud = min(100.0, max(0.0, 40 + 40 * _noise(lat, lon, ts.date(), "c")))
+    radiation = 1000 * sun * (1 - 0.6 * cloud / 100)
+
+    rain_chance = max(0.0, _noise(lat, lon, ts, "p"))
+    precipitation = round(4 * rain_chance, 1) if rain_chance > 0.9 else 0.0
+
+    return {
+        "temperature_2m": round(temp, 1),
+        "relative_humidity_2m": round(rh, 0),
+        "dew_point_2m": round(dew, 1),
+        "wind_speed_10m": round(2.5 + 1.5 * abs(_noise(lat, lon, ts, "w")), 1),
+        "surface_pressure": round(1013 - synthetic_elevation(lat, lon) / 8.3, 1),
+        "shortwave_radiation": round(radiation, 1),
+        "cloud_cover": round(cloud, 0),
+        "vapour_pressure_deficit": round(max(0.0, es - ea), 2),
+        "precipitation": precipitation,
+        "precipitation_probability": round(100 * rain_chance, 0),
+        "et0_fao_evapotranspiration": round(0.3 * sun * (es - ea + 0.2), 2),
+    }
+
+
+def _hours(start: datetime, n_hours: int) -> List[datetime]:
+    return [start + timedelta(hours=h) for h in range(n_hours)]
+
+
+def _today_utc() -> datetime:
+    now = datetime.now(timezone.utc)
+    return datetime(now.year, now.month, now.day, tzinfo=timezone.utc)
+
+
+def _float_list(value: str) -> List[float]:
+    return [float(v) for v in value.split(",") if v.strip()]
+
+
+# ---------------------------------------------------------------------------
+# Aplicação
+# ---------------------------------------------------------------------------
+
+def create_mock_app(config: Optional[MockServerConfig] = None) -> FastAPI:
+    """
+    Cria a aplicação FastAPI do servidor simulado.
+
+    Args:
+        config: Configuração de latência/erros/rate limit
+            (padrão: MockServerConfig.from_env())
+
+    Returns:
+        FastAPI: Aplicação ASGI (use com uvicorn ou httpx.ASGITransport)
+    """
+    config = config or MockServerConfig.from_env()
+    rng = random.Random(config.seed)
+    limiters: Dict[str, _RateLimiter] = {}
+    app = FastAPI(title="EVAonline mock climate APIs")
+    app.state.config = config
+    app.state.request_counts = {source: 0 for source in MOCK_SOURCES}
+
+    def _source_of(path: str) -> Optional[str]:
+        for source, prefixes in MOCK_SOURCES.items():
+            if any(path.startswith(p) for p in prefixes):
+                return source
+        return None
+
+    @app.middleware("http")
+    async def simulate_upstream(request: Request, call_next):
+        source = _source_of(request.url.path)
+        if source is None:
+            return await call_next(request)
+
+        app.state.request_counts[source] += 1
+        behaviour = config.for_source(source)
+
+        # Custo por localização (Open-Meteo/elevação cobram por ponto)
+        cost = 1.0
+        if source in ("openmeteo", "elevation"):
+            cost = float(
+                len(request.query_params.get("latitude", "").split(","))
+            )
+
+        if behaviour.rate_limit_per_second:
+            limiter = limiters.setdefault(source, _RateLimiter(
+                behaviour.rate_limit_per_second, behaviour.rate_limit_burst
+            ))
+            retry_after = limiter.try_acquire(cost)
+            if retry_after > 0:
+                return JSONResponse(
+                    {"error": True, "reason": "Too many requests"},
+                    status_code=429,
+                    headers={"Retry-After": str(math.ceil(retry_after))},
+                )
+
+        if behaviour.latency_ms or behaviour.latency_jitter_ms:
+            delay = behaviour.latency_ms + rng.uniform(
+                -behaviour.latency_jitter_ms, behaviour.latency_jitter_ms
+            )
+            await asyncio.sleep(max(0.0, delay) / 1000)
+
+        if behaviour.error_rate and rng.random() < behaviour.error_rate:
+            return JSONResponse(
+                {"error": True, "reason": "Simulated upstream failure"},
+                status_code=503,
+            )
+
+        return await call_next(request)
+
+    @app.get("/api/temporal/daily/point")
+    async def nasa_power(
+        latitude: float,
+        longitude: float,
+        start: str,
+        end: str,
+        parameters: str = "T2M_MAX,T2M_MIN,T2M"
+    ):
+        day = datetime.strptime(start, "%Y%m%d").replace(tzinfo=timezone.utc)
+        last = datetime.strptime(end, "%Y%m%d").replace(tzinfo=timezone.utc)
+        names = parameters.split(",")
+        series: Dict[str, Dict[str, float]] = {name: {} for name in names}
+
+        while day <= last:
+            hours = [synthetic_hourly(latitude, longitude, ts)
+                     for ts in _hours(day, 24)]
+            temps = [h["temperature_2m"] for h in hours]
+            daily = {
+                "T2M_MAX": max(temps),
+                "T2M_MIN": min(temps),
+                "T2M": round(sum(temps) / 24, 2),
+                "RH2M": round(
+                    sum(h["relative_humidity_2m"] for h in hours) / 24, 2
+                ),
+                "WS2M": round(
+                    sum(h["wind_speed_10m"] for h in hours) / 24 * 0.748, 2
+                ),
+                # W/m² (médias horárias) → MJ/m²/dia (community=AG)
+                "ALLSKY_SFC_SW_DWN": round(
+                    sum(h["shortwave_radiation"] for h in hours) * 0.0036, 2
+                ),
+                "PRECTOTCORR": round(sum(h["precipitation"] for h in hours), 2),
+            }
+            key = day.strftime("%Y%m%d")
+            for name in names:
+                series[name][key] = daily.get(name, -999.0)
+            day += timedelta(days=1)
+
+        return {
+            "type": "Feature",
+            "geometry": {
+                "type": "Point",
+                "coordinates": [
+                    longitude, latitude, synthetic_elevation(latitude, longitude)
+                ],
+            },
+            "properties": {"parameter": series},
+        }
+
+    @app.get("/weatherapi/locationforecast/2.0/complete")
+    async def met_norway(lat: float, lon: float):
+        timeseries = []
+        for ts in _hours(_today_utc(), 9 * 24):
+            h = synthetic_hourly(lat, lon, ts)
+            timeseries.append({
+                "time": ts.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "data": {
+                    "instant": {"details": {
+                        "air_temperature": h["temperature_2m"],
+                        "relative_humidity": h["relative_humidity_2m"],
+                        "wind_speed": h["wind_speed_10m"],
+                        "air_pressure_at_sea_level": h["surface_pressure"],
+                        "cloud_area_fraction": h["cloud_cover"],
+                        "dew_point_temperature": h["dew_point_2m"],
+                    }},
+                    "next_1_hours": {"details": {
+                        "precipitation_amount": h["precipitation"],
+                    }},
+                },
+            })
+        return {
+            "type": "Feature",
+            "geometry": {"type": "Point", "coordinates": [lon, lat]},
+            "properties": {"timeseries": timeseries},
+        }
+
+    @app.get("/points/{lat},{lon}")
+    async def nws_points(lat: float, lon: float, request: Request):
+        x, y = int((lon + 180) * 40), int((lat + 90) * 40)
+        base = str(request.base_url).rstrip("/")
+        return {
+            "properties": {
+                "gridId": "MCK",
+                "gridX": x,
+                "gridY": y,
+                "forecast": f"{base}/gridpoints/MCK/{x},{y}/forecast",
+                "forecastHourly": (
+                    f"{base}/gridpoints/MCK/{x},{y}/forecast/hourly"
+                ),
+            }
+        }
+
+    @app.get("/gridpoints/{office}/{x},{y}/forecast/hourly")
+    async def nws_hourly(office: str, x: int, y: int):
+        lat, lon = y / 40 - 90, x / 40 - 180
+        periods = []
+        for number, ts in enumerate(_hours(_today_utc(), 7 * 24), start=1):
+            h = synthetic_hourly(lat, lon, ts)
+            periods.append({
+                "number": number,
+                "startTime": ts.isoformat(),
+                "endTime": (ts + timedelta(hours=1)).isoformat(),
+                "temperature": round(h["temperature_2m"] * 9 / 5 + 32),
+                "temperatureUnit": "F",
+                "windSpeed": f"{round(h['wind_speed_10m'] / 0.44704)} mph",
+                "windDirection": "S",
+                "shortForecast": "Synthetic",
+                "probabilityOfPrecipitation": {
+                    "value": h["precipitation_probability"]
+                },
+                "relativeHumidity": {"value": h["relative_humidity_2m"]},
+            })
+        return {"properties": {"periods": periods}}
+
+    @app.get("/v1/forecast")
+    async def openmeteo_forecast(
+        latitude: str,
+        longitude: str,
+        hourly: str = "temperature_2m",
+        forecast_days: int = 7,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        timezone_name: str = Query("UTC", alias="timezone")
+    ):
+        if start_date and end_date:
+            start = datetime.strptime(start_date, "%Y-%m-%d").replace(
+                tzinfo=timezone.utc
+            )
+            n_days = (datetime.strptime(end_date, "%Y-%m-%d").replace(
+                tzinfo=timezone.utc
+            ) - start).days + 1
+        else:
+            start, n_days = _today_utc(), forecast_days
+
+        variables = hourly.split(",")
+        times = _hours(start, n_days * 24)
+        payloads = []
+        for lat, lon in zip(_float_list(latitude), _float_list(longitude)):
+            rows = [synthetic_hourly(lat, lon, ts) for ts in times]
+            series = {"time": [ts.strftime("%Y-%m-%dT%H:%M") for ts in times]}
+            for var in variables:
+                series[var] = [row.get(var) for row in rows]
+            payloads.append({
+                "latitude": lat,
+                "longitude": lon,
+                "elevation": synthetic_elevation(lat, lon),
+                "timezone": timezone_name,
+                "hourly": series,
+            })
+        return payloads[0] if len(payloads) == 1 else payloads
+
+    @app.get("/v1/elevation")
+    async def openmeteo_elevation(latitude: str, longitude: str):
+        return {
+            "elevation": [
+                synthetic_elevation(lat, lon)
+                for lat, lon in zip(_float_list(latitude), _float_list(longitude))
+            ]
+        }
+
+    return app
+
+
+if __name__ == "__main__":
+    import argparse
+
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Mock das APIs climáticas")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8099)
+    args = parser.parse_args()
+
+    uvicorn.run(create_mock_app(), host=args.host, port=args.port)
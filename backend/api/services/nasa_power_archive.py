@@ -0,0 +1,375 @@
+"""
+Arquivo histórico local (colunar) da NASA POWER e backfill retomável.
+
+Guarda a série diária completa desde 1981 para localizações fixas
+(337 cidades MATOPIBA + cidades mundiais populares), para que consultas
+históricas nesses pontos sejam servidas localmente, sem chamada upstream.
+
+Organização em disco (NASA_POWER_ARCHIVE_DIR, padrão
+data/nasa_power_archive/), um arquivo por célula MERRA-2:
+    <lat>_<lon>.npz     Colunas float32 (uma por variável, NaN = ausente)
+                        + 'start' (ordinal do 1º dia), 'days' e 'version'
+    manifest.json       Células, localizações e período arquivado
+
+A série de cada célula é contígua a partir de ARCHIVE_START; o fim
+arquivado é o checkpoint: cada bloco baixado é gravado atomicamente e
+uma nova execução retoma do dia seguinte ao último arquivado.
+
+Uso:
+    archive = get_nasa_power_archive()
+    records = archive.read(-7.5, -46.0, start, end)  # None se incompleto
+
+    summary = asyncio.run(backfill_nasa_power(locations))
+"""
+
+import asyncio
+import json
+import os
+import tempfile
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from loguru import logger
+
+from backend.api.services.rate_limiter import AsyncTokenBucket
+from backend.api.services.source_grid import SOURCE_GRIDS
+
+NASA_POWER_ARCHIVE_DIR = os.getenv(
+    "NASA_POWER_ARCHIVE_DIR",
+    str(Path(__file__).parent.parent.parent.parent / "data"
+        / "nasa_power_archive")
+)
+MANIFEST_FILE = "manifest.json"
+
+# Início da série diária NASA POWER (MERRA-2)
+ARCHIVE_START = date(1981, 1, 1)
+
+# Dias mais recentes ainda provisórios no upstream (não arquivados)
+ARCHIVE_LAG_DAYS = 7
+
+# Versão das células: a 1 gravava a radiação ×3.6 (community=AG já vem
+# em MJ/m²/day); células v1 são corrigidas na leitura e regravadas no
+# próximo append
+ARCHIVE_VERSION = 2
+
+# Colunas arquivadas (campos de NASAPowerData, unidades já convertidas)
+VARIABLES = (
+    "temp_max", "temp_min", "temp_mean", "humidity",
+    "wind_speed", "solar_radiation", "precipitation",
+)
+
+# Cota do backfill (NASA POWER pede uso moderado)
+BACKFILL_CHUNK_YEARS = 10
+BACKFILL_CONCURRENCY = 4
+BACKFILL_REQUESTS_PER_SECOND = 1.0
+BACKFILL_BURST = 4.0
+
+NATIVE_GRID = SOURCE_GRIDS["nasa_power"]
+
+
+def _as_date(value: Union[date, datetime]) -> date:
+    return value.date() if isinstance(value, datetime) else value
+
+
+class NASAPowerArchive:
+    """
+    Arquivo colunar por célula MERRA-2.
+
+    Attributes:
+        directory: Diretório do arquivo
+    """
+
+    def __init__(self, directory: Union[str, Path] = NASA_POWER_ARCHIVE_DIR):
+        self.directory = Path(directory)
+
+    def cell_path(self, lat: float, lon: float) -> Path:
+        """Arquivo da célula que contém o ponto."""
+        lat, lon = NATIVE_GRID.snap(lat, lon)
+        return self.directory / f"{lat:+08.3f}_{lon:+09.3f}.npz"
+
+    def _load(self, path: Path) -> Optional[Dict[str, np.ndarray]]:
+        if not path.exists():
+            return None
+        try:
+            with np.load(path) as npz:
+                columns = {key: npz[key] for key in npz.files}
+        except (OSError, ValueError) as e:
+            logger.error(f"Arquivo NASA POWER corrompido {path.name}: {e}")
+            return None
+        if int(columns.get("version", 1)) < 2:
+            columns["solar_radiation"] = (
+                columns["solar_radiation"] / np.float32(3.6)
+            )
+            columns["version"] = np.array(ARCHIVE_VERSION)
+        return columns
+
+    def coverage(self, lat: float, lon: float) -> Optional[Tuple[date, date]]:
+        """
+        Período arquivado da célula (início, fim), ou None se vazio.
+        """
+        columns = self._load(self.cell_path(lat, lon))
+        if columns is None or int(columns["days"]) == 0:
+            return None
+        first = int(columns["start"])
+        return (date.fromordinal(first),
+                date.fromordinal(first + int(columns["days"]) - 1))
+
+    def read(
+        self,
+        lat: float,
+        lon: float,
+        start: Union[date, datetime],
+        end: Union[date, datetime]
+    ) -> Optional[List]:
+        """
+        Registros diários do período, se inteiramente arquivado.
+
+        Args:
+            lat: Latitude
+            lon: Longitude
+            start: Data inicial
+            end: Data final
+
+        Returns:
+            List[NASAPowerData] ou None se o período não está completo
+        """
+        from backend.api.services.nasa_power_client import NASAPowerData
+
+        start, end = _as_date(start), _as_date(end)
+        columns = self._load(self.cell_path(lat, lon))
+        if columns is None:
+            return None
+
+        first = int(columns["start"])
+        i0 = start.toordinal() - first
+        i1 = end.toordinal() - first + 1
+        if i0 < 0 or i1 > int(columns["days"]) or i0 >= i1:
+            return None
+
+        values = {
+            name: np.round(columns[name][i0:i1].astype(np.float64), 3)
+            for name in VARIABLES
+        }
+        return [
+            NASAPowerData(
+                date=date.fromordinal(first + i0 + k).isoformat(),
+                **{
+                    name: (None if np.isnan(values[name][k])
+                           else float(values[name][k]))
+                    for name in VARIABLES
+                }
+            )
+            for k in range(i1 - i0)
+        ]
+
+    def append(self, lat: float, lon: float, records: Sequence) -> date:
+        """
+        Acrescenta registros contíguos ao fim da série da célula.
+
+        Gravação atômica (arquivo temporário + rename): uma falha no
+        meio nunca deixa a célula corrompida.
+
+        Args:
+            lat: Latitude
+            lon: Longitude
+            records: NASAPowerData em ordem cronológica
+
+        Returns:
+            date: Novo fim arquivado (checkpoint)
+
+        Raises:
+            ValueError: Se os registros não continuarem a série
+        """
+        path = self.cell_path(lat, lon)
+        columns = self._load(path) or {
+            "start": np.array(ARCHIVE_START.toordinal()),
+            "days": np.array(0),
+            "version": np.array(ARCHIVE_VERSION),
+            **{name: np.empty(0, dtype=np.float32) for name in VARIABLES},
+        }
+        first, days = int(columns["start"]), int(columns["days"])
+        expected = first + days
+        if not records:
+            return date.fromordinal(expected - 1)
+
+        offset = date.fromisoformat(records[0].date).toordinal()
+        if offset != expected:
+            raise ValueError(
+                f"Registros começam em {records[0].date}, esperado "
+                f"{date.fromordinal(expected)}"
+            )
+
+        for name in VARIABLES:
+            chunk = np.array(
+                [getattr(r, name) for r in records], dtype=np.float64
+            )
+            # Fill value do upstream (-999) vira ausente
+            chunk[chunk <= -999] = np.nan
+            columns[name] = np.concatenate(
+                [columns[name], chunk.astype(np.float32)]
+            )
+        columns["days"] = np.array(days + len(records))
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".npz.tmp")
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                np.savez_compressed(fh, **columns)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        return date.fromordinal(expected + len(records) - 1)
+
+    def write_manifest(self, cells: Dict[str, Dict]) -> None:
+        """Atualiza manifest.json com células e localizações."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        manifest_path = self.directory / MANIFEST_FILE
+        manifest = {}
+        if manifest_path.exists():
+            manifest = json.loads(manifest_path.read_text())
+        manifest.update(cells)
+        manifest_path.write_text(json.dumps(manifest, indent=1,
+                                            ensure_ascii=False))
+
+
+@lru_cache(maxsize=1)
+def get_nasa_power_archive() -> NASAPowerArchive:
+    """Arquivo compartilhado no processo."""
+    return NASAPowerArchive(NASA_POWER_ARCHIVE_DIR)
+
+
+def _plan_chunks(
+    next_day: date,
+    until: date,
+    chunk_years: int
+) -> List[Tuple[date, date]]:
+    chunks = []
+    while next_day <= until:
+        try:
+            chunk_end = next_day.replace(year=next_day.year + chunk_years)
+        except ValueError:  # 29/02
+            chunk_end = next_day.replace(year=next_day.year + chunk_years,
+                                         day=28)
+        chunk_end = min(chunk_end - timedelta(days=1), until)
+        chunks.append((next_day, chunk_end))
+        next_day = chunk_end + timedelta(days=1)
+    return chunks
+
+
+async def backfill_nasa_power(
+    locations: Sequence[Dict],
+    archive: Optional[NASAPowerArchive] = None,
+    client=None,
+    until: Optional[date] = None,
+    chunk_years: int = BACKFILL_CHUNK_YEARS,
+    concurrency: int = BACKFILL_CONCURRENCY,
+    limiter: Optional[AsyncTokenBucket] = None
+) -> Dict:
+    """
+    Baixa a série NASA POWER desde 1981 para as localizações.
+
+    Localizações na mesma célula MERRA-2 compartilham um único download.
+    Células são processadas em paralelo (``concurrency``), com cada
+    requisição passando pelo token bucket; dentro de uma célula os blocos
+    são sequenciais e cada bloco é arquivado ao terminar. Na primeira
+    falha a célula para e será retomada na próxima execução.
+
+    Args:
+        locations: Dicts com 'name', 'lat' e 'lon'
+        archive: Arquivo de destino (padrão: compartilhado)
+        client: NASAPowerClient (padrão: sem cache e sem arquivo)
+        until: Último dia a arquivar (padrão: hoje - ARCHIVE_LAG_DAYS)
+        chunk_years: Anos por requisição
+        concurrency: Células baixadas em paralelo
+        limiter: Token bucket de requisições upstream
+
+    Returns:
+        dict: Estatísticas (células, requisições, falhas, período)
+    """
+    from backend.api.services.nasa_power_client import (NASAPowerClient,
+                                                        NASAPowerConfig)
+
+    archive = archive or get_nasa_power_archive()
+    until = until or date.today() - timedelta(days=ARCHIVE_LAG_DAYS)
+    limiter = limiter or AsyncTokenBucket(
+        rate=BACKFILL_REQUESTS_PER_SECOND, capacity=BACKFILL_BURST
+    )
+    owns_client = client is None
+    if owns_client:
+        client = NASAPowerClient(config=NASAPowerConfig(use_archive=False))
+
+    cells: Dict[Tuple[float, float], List[str]] = {}
+    for loc in locations:
+        cell = NATIVE_GRID.snap(loc["lat"], loc["lon"])
+        cells.setdefault(cell, []).append(loc["name"])
+
+    stats = {"requests": 0, "days": 0, "complete": 0, "failed": []}
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run_cell(cell: Tuple[float, float], names: List[str]):
+        lat, lon = cell
+        covered = archive.coverage(lat, lon)
+        next_day = covered[1] + timedelta(days=1) if covered else ARCHIVE_START
+
+        async with semaphore:
+            for chunk_start, chunk_end in _plan_chunks(next_day, until,
+                                                       chunk_years):
+                await limiter.acquire()
+                try:
+                    records = await client.get_daily_data(
+                        lat=lat, lon=lon,
+                        start_date=datetime.combine(chunk_start,
+                                                    datetime.min.time()),
+                        end_date=datetime.combine(chunk_end,
+                                                  datetime.min.time())
+                    )
+                    stats["requests"] += 1
+                    archive.append(lat, lon, records)
+                except Exception as e:
+                    logger.error(
+                        f"❌ Backfill NASA POWER {names[0]} ({lat}, {lon}) "
+                        f"{chunk_start}..{chunk_end}: {str(e)[:100]}"
+                    )
+                    stats["failed"].append(names[0])
+                    return
+                stats["days"] += len(records)
+
+        stats["complete"] += 1
+        covered = archive.coverage(lat, lon)
+        archive_cells[f"{lat}_{lon}"] = {
+            "lat": lat, "lon": lon, "locations": names,
+            "start": covered[0].isoformat() if covered else None,
+            "end": covered[1].isoformat() if covered else None,
+        }
+
+    archive_cells: Dict[str, Dict] = {}
+    logger.info(
+        f"🚀 Backfill NASA POWER: {len(locations)} localizações em "
+        f"{len(cells)} células até {until}"
+    )
+    try:
+        await asyncio.gather(*(run_cell(c, n) for c, n in cells.items()))
+    finally:
+        archive.write_manifest(archive_cells)
+        if owns_client:
+            await client.close()
+
+    result = {
+        "status": "success" if not stats["failed"] else "partial",
+        "locations": len(locations),
+        "cells": len(cells),
+        "complete_cells": stats["complete"],
+        "requests": stats["requests"],
+        "days_archived": stats["days"],
+        "failed": stats["failed"][:10],
+        "until": until.isoformat(),
+    }
+    logger.info(
+        f"🎯 Backfill NASA POWER: {stats['complete']}/{len(cells)} células, "
+        f"{stats['requests']} requisições, {stats['days']} dias"
+    )
+    return result
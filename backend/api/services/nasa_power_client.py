@@ -10,15 +10,23 @@ from typing import Dict, List, Optional
 import httpx
 from pydantic import BaseModel, Field
 
+from backend.api.services.nasa_power_archive import get_nasa_power_archive
+from backend.api.services.source_grid import SOURCE_GRIDS
+from backend.api.services.source_health import (HealthConfig,
+                                                get_source_health,
+                                                resilient_get)
+
 logger = logging.getLogger(__name__)
 
 
 class NASAPowerConfig(BaseModel):
     """Configuração da API NASA POWER."""
     base_url: str = "https://power.larc.nasa.gov/api/temporal/daily/point"
-    timeout: int = 30
+    timeout: int = 30              # Orçamento total da chamada (s)
     retry_attempts: int = 3
-    retry_delay: float = 1.0
+    retry_delay: float = 1.0       # Base do backoff exponencial c/ jitter
+    hedge_requests: bool = False   # Requisição duplicada após o p95
+    use_archive: bool = True       # Serve períodos do arquivo histórico local
 
 
 class NASAPowerData(BaseModel):
@@ -54,10 +62,15 @@ class NASAPowerClient:
     https://power.larc.nasa.gov/docs/services/api/
     """
     
+    # Grade nativa MERRA-2 (0.5° x 0.625°): cache e requisições usam o
+    # centro da célula, pois o upstream retorna o mesmo valor na célula
+    NATIVE_GRID = SOURCE_GRIDS["nasa_power"]
+    
     def __init__(
         self,
         config: Optional[NASAPowerConfig] = None,
-        cache: Optional[any] = None
+        cache: Optional[any] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None
     ):
         """
         Inicializa cliente NASA POWER.
@@ -65,14 +78,36 @@ class NASAPowerClient:
         Args:
             config: Configuração customizada (opcional)
             cache: ClimateCacheService (opcional, injetado via DI)
+            transport: Transporte httpx customizado (opcional, ex:
+                gravação/reprodução ou servidor simulado)
         """
         self.config = config or NASAPowerConfig()
-        self.client = httpx.AsyncClient(timeout=self.config.timeout)
+        self.client = httpx.AsyncClient(
+            timeout=self.config.timeout,
+            transport=transport
+        )
         self.cache = cache  # Cache service opcional
+        # Arquivo histórico local (backfill desde 1981)
+        self.archive = (
+            get_nasa_power_archive() if self.config.use_archive else None
+        )
+        
+        # Saúde compartilhada da fonte (circuit breaker + timeout adaptativo)
+        self.health = get_source_health(
+            "nasa_power",
+            config=HealthConfig(
+                max_timeout=self.config.timeout,
+                backoff_base=self.config.retry_delay
+            ),
+            redis=getattr(cache, "redis", None)
+        )
     
     async def close(self):
-        """Fecha conexão HTTP."""
-        await self.client.aclose()
+        """Fecha conexão HTTP (após renovações de cache pendentes)."""
+        if self.cache:
+            await self.cache.run_after_refreshes(self.client.aclose)
+        else:
+            await self.client.aclose()
     
     async def get_daily_data(
         self,
@@ -80,15 +115,19 @@ class NASAPowerClient:
         lon: float,
         start_date: datetime,
         end_date: datetime,
-        community: str = "ag"
+        community: str = "ag",
+        use_cache: bool = True
     ) -> List[NASAPowerData]:
         """
         Busca dados climáticos diários para um ponto com cache inteligente.
         
         Fluxo:
-        1. Tenta buscar do cache Redis (se disponível)
-        2. Se cache MISS, busca da API NASA POWER
-        3. Salva resultado no cache para requisições futuras
+        1. Ajusta coordenadas ao centro da célula nativa (NATIVE_GRID)
+        2. Serve do arquivo histórico local, se o período estiver completo
+        3. Tenta buscar do cache Redis (se disponível); dado stale é
+           servido enquanto renova em segundo plano
+        4. Se cache MISS, busca da API NASA POWER
+        5. Salva resultado no cache para requisições futuras
         
         Args:
             lat: Latitude (-90 a 90)
@@ -96,6 +135,8 @@ class NASAPowerClient:
             start_date: Data inicial
             end_date: Data final
             community: Comunidade NASA POWER (ag=agriculture)
+            use_cache: False quando o chamador consulta/grava o cache em
+                lote (get_many/set_many)
             
         Returns:
             List[NASAPowerData]: Dados diários
@@ -112,22 +153,41 @@ class NASAPowerClient:
         if start_date > end_date:
             raise ValueError("start_date deve ser <= end_date")
         
-        # 1. Tenta buscar do cache (se disponível)
-        if self.cache:
-            cached_data = await self.cache.get(
-                source="nasa_power",
-                lat=lat,
-                lon=lon,
-                start=start_date,
-                end=end_date
-            )
-            if cached_data:
+        # Mesma célula nativa → mesmos dados upstream
+        lat, lon = self.NATIVE_GRID.snap(lat, lon)
+        
+        # 0. Arquivo histórico local (zero chamadas upstream)
+        if self.archive is not None:
+            archived = self.archive.read(lat, lon, start_date, end_date)
+            if archived is not None:
                 logger.info(
-                    f"🎯 Cache HIT: NASA POWER lat={lat}, lon={lon}"
+                    f"📦 Arquivo local HIT: NASA POWER lat={lat}, lon={lon}"
+                )
+                return archived
+        
+        # 1. Cache com stale-while-revalidate (API só em miss ou em
+        #    renovação em segundo plano)
+        if self.cache and use_cache:
+            return await self.cache.get_or_fetch(
+                "nasa_power", lat, lon, start_date, end_date,
+                loader=lambda: self._fetch_daily(
+                    lat, lon, start_date, end_date, community
                 )
-                return cached_data
+            )
         
-        # 2. Cache MISS - busca da API
+        # 2. Sem cache - busca da API
+        return await self._fetch_daily(lat, lon, start_date, end_date,
+                                       community)
+    
+    async def _fetch_daily(
+        self,
+        lat: float,
+        lon: float,
+        start_date: datetime,
+        end_date: datetime,
+        community: str
+    ) -> List[NASAPowerData]:
+        """Busca e converte dados diários da API (coordenadas já ajustadas)."""
         logger.info(f"🌐 Buscando NASA API: lat={lat}, lon={lon}")
         
         # Formatar datas (YYYYMMDD)
@@ -142,7 +202,7 @@ class NASAPowerClient:
                 "T2M",            # Temp média 2m (°C)
                 "RH2M",           # Umidade relativa 2m (%)
                 "WS2M",           # Velocidade vento 2m (m/s)
-                "ALLSKY_SFC_SW_DWN",  # Radiação solar (kWh/m²/day)
+                "ALLSKY_SFC_SW_DWN",  # Radiação solar (MJ/m²/day em AG)
                 "PRECTOTCORR"     # Precipitação (mm/dia)
             ]),
             "community": community,
@@ -153,55 +213,38 @@ class NASAPowerClient:
             "format": "JSON"
         }
         
-        # Requisição com retry
-        for attempt in range(self.config.retry_attempts):
-            try:
-                logger.info(
-                    f"NASA POWER request: lat={lat}, lon={lon}, "
-                    f"dates={start_str} to {end_str} (attempt {attempt + 1})"
-                )
-                
-                response = await self.client.get(
-                    self.config.base_url,
-                    params=params
-                )
-                response.raise_for_status()
-                
-                data = response.json()
-                parsed_data = self._parse_response(data)
-                
-                # 3. Salva no cache (se disponível)
-                if self.cache and parsed_data:
-                    await self.cache.set(
-                        source="nasa_power",
-                        lat=lat,
-                        lon=lon,
-                        start=start_date,
-                        end=end_date,
-                        data=parsed_data
-                    )
-                    logger.info(
-                        f"💾 Cache SAVE: NASA POWER lat={lat}, lon={lon}"
-                    )
-                
-                return parsed_data
-                
-            except httpx.HTTPError as e:
-                logger.warning(
-                    f"NASA POWER request failed (attempt {attempt + 1}): {e}"
-                )
-                if attempt == self.config.retry_attempts - 1:
-                    raise
-                await self._delay_retry()
+        # Requisição com circuit breaker, timeout adaptativo e backoff
+        logger.info(
+            f"NASA POWER request: lat={lat}, lon={lon}, "
+            f"dates={start_str} to {end_str}"
+        )
+        try:
+            response = await resilient_get(
+                self.client,
+                self.config.base_url,
+                self.health,
+                retry_attempts=self.config.retry_attempts,
+                hedge=self.config.hedge_requests,
+                params=params
+            )
+        except httpx.HTTPError as e:
+            logger.warning(f"NASA POWER request failed: {e}")
+            raise
         
-        raise httpx.HTTPError("NASA POWER: Todos os attempts falharam")
+        return self._parse_response(response.json(), community)
     
-    def _parse_response(self, data: Dict) -> List[NASAPowerData]:
+    def _parse_response(
+        self,
+        data: Dict,
+        community: str = "ag"
+    ) -> List[NASAPowerData]:
         """
         Parseia resposta JSON da NASA POWER.
         
         Args:
             data: Resposta JSON
+            community: Comunidade da requisição (define a unidade da
+                radiação: AG já retorna MJ/m²/day; RE e SB, kWh/m²/day)
             
         Returns:
             List[NASAPowerData]: Dados parseados
@@ -215,11 +258,14 @@ class NASAPowerClient:
         first_param = next(iter(parameters.values()))
         dates = sorted(first_param.keys())
         
+        to_mj = 1.0 if community.lower() == "ag" else 3.6
         results = []
         for date_str in dates:
-            # Converter radiação kWh/m²/day → MJ/m²/day (1 kWh = 3.6 MJ)
-            solar_kwh = parameters.get("ALLSKY_SFC_SW_DWN", {}).get(date_str)
-            solar_mj = solar_kwh * 3.6 if solar_kwh is not None else None
+            # Radiação em MJ/m²/day, a mesma unidade do NasaPowerAPI (AG);
+            # só RE/SB retornam kWh/m²/day (1 kWh = 3.6 MJ)
+            solar_mj = parameters.get("ALLSKY_SFC_SW_DWN", {}).get(date_str)
+            if solar_mj is not None and solar_mj > -999:
+                solar_mj *= to_mj
             
             record = NASAPowerData(
                 date=self._format_date(date_str),
@@ -251,11 +297,6 @@ class NASAPowerClient:
         day = date_str[6:8]
         return f"{year}-{month}-{day}"
     
-    async def _delay_retry(self):
-        """Delay entre tentativas de retry."""
-        import asyncio
-        await asyncio.sleep(self.config.retry_delay)
-    
     async def get_current_delay(self) -> timedelta:
         """
         Retorna delay atual dos dados NASA POWER.
@@ -1,14 +1,15 @@
 from datetime import date, datetime, timedelta
 from typing import Optional, Union, Tuple, List
 import os
-import pickle
 import pandas as pd
 import requests
 from requests.exceptions import RequestException
-from celery import shared_task
 from redis import Redis
 from loguru import logger
 
+from backend.api.services.nasa_power_archive import get_nasa_power_archive
+from backend.api.services.source_grid import snap_coordinates
+
 # Definir a URL do Redis
 REDIS_URL = os.getenv("REDIS_URL", "redis://redis:6379/0")
 
@@ -26,7 +27,16 @@ class NasaPowerAPI:
         "PRECTOTCORR",
     ]
 
-    NASA_CACHE_EXPIRY_HOURS = 720  # 30 days
+    # Parâmetro NASA POWER -> coluna do arquivo local (NASAPowerData)
+    ARCHIVE_COLUMNS = {
+        "T2M_MAX": "temp_max",
+        "T2M_MIN": "temp_min",
+        "T2M": "temp_mean",
+        "RH2M": "humidity",
+        "WS2M": "wind_speed",
+        "ALLSKY_SFC_SW_DWN": "solar_radiation",
+        "PRECTOTCORR": "precipitation",
+    }
 
     def __init__(
         self,
@@ -36,6 +46,7 @@ class NasaPowerAPI:
         lat: float,
         parameter: Optional[list] = None,
         matopiba_only: bool = False,
+        session: Optional[requests.Session] = None,
     ):
         """
         Initialize the class to download daily weather data from NASA POWER.
@@ -48,6 +59,9 @@ class NasaPowerAPI:
             parameter: List of climate parameters to download; if None, uses 
                 defaults for FAO-56 ETo.
             matopiba_only: Whether to restrict coordinates to MATOPIBA region.
+            session: HTTP session for the upstream requests; if None, uses
+                the one for CLIMATE_HTTP_MODE (mock server or cassettes),
+                or plain ``requests`` in live mode.
 
         Raises:
             ValueError: If parameters, dates, or coordinates are invalid.
@@ -123,8 +137,22 @@ class NasaPowerAPI:
 
         self.long = long
         self.lat = lat
+        # Centro da célula MERRA-2 (0.5° x 0.625°): usado na requisição e
+        # na chave de cache, pois o upstream retorna o mesmo valor na célula
+        self.lat_grid, self.long_grid = snap_coordinates(
+            "nasa_power", lat, long
+        )
         self.matopiba_only = matopiba_only
         self.request = self._build_request()
+        # Importa aqui para evitar circular imports (factory -> cache -> main)
+        from backend.api.services.climate_factory import ClimateClientFactory
+        self.session = (
+            session if session is not None
+            else ClimateClientFactory.create_requests_session()
+        )
+        self.archive = get_nasa_power_archive()
+        # Mesmo cache (prefixo 'climate') do NASAPowerClient e do warm-up
+        self.cache = ClimateClientFactory.get_cache_service()
 
         # Inicializa cliente Redis
         try:
@@ -153,8 +181,8 @@ class NasaPowerAPI:
             f"community=AG&format=JSON"
         )
         coords = (
-            f"&longitude={self.long}&"
-            f"latitude={self.lat}"
+            f"&longitude={self.long_grid}&"
+            f"latitude={self.lat_grid}"
         )
         dates = (
             f"&start={start_date}&"
@@ -166,7 +194,8 @@ class NasaPowerAPI:
         """Faz requisição à API NASA POWER."""
         warnings = []
         try:
-            response = requests.get(self.request, timeout=30)
+            http = self.session or requests
+            response = http.get(self.request, timeout=30)
             response.raise_for_status()
             data = response.json()
             
@@ -203,61 +232,102 @@ class NasaPowerAPI:
             logger.error(msg)
             return {}, warnings
 
-    def _save_to_cache(self, df: pd.DataFrame, cache_key: str) -> None:
-        """Save data to Redis cache."""
+    def _records_to_df(self, records: list) -> pd.DataFrame:
+        """Registros NASAPowerData -> colunas NASA POWER (self.parameter)."""
+        df = pd.DataFrame(
+            {
+                param: [getattr(r, column) for r in records]
+                for param, column in self.ARCHIVE_COLUMNS.items()
+            },
+            index=pd.to_datetime([r.date for r in records]),
+            dtype=float,
+        )
+        return df[self.parameter]
+
+    def _df_to_records(self, df: pd.DataFrame) -> list:
+        """Colunas NASA POWER -> registros NASAPowerData (formato do cache)."""
+        from backend.api.services.nasa_power_client import NASAPowerData
+
+        return [
+            NASAPowerData(
+                date=day.strftime("%Y-%m-%d"),
+                **{
+                    column: (None if pd.isna(row[param])
+                             else float(row[param]))
+                    for param, column in self.ARCHIVE_COLUMNS.items()
+                }
+            )
+            for day, row in df.iterrows()
+        ]
+
+    def _save_to_cache(self, df: pd.DataFrame) -> None:
+        """
+        Salva no cache compartilhado (ClimateCacheService, prefixo
+        'climate'), o mesmo que NASAPowerClient e o warm-up usam.
+
+        Só períodos com todos os parâmetros: a chave não distingue
+        subconjuntos de parâmetros.
+        """
         if not self.redis_client:
             logger.warning("No Redis connection. Skipping cache save.")
             return
-        try:
-            self.redis_client.setex(
-                cache_key,
-                timedelta(hours=self.NASA_CACHE_EXPIRY_HOURS),
-                pickle.dumps(df)
-            )
-            logger.info(f"Saved to Redis cache: {cache_key}")
-        except Exception as e:
-            logger.error("Erro ao salvar no cache Redis: %s", e)
+        if set(self.parameter) != set(self.ARCHIVE_COLUMNS):
+            return
+        self.cache.set_sync(
+            self.redis_client, "nasa_power", self.lat_grid, self.long_grid,
+            self.start, self.end, self._df_to_records(df)
+        )
 
-    def _load_from_cache(self, cache_key: str) -> Optional[pd.DataFrame]:
+    def _load_from_cache(self) -> Optional[pd.DataFrame]:
         """
-        Carrega dados do cache Redis se disponíveis e válidos.
-        
-        Args:
-            cache_key: Chave para buscar no cache.
-            
+        Carrega dados do cache compartilhado, se disponíveis e frescos
+        (inclusive os gravados pelo NASAPowerClient e pelo warm-up).
+
         Returns:
             Optional[pd.DataFrame]: DataFrame com dados ou None.
         """
         if not self.redis_client:
             logger.warning("Sem conexão Redis. Ignorando cache.")
             return None
-            
+
+        records = self.cache.get_sync(
+            self.redis_client, "nasa_power", self.lat_grid, self.long_grid,
+            self.start, self.end
+        )
+        if not records:
+            return None
         try:
-            # Tenta carregar do cache
-            cached_data = self.redis_client.get(cache_key)
-            if not cached_data:
-                logger.info("Cache Redis não encontrado: %s", cache_key)
-                return None
-                
-            # Desserializa dados
-            df = pickle.loads(cached_data)
-            
-            # Valida período
-            if df.index.min() <= self.start and df.index.max() >= self.end:
-                logger.info("Carregado do cache Redis: %s", cache_key)
-                return df
-                
-            logger.info(
-                "Dados em cache não cobrem o período: %s",
-                cache_key
-            )
-            
+            return self._records_to_df(records)
         except Exception as e:
             logger.error("Erro ao carregar do cache Redis: %s", e)
-            
-        return None
+            return None
+
+    def _load_from_archive(self) -> Optional[pd.DataFrame]:
+        """
+        Carrega o período do arquivo histórico local, se inteiramente
+        arquivado (mesmo arquivo que o NASAPowerClient consulta).
+
+        Returns:
+            Optional[pd.DataFrame]: DataFrame com dados ou None.
+        """
+        if self.archive is None:
+            return None
+        try:
+            records = self.archive.read(
+                self.lat_grid, self.long_grid, self.start, self.end
+            )
+        except Exception as e:
+            logger.error("Erro ao ler arquivo local NASA POWER: %s", e)
+            return None
+        if records is None:
+            return None
+
+        logger.info(
+            "Carregado do arquivo local NASA POWER: (%s, %s)",
+            self.lat_grid, self.long_grid
+        )
+        return self._records_to_df(records)
 
-    @shared_task
     def get_weather_sync(self) -> Tuple[pd.DataFrame, List[str]]:
         """
         Baixa dados meteorológicos do NASA POWER.
@@ -283,15 +353,15 @@ class NasaPowerAPI:
             self.long
         )
         
-        # Gera chave de cache
-        cache_key = (
-            f"nasa_power:{self.start:%Y%m%d}:{self.end:%Y%m%d}:"
-            f"{self.lat}:{self.long}"
-        )
         warnings = []
+
+        # Arquivo histórico local: sem Redis nem chamada upstream
+        df = self._load_from_archive()
+        if df is not None:
+            return df, warnings
         
         # Tenta carregar do cache
-        df = self._load_from_cache(cache_key)
+        df = self._load_from_cache()
         if df is not None:
             return df, warnings
 
@@ -320,7 +390,7 @@ class NasaPowerAPI:
                 weather_df = weather_df[self.parameter]
                 
                 # Salva no cache
-                self._save_to_cache(weather_df, cache_key)
+                self._save_to_cache(weather_df)
                 return weather_df, warnings
                 
             except Exception as e:
@@ -18,15 +18,22 @@ from typing import Dict, List, Optional
 import httpx
 from pydantic import BaseModel, Field
 
+from backend.api.services.source_coverage import get_coverage_index
+from backend.api.services.source_grid import SOURCE_GRIDS
+from backend.api.services.source_health import (HealthConfig,
+                                                get_source_health,
+                                                resilient_get)
+
 logger = logging.getLogger(__name__)
 
 
 class NWSConfig(BaseModel):
     """Configuração da API NWS."""
     base_url: str = "https://api.weather.gov"
-    timeout: int = 30
+    timeout: int = 30              # Orçamento total da chamada (s)
     retry_attempts: int = 3
-    retry_delay: float = 1.0
+    retry_delay: float = 1.0       # Base do backoff exponencial c/ jitter
+    hedge_requests: bool = False   # Requisição duplicada após o p95
     user_agent: str = (
         "EVAonline/1.0 "
         "(https://github.com/angelacunhasoares/EVAonline)"
@@ -85,10 +92,14 @@ class NWSClient:
     # Bounding box USA Continental (lon_min, lat_min, lon_max, lat_max)
     USA_BBOX = (-125.0, 24.0, -66.0, 49.0)
     
+    # Grade nativa NDFD (~2.5 km): cache e requisições usam o centro da célula
+    NATIVE_GRID = SOURCE_GRIDS["nws"]
+    
     def __init__(
         self,
         config: Optional[NWSConfig] = None,
-        cache: Optional[any] = None
+        cache: Optional[any] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None
     ):
         """
         Inicializa cliente NWS.
@@ -96,6 +107,8 @@ class NWSClient:
         Args:
             config: Configuração customizada (opcional)
             cache: ClimateCacheService (opcional, injetado via DI)
+            transport: Transporte httpx customizado (opcional, ex:
+                gravação/reprodução ou servidor simulado)
         """
         self.config = config or NWSConfig()
         
@@ -108,13 +121,27 @@ class NWSClient:
         self.client = httpx.AsyncClient(
             timeout=self.config.timeout,
             headers=headers,
+            transport=transport,
             follow_redirects=True
         )
         self.cache = cache  # Cache service opcional
+        
+        # Saúde compartilhada da fonte (circuit breaker + timeout adaptativo)
+        self.health = get_source_health(
+            "nws",
+            config=HealthConfig(
+                max_timeout=self.config.timeout,
+                backoff_base=self.config.retry_delay
+            ),
+            redis=getattr(cache, "redis", None)
+        )
     
     async def close(self):
-        """Fecha conexão HTTP."""
-        await self.client.aclose()
+        """Fecha conexão HTTP (após renovações de cache pendentes)."""
+        if self.cache:
+            await self.cache.run_after_refreshes(self.client.aclose)
+        else:
+            await self.client.aclose()
     
     def is_in_coverage(self, lat: float, lon: float) -> bool:
         """
@@ -125,17 +152,18 @@ class NWSClient:
             lon: Longitude
         
         Returns:
-            bool: True se dentro do bbox USA
+            bool: True se dentro do footprint CONUS
         """
-        lon_min, lat_min, lon_max, lat_max = self.USA_BBOX
-        return (lon_min <= lon <= lon_max) and (lat_min <= lat <= lat_max)
+        # Footprint poligonal (bbox fica apenas como referência/exibição)
+        return get_coverage_index().covers("nws", lat, lon)
     
     async def get_forecast_data(
         self,
         lat: float,
         lon: float,
         start_date: Optional[datetime] = None,
-        end_date: Optional[datetime] = None
+        end_date: Optional[datetime] = None,
+        use_cache: bool = True
     ) -> List[NWSData]:
         """
         Busca dados de previsão meteorológica com cache inteligente.
@@ -150,6 +178,8 @@ class NWSClient:
             lon: Longitude (-180 a 180)
             start_date: Data inicial (default: agora)
             end_date: Data final (default: agora + 7 dias)
+            use_cache: False quando o chamador consulta/grava o cache em
+                lote (get_many/set_many)
             
         Returns:
             List[NWSData]: Dados horários de previsão
@@ -180,49 +210,41 @@ class NWSClient:
         if start_date > end_date:
             raise ValueError("start_date deve ser <= end_date")
         
-        # 1. Tenta buscar do cache (se disponível)
-        if self.cache:
-            cached_data = await self.cache.get(
-                source="nws",
-                lat=lat,
-                lon=lon,
-                start=start_date,
-                end=end_date
-            )
-            if cached_data:
-                logger.info(
-                    f"🎯 Cache HIT: NWS lat={lat}, lon={lon}"
+        # Mesma célula nativa → mesmos dados upstream
+        lat, lon = self.NATIVE_GRID.snap(lat, lon)
+        
+        # 1. Cache com stale-while-revalidate (API só em miss ou em
+        #    renovação em segundo plano)
+        if self.cache and use_cache:
+            return await self.cache.get_or_fetch(
+                "nws", lat, lon, start_date, end_date,
+                loader=lambda: self._fetch_forecast(
+                    lat, lon, start_date, end_date
                 )
-                return cached_data
+            )
         
-        # 2. Cache MISS - busca da API
+        # 2. Sem cache - busca da API
+        return await self._fetch_forecast(lat, lon, start_date, end_date)
+    
+    async def _fetch_forecast(
+        self,
+        lat: float,
+        lon: float,
+        start_date: datetime,
+        end_date: datetime
+    ) -> List[NWSData]:
+        """Busca a previsão da API em 2 passos (coordenadas já ajustadas)."""
         logger.info(f"🌐 Buscando NWS API: lat={lat}, lon={lon}")
         
         # Step 1: Get grid metadata
         grid_metadata = await self._get_grid_metadata(lat, lon)
         
         # Step 2: Get forecast data
-        parsed_data = await self._get_forecast_from_grid(
+        return await self._get_forecast_from_grid(
             grid_metadata,
             start_date,
             end_date
         )
-        
-        # 3. Salva no cache (se disponível)
-        if self.cache and parsed_data:
-            await self.cache.set(
-                source="nws",
-                lat=lat,
-                lon=lon,
-                start=start_date,
-                end=end_date,
-                data=parsed_data
-            )
-            logger.info(
-                f"💾 Cache SAVE: NWS lat={lat}, lon={lon}"
-            )
-        
-        return parsed_data
     
     async def _get_grid_metadata(
         self,
@@ -254,35 +276,26 @@ class NWSClient:
         """
         points_url = f"{self.config.base_url}/points/{lat},{lon}"
         
-        for attempt in range(self.config.retry_attempts):
-            try:
-                logger.info(
-                    f"NWS metadata request: {points_url} "
-                    f"(attempt {attempt + 1})"
-                )
-                
-                response = await self.client.get(points_url)
-                response.raise_for_status()
-                
-                data = response.json()
-                properties = data.get("properties", {})
-                
-                if not properties.get("forecastHourly"):
-                    raise ValueError(
-                        "NWS metadata inválida (sem forecastHourly)"
-                    )
-                
-                return properties
-                
-            except httpx.HTTPError as e:
-                logger.warning(
-                    f"NWS metadata failed (attempt {attempt + 1}): {e}"
-                )
-                if attempt == self.config.retry_attempts - 1:
-                    raise
-                await self._delay_retry()
+        logger.info(f"NWS metadata request: {points_url}")
+        try:
+            response = await resilient_get(
+                self.client,
+                points_url,
+                self.health,
+                retry_attempts=self.config.retry_attempts,
+                hedge=self.config.hedge_requests
+            )
+        except httpx.HTTPError as e:
+            logger.warning(f"NWS metadata failed: {e}")
+            raise
+        
+        data = response.json()
+        properties = data.get("properties", {})
         
-        raise ValueError("Failed to get NWS grid metadata")
+        if not properties.get("forecastHourly"):
+            raise ValueError("NWS metadata inválida (sem forecastHourly)")
+        
+        return properties
     
     async def _get_forecast_from_grid(
         self,
@@ -306,30 +319,21 @@ class NWSClient:
         if not forecast_url:
             raise ValueError("Grid metadata sem URL de forecast")
         
-        for attempt in range(self.config.retry_attempts):
-            try:
-                logger.info(
-                    f"NWS forecast request: {forecast_url} "
-                    f"(attempt {attempt + 1})"
-                )
-                
-                response = await self.client.get(forecast_url)
-                response.raise_for_status()
-                
-                data = response.json()
-                return self._parse_forecast_response(
-                    data, start_date, end_date
-                )
-                
-            except httpx.HTTPError as e:
-                logger.warning(
-                    f"NWS forecast failed (attempt {attempt + 1}): {e}"
-                )
-                if attempt == self.config.retry_attempts - 1:
-                    raise
-                await self._delay_retry()
+        logger.info(f"NWS forecast request: {forecast_url}")
+        try:
+            response = await resilient_get(
+                self.client,
+                forecast_url,
+                self.health,
+                retry_attempts=self.config.retry_attempts,
+                hedge=self.config.hedge_requests
+            )
+        except httpx.HTTPError as e:
+            logger.warning(f"NWS forecast failed: {e}")
+            raise
         
-        return []
+        data = response.json()
+        return self._parse_forecast_response(data, start_date, end_date)
     
     def _parse_forecast_response(
         self,
@@ -437,11 +441,6 @@ class NWSClient:
             logger.error(f"Erro ao processar resposta NWS: {e}")
             raise ValueError(f"Resposta NWS inválida: {e}")
     
-    async def _delay_retry(self):
-        """Aguarda antes de retry."""
-        import asyncio
-        await asyncio.sleep(self.config.retry_delay)
-    
     async def health_check(self) -> bool:
         """
         Verifica se API NWS está acessível.
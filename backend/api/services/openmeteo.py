@@ -1,7 +1,7 @@
 import os
 import pickle
 from datetime import date, datetime, timedelta
-from typing import List, Optional, Tuple, Union
+from typing import Dict, List, Optional, Sequence, Tuple, Union
 
 import numpy as np
 import pandas as pd
@@ -12,9 +12,24 @@ from loguru import logger
 from redis import Redis
 from requests.exceptions import RequestException
 
+from backend.api.services.elevation_grid import get_elevation_grid
+from backend.api.services.source_grid import snap_coordinates
+from backend.api.services.timezone_grid import resolve_timezone
+
 # Redis configuration
 # Prioriza localhost para desenvolvimento local, fallback para Docker
 REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+_redis_client: Optional[Redis] = None
+
+# Elevation API (fallback for points outside the local DEM tiles)
+OPENMETEO_ELEVATION_URL = os.getenv(
+    "OPENMETEO_ELEVATION_URL", "https://api.open-meteo.com/v1/elevation"
+)
+# Terrain does not change: cache API answers for a long time
+ELEVATION_CACHE_TTL = timedelta(days=30)
+# Elevation API limits: coordinates per request and bulk request size
+ELEVATION_API_BATCH_SIZE = 100
+MAX_BULK_ELEVATION_POINTS = 5000
 
 
 class OpenMeteoAPI:
@@ -41,7 +56,8 @@ class OpenMeteoAPI:
         end: Union[datetime, date],
         long: float,
         lat: float,
-        cache_expiry_hours: int = 24
+        cache_expiry_hours: int = 24,
+        session: Optional[requests.Session] = None
     ) -> None:
         """Initialize base OpenMeteo API client.
 
@@ -51,6 +67,8 @@ class OpenMeteoAPI:
             long: Longitude (-180 to 180).
             lat: Latitude (-90 to 90).
             cache_expiry_hours: Cache expiry in hours.
+            session: HTTP session for the API requests; if None, uses the
+                one for CLIMATE_HTTP_MODE (None in live mode).
 
         Raises:
             ValueError: If end date is not after start date.
@@ -74,6 +92,12 @@ class OpenMeteoAPI:
         self.long = long
         self.lat = lat
         self.cache_expiry_hours = cache_expiry_hours
+        # Importa aqui para evitar circular imports (factory -> cache -> main)
+        from backend.api.services.climate_factory import ClimateClientFactory
+        self.session = (
+            session if session is not None
+            else ClimateClientFactory.create_requests_session()
+        )
 
         try:
             # Tenta conectar com a URL configurada (pode incluir senha)
@@ -115,7 +139,8 @@ class OpenMeteoAPI:
         """
         warnings = []
         try:
-            response = requests.get(url, timeout=timeout)
+            http = self.session or requests
+            response = http.get(url, timeout=timeout)
             response.raise_for_status()
             return response.json(), warnings
         except RequestException as e:
@@ -176,10 +201,13 @@ class OpenMeteoAPI:
             return None
 
     def _get_timezone_from_coords(self) -> str:
-        """Return default timezone for Matopiba."""
-        logger.warning("Using default timezone America/Sao_Paulo due to "
-                       "timezonefinder issues.")
-        return "America/Sao_Paulo"
+        """Return the timezone at the coordinates (default America/Sao_Paulo).
+
+        Uses the process-wide cached timezone grid, so repeated lookups for
+        the same area never hit the polygon search.
+        """
+        return resolve_timezone(self.lat, self.long,
+                                default="America/Sao_Paulo")
 
 
 class OpenMeteoForecastAPI(OpenMeteoAPI):
@@ -196,20 +224,33 @@ class OpenMeteoForecastAPI(OpenMeteoAPI):
         "precipitation_probability": (0, 100)
     }
 
-    def __init__(self, lat: float, long: float, days_ahead: int = 1):
+    def __init__(
+        self,
+        lat: float,
+        long: float,
+        days_ahead: int = 1,
+        session: Optional[requests.Session] = None
+    ):
         """Initialize the Open-Meteo Forecast API client for today and tomorrow.
 
         Args:
             lat: Latitude (-90 to 90).
             long: Longitude (-180 to 180).
             days_ahead: Number of days ahead to fetch (default: 1 for tomorrow).
+            session: HTTP session (see OpenMeteoAPI).
         """
         today = datetime.now(pytz.UTC).astimezone(
             pytz.timezone("America/Sao_Paulo")).date()
         start_date = today
         end_date = today + timedelta(days=days_ahead + 1)  # Include tomorrow
-        super().__init__(start_date, end_date, long, lat, self.FORECAST_CACHE_EXPIRY_HOURS)
+        super().__init__(start_date, end_date, long, lat,
+                         self.FORECAST_CACHE_EXPIRY_HOURS, session=session)
         self.timezone = self._get_timezone_from_coords()
+        # Centro da célula best_match (~0.1°): usado na requisição e nas
+        # chaves de cache, como a grade declarada em source_grid
+        self.lat_grid, self.long_grid = snap_coordinates(
+            "openmeteo_forecast", lat, long
+        )
 
     def _should_update_today(self) -> bool:
         """Determine if we should update data for today (fixed at 05h)."""
@@ -217,7 +258,7 @@ class OpenMeteoForecastAPI(OpenMeteoAPI):
         current_hour = now.hour
         in_update_window = current_hour == 5  # Fixed at 05h
         today_str = now.strftime("%Y%m%d")
-        cache_key = f"last_update:{today_str}:{self.lat}:{self.long}"
+        cache_key = f"last_update:{today_str}:{self.lat_grid}:{self.long_grid}"
 
         if not self.redis_client:
             return in_update_window
@@ -231,7 +272,8 @@ class OpenMeteoForecastAPI(OpenMeteoAPI):
     def _build_request(self) -> str:
         """Build the Open-Meteo Forecast API request URL."""
         return (
-            f"{self.FORECAST_URL}latitude={self.lat}&longitude={self.long}"
+            f"{self.FORECAST_URL}latitude={self.lat_grid}"
+            f"&longitude={self.long_grid}"
             f"&start_date={self.start.strftime('%Y-%m-%d')}"
             f"&end_date={self.end.strftime('%Y-%m-%d')}"
             "&hourly=temperature_2m,relative_humidity_2m,"
@@ -253,7 +295,8 @@ class OpenMeteoForecastAPI(OpenMeteoAPI):
             self.lat, self.long, self.timezone
         )
         today_str = datetime.now(pytz.UTC).astimezone(pytz.timezone("America/Sao_Paulo")).strftime("%Y%m%d")
-        cache_key = f"forecast:{today_str}:{self.lat}:{self.long}:{self.timezone}"
+        cache_key = (f"forecast:{today_str}:{self.lat_grid}:{self.long_grid}:"
+                     f"{self.timezone}")
         warnings = []
 
         df = self._load_from_cache(cache_key, self.start, self.end)
@@ -336,11 +379,47 @@ class OpenMeteoForecastAPI(OpenMeteoAPI):
             return pd.DataFrame(), warnings
 
 
+def _get_redis_client() -> Optional[Redis]:
+    """Shared Redis client for elevation caching.
+
+    The connection pool is created once per process and reused, instead of
+    opening (and pinging) a new connection on every lookup. Connection
+    errors surface on the first command and are handled by the caller.
+    """
+    global _redis_client
+    if _redis_client is None:
+        try:
+            _redis_client = Redis.from_url(
+                REDIS_URL,
+                decode_responses=True,
+                socket_connect_timeout=2,
+                socket_timeout=2
+            )
+        except Exception as e:
+            logger.warning(f"Invalid Redis configuration: {e}")
+    return _redis_client
+
+
+def elevation_cache_key(lat: float, long: float) -> str:
+    """Redis key for an elevation lookup.
+
+    Coordinates are snapped to the ~90 m DEM grid, so nearby clicks share
+    one entry instead of keying on raw floats.
+    """
+    lat_s, long_s = snap_coordinates("elevation", lat, long)
+    return f"elevation:{lat_s}:{long_s}"
+
+
 @shared_task
 def get_openmeteo_elevation(
     lat: float, long: float
 ) -> Tuple[float, List[str]]:
-    """Get elevation data from the OpenMeteo Elevation API.
+    """Get elevation for a point.
+
+    Lookup order:
+        1. Local memory-mapped DEM tiles (offline, sub-millisecond)
+        2. Redis cache (key snapped to the DEM grid)
+        3. OpenMeteo Elevation API (fallback)
 
     Args:
         lat: Latitude (-90 to 90).
@@ -367,21 +446,14 @@ def get_openmeteo_elevation(
         logger.error(msg)
         raise ValueError(msg)
 
-    # Cache key and settings
-    cache_key = f"elevation:{lat}:{long}"
-    cache_expiry_hours = 24  # 24 hours
+    # Local DEM tiles first: no network, works with the upstream down
+    elevation = get_elevation_grid().lookup(lat, long)
+    if elevation is not None:
+        logger.debug(f"Elevation from local grid: {elevation} meters")
+        return elevation, warnings
 
-    # Initialize Redis client
-    redis_client = None
-    try:
-        redis_client = Redis.from_url(REDIS_URL, decode_responses=True)
-        redis_client.ping()
-        logger.info("Redis connection successful")
-    except Exception as e:
-        msg = f"Failed to connect to Redis: {e}. Continuing without cache."
-        logger.warning(msg)
-        warnings.append(msg)
-        # Don't return here - continue to fetch from API
+    cache_key = elevation_cache_key(lat, long)
+    redis_client = _get_redis_client()
 
     # Check cache only if Redis is available
     if redis_client:
@@ -399,8 +471,7 @@ def get_openmeteo_elevation(
                 elevation = float(elevation_str)
                 if -1000 <= elevation <= 9000:
                     logger.info(
-                        "Loaded elevation from cache: %s meters",
-                        elevation
+                        f"Loaded elevation from cache: {elevation} meters"
                     )
                     return elevation, warnings
 
@@ -415,12 +486,13 @@ def get_openmeteo_elevation(
 
     # Exemplo de URL, Jaú, SP, Brasil:
     # https://api.open-meteo.com/v1/elevation?latitude=-22.2964&longitude=-48.5578
-    url = (
-        "https://api.open-meteo.com/v1/elevation?"
-        f"latitude={lat}&longitude={long}"
-    )
+    lat_s, long_s = snap_coordinates("elevation", lat, long)
+    url = f"{OPENMETEO_ELEVATION_URL}?latitude={lat_s}&longitude={long_s}"
+    # Imported here to avoid a circular import (factory -> cache -> main)
+    from backend.api.services.climate_factory import ClimateClientFactory
+    http = ClimateClientFactory.create_requests_session() or requests
     try:
-        response = requests.get(url, timeout=10)
+        response = http.get(url, timeout=10)
         response.raise_for_status()
         data = response.json()
 
@@ -448,21 +520,18 @@ def get_openmeteo_elevation(
             try:
                 redis_client.setex(
                     cache_key,
-                    timedelta(hours=cache_expiry_hours),
+                    ELEVATION_CACHE_TTL,
                     str(elevation)
                 )
-                logger.info(
-                    "Elevation saved to cache: %s meters",
-                    elevation
-                )
+                logger.info(f"Elevation saved to cache: {elevation} meters")
             except Exception as e:
                 msg = f"Error saving to cache: {e}"
                 warnings.append(msg)
                 logger.error(msg)
 
         logger.info(
-            "Elevation fetched (lat=%s, long=%s): %s meters",
-            lat, long, elevation
+            f"Elevation fetched (lat={lat_s}, long={long_s}): "
+            f"{elevation} meters"
         )
         return float(elevation), warnings
 
@@ -477,3 +546,136 @@ def get_openmeteo_elevation(
         warnings.append(msg)
         logger.error(msg)
         return 0.0, warnings
+
+
+def get_openmeteo_elevations(
+    coordinates: Sequence[Tuple[float, float]]
+) -> Tuple[List[Optional[float]], List[str]]:
+    """Get elevation for many points in as few round-trips as possible.
+
+    Coordinates are snapped to the DEM grid and deduplicated, then resolved
+    in bulk: local DEM tiles (vectorized), one Redis MGET for the rest, and
+    only the remaining misses from the OpenMeteo Elevation API, in batches of
+    ELEVATION_API_BATCH_SIZE points. API answers are cached with a single
+    pipelined write.
+
+    Args:
+        coordinates: Sequence of (lat, long) pairs, in any order, with
+            duplicates allowed (at most MAX_BULK_ELEVATION_POINTS).
+
+    Returns:
+        Tuple[List[Optional[float]], List[str]]: Elevations in meters in the
+            input order (None where unresolved) and warnings list.
+
+    Raises:
+        ValueError: If a coordinate is invalid or too many points are given.
+
+    Example:
+        >>> elevs, warns = get_openmeteo_elevations([(-10.0, -45.0),
+        ...                                          (-22.3, -48.6)])
+    """
+    warnings: List[str] = []
+
+    if len(coordinates) > MAX_BULK_ELEVATION_POINTS:
+        raise ValueError(
+            f"At most {MAX_BULK_ELEVATION_POINTS} coordinates per request"
+        )
+    for i, (lat, long) in enumerate(coordinates):
+        if not (-90 <= lat <= 90) or not (-180 <= long <= 180):
+            raise ValueError(f"Invalid coordinate at index {i}: {lat}, {long}")
+
+    # Snap + deduplicate (nearby points share one DEM cell)
+    snapped = [snap_coordinates("elevation", lat, long)
+               for lat, long in coordinates]
+    unique = list(dict.fromkeys(snapped))
+    resolved: Dict[Tuple[float, float], float] = {}
+    stats = {"local": 0, "cache": 0, "api": 0}
+
+    # 1. Local DEM tiles (one vectorized lookup)
+    grid = get_elevation_grid()
+    if grid.available and unique:
+        values = grid.lookup_many([p[0] for p in unique],
+                                  [p[1] for p in unique])
+        for point, value in zip(unique, values):
+            if not np.isnan(value):
+                resolved[point] = round(float(value), 1)
+        stats["local"] = len(resolved)
+
+    # 2. Redis cache (one MGET)
+    pending = [p for p in unique if p not in resolved]
+    redis_client = _get_redis_client() if pending else None
+    if redis_client:
+        try:
+            keys = [elevation_cache_key(lat, long) for lat, long in pending]
+            for point, cached in zip(pending, redis_client.mget(keys)):
+                if cached is None:
+                    continue
+                elevation = float(cached)
+                if -1000 <= elevation <= 9000:
+                    resolved[point] = elevation
+                    stats["cache"] += 1
+        except Exception as e:
+            msg = f"Error accessing Redis cache: {e}"
+            warnings.append(msg)
+            logger.error(msg)
+
+    # 3. OpenMeteo API for the rest, in maximal batches
+    pending = [p for p in unique if p not in resolved]
+    fetched: Dict[Tuple[float, float], float] = {}
+    session = None
+    if pending:
+        # Imported here to avoid a circular import (factory -> cache -> main)
+        from backend.api.services.climate_factory import ClimateClientFactory
+        session = (ClimateClientFactory.create_requests_session()
+                   or requests.Session())
+    for start in range(0, len(pending), ELEVATION_API_BATCH_SIZE):
+        batch = pending[start:start + ELEVATION_API_BATCH_SIZE]
+        params = {
+            "latitude": ",".join(str(lat) for lat, _ in batch),
+            "longitude": ",".join(str(long) for _, long in batch),
+        }
+        try:
+            response = session.get(
+                OPENMETEO_ELEVATION_URL, params=params, timeout=10
+            )
+            response.raise_for_status()
+            values = response.json().get("elevation") or []
+        except (RequestException, ValueError) as e:
+            msg = f"HTTP error fetching {len(batch)} elevations: {e}"
+            warnings.append(msg)
+            logger.error(msg)
+            continue
+
+        for point, elevation in zip(batch, values):
+            if (isinstance(elevation, (int, float))
+                    and -1000 <= elevation <= 9000):
+                fetched[point] = float(elevation)
+    resolved.update(fetched)
+    stats["api"] = len(fetched)
+
+    # Cache API answers with one pipelined write
+    if fetched and redis_client:
+        try:
+            pipe = redis_client.pipeline(transaction=False)
+            for (lat, long), elevation in fetched.items():
+                pipe.setex(
+                    elevation_cache_key(lat, long),
+                    ELEVATION_CACHE_TTL,
+                    str(elevation)
+                )
+            pipe.execute()
+        except Exception as e:
+            msg = f"Error saving to cache: {e}"
+            warnings.append(msg)
+            logger.error(msg)
+
+    missing = len(unique) - len(resolved)
+    if missing:
+        warnings.append(f"Elevation unavailable for {missing} points")
+
+    logger.info(
+        f"Bulk elevation: {len(coordinates)} points, {len(unique)} unique "
+        f"(local={stats['local']}, cache={stats['cache']}, "
+        f"api={stats['api']}, missing={missing})"
+    )
+    return [resolved.get(point) for point in snapped], warnings
@@ -3,7 +3,10 @@ OpenMeteo Client específico para previsões MATOPIBA.
 
 Este módulo implementa:
 - Busca de previsões meteorológicas para 337 cidades MATOPIBA
-- Requisições em lote para otimização
+- Requisições em lote concorrentes (asyncio + httpx), com lotes
+  dimensionados pelo limite de tamanho de URL
+- Token bucket ajustado aos limites do Open-Meteo, reagindo a 429/Retry-After
+- Retentativa apenas dos lotes que falharam
 - Retorno de variáveis para cálculo ETo + ETo Open-Meteo (validação)
 - Conformidade com licença CC-BY-NC 4.0 (apenas visualização)
 
@@ -11,18 +14,23 @@ Autor: EVAonline Team
 Data: 2025-10-09
 """
 
+import asyncio
 import os
+import warnings
 from datetime import datetime, timedelta
 from pathlib import Path
-from time import sleep
 from typing import Dict, List, Optional, Tuple
 
+import httpx
 import numpy as np
 import pandas as pd
 import requests
 from loguru import logger
 from requests.exceptions import RequestException
 
+from backend.api.services.rate_limiter import (AsyncTokenBucket,
+                                               parse_retry_after)
+
 # Configuração do logging
 logger.add(
     "./logs/openmeteo_matopiba.log",
@@ -35,8 +43,193 @@ logger.add(
 # Constantes
 CITIES_FILE = Path(__file__).parent.parent.parent.parent / "data" / "csv" / "CITIES_MATOPIBA_337.csv"
 OPENMETEO_BASE_URL = "https://api.open-meteo.com/v1/forecast"
-BATCH_SIZE = 50  # Requisições em lote para otimizar
-REQUEST_DELAY = 2.0  # Delay entre lotes (segundos) para respeitar rate limits
+REQUEST_TIMEOUT = 30  # segundos
+
+# Variáveis HORÁRIAS para ETo Penman-Monteith + validação
+# ⚠️ Dados HORÁRIOS (não diários) para cálculo preciso
+HOURLY_VARIABLES = [
+    "temperature_2m",                # Temp a 2m (°C)
+    "relative_humidity_2m",          # RH a 2m (%)
+    "dew_point_2m",                  # Td (°C) - prioritário p/ ea
+    "wind_speed_10m",                # Vento 10m (m/s)
+    "surface_pressure",              # Pressão (hPa)
+    "shortwave_radiation",           # Radiação (W/m²)
+    "cloud_cover",                   # Nuvens (%) - ajuste Rnl
+    "vapour_pressure_deficit",       # VPD (kPa) - validação
+    "precipitation",                 # Precip (mm)
+    "precipitation_probability",     # Prob precip (%)
+    "et0_fao_evapotranspiration"     # ETo OM (mm) - validação
+]
+
+# Dimensionamento de lotes
+MAX_URL_LENGTH = 8000   # Limite seguro de URL (servidores costumam usar 8 KB)
+MAX_BATCH_SIZE = 100    # Máximo de cidades por requisição (tamanho da resposta)
+
+# Limites do plano gratuito Open-Meteo: 600 chamadas/min.
+# Uma "chamada" = 1 localização com até 10 variáveis e 2 semanas de dados;
+# requisições maiores contam frações extras (11 variáveis = 1.1 chamada).
+OPENMETEO_CALLS_PER_MINUTE = 600
+RATE_LIMIT_PER_SECOND = OPENMETEO_CALLS_PER_MINUTE / 60
+RATE_LIMIT_BURST = OPENMETEO_CALLS_PER_MINUTE
+MAX_CONCURRENT_BATCHES = 4
+
+# Retentativas (apenas lotes que falharam)
+MAX_BATCH_ROUNDS = 3
+RETRY_BASE_DELAY = 1.0    # segundos, dobra a cada rodada
+DEFAULT_RETRY_AFTER = 60.0  # pausa em 429 sem header Retry-After
+
+# Agregação diária: (coluna de saída, variável horária, redução)
+DAILY_AGGREGATIONS = [
+    ("T2M_MAX", "temperature_2m", "max"),
+    ("T2M_MIN", "temperature_2m", "min"),
+    ("T2M", "temperature_2m", "mean"),
+    ("RH2M", "relative_humidity_2m", "mean"),
+    ("WS2M", "wind_speed_10m", "mean"),
+    ("ALLSKY_SFC_SW_DWN", "shortwave_radiation", "sum"),
+    ("PRECTOTCORR", "precipitation", "sum"),
+    ("PREC_PROB", "precipitation_probability", "mean"),
+    ("ETo_OpenMeteo", "et0_fao_evapotranspiration", "sum"),  # Soma horária
+]
+# W/m² (média horária) → MJ/m²: soma * 3600s/h / 1e6
+W_M2_HOUR_TO_MJ = 3600 / 1_000_000
+HOURS_PER_DAY = 24
+
+
+class HourlyForecastCube:
+    """
+    Dados horários de um lote de cidades em cubo (cidade, hora, variável).
+    
+    Todas as cidades do lote compartilham o mesmo eixo de tempo (mesma
+    requisição, timezone UTC), então a agregação diária é feita uma única
+    vez para o lote inteiro: o cubo é completado até dias inteiros com NaN,
+    remodelado para (cidade, dia, 24, variável) e reduzido no eixo da hora.
+    Dicionários por cidade só são criados em to_results().
+    
+    Attributes:
+        times: Eixo de tempo ISO 8601 (UTC)
+        values: Cubo float32 (n_cidades, n_horas, n_variáveis)
+        dates: Datas (YYYY-MM-DD) do eixo diário
+        daily: Agregados diários float64 (n_cidades, n_dias, n_agregações)
+    """
+    
+    def __init__(
+        self,
+        times: List[str],
+        locations: List[Dict],
+        batch_df: pd.DataFrame
+    ):
+        """
+        Monta o cubo a partir das respostas por localização.
+        
+        Args:
+            times: Eixo de tempo comum às localizações
+            locations: Respostas Open-Meteo (uma por cidade, com 'hourly')
+            batch_df: Cidades correspondentes (mesma ordem)
+        """
+        self.times = times
+        self.locations = locations
+        self.batch_df = batch_df
+        
+        n_hours = len(times)
+        self.values = np.full(
+            (len(locations), n_hours, len(HOURLY_VARIABLES)),
+            np.nan,
+            dtype=np.float32
+        )
+        for v, var in enumerate(HOURLY_VARIABLES):
+            for c, location in enumerate(locations):
+                series = location.get('hourly', {}).get(var)
+                if series is not None and len(series) == n_hours:
+                    self.values[c, :, v] = np.array(series, dtype=np.float32)
+        
+        self.dates, self.daily = self._aggregate_daily()
+    
+    def _aggregate_daily(self) -> Tuple[List[str], np.ndarray]:
+        """
+        Agrega o cubo horário em dias (reshape + redução no eixo da hora).
+        
+        Returns:
+            Tuple[List[str], np.ndarray]: Datas e agregados
+            (n_cidades, n_dias, len(DAILY_AGGREGATIONS))
+        """
+        n_cities, n_hours, n_vars = self.values.shape
+        
+        # Completa com NaN até dias inteiros (00h–23h)
+        offset = int(self.times[0][11:13])
+        n_days = -(-(offset + n_hours) // HOURS_PER_DAY)
+        padded = np.full(
+            (n_cities, n_days * HOURS_PER_DAY, n_vars), np.nan, dtype=np.float32
+        )
+        padded[:, offset:offset + n_hours] = self.values
+        days = padded.reshape(n_cities, n_days, HOURS_PER_DAY, n_vars)
+        
+        # Reduções ignorando NaN (mesma semântica do pandas groupby);
+        # dias sem dados geram avisos de "all-NaN slice", esperados aqui
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", category=RuntimeWarning)
+            reductions = {
+                "min": np.nanmin(days, axis=2),
+                "max": np.nanmax(days, axis=2),
+                "mean": np.nanmean(days, axis=2, dtype=np.float64),
+                "sum": np.nansum(days, axis=2, dtype=np.float64),
+            }
+        
+        var_index = {var: i for i, var in enumerate(HOURLY_VARIABLES)}
+        columns = []
+        for column, var, reduction in DAILY_AGGREGATIONS:
+            values = reductions[reduction][:, :, var_index[var]]
+            if column == "ALLSKY_SFC_SW_DWN":
+                values = values * W_M2_HOUR_TO_MJ
+            columns.append(values.astype(np.float64))
+        daily = np.stack(columns, axis=-1)
+        
+        dates = [
+            self.times[max(0, d * HOURS_PER_DAY - offset)][:10]
+            for d in range(n_days)
+        ]
+        return dates, daily
+    
+    def to_results(self) -> Dict[str, Dict]:
+        """
+        Materializa o formato padrão EVAonline por cidade.
+        
+        Returns:
+            Dict[str, Dict]: {code: {city_info, hourly_data, forecast}}
+        """
+        daily = self.daily.tolist()
+        columns = [column for column, _, _ in DAILY_AGGREGATIONS]
+        
+        results = {}
+        rows = self.batch_df[
+            ['CODE_CITY', 'CITY', 'UF', 'LATITUDE', 'LONGITUDE', 'HEIGHT']
+        ].itertuples(index=False)
+        for c, (code, name, uf, lat, lon, height) in enumerate(rows):
+            hourly = self.locations[c].get('hourly', {})
+            
+            # Dados horários brutos (para calculate_eto_hourly):
+            # reaproveita as listas da resposta, sem cópia
+            hourly_data = {'time': self.times}
+            for var in HOURLY_VARIABLES:
+                hourly_data[var] = hourly.get(var, [None] * len(self.times))
+            
+            results[str(code)] = {
+                'city_info': {
+                    'code': str(code),
+                    'name': name,
+                    'uf': uf,
+                    'latitude': float(lat),
+                    'longitude': float(lon),
+                    'elevation': float(height)
+                },
+                'hourly_data': hourly_data,
+                'forecast': {
+                    date_str: dict(zip(columns, daily[c][d]))
+                    for d, date_str in enumerate(self.dates)
+                }
+            }
+        
+        return results
+
 
 
 class OpenMeteoMatopibaClient:
@@ -54,18 +247,24 @@ class OpenMeteoMatopibaClient:
         forecast_days: Número de dias de previsão (padrão: 2 = hoje + amanhã)
     """
     
-    def __init__(self, forecast_days: int = 2):
+    def __init__(
+        self,
+        forecast_days: int = 2,
+        transport: Optional[httpx.AsyncBaseTransport] = None
+    ):
         """
         Inicializa cliente Open-Meteo para MATOPIBA.
         
         Args:
             forecast_days: Número de dias de previsão (padrão: 2)
+            transport: Transporte httpx customizado (opcional, ex: testes)
         
         Raises:
             FileNotFoundError: Se arquivo de cidades não for encontrado
             ValueError: Se arquivo de cidades estiver vazio ou inválido
         """
         self.forecast_days = forecast_days
+        self.transport = transport
         self.cities_df = self._load_cities()
         logger.info(
             "OpenMeteo MATOPIBA Client inicializado: %d cidades, %d dias",
@@ -123,22 +322,6 @@ class OpenMeteoMatopibaClient:
         Returns:
             URL completa com parâmetros
         """
-        # Variáveis HORÁRIAS para ETo Penman-Monteith + validação
-        # ⚠️ Dados HORÁRIOS (não diários) para cálculo preciso
-        hourly_vars = [
-            "temperature_2m",                # Temp a 2m (°C)
-            "relative_humidity_2m",          # RH a 2m (%)
-            "dew_point_2m",                  # Td (°C) - prioritário p/ ea
-            "wind_speed_10m",                # Vento 10m (m/s)
-            "surface_pressure",              # Pressão (hPa)
-            "shortwave_radiation",           # Radiação (W/m²)
-            "cloud_cover",                   # Nuvens (%) - ajuste Rnl
-            "vapour_pressure_deficit",       # VPD (kPa) - validação
-            "precipitation",                 # Precip (mm)
-            "precipitation_probability",     # Prob precip (%)
-            "et0_fao_evapotranspiration"     # ETo OM (mm) - validação
-        ]
-        
         # Formatar coordenadas para API (aceita múltiplas localizações)
         lat_str = ",".join([f"{lat:.4f}" for lat in latitudes])
         lon_str = ",".join([f"{lon:.4f}" for lon in longitudes])
@@ -147,7 +330,7 @@ class OpenMeteoMatopibaClient:
         params = {
             "latitude": lat_str,
             "longitude": lon_str,
-            "hourly": ",".join(hourly_vars),
+            "hourly": ",".join(HOURLY_VARIABLES),
             "models": "best_match",          # Usa melhor modelo disponível
             "forecast_days": self.forecast_days,
             "timezone": "UTC"                # UTC para consistência com cálculos solares
@@ -159,12 +342,132 @@ class OpenMeteoMatopibaClient:
         
         return url
     
+    def _plan_batches(self, cities_df: pd.DataFrame) -> List[pd.DataFrame]:
+        """
+        Divide as cidades em lotes dimensionados pelo tamanho da URL.
+        
+        Cada lote recebe o máximo de cidades que cabe em MAX_URL_LENGTH
+        (limitado a MAX_BATCH_SIZE), minimizando o número de requisições.
+        
+        Args:
+            cities_df: DataFrame com cidades
+        
+        Returns:
+            Lista de DataFrames (um por lote)
+        """
+        base_length = len(self._build_batch_url([], []))
+        batches = []
+        start_idx = 0
+        length = base_length
+        
+        latitudes = cities_df['LATITUDE'].tolist()
+        longitudes = cities_df['LONGITUDE'].tolist()
+        
+        for idx, (lat, lon) in enumerate(zip(latitudes, longitudes)):
+            # Coordenadas + vírgulas separadoras (lat e lon)
+            city_length = len(f"{lat:.4f}") + len(f"{lon:.4f}") + 2
+            batch_len = idx - start_idx
+            if batch_len > 0 and (
+                length + city_length > MAX_URL_LENGTH
+                or batch_len >= MAX_BATCH_SIZE
+            ):
+                batches.append(cities_df.iloc[start_idx:idx])
+                start_idx = idx
+                length = base_length
+            length += city_length
+        
+        if start_idx < len(cities_df):
+            batches.append(cities_df.iloc[start_idx:])
+        
+        return batches
+    
+    @staticmethod
+    def _batch_cost(batch_df: pd.DataFrame) -> float:
+        """
+        Custo do lote em "chamadas" Open-Meteo (contabilização do upstream).
+        
+        Args:
+            batch_df: DataFrame com cidades do lote
+        
+        Returns:
+            float: Chamadas consumidas (localizações × fator de variáveis)
+        """
+        variables_factor = max(1.0, len(HOURLY_VARIABLES) / 10)
+        return len(batch_df) * variables_factor
+    
+    def _parse_batch_payload(
+        self,
+        data,
+        batch_df: pd.DataFrame
+    ) -> Dict[str, Dict]:
+        """
+        Converte a resposta JSON de um lote em dados por cidade.
+        
+        Args:
+            data: JSON retornado pelo Open-Meteo (lista ou objeto)
+            batch_df: DataFrame com cidades do lote (mesma ordem)
+        
+        Returns:
+            Dict[str, Dict]: Dados por código de cidade
+        """
+        results = {}
+        city_codes = batch_df['CODE_CITY'].tolist()
+        
+        # Open-Meteo retorna array de resultados (um por localização)
+        if isinstance(data, list):
+            # Múltiplas localizações: um cubo por eixo de tempo (normalmente
+            # um só para o lote inteiro)
+            data = data[:len(city_codes)]
+            groups: Dict[Tuple[str, ...], List[int]] = {}
+            for i, city_data in enumerate(data):
+                times = tuple(city_data.get('hourly', {}).get('time', []))
+                groups.setdefault(times, []).append(i)
+            
+            for times, indices in groups.items():
+                if not times:
+                    for i in indices:
+                        results[str(city_codes[i])] = self._parse_city_data(
+                            data[i], batch_df.iloc[i]
+                        )
+                    continue
+                cube = HourlyForecastCube(
+                    list(times),
+                    [data[i] for i in indices],
+                    batch_df.iloc[indices]
+                )
+                results.update(cube.to_results())
+        else:
+            # Resposta única (formato antigo ou erro)
+            if 'latitude' in data and isinstance(data['latitude'], (list, tuple)):
+                # Múltiplas localizações em formato único
+                for i in range(len(data['latitude'])):
+                    city_code = str(city_codes[i])
+                    city_specific_data = {
+                        'latitude': data['latitude'][i],
+                        'longitude': data['longitude'][i],
+                        'daily': {
+                            key: [val[i]] if isinstance(val, list) else val
+                            for key, val in data.get('daily', {}).items()
+                        }
+                    }
+                    results[city_code] = self._parse_city_data(
+                        city_specific_data, batch_df.iloc[i]
+                    )
+            else:
+                # Resposta única (1 localização)
+                city_code = str(city_codes[0])
+                results[city_code] = self._parse_city_data(
+                    data, batch_df.iloc[0]
+                )
+        
+        return results
+    
     def _fetch_batch(
         self,
         batch_df: pd.DataFrame
     ) -> Tuple[Dict[str, Dict], List[str]]:
         """
-        Busca dados de previsão para um lote de cidades.
+        Busca dados de previsão para um lote de cidades (síncrono).
         
         Args:
             batch_df: DataFrame com cidades do lote
@@ -175,53 +478,18 @@ class OpenMeteoMatopibaClient:
         warnings = []
         results = {}
         
-        latitudes = batch_df['LATITUDE'].tolist()
-        longitudes = batch_df['LONGITUDE'].tolist()
-        city_codes = batch_df['CODE_CITY'].tolist()
-        
-        url = self._build_batch_url(latitudes, longitudes)
+        url = self._build_batch_url(
+            batch_df['LATITUDE'].tolist(),
+            batch_df['LONGITUDE'].tolist()
+        )
         
         try:
-            logger.debug("Requisição Open-Meteo: %d cidades", len(batch_df))
-            response = requests.get(url, timeout=30)
+            logger.debug(f"Requisição Open-Meteo: {len(batch_df)} cidades")
+            response = requests.get(url, timeout=REQUEST_TIMEOUT)
             response.raise_for_status()
-            data = response.json()
-            
-            # Processar resposta
-            # Open-Meteo retorna array de resultados (um por localização)
-            if isinstance(data, list):
-                # Múltiplas localizações
-                for i, city_data in enumerate(data):
-                    if i < len(city_codes):
-                        city_code = str(city_codes[i])
-                        results[city_code] = self._parse_city_data(
-                            city_data, batch_df.iloc[i]
-                        )
-            else:
-                # Resposta única (formato antigo ou erro)
-                if 'latitude' in data and isinstance(data['latitude'], (list, tuple)):
-                    # Múltiplas localizações em formato único
-                    for i in range(len(data['latitude'])):
-                        city_code = str(city_codes[i])
-                        city_specific_data = {
-                            'latitude': data['latitude'][i],
-                            'longitude': data['longitude'][i],
-                            'daily': {
-                                key: [val[i]] if isinstance(val, list) else val
-                                for key, val in data.get('daily', {}).items()
-                            }
-                        }
-                        results[city_code] = self._parse_city_data(
-                            city_specific_data, batch_df.iloc[i]
-                        )
-                else:
-                    # Resposta única (1 localização)
-                    city_code = str(city_codes[0])
-                    results[city_code] = self._parse_city_data(
-                        data, batch_df.iloc[0]
-                    )
+            results = self._parse_batch_payload(response.json(), batch_df)
             
-            logger.info("Lote processado: %d/%d cidades", len(results), len(batch_df))
+            logger.info(f"Lote processado: {len(results)}/{len(batch_df)} cidades")
             
         except RequestException as e:
             msg = f"Erro HTTP na requisição Open-Meteo: {e}"
@@ -234,18 +502,82 @@ class OpenMeteoMatopibaClient:
         
         return results, warnings
     
+    async def _fetch_batch_async(
+        self,
+        http_client: httpx.AsyncClient,
+        batch_df: pd.DataFrame,
+        limiter: AsyncTokenBucket,
+        semaphore: asyncio.Semaphore
+    ) -> Tuple[Dict[str, Dict], List[str], bool]:
+        """
+        Busca um lote de cidades respeitando o rate limiter compartilhado.
+        
+        Em HTTP 429, pausa o limiter pelo Retry-After informado, de modo
+        que todos os lotes concorrentes aguardem juntos.
+        
+        Args:
+            http_client: Cliente HTTP assíncrono compartilhado
+            batch_df: DataFrame com cidades do lote
+            limiter: Token bucket compartilhado
+            semaphore: Limita requisições simultâneas
+        
+        Returns:
+            Tuple[Dict, List, bool]: Dados por cidade, avisos e se a
+            falha (quando houver) é transitória e vale nova tentativa
+        """
+        url = self._build_batch_url(
+            batch_df['LATITUDE'].tolist(),
+            batch_df['LONGITUDE'].tolist()
+        )
+        
+        async with semaphore:
+            await limiter.acquire(self._batch_cost(batch_df))
+            try:
+                response = await http_client.get(url)
+            except httpx.HTTPError as e:
+                msg = f"Erro HTTP na requisição Open-Meteo: {e}"
+                logger.warning(msg)
+                return {}, [msg], True
+        
+        if response.status_code == 429:
+            retry_after = parse_retry_after(
+                response.headers.get("Retry-After"), DEFAULT_RETRY_AFTER
+            )
+            limiter.pause(retry_after)
+            msg = f"Open-Meteo rate limit (429), aguardando {retry_after:.0f}s"
+            logger.warning(msg)
+            return {}, [msg], True
+        
+        if response.status_code >= 400:
+            msg = f"Erro HTTP na requisição Open-Meteo: {response.status_code}"
+            logger.error(msg)
+            return {}, [msg], response.status_code >= 500
+        
+        try:
+            results = self._parse_batch_payload(response.json(), batch_df)
+        except Exception as e:
+            msg = f"Erro ao processar resposta Open-Meteo: {e}"
+            logger.error(msg)
+            return {}, [msg], False
+        
+        logger.info(f"Lote processado: {len(results)}/{len(batch_df)} cidades")
+        return results, [], False
+    
     def _parse_city_data(
         self,
         api_data: Dict,
         city_info: pd.Series
     ) -> Dict:
         """
-        Parse dados da API para formato padrão EVAonline.
+        Parse dados da API para formato padrão EVAonline (uma cidade).
         
         ⚠️ IMPORTANTE: Retorna dados HORÁRIOS brutos + agregados diários
         - hourly_data: Para cálculo ETo EVAonline (eto_hourly.py)
         - forecast: Dados diários agregados (para validação/compatibilidade)
         
+        Lotes com várias cidades usam HourlyForecastCube diretamente
+        (ver _parse_batch_payload); aqui o cubo tem uma única cidade.
+        
         Args:
             api_data: Dados da API Open-Meteo
             city_info: Informações da cidade (Series do DataFrame)
@@ -253,168 +585,84 @@ class OpenMeteoMatopibaClient:
         Returns:
             Dicionário com city_info, hourly_data (bruto) e forecast (agregado)
         """
-        # ⚠️ MUDANÇA: Agora processamos dados HORÁRIOS
-        hourly = api_data.get('hourly', {})
-        time = hourly.get('time', [])
+        time = api_data.get('hourly', {}).get('time', [])
         
         if not time:
-            logger.warning("Sem dados horários para cidade %s", city_info['CITY'])
+            logger.warning(f"Sem dados horários para cidade {city_info['CITY']}")
             return {'city_info': {}, 'hourly_data': {}, 'forecast': {}}
         
-        # Extrair variáveis horárias (com fallback para None)
-        temp = hourly.get('temperature_2m', [None] * len(time))
-        rh = hourly.get('relative_humidity_2m', [None] * len(time))
-        dew_point = hourly.get('dew_point_2m', [None] * len(time))
-        ws = hourly.get('wind_speed_10m', [None] * len(time))
-        pressure = hourly.get('surface_pressure', [None] * len(time))
-        radiation = hourly.get('shortwave_radiation', [None] * len(time))
-        cloud = hourly.get('cloud_cover', [None] * len(time))
-        vpd = hourly.get('vapour_pressure_deficit', [None] * len(time))
-        precip = hourly.get('precipitation', [None] * len(time))
-        precip_prob = hourly.get(
-            'precipitation_probability', [None] * len(time)
-        )
-        eto = hourly.get('et0_fao_evapotranspiration', [None] * len(time))
-        
-        # Criar DataFrame para facilitar agregação
-        df = pd.DataFrame({
-            'time': pd.to_datetime(time),
-            'temp': temp,
-            'rh': rh,
-            'dew_point': dew_point,
-            'ws': ws,
-            'pressure': pressure,
-            'radiation': radiation,
-            'cloud': cloud,
-            'vpd': vpd,
-            'precip': precip,
-            'precip_prob': precip_prob,
-            'eto': eto
-        })
-        
-        # ===================================================================
-        # 1) DADOS HORÁRIOS BRUTOS (para calculate_eto_hourly)
-        # ===================================================================
-        hourly_data_dict = {
-            'time': time,
-            'temperature_2m': temp,
-            'relative_humidity_2m': rh,
-            'dew_point_2m': dew_point,
-            'wind_speed_10m': ws,
-            'surface_pressure': pressure,
-            'shortwave_radiation': radiation,
-            'cloud_cover': cloud,
-            'vapour_pressure_deficit': vpd,
-            'precipitation': precip,
-            'precipitation_probability': precip_prob,
-            'et0_fao_evapotranspiration': eto
-        }
-        
-        # ===================================================================
-        # 2) AGREGAÇÃO DIÁRIA (para compatibilidade/validação)
-        # ===================================================================
-        # Extrair data (sem hora)
-        df['date'] = df['time'].dt.date
-        
-        # Agregar por dia
-        daily_data = df.groupby('date').agg({
-            'temp': ['min', 'max', 'mean'],
-            'rh': 'mean',
-            'ws': 'mean',
-            # W/m² → MJ/m²/dia: soma * 3600s/h / 1e6
-            'radiation': lambda x: np.sum(x) * 3600 / 1_000_000,
-            'precip': 'sum',
-            'precip_prob': 'mean',
-            'eto': 'sum'  # Somar ETo horária para obter diária
-        }).reset_index()
-        
-        # Renomear colunas
-        daily_data.columns = ['date', 'T2M_MIN', 'T2M_MAX', 'T2M',
-                              'RH2M', 'WS2M', 'ALLSKY_SFC_SW_DWN',
-                              'PRECTOTCORR', 'PREC_PROB', 'ETo_OpenMeteo']
-        
-        # Construir resultado
-        result = {
-            'city_info': {
-                'code': str(city_info['CODE_CITY']),
-                'name': city_info['CITY'],
-                'uf': city_info['UF'],
-                'latitude': float(city_info['LATITUDE']),
-                'longitude': float(city_info['LONGITUDE']),
-                'elevation': float(city_info['HEIGHT'])
-            },
-            'hourly_data': hourly_data_dict,  # NOVO: dados horários brutos
-            'forecast': {}
-        }
-        
-        # Adicionar dados por dia
-        for _, row in daily_data.iterrows():
-            date_str = str(row['date'])
-            result['forecast'][date_str] = {
-                'T2M_MAX': float(row['T2M_MAX']),
-                'T2M_MIN': float(row['T2M_MIN']),
-                'T2M': float(row['T2M']),
-                'RH2M': float(row['RH2M']),
-                'WS2M': float(row['WS2M']),
-                'ALLSKY_SFC_SW_DWN': float(row['ALLSKY_SFC_SW_DWN']),
-                'PRECTOTCORR': float(row['PRECTOTCORR']),
-                'PREC_PROB': float(row['PREC_PROB']),
-                'ETo_OpenMeteo': float(row['ETo_OpenMeteo'])
-            }
-        
-        return result
+        cube = HourlyForecastCube(time, [api_data], city_info.to_frame().T)
+        return next(iter(cube.to_results().values()))
     
-    def get_forecasts_all_cities(self) -> Tuple[Dict[str, Dict], List[str]]:
+    async def get_forecasts_all_cities_async(
+        self
+    ) -> Tuple[Dict[str, Dict], List[str]]:
         """
-        Busca previsões para todas as 337 cidades MATOPIBA.
+        Busca previsões para todas as cidades MATOPIBA (concorrente).
         
         Implementa:
-        - Requisições em lote (BATCH_SIZE cidades por vez)
-        - Rate limiting (delay entre lotes)
-        - Tratamento de erros por lote
+        - Lotes dimensionados pelo tamanho máximo de URL
+        - Lotes em paralelo (MAX_CONCURRENT_BATCHES) sob token bucket
+          ajustado ao limite do Open-Meteo (600 chamadas/min)
+        - Pausa global em 429 respeitando Retry-After
+        - Retentativa apenas dos lotes com falha transitória
         
         Returns:
             Tuple[Dict, List]: Dados por cidade e lista de avisos
-        
-        Example:
-            >>> client = OpenMeteoMatopibaClient()
-            >>> forecasts, warnings = client.get_forecasts_all_cities()
-            >>> len(forecasts)  # 337 cidades
-            337
         """
-        logger.info("Iniciando busca de previsões para 337 cidades MATOPIBA")
-        all_results = {}
-        all_warnings = []
-        
-        # Dividir em lotes
         n_cities = len(self.cities_df)
-        n_batches = (n_cities + BATCH_SIZE - 1) // BATCH_SIZE
+        batches = self._plan_batches(self.cities_df)
+        logger.info(
+            f"Iniciando busca de previsões para {n_cities} cidades MATOPIBA "
+            f"({len(batches)} lotes concorrentes)"
+        )
         
-        for batch_idx in range(n_batches):
-            start_idx = batch_idx * BATCH_SIZE
-            end_idx = min((batch_idx + 1) * BATCH_SIZE, n_cities)
-            
-            batch_df = self.cities_df.iloc[start_idx:end_idx]
-            
-            logger.info(
-                "Processando lote %d/%d (%d cidades)",
-                batch_idx + 1, n_batches, len(batch_df)
-            )
-            
-            # Buscar dados do lote
-            batch_results, batch_warnings = self._fetch_batch(batch_df)
-            all_results.update(batch_results)
-            all_warnings.extend(batch_warnings)
-            
-            # Rate limiting (exceto no último lote)
-            if batch_idx < n_batches - 1:
-                logger.debug("Aguardando %.1fs antes do próximo lote", REQUEST_DELAY)
-                sleep(REQUEST_DELAY)
+        limiter = AsyncTokenBucket(
+            rate=RATE_LIMIT_PER_SECOND, capacity=RATE_LIMIT_BURST
+        )
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_BATCHES)
+        
+        all_results = {}
+        all_warnings = []
+        pending = list(range(len(batches)))
+        
+        async with httpx.AsyncClient(
+            timeout=REQUEST_TIMEOUT, transport=self.transport
+        ) as http_client:
+            for round_idx in range(MAX_BATCH_ROUNDS):
+                outcomes = await asyncio.gather(*[
+                    self._fetch_batch_async(
+                        http_client, batches[i], limiter, semaphore
+                    )
+                    for i in pending
+                ])
+                
+                retry = []
+                for batch_idx, (results, warnings, retryable) in zip(
+                    pending, outcomes
+                ):
+                    all_results.update(results)
+                    is_last_round = round_idx == MAX_BATCH_ROUNDS - 1
+                    if retryable and not is_last_round:
+                        retry.append(batch_idx)
+                    else:
+                        all_warnings.extend(warnings)
+                
+                if not retry:
+                    break
+                
+                delay = RETRY_BASE_DELAY * 2 ** round_idx
+                logger.warning(
+                    f"Retentando {len(retry)} lote(s) com falha em {delay:.0f}s "
+                    f"(rodada {round_idx + 2}/{MAX_BATCH_ROUNDS})"
+                )
+                await asyncio.sleep(delay)
+                pending = retry
         
         success_rate = (len(all_results) / n_cities) * 100
         logger.info(
-            "Busca concluída: %d/%d cidades (%.1f%%)",
-            len(all_results), n_cities, success_rate
+            f"Busca concluída: {len(all_results)}/{n_cities} cidades "
+            f"({success_rate:.1f}%)"
         )
         
         if success_rate < 90:
@@ -424,6 +672,24 @@ class OpenMeteoMatopibaClient:
         
         return all_results, all_warnings
     
+    def get_forecasts_all_cities(self) -> Tuple[Dict[str, Dict], List[str]]:
+        """
+        Busca previsões para todas as 337 cidades MATOPIBA.
+        
+        Wrapper síncrono (uso em tasks Celery) de
+        get_forecasts_all_cities_async.
+        
+        Returns:
+            Tuple[Dict, List]: Dados por cidade e lista de avisos
+        
+        Example:
+            >>> client = OpenMeteoMatopibaClient()
+            >>> forecasts, warnings = client.get_forecasts_all_cities()
+            >>> len(forecasts)  # 337 cidades
+            337
+        """
+        return asyncio.run(self.get_forecasts_all_cities_async())
+    
     def get_forecast_single_city(
         self,
         city_code: str
@@ -0,0 +1,141 @@
+"""
+Rate limiting assíncrono para APIs climáticas externas.
+
+Implementa token bucket compartilhado entre requisições concorrentes:
+- Taxa sustentada (tokens/segundo) + rajada (capacidade)
+- Custo ponderado por requisição (ex: Open-Meteo cobra por localização)
+- Pausa global ao receber HTTP 429 (respeita Retry-After)
+
+Uso:
+    limiter = AsyncTokenBucket(rate=10.0, capacity=600.0)
+
+    await limiter.acquire(cost=55.0)   # bloqueia até haver tokens
+    ...
+    if response.status_code == 429:
+        limiter.pause(parse_retry_after(response.headers.get("Retry-After")))
+"""
+
+import asyncio
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+
+class AsyncTokenBucket:
+    """
+    Token bucket assíncrono (seguro para uso com asyncio.gather).
+
+    Attributes:
+        rate: Tokens repostos por segundo
+        capacity: Máximo de tokens acumulados (tamanho da rajada)
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        """
+        Inicializa o bucket cheio.
+
+        Args:
+            rate: Tokens repostos por segundo (> 0)
+            capacity: Capacidade máxima do bucket (> 0)
+        """
+        if rate <= 0 or capacity <= 0:
+            raise ValueError("rate e capacity devem ser positivos")
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated_at = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float) -> None:
+        """Repõe tokens proporcionalmente ao tempo decorrido."""
+        elapsed = now - self._updated_at
+        if elapsed > 0:
+            self._tokens = min(
+                self.capacity, self._tokens + elapsed * self.rate
+            )
+            self._updated_at = now
+
+    async def acquire(self, cost: float = 1.0) -> float:
+        """
+        Aguarda até haver tokens suficientes e os consome.
+
+        Custos maiores que a capacidade são limitados à capacidade
+        (a requisição ainda passa, mas esvazia o bucket).
+
+        Args:
+            cost: Quantidade de tokens a consumir
+
+        Returns:
+            float: Tempo total aguardado (segundos)
+        """
+        cost = min(cost, self.capacity)
+        waited = 0.0
+
+        while True:
+            async with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+
+                if now < self._paused_until:
+                    wait = self._paused_until - now
+                elif self._tokens >= cost:
+                    self._tokens -= cost
+                    return waited
+                else:
+                    wait = (cost - self._tokens) / self.rate
+
+            await asyncio.sleep(wait)
+            waited += wait
+
+    def pause(self, seconds: float) -> None:
+        """
+        Suspende todas as aquisições por um período (ex: após HTTP 429).
+
+        O bucket também é esvaziado para que as requisições retomem
+        gradualmente ao fim da pausa, em vez de todas de uma vez.
+
+        Args:
+            seconds: Duração da pausa
+        """
+        if seconds <= 0:
+            return
+        now = time.monotonic()
+        self._paused_until = max(self._paused_until, now + seconds)
+        self._tokens = 0.0
+        self._updated_at = self._paused_until
+
+
+def parse_retry_after(
+    value: Optional[str],
+    default: Optional[float] = None
+) -> Optional[float]:
+    """
+    Interpreta o header HTTP Retry-After.
+
+    Aceita segundos ("120") ou data HTTP ("Wed, 21 Oct 2015 07:28:00 GMT").
+
+    Args:
+        value: Valor do header (ou None)
+        default: Valor retornado se ausente/inválido
+
+    Returns:
+        float: Segundos a aguardar (>= 0) ou ``default``
+    """
+    if not value:
+        return default
+
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return default
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
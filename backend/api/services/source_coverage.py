@@ -0,0 +1,295 @@
+"""
+Índice espacial de cobertura das fontes climáticas.
+
+Substitui a varredura linear de bounding boxes por fonte: cada fonte
+regional declara um footprint poligonal (domínio real do produto) e o
+índice pré-compila esses polígonos numa grade de células (padrão 0.25°):
+
+- Célula inteiramente dentro/fora do polígono → resposta por leitura
+  de array
+- Célula cortada pela borda (MIXED) → teste ponto-em-polígono exato
+
+Resultados são memoizados por célula ajustada (~1 km, SNAP_STEP), então
+jobs em lote e overlays de mapa consultam milhares de pontos com custo
+de uma operação vetorizada.
+
+Footprints (lon, lat), simplificados com margem costeira (~0.3°):
+- NWS: CONUS (48 estados contíguos, grade NDFD)
+- MET Norway: Europa (domínio 'complete', inclui Islândia, Svalbard,
+  Chipre e Turquia; exclui Norte da África e Oriente Médio)
+Fontes sem footprint têm cobertura global.
+
+Uso:
+    from backend.api.services.source_coverage import get_coverage_index
+
+    index = get_coverage_index()
+    index.sources_at(48.8566, 2.3522)        # ('met_norway', 'nasa_power')
+    index.sources_many(lats, lons)           # lista de tuplas, 1 por ponto
+"""
+
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from loguru import logger
+
+# Polígono = lista de vértices (lon, lat)
+Polygon = Sequence[Tuple[float, float]]
+
+NWS_CONUS = [
+    (-125.0, 48.5), (-123.3, 49.0), (-95.2, 49.0), (-95.2, 49.4),
+    (-89.5, 48.0), (-84.5, 46.6), (-82.4, 45.3), (-82.5, 42.6),
+    (-79.0, 43.3), (-76.3, 44.2), (-74.7, 45.0), (-71.5, 45.0),
+    (-70.3, 45.9), (-69.2, 47.5), (-67.8, 47.1), (-66.7, 44.8),
+    (-69.5, 41.4), (-73.5, 39.8), (-75.0, 35.2), (-80.4, 32.0),
+    (-79.8, 26.8), (-80.0, 25.0), (-81.0, 24.3), (-82.2, 24.4),
+    (-82.9, 27.8), (-84.5, 29.5), (-89.0, 28.8), (-94.5, 29.2),
+    (-97.1, 25.8), (-99.5, 27.5), (-101.4, 29.8), (-103.1, 28.9),
+    (-104.7, 29.9), (-106.5, 31.8), (-108.2, 31.8), (-108.2, 31.3),
+    (-111.1, 31.3), (-114.7, 32.72), (-117.2, 32.54), (-118.6, 33.3),
+    (-120.8, 34.3), (-122.0, 36.3), (-123.9, 38.9), (-124.6, 40.4),
+    (-124.8, 42.8), (-124.4, 46.2),
+]
+
+MET_NORWAY_EUROPE = [
+    (-25.0, 67.5), (-25.0, 62.5), (-11.0, 58.0), (-11.0, 51.0),
+    (-10.0, 43.0), (-10.0, 36.8), (-6.5, 36.0), (-2.0, 36.5),
+    (3.0, 37.6), (8.5, 38.2), (11.0, 37.6), (12.0, 36.4),
+    (14.5, 35.7), (22.0, 35.9), (23.0, 34.7), (26.5, 34.8),
+    (28.5, 35.8), (32.0, 34.4), (34.8, 34.4), (36.0, 36.0),
+    (45.0, 37.5), (45.0, 72.0), (35.0, 81.0), (10.0, 81.0),
+    (-10.0, 74.0),
+]
+
+# Footprints por fonte (inclui aliases usados no código)
+SOURCE_FOOTPRINTS: Dict[str, List[Polygon]] = {
+    "met_norway": [MET_NORWAY_EUROPE],
+    "nws": [NWS_CONUS],
+}
+SOURCE_FOOTPRINTS["nws_usa"] = SOURCE_FOOTPRINTS["nws"]
+
+DEFAULT_SOURCES = ("met_norway", "nws", "nasa_power")
+
+# Estados das células pré-compiladas
+OUTSIDE, INSIDE, MIXED = 0, 1, 2
+
+CELL_SIZE = 0.25
+SNAP_STEP = 0.01
+MEMO_SIZE = 200_000
+
+
+def points_in_polygon(
+    lats: np.ndarray,
+    lons: np.ndarray,
+    polygon: Polygon
+) -> np.ndarray:
+    """
+    Teste ponto-em-polígono vetorizado (regra par-ímpar).
+
+    Args:
+        lats: Latitudes
+        lons: Longitudes
+        polygon: Vértices (lon, lat), anel implicitamente fechado
+
+    Returns:
+        np.ndarray: Máscara booleana
+    """
+    lats = np.asarray(lats, dtype=np.float64)
+    lons = np.asarray(lons, dtype=np.float64)
+    inside = np.zeros(lats.shape, dtype=bool)
+    vertices = np.asarray(polygon, dtype=np.float64)
+    x1, y1 = vertices[:, 0], vertices[:, 1]
+    x2, y2 = np.roll(x1, -1), np.roll(y1, -1)
+
+    for ax, ay, bx, by in zip(x1, y1, x2, y2):
+        crosses = (ay > lats) != (by > lats)
+        if not crosses.any():
+            continue
+        x_cross = ax + (lats - ay) * (bx - ax) / ((by - ay) or 1e-12)
+        inside ^= crosses & (lons < x_cross)
+    return inside
+
+
+class _Footprint:
+    """Footprint de uma fonte pré-compilado em grade de células."""
+
+    def __init__(self, polygons: List[Polygon], cell_size: float):
+        self.polygons = polygons
+        self.cell_size = cell_size
+        vertices = np.concatenate([np.asarray(p) for p in polygons])
+        self.lon_min = float(np.floor(vertices[:, 0].min() / cell_size)
+                             * cell_size)
+        self.lat_min = float(np.floor(vertices[:, 1].min() / cell_size)
+                             * cell_size)
+        rows = int(np.ceil((vertices[:, 1].max() - self.lat_min)
+                           / cell_size)) + 1
+        cols = int(np.ceil((vertices[:, 0].max() - self.lon_min)
+                           / cell_size)) + 1
+
+        # Centros das células classificados pelo polígono
+        centers_lat = self.lat_min + (np.arange(rows) + 0.5) * cell_size
+        centers_lon = self.lon_min + (np.arange(cols) + 0.5) * cell_size
+        grid_lat, grid_lon = np.meshgrid(centers_lat, centers_lon,
+                                         indexing="ij")
+        self.cells = self._contains_exact(grid_lat, grid_lon).astype(np.uint8)
+
+        # Células tocadas por arestas (+1 de margem) viram MIXED
+        border = np.zeros((rows, cols), dtype=bool)
+        for polygon in polygons:
+            ring = np.asarray(polygon, dtype=np.float64)
+            for (ax, ay), (bx, by) in zip(ring, np.roll(ring, -1, axis=0)):
+                n = int(max(abs(bx - ax), abs(by - ay)) / cell_size * 4) + 2
+                t = np.linspace(0.0, 1.0, n)
+                r = ((ay + t * (by - ay) - self.lat_min) // cell_size)
+                c = ((ax + t * (bx - ax) - self.lon_min) // cell_size)
+                border[r.astype(int), c.astype(int)] = True
+        dilated = border.copy()
+        dilated[1:, :] |= border[:-1, :]
+        dilated[:-1, :] |= border[1:, :]
+        dilated[:, 1:] |= border[:, :-1]
+        dilated[:, :-1] |= border[:, 1:]
+        self.cells[dilated] = MIXED
+
+    def _contains_exact(self, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+        inside = np.zeros(np.shape(lats), dtype=bool)
+        for polygon in self.polygons:
+            inside |= points_in_polygon(lats, lons, polygon)
+        return inside
+
+    def contains(self, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+        """Máscara de cobertura (grade + teste exato nas bordas)."""
+        rows, cols = self.cells.shape
+        r = np.floor((lats - self.lat_min) / self.cell_size).astype(np.int64)
+        c = np.floor((lons - self.lon_min) / self.cell_size).astype(np.int64)
+        in_grid = (r >= 0) & (r < rows) & (c >= 0) & (c < cols)
+
+        state = np.full(lats.shape, OUTSIDE, dtype=np.uint8)
+        state[in_grid] = self.cells[r[in_grid], c[in_grid]]
+        result = state == INSIDE
+
+        mixed = state == MIXED
+        if mixed.any():
+            result[mixed] = self._contains_exact(lats[mixed], lons[mixed])
+        return result
+
+
+class CoverageIndex:
+    """
+    Índice de cobertura espacial para um conjunto de fontes.
+
+    Attributes:
+        sources: Fontes indexadas (na ordem de registro)
+        footprints: Footprints pré-compilados das fontes regionais
+        memo_hits: Consultas respondidas pela memoização por célula
+    """
+
+    def __init__(
+        self,
+        sources: Iterable[str] = DEFAULT_SOURCES,
+        footprints: Optional[Dict[str, List[Polygon]]] = None,
+        cell_size: float = CELL_SIZE,
+        memo_size: int = MEMO_SIZE
+    ):
+        footprints = SOURCE_FOOTPRINTS if footprints is None else footprints
+        self.sources = tuple(sources)
+        self.footprints: Dict[str, _Footprint] = {
+            source: _Footprint(footprints[source], cell_size)
+            for source in self.sources if source in footprints
+        }
+        self.global_sources = tuple(
+            s for s in self.sources if s not in self.footprints
+        )
+        self._memo: "OrderedDict[Tuple[int, int], Tuple[str, ...]]" = (
+            OrderedDict()
+        )
+        self._memo_size = memo_size
+        self.memo_hits = 0
+
+        mixed = {
+            source: f"{np.mean(fp.cells == MIXED):.1%}"
+            for source, fp in self.footprints.items()
+        }
+        logger.info(
+            f"✅ Índice de cobertura: {len(self.footprints)} footprints "
+            f"(células de fronteira: {mixed}), "
+            f"{len(self.global_sources)} fontes globais"
+        )
+
+    def covers(self, source: str, lat: float, lon: float) -> bool:
+        """Indica se a fonte cobre o ponto."""
+        return source in self.sources_at(lat, lon)
+
+    def sources_at(self, lat: float, lon: float) -> Tuple[str, ...]:
+        """Fontes que cobrem um ponto."""
+        return self.sources_many([lat], [lon])[0]
+
+    def sources_many(
+        self,
+        lats: Sequence[float],
+        lons: Sequence[float]
+    ) -> List[Tuple[str, ...]]:
+        """
+        Fontes disponíveis para N pontos de uma vez.
+
+        Pontos são ajustados a células de SNAP_STEP; cada célula distinta
+        é resolvida uma única vez (vetorizado) e memoizada.
+
+        Args:
+            lats: Latitudes
+            lons: Longitudes
+
+        Returns:
+            List[Tuple[str, ...]]: Fontes por ponto, na ordem de self.sources
+        """
+        lats = np.asarray(lats, dtype=np.float64)
+        lons = np.asarray(lons, dtype=np.float64)
+        if lats.shape != lons.shape:
+            raise ValueError("lats e lons devem ter o mesmo tamanho")
+        if lats.size == 0:
+            return []
+
+        keys = np.stack([
+            np.rint(lats / SNAP_STEP).astype(np.int64),
+            np.rint(lons / SNAP_STEP).astype(np.int64),
+        ], axis=1)
+        unique, inverse = np.unique(keys, axis=0, return_inverse=True)
+        inverse = inverse.reshape(-1)
+
+        resolved: List[Optional[Tuple[str, ...]]] = []
+        missing = []
+        for i, (lat_key, lon_key) in enumerate(unique.tolist()):
+            cached = self._memo.get((lat_key, lon_key))
+            if cached is not None:
+                self._memo.move_to_end((lat_key, lon_key))
+                self.memo_hits += 1
+            else:
+                missing.append(i)
+            resolved.append(cached)
+
+        if missing:
+            cell_lats = unique[missing, 0] * SNAP_STEP
+            cell_lons = unique[missing, 1] * SNAP_STEP
+            masks = {
+                source: fp.contains(cell_lats, cell_lons)
+                for source, fp in self.footprints.items()
+            }
+            for j, i in enumerate(missing):
+                sources = tuple(
+                    s for s in self.sources
+                    if s in self.global_sources or masks[s][j]
+                )
+                resolved[i] = sources
+                self._memo[tuple(unique[i].tolist())] = sources
+            while len(self._memo) > self._memo_size:
+                self._memo.popitem(last=False)
+
+        return [resolved[i] for i in inverse]
+
+
+@lru_cache(maxsize=8)
+def get_coverage_index(
+    sources: Tuple[str, ...] = DEFAULT_SOURCES
+) -> CoverageIndex:
+    """Índice compartilhado no processo (compilado uma vez por conjunto)."""
+    return CoverageIndex(sources)
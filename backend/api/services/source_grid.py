@@ -0,0 +1,188 @@
+"""
+Grades nativas das fontes climáticas.
+
+Cada fonte entrega dados numa grade própria: dois cliques a poucos km de
+distância caem na mesma célula e recebem exatamente os mesmos valores do
+upstream. Ajustar (snap) as coordenadas ao centro da célula nativa antes de
+montar chaves de cache e requisições faz o hit rate refletir a identidade
+física dos dados, e não a precisão do clique.
+
+Grades:
+- NASA POWER: MERRA-2, 0.5° (lat) × 0.625° (lon), nós em -90/-180
+- MET Norway: MEPS/MET Nordic, ~2.5 km (0.025°)
+- NWS: NDFD, ~2.5 km (0.025°)
+- Open-Meteo: best_match, ~0.1° (resolução mais fina comum entre modelos)
+- Elevação: Copernicus DEM GLO-90, ~90 m (0.001°)
+
+Uso:
+    from backend.api.services.source_grid import snap_coordinates
+
+    lat_s, lon_s = snap_coordinates("nasa_power", -15.7939, -47.8828)
+    # → (-16.0, -48.125)
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+# Casas decimais usadas ao formatar coordenadas ajustadas
+# (evita artefatos de ponto flutuante, ex: -48.12500000000001)
+SNAP_DECIMALS = 4
+
+# Arredondamento usado para fontes sem grade declarada (~1 km)
+FALLBACK_DECIMALS = 2
+
+
+@dataclass(frozen=True)
+class NativeGrid:
+    """
+    Grade regular lat/lon nativa de uma fonte climática.
+
+    Os nós da grade ficam em ``origin + k * step``; cada nó é o centro da
+    célula que representa (valor retornado pelo upstream para qualquer
+    ponto dentro dela).
+
+    Attributes:
+        lat_step: Espaçamento em latitude (graus)
+        lon_step: Espaçamento em longitude (graus)
+        lat_origin: Latitude de um nó de referência
+        lon_origin: Longitude de um nó de referência
+        description: Descrição legível (modelo/resolução)
+    """
+    lat_step: float
+    lon_step: float
+    lat_origin: float = 0.0
+    lon_origin: float = 0.0
+    description: str = ""
+
+    def snap(self, lat: float, lon: float) -> Tuple[float, float]:
+        """
+        Ajusta coordenadas ao centro da célula nativa mais próxima.
+
+        Args:
+            lat: Latitude (-90 a 90)
+            lon: Longitude (-180 a 180)
+
+        Returns:
+            Tuple[float, float]: (lat, lon) do centro da célula
+        """
+        lat_idx = round((lat - self.lat_origin) / self.lat_step)
+        lon_idx = round((lon - self.lon_origin) / self.lon_step)
+
+        lat_c = self.lat_origin + lat_idx * self.lat_step
+        lon_c = self.lon_origin + lon_idx * self.lon_step
+
+        # Mantém dentro dos limites válidos
+        lat_c = min(90.0, max(-90.0, lat_c))
+        if lon_c > 180.0:
+            lon_c -= 360.0
+        elif lon_c < -180.0:
+            lon_c += 360.0
+
+        return round(lat_c, SNAP_DECIMALS), round(lon_c, SNAP_DECIMALS)
+
+    def to_dict(self) -> Dict[str, object]:
+        """Representação serializável (metadata de resposta)."""
+        return {
+            "lat_step": self.lat_step,
+            "lon_step": self.lon_step,
+            "description": self.description,
+        }
+
+
+# Registro de grades por fonte (inclui aliases usados no código)
+SOURCE_GRIDS: Dict[str, NativeGrid] = {
+    "nasa_power": NativeGrid(
+        lat_step=0.5,
+        lon_step=0.625,
+        lat_origin=-90.0,
+        lon_origin=-180.0,
+        description="MERRA-2 0.5° x 0.625°",
+    ),
+    "met_norway": NativeGrid(
+        lat_step=0.025,
+        lon_step=0.025,
+        description="MEPS/MET Nordic ~2.5 km",
+    ),
+    "nws": NativeGrid(
+        lat_step=0.025,
+        lon_step=0.025,
+        description="NDFD ~2.5 km",
+    ),
+    "openmeteo": NativeGrid(
+        lat_step=0.1,
+        lon_step=0.1,
+        description="Open-Meteo best_match ~0.1°",
+    ),
+    "elevation": NativeGrid(
+        lat_step=0.001,
+        lon_step=0.001,
+        description="Copernicus DEM GLO-90 ~90 m",
+    ),
+}
+SOURCE_GRIDS["nws_usa"] = SOURCE_GRIDS["nws"]
+SOURCE_GRIDS["openmeteo_forecast"] = SOURCE_GRIDS["openmeteo"]
+
+
+def get_native_grid(source: str) -> Optional[NativeGrid]:
+    """
+    Retorna a grade nativa declarada para uma fonte.
+
+    Args:
+        source: ID da fonte (ex: 'nasa_power', 'met_norway', 'nws')
+
+    Returns:
+        NativeGrid ou None se a fonte não declarar grade
+    """
+    return SOURCE_GRIDS.get(source)
+
+
+def snap_coordinates(
+    source: str,
+    lat: float,
+    lon: float
+) -> Tuple[float, float]:
+    """
+    Ajusta coordenadas à grade nativa da fonte.
+
+    Fontes sem grade declarada usam arredondamento de 0.01° (~1 km).
+
+    Args:
+        source: ID da fonte
+        lat: Latitude
+        lon: Longitude
+
+    Returns:
+        Tuple[float, float]: Coordenadas ajustadas
+    """
+    grid = get_native_grid(source)
+    if grid is None:
+        return round(lat, FALLBACK_DECIMALS), round(lon, FALLBACK_DECIMALS)
+    return grid.snap(lat, lon)
+
+
+def describe_snap(source: str, lat: float, lon: float) -> Dict[str, object]:
+    """
+    Descreve o ajuste de grade aplicado (para metadata de resposta).
+
+    Args:
+        source: ID da fonte
+        lat: Latitude solicitada
+        lon: Longitude solicitada
+
+    Returns:
+        dict: Coordenadas solicitadas, ajustadas e grade usada
+            {
+                "source": "nasa_power",
+                "requested": {"lat": -15.7939, "lon": -47.8828},
+                "snapped": {"lat": -16.0, "lon": -48.125},
+                "grid": {"lat_step": 0.5, "lon_step": 0.625, ...}
+            }
+    """
+    lat_s, lon_s = snap_coordinates(source, lat, lon)
+    grid = get_native_grid(source)
+    return {
+        "source": source,
+        "requested": {"lat": lat, "lon": lon},
+        "snapped": {"lat": lat_s, "lon": lon_s},
+        "grid": grid.to_dict() if grid else None,
+    }
@@ -0,0 +1,475 @@
+"""
+Saúde das fontes climáticas: circuit breaker, timeouts adaptativos e
+requisições "hedged".
+
+Cada fonte (nasa_power, met_norway, nws, ...) tem um SourceHealth
+compartilhado no processo, alimentado por uma janela móvel de latências
+e erros:
+
+- Timeout adaptativo: p99 da latência × k, limitado a [min, max]
+  (sem amostras suficientes, usa o máximo)
+- Circuit breaker: abre com taxa de erro alta ou falhas consecutivas,
+  permite uma sonda após o cooldown (half-open) e dobra o cooldown a cada
+  sonda falha. O estado aberto é publicado no Redis para que todos os
+  workers parem de chamar o upstream degradado.
+- Backoff exponencial com jitter ("full jitter"), respeitando Retry-After
+- Hedging opcional: se a resposta não chegar até o p95, dispara uma
+  segunda requisição idêntica e usa a primeira que responder
+
+Todas as tentativas de uma chamada compartilham um orçamento total
+(``HealthConfig.max_timeout``), então um upstream degradado não segura
+a requisição por vários timeouts completos.
+
+Uso:
+    health = get_source_health("nasa_power", redis=cache.redis)
+    response = await resilient_get(
+        client, url, health, retry_attempts=3, params=params
+    )
+"""
+
+import asyncio
+import random
+import time
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+
+import httpx
+from loguru import logger
+from pydantic import BaseModel
+
+from backend.api.services.rate_limiter import parse_retry_after
+
+# Estados do circuit breaker
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Prefixo das chaves Redis com o estado compartilhado
+CIRCUIT_KEY_PREFIX = "circuit"
+
+
+class HealthConfig(BaseModel):
+    """Parâmetros do modelo de saúde de uma fonte."""
+    window_seconds: float = 300.0     # Janela móvel de amostras
+    max_samples: int = 1024
+    min_samples: int = 20             # Mínimo para confiar nos quantis
+    timeout_multiplier: float = 3.0   # k em p99 × k
+    min_timeout: float = 2.0
+    max_timeout: float = 30.0         # Também é o orçamento total da chamada
+    failure_rate_threshold: float = 0.5
+    min_calls: int = 10               # Mínimo de chamadas p/ taxa de erro
+    consecutive_failures: int = 5
+    open_seconds: float = 30.0        # Cooldown inicial do circuito
+    max_open_seconds: float = 300.0
+    backoff_base: float = 0.5
+    backoff_cap: float = 10.0
+    hedge_quantile: float = 0.95
+    redis_sync_interval: float = 1.0  # Intervalo mínimo entre leituras
+
+
+class CircuitOpenError(httpx.HTTPError):
+    """Circuito aberto: o upstream não é chamado até o fim do cooldown."""
+
+    def __init__(self, source: str, retry_in: float):
+        super().__init__(
+            f"Circuito aberto para {source} "
+            f"(nova tentativa em {retry_in:.0f}s)"
+        )
+        self.source = source
+        self.retry_in = retry_in
+
+
+class RollingWindow:
+    """Amostras (instante, latência, sucesso) dentro de uma janela de tempo."""
+
+    def __init__(self, window_seconds: float, max_samples: int):
+        self.window_seconds = window_seconds
+        self._samples: Deque[Tuple[float, float, bool]] = deque(
+            maxlen=max_samples
+        )
+
+    def add(self, latency: float, ok: bool) -> None:
+        self._samples.append((time.monotonic(), latency, ok))
+
+    def _prune(self) -> None:
+        cutoff = time.monotonic() - self.window_seconds
+        while self._samples and self._samples[0][0] < cutoff:
+            self._samples.popleft()
+
+    def latency_quantile(self, q: float, min_samples: int) -> Optional[float]:
+        """Quantil das latências de sucesso (None se poucas amostras)."""
+        self._prune()
+        latencies = sorted(lat for _, lat, ok in self._samples if ok)
+        if len(latencies) < min_samples:
+            return None
+        index = min(len(latencies) - 1, int(q * len(latencies)))
+        return latencies[index]
+
+    def error_rate(self) -> Tuple[int, float]:
+        """Retorna (número de chamadas, taxa de erro) na janela."""
+        self._prune()
+        n = len(self._samples)
+        if n == 0:
+            return 0, 0.0
+        errors = sum(1 for _, _, ok in self._samples if not ok)
+        return n, errors / n
+
+
+class SourceHealth:
+    """
+    Modelo de saúde + circuit breaker de uma fonte.
+
+    Attributes:
+        source: ID da fonte
+        config: Parâmetros (HealthConfig)
+        redis: Cliente redis.asyncio para estado compartilhado (opcional)
+    """
+
+    def __init__(
+        self,
+        source: str,
+        config: Optional[HealthConfig] = None,
+        redis=None
+    ):
+        self.source = source
+        self.config = config or HealthConfig()
+        self.redis = redis
+        self.window = RollingWindow(
+            self.config.window_seconds, self.config.max_samples
+        )
+        self.state = CLOSED
+        self._open_until = 0.0          # time.time() (compartilhável)
+        self._open_seconds = self.config.open_seconds
+        self._consecutive_failures = 0
+        self._probe_in_flight = False
+        self._remote_checked_at = 0.0
+        self.hedged = 0
+
+    @property
+    def _redis_key(self) -> str:
+        return f"{CIRCUIT_KEY_PREFIX}:{self.source}"
+
+    def timeout(self) -> float:
+        """Timeout adaptativo: p99 × k limitado a [min_timeout, max_timeout]."""
+        p99 = self.window.latency_quantile(0.99, self.config.min_samples)
+        if p99 is None:
+            return self.config.max_timeout
+        return min(
+            self.config.max_timeout,
+            max(self.config.min_timeout, p99 * self.config.timeout_multiplier)
+        )
+
+    def hedge_delay(self) -> Optional[float]:
+        """Atraso até disparar a requisição hedged (quantil configurado)."""
+        return self.window.latency_quantile(
+            self.config.hedge_quantile, self.config.min_samples
+        )
+
+    async def _sync_from_redis(self) -> None:
+        """Adota abertura do circuito publicada por outro worker."""
+        if self.redis is None:
+            return
+        now = time.time()
+        if now - self._remote_checked_at < self.config.redis_sync_interval:
+            return
+        self._remote_checked_at = now
+        try:
+            value = await self.redis.get(self._redis_key)
+        except Exception as e:
+            logger.debug(f"Circuit sync Redis indisponível: {e}")
+            return
+        if value is None:
+            return
+        open_until = float(value)
+        if open_until > self._open_until:
+            self._open_until = open_until
+            self.state = OPEN
+
+    async def _publish_open(self) -> None:
+        if self.redis is None:
+            return
+        ttl = max(1, int(self._open_until - time.time()) + 1)
+        try:
+            await self.redis.set(self._redis_key, str(self._open_until), ex=ttl)
+        except Exception as e:
+            logger.debug(f"Circuit publish Redis indisponível: {e}")
+
+    async def _publish_closed(self) -> None:
+        if self.redis is None:
+            return
+        try:
+            await self.redis.delete(self._redis_key)
+        except Exception as e:
+            logger.debug(f"Circuit publish Redis indisponível: {e}")
+
+    async def before_request(self) -> None:
+        """
+        Verifica se o upstream pode ser chamado.
+
+        Raises:
+            CircuitOpenError: Circuito aberto (ou sonda já em andamento)
+        """
+        if self.state == CLOSED:
+            await self._sync_from_redis()
+        if self.state == CLOSED:
+            return
+
+        now = time.time()
+        if now < self._open_until:
+            raise CircuitOpenError(self.source, self._open_until - now)
+
+        # Cooldown expirado: uma única sonda por vez (half-open)
+        if self._probe_in_flight:
+            raise CircuitOpenError(self.source, self.config.min_timeout)
+        self.state = HALF_OPEN
+        self._probe_in_flight = True
+
+    async def record_success(self, latency: float) -> None:
+        self.window.add(latency, True)
+        self._consecutive_failures = 0
+        if self.state != CLOSED:
+            logger.info(f"✅ Circuito {self.source} fechado")
+            self.state = CLOSED
+            self._probe_in_flight = False
+            self._open_seconds = self.config.open_seconds
+            await self._publish_closed()
+
+    async def record_failure(self, latency: float) -> None:
+        self.window.add(latency, False)
+        self._consecutive_failures += 1
+
+        if self.state == HALF_OPEN:
+            # Sonda falhou: reabre com cooldown dobrado
+            self._probe_in_flight = False
+            self._open_seconds = min(
+                self._open_seconds * 2, self.config.max_open_seconds
+            )
+            await self._trip()
+            return
+
+        n, rate = self.window.error_rate()
+        if (
+            self._consecutive_failures >= self.config.consecutive_failures
+            or (n >= self.config.min_calls
+                and rate >= self.config.failure_rate_threshold)
+        ):
+            await self._trip()
+
+    def release_probe(self) -> None:
+        """Sonda sem veredito (ex: 429, cancelamento): libera nova sonda."""
+        if self._probe_in_flight:
+            self._probe_in_flight = False
+            self.state = OPEN
+
+    async def _trip(self) -> None:
+        self.state = OPEN
+        self._open_until = time.time() + self._open_seconds
+        logger.warning(
+            f"⚡ Circuito {self.source} aberto por {self._open_seconds:.0f}s"
+        )
+        await self._publish_open()
+
+    def snapshot(self) -> Dict[str, object]:
+        """Estado atual (para endpoints de status)."""
+        n, rate = self.window.error_rate()
+        p50 = self.window.latency_quantile(0.5, 1)
+        p99 = self.window.latency_quantile(0.99, 1)
+        return {
+            "source": self.source,
+            "state": self.state,
+            "open_for_seconds": max(0.0, self._open_until - time.time()),
+            "calls_in_window": n,
+            "error_rate": round(rate, 3),
+            "latency_p50": p50,
+            "latency_p99": p99,
+            "adaptive_timeout": self.timeout(),
+            "hedged_requests": self.hedged,
+        }
+
+
+# Registro por processo (clientes criados pela factory compartilham saúde)
+_registry: Dict[str, SourceHealth] = {}
+
+
+def get_source_health(
+    source: str,
+    config: Optional[HealthConfig] = None,
+    redis=None
+) -> SourceHealth:
+    """
+    Retorna o SourceHealth compartilhado de uma fonte.
+
+    A configuração da primeira chamada prevalece; o cliente Redis é
+    anexado assim que algum chamador o fornecer.
+
+    Args:
+        source: ID da fonte
+        config: Parâmetros (usados só na criação)
+        redis: Cliente redis.asyncio (opcional)
+
+    Returns:
+        SourceHealth
+    """
+    health = _registry.get(source)
+    if health is None:
+        health = _registry[source] = SourceHealth(source, config, redis)
+    elif health.redis is None and redis is not None:
+        health.redis = redis
+    return health
+
+
+def all_source_health() -> Dict[str, Dict[str, object]]:
+    """Snapshots de todas as fontes já usadas no processo."""
+    return {source: h.snapshot() for source, h in _registry.items()}
+
+
+def backoff_delay(
+    attempt: int,
+    config: HealthConfig,
+    retry_after: Optional[float] = None
+) -> float:
+    """
+    Backoff exponencial com full jitter, respeitando Retry-After.
+
+    Args:
+        attempt: Tentativa que falhou (0 = primeira)
+        config: Parâmetros de backoff
+        retry_after: Segundos pedidos pelo servidor (429/503)
+
+    Returns:
+        float: Segundos a aguardar
+    """
+    ceiling = min(config.backoff_cap, config.backoff_base * 2 ** attempt)
+    delay = random.uniform(0, ceiling)
+    if retry_after is not None:
+        delay = max(delay, retry_after)
+    return delay
+
+
+def _is_acceptable(task: "asyncio.Task") -> bool:
+    return task.exception() is None and task.result().status_code < 500
+
+
+async def _send(
+    client: httpx.AsyncClient,
+    url: str,
+    timeout: float,
+    hedge_delay: Optional[float],
+    health: SourceHealth,
+    **kwargs
+) -> httpx.Response:
+    """GET com hedging opcional: primeira resposta aceitável vence."""
+    first = asyncio.ensure_future(client.get(url, timeout=timeout, **kwargs))
+    if hedge_delay is None or hedge_delay >= timeout:
+        return await first
+
+    done, _ = await asyncio.wait({first}, timeout=hedge_delay)
+    if done:
+        return first.result()
+
+    health.hedged += 1
+    second = asyncio.ensure_future(client.get(url, timeout=timeout, **kwargs))
+    pending = {first, second}
+    last = None
+    try:
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                if _is_acceptable(task):
+                    return task.result()
+                last = task
+        return last.result()
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+async def resilient_get(
+    client: httpx.AsyncClient,
+    url: str,
+    health: SourceHealth,
+    retry_attempts: int = 3,
+    hedge: bool = False,
+    **kwargs
+) -> httpx.Response:
+    """
+    GET com circuit breaker, timeout adaptativo, backoff e hedging.
+
+    Retenta falhas de transporte, 429 e 5xx; outros 4xx são propagados
+    imediatamente. Todas as tentativas cabem em ``max_timeout``.
+
+    Args:
+        client: Cliente httpx
+        url: URL
+        health: SourceHealth da fonte
+        retry_attempts: Máximo de tentativas
+        hedge: Habilita requisição hedged (só para GET idempotente)
+        **kwargs: Repassados ao client.get (params, headers...)
+
+    Returns:
+        httpx.Response com status 2xx
+
+    Raises:
+        CircuitOpenError: Circuito aberto
+        httpx.HTTPError: Falha após esgotar tentativas/orçamento
+    """
+    config = health.config
+    deadline = time.monotonic() + config.max_timeout
+    last_error: Optional[httpx.HTTPError] = None
+
+    for attempt in range(retry_attempts):
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        await health.before_request()
+        timeout = min(health.timeout(), remaining)
+        hedge_delay = health.hedge_delay() if hedge else None
+        retry_after = None
+        start = time.monotonic()
+
+        try:
+            response = await _send(
+                client, url, timeout, hedge_delay, health, **kwargs
+            )
+        except httpx.TransportError as e:
+            await health.record_failure(time.monotonic() - start)
+            last_error = e
+        else:
+            latency = time.monotonic() - start
+            if response.status_code == 429:
+                # Throttling não indica upstream doente
+                retry_after = parse_retry_after(
+                    response.headers.get("Retry-After")
+                )
+            elif response.status_code >= 500:
+                await health.record_failure(latency)
+                retry_after = parse_retry_after(
+                    response.headers.get("Retry-After")
+                )
+            else:
+                await health.record_success(latency)
+                response.raise_for_status()
+                return response
+            try:
+                response.raise_for_status()
+            except httpx.HTTPStatusError as e:
+                last_error = e
+        finally:
+            health.release_probe()
+
+        logger.warning(
+            f"{health.source} falhou (tentativa {attempt + 1}/"
+            f"{retry_attempts}): {last_error}"
+        )
+        if attempt == retry_attempts - 1:
+            break
+        delay = backoff_delay(attempt, config, retry_after)
+        if time.monotonic() + delay >= deadline:
+            break
+        await asyncio.sleep(delay)
+
+    raise last_error or httpx.TimeoutException(
+        f"{health.source}: orçamento de {config.max_timeout:.0f}s esgotado"
+    )
@@ -0,0 +1,275 @@
+"""
+Resolução de fuso horário por grade grosseira pré-calculada.
+
+A busca ponto-em-polígono do timezonefinderL é cara e se repete para as
+mesmas regiões (cliques no mapa, previsões MATOPIBA). Aqui o mundo é
+dividido numa grade regular (padrão 0.25°): células inteiramente dentro
+de um fuso guardam o índice do fuso e respondem com uma leitura de
+array; só as células de fronteira (BORDER) recorrem à busca exata por
+polígono. Um LRU por coordenada arredondada evita repetir até isso.
+
+Organização em disco (TIMEZONE_GRID_DIR, padrão data/timezone/):
+    tz_grid.json        Metadados (step, lat_max, lon_min, names)
+    tz_grid.npy         Matriz uint16 de índices em names,
+                        linha 0 = lat_max (norte)
+
+Índice 0 = sem fuso (ex: oceano sem polígono), BORDER = célula mista.
+
+Geração da grade: scripts/build_timezone_grid.py
+
+Uso (frontend e backend compartilham a mesma instância por processo):
+    from backend.api.services.timezone_grid import resolve_timezone
+
+    tz_name = resolve_timezone(-15.7939, -47.8828)   # 'America/Sao_Paulo'
+"""
+
+import json
+import math
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+from loguru import logger
+
+TIMEZONE_GRID_DIR = os.getenv(
+    "TIMEZONE_GRID_DIR",
+    str(Path(__file__).parent.parent.parent.parent / "data" / "timezone")
+)
+GRID_META_FILE = "tz_grid.json"
+GRID_DATA_FILE = "tz_grid.npy"
+NO_ZONE = 0
+BORDER = np.iinfo(np.uint16).max
+
+# Casas decimais da chave do LRU (~11 m no equador)
+LRU_PRECISION = 4
+LRU_SIZE = 65536
+
+
+class TimezoneGrid:
+    """
+    Resolvedor de fuso horário: grade grosseira + polígonos na fronteira.
+
+    Attributes:
+        directory: Diretório com tz_grid.json e tz_grid.npy
+        names: Nomes IANA indexados pelos valores da grade
+        stats: Consultas fora do LRU resolvidas pela grade ou por polígono
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, Path] = TIMEZONE_GRID_DIR,
+        finder=None,
+        lru_size: int = LRU_SIZE
+    ):
+        self.directory = Path(directory)
+        self.names: List[Optional[str]] = [None]
+        self.ids: Optional[np.ndarray] = None
+        self.step = 0.0
+        self.lat_max = 90.0
+        self.lon_min = -180.0
+        self._finder = finder
+        self._finder_loaded = finder is not None
+        self.stats: Dict[str, int] = {"grid": 0, "exact": 0}
+        self._cached_lookup = lru_cache(maxsize=lru_size)(self._resolve)
+
+        meta_path = self.directory / GRID_META_FILE
+        data_path = self.directory / GRID_DATA_FILE
+        if not (meta_path.exists() and data_path.exists()):
+            logger.warning(
+                f"Grade de fusos ausente ({self.directory}); "
+                "usando apenas a busca por polígonos"
+            )
+            return
+
+        try:
+            meta = json.loads(meta_path.read_text())
+            self.ids = np.load(data_path, mmap_mode="r")
+        except (OSError, ValueError) as e:
+            logger.error(f"Grade de fusos inválida: {e}")
+            return
+        self.names = meta["names"]
+        self.step = float(meta["step"])
+        self.lat_max = float(meta.get("lat_max", 90.0))
+        self.lon_min = float(meta.get("lon_min", -180.0))
+
+        border = int(np.count_nonzero(self.ids == BORDER))
+        logger.info(
+            f"✅ Grade de fusos: {self.ids.shape[0]}x{self.ids.shape[1]} "
+            f"células de {self.step}°, {len(self.names) - 1} fusos, "
+            f"{border / self.ids.size:.1%} de fronteira"
+        )
+
+    @property
+    def available(self) -> bool:
+        return self.ids is not None
+
+    @property
+    def finder(self):
+        """TimezoneFinder carregado sob demanda (uma vez por processo)."""
+        if not self._finder_loaded:
+            self._finder_loaded = True
+            try:
+                from timezonefinderL import TimezoneFinder
+                self._finder = TimezoneFinder()
+            except ImportError:
+                logger.warning(
+                    "timezonefinderL não instalado; "
+                    "células de fronteira ficam sem fuso"
+                )
+        return self._finder
+
+    def cell_value(self, lat: float, lon: float) -> int:
+        """Valor da célula que contém o ponto (BORDER fora da grade)."""
+        if self.ids is None:
+            return int(BORDER)
+        rows, cols = self.ids.shape
+        if not (self.lat_max - rows * self.step <= lat <= self.lat_max
+                and self.lon_min <= lon <= self.lon_min + cols * self.step):
+            return int(BORDER)
+        # Limites sul/leste exatos caem na última célula
+        r = min(int(math.floor((self.lat_max - lat) / self.step)), rows - 1)
+        c = min(int(math.floor((lon - self.lon_min) / self.step)), cols - 1)
+        return int(self.ids[r, c])
+
+    def _resolve(self, lat: float, lon: float) -> Optional[str]:
+        value = self.cell_value(lat, lon)
+        if value != BORDER:
+            self.stats["grid"] += 1
+            return self.names[value]
+
+        self.stats["exact"] += 1
+        finder = self.finder
+        if finder is None:
+            return None
+        try:
+            return finder.timezone_at(lng=lon, lat=lat)
+        except ValueError as e:
+            logger.error(f"Erro na busca de fuso ({lat}, {lon}): {e}")
+            return None
+
+    def timezone_at(self, lat: float, lon: float) -> Optional[str]:
+        """
+        Nome IANA do fuso horário do ponto, ou None se indeterminado.
+
+        Args:
+            lat: Latitude (-90 a 90)
+            lon: Longitude (-180 a 180)
+        """
+        if not (-90 <= lat <= 90) or not (-180 <= lon <= 180):
+            raise ValueError(f"Coordenadas inválidas: {lat}, {lon}")
+        return self._cached_lookup(
+            round(lat, LRU_PRECISION), round(lon, LRU_PRECISION)
+        )
+
+    def cache_info(self):
+        """Estatísticas do LRU (hits, misses, currsize)."""
+        return self._cached_lookup.cache_info()
+
+
+@lru_cache(maxsize=1)
+def get_timezone_grid() -> TimezoneGrid:
+    """Resolvedor compartilhado no processo (grade carregada uma vez)."""
+    return TimezoneGrid(TIMEZONE_GRID_DIR)
+
+
+def resolve_timezone(
+    lat: float,
+    lon: float,
+    default: Optional[str] = None
+) -> Optional[str]:
+    """
+    Fuso horário do ponto pelo resolvedor compartilhado.
+
+    Args:
+        lat: Latitude
+        lon: Longitude
+        default: Retorno quando o fuso é indeterminado
+
+    Returns:
+        Optional[str]: Nome IANA (ex: 'America/Sao_Paulo') ou default
+    """
+    return get_timezone_grid().timezone_at(lat, lon) or default
+
+
+# ---------------------------------------------------------------------------
+# Geração da grade
+# ---------------------------------------------------------------------------
+
+def build_timezone_grid(
+    finder,
+    directory: Union[str, Path] = TIMEZONE_GRID_DIR,
+    step: float = 0.25,
+    samples: int = 3,
+    lat_max: float = 90.0,
+    lat_min: float = -90.0,
+    lon_min: float = -180.0,
+    lon_max: float = 180.0
+) -> np.ndarray:
+    """
+    Amostra o fuso de cada célula e grava tz_grid.json/tz_grid.npy.
+
+    Cada célula é amostrada numa sub-grade samples x samples (bordas
+    incluídas, compartilhadas com as vizinhas); se todas as amostras
+    concordam a célula recebe o fuso, senão vira BORDER. Enclaves
+    menores que step / (samples - 1) podem escapar da amostragem.
+
+    Args:
+        finder: Objeto com timezone_at(lng=, lat=) (ex: TimezoneFinder)
+        directory: Diretório de saída
+        step: Tamanho da célula (graus)
+        samples: Amostras por lado de cada célula (>= 2)
+        lat_max, lat_min, lon_min, lon_max: Extensão da grade
+
+    Returns:
+        np.ndarray: Matriz uint16 gravada
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    sub = max(samples - 1, 1)
+    rows = int(round((lat_max - lat_min) / step))
+    cols = int(round((lon_max - lon_min) / step))
+
+    names: List[Optional[str]] = [None]
+    index: Dict[Optional[str], int] = {None: NO_ZONE}
+
+    # Nós da sub-grade (compartilhados entre células vizinhas)
+    node_lats = lat_max - np.arange(rows * sub + 1) * step / sub
+    node_lons = lon_min + np.arange(cols * sub + 1) * step / sub
+    nodes = np.empty((len(node_lats), len(node_lons)), dtype=np.int32)
+    for i, lat in enumerate(node_lats):
+        lat = float(np.clip(lat, -90.0, 90.0))
+        for j, lon in enumerate(node_lons):
+            name = finder.timezone_at(
+                lng=float(np.clip(lon, -180.0, 180.0)), lat=lat
+            )
+            if name not in index:
+                index[name] = len(names)
+                names.append(name)
+            nodes[i, j] = index[name]
+        if i % 200 == 0:
+            logger.info(f"  {i}/{len(node_lats)} linhas amostradas")
+
+    if len(names) >= BORDER:
+        raise ValueError(f"Fusos demais para uint16: {len(names)}")
+
+    # Célula homogênea: mínimo == máximo entre suas amostras
+    windows = np.lib.stride_tricks.sliding_window_view(
+        nodes, (sub + 1, sub + 1)
+    )[::sub, ::sub]
+    low = windows.min(axis=(2, 3))
+    high = windows.max(axis=(2, 3))
+    ids = np.where(low == high, low, BORDER).astype(np.uint16)
+
+    np.save(directory / GRID_DATA_FILE, ids)
+    (directory / GRID_META_FILE).write_text(json.dumps({
+        "step": step, "lat_max": lat_max, "lon_min": lon_min,
+        "samples": samples, "names": names,
+    }, indent=1))
+
+    logger.info(
+        f"💾 Grade de fusos {rows}x{cols} gravada em {directory} "
+        f"({np.count_nonzero(ids == BORDER) / ids.size:.1%} de fronteira)"
+    )
+    return ids
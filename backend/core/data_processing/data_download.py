@@ -178,64 +178,64 @@ def download_weather_data(
             )
             continue
 
-            # Valida DataFrame
-            if weather_df is None or weather_df.empty:
-                msg = (
-                    f"Nenhum dado obtido de {source} para ({latitude}, {longitude}) "
-                    f"entre {data_inicial} e {data_final}"
-                )
-                logger.warning(msg)
-                warnings_list.append(msg)
-                continue
+        # Valida DataFrame
+        if weather_df is None or weather_df.empty:
+            msg = (
+                f"Nenhum dado obtido de {source} para ({latitude}, {longitude}) "
+                f"entre {data_inicial} e {data_final}"
+            )
+            logger.warning(msg)
+            warnings_list.append(msg)
+            continue
 
-            # Standardize columns
-            expected_columns = [
-                "T2M_MAX", "T2M_MIN", "T2M", "RH2M", "WS2M",
-                "ALLSKY_SFC_SW_DWN", "PRECTOTCORR"
-            ]
-            for col in expected_columns:
-                if col not in weather_df.columns:
-                    weather_df[col] = np.nan
+        # Standardize columns
+        expected_columns = [
+            "T2M_MAX", "T2M_MIN", "T2M", "RH2M", "WS2M",
+            "ALLSKY_SFC_SW_DWN", "PRECTOTCORR"
+        ]
+        for col in expected_columns:
+            if col not in weather_df.columns:
+                weather_df[col] = np.nan
 
-            # Filter expected columns
-            weather_df = weather_df[expected_columns]
-            weather_df = weather_df.replace(-999.00, np.nan)
-            weather_df = weather_df.dropna(how="all", subset=weather_df.columns)
+        # Filter expected columns
+        weather_df = weather_df[expected_columns]
+        weather_df = weather_df.replace(-999.00, np.nan)
+        weather_df = weather_df.dropna(how="all", subset=weather_df.columns)
 
-            # Verifica quantidade de dados
-            dias_retornados = (
-                weather_df.index.max() - weather_df.index.min()
-            ).days + 1
-            if dias_retornados < period_days:
+        # Verifica quantidade de dados
+        dias_retornados = (
+            weather_df.index.max() - weather_df.index.min()
+        ).days + 1
+        if dias_retornados < period_days:
+            msg = (
+                f"{source}: obtidos {dias_retornados} dias "
+                f"(solicitados: {period_days})"
+            )
+            warnings_list.append(msg)
+
+        # Verifica dados faltantes
+        perc_faltantes = weather_df.isna().mean() * 100
+        nomes_variaveis = {
+            "ALLSKY_SFC_SW_DWN": "Radiação Solar (MJ/m²/dia)",
+            "PRECTOTCORR": "Precipitação Total (mm)",
+            "T2M_MAX": "Temperatura Máxima (°C)",
+            "T2M_MIN": "Temperatura Mínima (°C)",
+            "T2M": "Temperatura Média (°C)",
+            "RH2M": "Umidade Relativa (%)",
+            "WS2M": "Velocidade do Vento (m/s)",
+        }
+        
+        for nome_var, porcentagem in perc_faltantes.items():
+            if porcentagem > 25:
+                var_portugues = nomes_variaveis[nome_var]
                 msg = (
-                    f"{source}: obtidos {dias_retornados} dias "
-                    f"(solicitados: {period_days})"
+                    f"{source}: {porcentagem:.1f}% faltantes em "
+                    f"{var_portugues}. Será feita imputação."
                 )
                 warnings_list.append(msg)
 
-            # Verifica dados faltantes
-            perc_faltantes = weather_df.isna().mean() * 100
-            nomes_variaveis = {
-                "ALLSKY_SFC_SW_DWN": "Radiação Solar (MJ/m²/dia)",
-                "PRECTOTCORR": "Precipitação Total (mm)",
-                "T2M_MAX": "Temperatura Máxima (°C)",
-                "T2M_MIN": "Temperatura Mínima (°C)",
-                "T2M": "Temperatura Média (°C)",
-                "RH2M": "Umidade Relativa (%)",
-                "WS2M": "Velocidade do Vento (m/s)",
-            }
-            
-            for nome_var, porcentagem in perc_faltantes.items():
-                if porcentagem > 25:
-                    var_portugues = nomes_variaveis[nome_var]
-                    msg = (
-                        f"{source}: {porcentagem:.1f}% faltantes em "
-                        f"{var_portugues}. Será feita imputação."
-                    )
-                    warnings_list.append(msg)
-
-            dfs.append(weather_df)
-            logger.debug("%s: DataFrame obtido\n%s", source, weather_df)
+        dfs.append(weather_df)
+        logger.debug("%s: DataFrame obtido\n%s", source, weather_df)
 
     # Realiza fusão se necessário
     if data_source == "Data Fusion":
@@ -6,6 +6,7 @@ Este módulo implementa:
 - Pipeline completo de processamento de dados
 - Integração com diferentes fontes de dados
 - Suporte ao modo MATOPIBA
+- Cache do resultado final (Redis), antes de todo o pipeline
 """
 
 from datetime import datetime, timedelta
@@ -14,10 +15,14 @@ from typing import Any, Dict, List, Optional, Tuple, Union
 import numpy as np
 import pandas as pd
 from loguru import logger
+from redis.asyncio import Redis
 
 from backend.core.data_processing.data_download import download_weather_data
 from backend.core.data_processing.data_fusion import data_fusion
 from backend.core.data_processing.data_preprocessing import preprocessing
+from backend.infrastructure.cache.redis_manager import (CacheManager,
+                                                        eto_result_key)
+from config.settings.app_settings import get_settings
 
 # Configuração do logging
 logger.add(
@@ -39,6 +44,18 @@ MATOPIBA_BOUNDS = {
     'lng_max': -41.5
 }
 
+# Fontes extras buscadas para fusão no modo global (nasa_power)
+FUSION_SOURCES = ["met_norway", "nws", "noaa_cdo"]
+
+# Muda a chave do cache de resultados: incrementar ao alterar o cálculo,
+# o pré-processamento ou a fusão
+ETO_ALGORITHM_VERSION = "fao56-pm-1"
+
+# Resultados com dados recentes expiram antes (fontes ainda revisam)
+ETO_RESULT_TTL = 86400
+ETO_RESULT_TTL_RECENT = 3 * 3600
+ETO_RESULT_RECENT_DAYS = 7
+
 
 def calculate_eto(
     weather_df: pd.DataFrame, 
@@ -157,6 +174,81 @@ def calculate_eto(
         raise
 
 
+def _result_key(
+    lat: float,
+    lng: float,
+    elevation: float,
+    database: str,
+    d_inicial: str,
+    d_final: str
+) -> str:
+    """Chave do resultado: fontes, célula, período, elevação e versão."""
+    sources = [database] + (FUSION_SOURCES if database == "nasa_power" else [])
+    return eto_result_key(sources, lat, lng, d_inicial, d_final, elevation,
+                          ETO_ALGORITHM_VERSION)
+
+
+def _result_ttl(d_final: str) -> int:
+    end = datetime.strptime(d_final, "%Y-%m-%d")
+    recent = end >= datetime.now() - timedelta(days=ETO_RESULT_RECENT_DAYS)
+    return ETO_RESULT_TTL_RECENT if recent else ETO_RESULT_TTL
+
+
+def _result_redis() -> Redis:
+    return Redis.from_url(get_settings().REDIS_URL, socket_connect_timeout=1,
+                          socket_timeout=1)
+
+
+async def get_cached_eto_result(
+    lat: float,
+    lng: float,
+    elevation: float,
+    database: str,
+    d_inicial: str,
+    d_final: str
+) -> Optional[Tuple[Dict[str, Any], List[str]]]:
+    """
+    Busca o resultado final de ETo no cache.
+
+    Returns:
+        (resultado, avisos) como retornados por calculate_eto_pipeline, ou
+        None em miss/falha do Redis
+    """
+    key = _result_key(lat, lng, elevation, database, d_inicial, d_final)
+    redis = _result_redis()
+    try:
+        cached = await CacheManager(redis).get_eto_data(key)
+    finally:
+        await redis.aclose()
+    if not cached:
+        return None
+    return cached["result"], cached["warnings"]
+
+
+async def save_eto_result(
+    lat: float,
+    lng: float,
+    elevation: float,
+    database: str,
+    d_inicial: str,
+    d_final: str,
+    result: Dict[str, Any],
+    warnings: List[str]
+) -> None:
+    """Salva o resultado final de ETo (falhas apenas registradas)."""
+    key = _result_key(lat, lng, elevation, database, d_inicial, d_final)
+    redis = _result_redis()
+    try:
+        await CacheManager(redis).save_eto_data(
+            key, {"result": result, "warnings": warnings},
+            expiry=_result_ttl(d_final)
+        )
+    except Exception as e:
+        logger.warning(f"Falha ao salvar resultado de ETo no cache: {e}")
+    finally:
+        await redis.aclose()
+
+
 @app.task(
     bind=True, 
     name='backend.core.eto_calculation.eto_calculation.calculate_eto_pipeline'
@@ -177,6 +269,7 @@ async def calculate_eto_pipeline(
 
     Este pipeline realiza:
     1. Validação de parâmetros de entrada
+    1b. Consulta ao cache de resultados (hit encerra o pipeline)
     2. Download de dados meteorológicos
     3. Pré-processamento dos dados
     4. Cálculo da ETo
@@ -248,6 +341,14 @@ async def calculate_eto_pipeline(
                     "Coordenadas fora da região típica do MATOPIBA"
                 )
 
+        # Resultado já calculado para mesma célula/período/elevação
+        cached = await get_cached_eto_result(
+            lat, lng, elevation, database, d_inicial, d_final
+        )
+        if cached is not None:
+            logger.info("Resultado de ETo servido do cache")
+            return cached
+
         # Download dos dados primários
         weather_data, download_warnings = download_weather_data(
             database, d_inicial, d_final, lng, lat
@@ -262,7 +363,7 @@ async def calculate_eto_pipeline(
         if database == "nasa_power":
             try:
                 # Tentar obter dados de outras fontes disponíveis
-                for additional_source in ["met_norway", "nws", "noaa_cdo"]:
+                for additional_source in FUSION_SOURCES:
                     try:
                         extra_data, extra_warnings = download_weather_data(
                             additional_source, d_inicial, d_final, lng, lat
@@ -303,7 +404,12 @@ async def calculate_eto_pipeline(
         warnings.extend(calc_warnings)
 
         # Retornar resultados
-        return {'data': result_df.to_dict(orient='records')}, warnings
+        result = {'data': result_df.to_dict(orient='records')}
+        await save_eto_result(
+            lat, lng, elevation, database, d_inicial, d_final,
+            result, warnings
+        )
+        return result, warnings
 
     except Exception as e:
         msg = f"Erro no pipeline de ETo: {str(e)}"
@@ -0,0 +1,249 @@
+"""
+Rasters interpolados (IDW) das previsões MATOPIBA.
+
+Gerados uma vez por run pela task de previsões, para cada
+variável/dia: os 337 pontos são interpolados numa grade regular sobre o
+perímetro do MATOPIBA, coloridos com a mesma paleta do heatmap do
+frontend e gravados como PNG (overlay Leaflet, transparente fora do
+perímetro) com uma legenda de valores.
+
+Interpolação: IDW (potência IDW_POWER) com os IDW_NEIGHBORS pontos mais
+próximos de cada pixel; distância em graus com a longitude corrigida
+por cos(latitude).
+
+Uso:
+    index, arrays = build_arrays(results)
+    rasters = build_rasters(index, arrays)
+    png, legend = rasters["ETo_EVAonline|2025-10-09"]
+"""
+
+import io
+import json
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from loguru import logger
+from PIL import Image
+
+# raiz/backend/core/map_results/matopiba_raster.py -> raiz/
+BASE_DIR = Path(__file__).resolve().parent.parent.parent.parent
+PERIMETER_PATH = BASE_DIR / "data" / "geojson" / "Matopiba_Perimetro.geojson"
+
+# Grade (~5,5 km): 179 x 261 pixels sobre o perímetro
+RASTER_RESOLUTION_DEG = 0.05
+IDW_POWER = 2.0
+IDW_NEIGHBORS = 12
+# Pixels por bloco de cálculo (limita a matriz pixels x cidades)
+IDW_CHUNK = 4096
+# Mínimo de cidades com valor para gerar o raster
+MIN_POINTS = 3
+
+# Mesma paleta do heatmap (frontend/assets/matopiba-heatmap.js)
+COLOR_STOPS: List[Tuple[float, str]] = [
+    (0.0, "#FFEDA0"),
+    (0.4, "#FED976"),
+    (0.6, "#FD8D3C"),
+    (0.8, "#E31A1C"),
+    (1.0, "#BD0026"),
+]
+OVERLAY_ALPHA = 204  # 0.8
+
+
+class RasterGrid:
+    """
+    Grade regular sobre o perímetro (linha 0 = norte).
+
+    Attributes:
+        west, south, east, north: Limites (graus)
+        lon, lat: Centros dos pixels (1D)
+        mask: True dentro do perímetro (lat x lon)
+    """
+
+    def __init__(self, rings: List[np.ndarray],
+                 resolution: float = RASTER_RESOLUTION_DEG):
+        points = np.vstack(rings)
+        self.west, self.south = points.min(axis=0)
+        self.east, self.north = points.max(axis=0)
+        width = int(np.ceil((self.east - self.west) / resolution))
+        height = int(np.ceil((self.north - self.south) / resolution))
+        self.east = self.west + width * resolution
+        self.south = self.north - height * resolution
+        self.lon = self.west + (np.arange(width) + 0.5) * resolution
+        self.lat = self.north - (np.arange(height) + 0.5) * resolution
+        self.mask = _inside(rings, *np.meshgrid(self.lon, self.lat))
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.mask.shape
+
+    @property
+    def bounds(self) -> List[List[float]]:
+        """[[sul, oeste], [norte, leste]] (formato Leaflet)."""
+        return [[round(float(self.south), 6), round(float(self.west), 6)],
+                [round(float(self.north), 6), round(float(self.east), 6)]]
+
+
+def _inside(rings: List[np.ndarray], x: np.ndarray,
+            y: np.ndarray) -> np.ndarray:
+    """Ponto-no-polígono (par-ímpar, buracos incluídos)."""
+    inside = np.zeros(x.shape, dtype=bool)
+    for ring in rings:
+        x1, y1 = ring[:, 0], ring[:, 1]
+        x2, y2 = np.roll(x1, -1), np.roll(y1, -1)
+        for ax, ay, bx, by in zip(x1, y1, x2, y2):
+            if ay == by:
+                continue
+            crosses = (ay > y) != (by > y)
+            x_cross = ax + (y - ay) * (bx - ax) / (by - ay)
+            inside ^= crosses & (x < x_cross)
+    return inside
+
+
+@lru_cache(maxsize=1)
+def load_grid() -> RasterGrid:
+    """Grade do perímetro MATOPIBA (GeoJSON em CRS84)."""
+    with open(PERIMETER_PATH, encoding="utf-8") as f:
+        geojson = json.load(f)
+    rings = []
+    for feature in geojson["features"]:
+        geometry = feature["geometry"]
+        polygons = (geometry["coordinates"]
+                    if geometry["type"] == "MultiPolygon"
+                    else [geometry["coordinates"]])
+        for polygon in polygons:
+            rings.extend(np.asarray(ring, dtype=float)[:, :2]
+                         for ring in polygon)
+    return RasterGrid(rings)
+
+
+def idw(
+    lat: np.ndarray,
+    lon: np.ndarray,
+    values: np.ndarray,
+    grid_lat: np.ndarray,
+    grid_lon: np.ndarray,
+    power: float = IDW_POWER,
+    neighbors: int = IDW_NEIGHBORS
+) -> np.ndarray:
+    """
+    Interpola pontos nos pixels (vetores 1D do mesmo tamanho).
+
+    Pixel sobre um ponto recebe o valor do ponto.
+    """
+    k = min(neighbors, len(values))
+    scale = np.cos(np.radians(np.mean(lat)))
+    out = np.empty(len(grid_lat))
+    for start in range(0, len(grid_lat), IDW_CHUNK):
+        stop = start + IDW_CHUNK
+        d2 = ((grid_lat[start:stop, None] - lat[None, :]) ** 2
+              + ((grid_lon[start:stop, None] - lon[None, :]) * scale) ** 2)
+        if k < len(values):
+            nearest = np.argpartition(d2, k - 1, axis=1)[:, :k]
+            d2 = np.take_along_axis(d2, nearest, axis=1)
+            near_values = values[nearest]
+        else:
+            near_values = np.broadcast_to(values, d2.shape)
+        with np.errstate(divide="ignore"):
+            weights = 1.0 / d2 ** (power / 2)
+        exact = np.isinf(weights)
+        weights = np.where(exact.any(axis=1, keepdims=True),
+                           exact.astype(float), weights)
+        out[start:stop] = ((weights * near_values).sum(axis=1)
+                           / weights.sum(axis=1))
+    return out
+
+
+def _hex_rgb(color: str) -> np.ndarray:
+    return np.array([int(color[i:i + 2], 16) for i in (1, 3, 5)], float)
+
+
+def colorize(field: np.ndarray, mask: np.ndarray, vmin: float,
+             vmax: float) -> np.ndarray:
+    """RGBA (uint8) na paleta COLOR_STOPS; transparente fora da máscara."""
+    field = np.where(mask, field, vmin)
+    span = vmax - vmin
+    t = (np.clip((field - vmin) / span, 0.0, 1.0) if span > 0
+         else np.zeros_like(field))
+    positions = [pos for pos, _ in COLOR_STOPS]
+    rgba = np.zeros(field.shape + (4,), dtype=np.uint8)
+    for channel in range(3):
+        levels = [_hex_rgb(color)[channel] for _, color in COLOR_STOPS]
+        rgba[..., channel] = np.interp(t, positions, levels).round()
+    rgba[..., 3] = np.where(mask, OVERLAY_ALPHA, 0)
+    return rgba
+
+
+def encode_png(rgba: np.ndarray) -> bytes:
+    buffer = io.BytesIO()
+    Image.fromarray(rgba, "RGBA").save(buffer, format="PNG", optimize=True)
+    return buffer.getvalue()
+
+
+def render_raster(
+    lat: List[float],
+    lon: List[float],
+    values: List[Optional[float]],
+    grid: Optional[RasterGrid] = None
+) -> Optional[Tuple[bytes, Dict[str, Any]]]:
+    """
+    PNG e legenda de uma variável/dia.
+
+    Args:
+        lat, lon, values: Cidades na ordem do index (None = sem valor)
+
+    Returns:
+        Tuple: (png, {"bounds", "vmin", "vmax", "colors", "n_points"})
+        ou None se houver menos de MIN_POINTS valores
+    """
+    grid = grid or load_grid()
+    points = [(la, lo, v) for la, lo, v in zip(lat, lon, values)
+              if None not in (la, lo, v)]
+    if len(points) < MIN_POINTS:
+        return None
+    p_lat, p_lon, p_values = (np.asarray(col, dtype=float)
+                              for col in zip(*points))
+
+    inside = grid.mask.ravel()
+    grid_lon, grid_lat = (m.ravel()[inside]
+                          for m in np.meshgrid(grid.lon, grid.lat))
+    field = np.full(grid.mask.size, np.nan)
+    field[inside] = idw(p_lat, p_lon, p_values, grid_lat, grid_lon)
+    field = field.reshape(grid.shape)
+
+    vmin, vmax = float(p_values.min()), float(p_values.max())
+    legend = {
+        "bounds": grid.bounds,
+        "vmin": round(vmin, 3),
+        "vmax": round(vmax, 3),
+        "colors": [[pos, color] for pos, color in COLOR_STOPS],
+        "n_points": len(points),
+    }
+    return encode_png(colorize(field, grid.mask, vmin, vmax)), legend
+
+
+def build_rasters(
+    index: Dict[str, Any],
+    arrays: Dict[str, List[Optional[float]]]
+) -> Dict[str, Tuple[bytes, Dict[str, Any]]]:
+    """
+    Rasters de todas as variáveis/dias de um run.
+
+    Args:
+        index, arrays: Ver matopiba_store.build_arrays
+
+    Returns:
+        dict: {"{variável}|{dia}": (png, legenda)}
+    """
+    grid = load_grid()
+    rasters = {}
+    for field, values in arrays.items():
+        raster = render_raster(index["lat"], index["lon"], values, grid)
+        if raster is not None:
+            rasters[field] = raster
+    logger.info(
+        f"Rasters MATOPIBA: {len(rasters)}/{len(arrays)} variável/dia "
+        f"({grid.shape[1]}x{grid.shape[0]} px)"
+    )
+    return rasters
@@ -4,7 +4,8 @@ from celery import shared_task
 from loguru import logger
 from redis.asyncio import Redis
 
-from backend.main import CELERY_TASK_DURATION, CELERY_TASKS_TOTAL
+from backend.infrastructure.cache.maintenance import (delete_matching,
+                                                      rebuild_ranking)
 from config.settings.app_settings import get_settings
 
 # Fallback para métricas locais se houver problema de importação
@@ -38,10 +39,9 @@ async def cleanup_expired_data():
     start_time = time.time()
     try:
         redis_client = Redis.from_url(REDIS_URL)
-        expired_keys = await redis_client.keys("forecast:expired:*")
-        if expired_keys:
-            await redis_client.delete(*expired_keys)
-            logger.info(f"Removidas {len(expired_keys)} chaves expiradas")
+        removed = await delete_matching(redis_client, "forecast:expired:*")
+        if removed:
+            logger.info(f"Removidas {removed} chaves expiradas")
         
         logger.info("Limpeza de dados expirados concluída com sucesso")
         CELERY_TASKS_TOTAL.labels(
@@ -66,10 +66,7 @@ async def update_popular_ranking():
     start_time = time.time()
     try:
         redis_client = Redis.from_url(REDIS_URL)
-        keys = await redis_client.keys("acessos:*")
-        for key in keys:
-            acessos = int(await redis_client.get(key) or 0)
-            await redis_client.zadd("ranking_acessos", {key.decode(): acessos})
+        await rebuild_ranking(redis_client, "acessos:*", "ranking_acessos")
         
         top_keys = await redis_client.zrange(
             "ranking_acessos", 0, 9, desc=True
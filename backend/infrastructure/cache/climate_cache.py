@@ -5,9 +5,16 @@ Fornece cache inteligente com TTL dinâmico baseado na idade dos dados.
 Features:
 - TTL dinâmico: dados históricos (30d), recentes (1d), forecast (1h)
 - Métricas Prometheus integradas
-- Chaves únicas por fonte + coordenadas + período
+- Chaves únicas por fonte + célula da grade nativa + período
 - Async/await para alta performance
 - Graceful degradation se Redis indisponível
+- L1 em memória do processo para chaves quentes (ver local_cache)
+- Payload colunar versionado e comprimido (ver serialization); entradas
+  pickle antigas são lidas e regravadas no formato novo
+- Operações em lote (get_many/set_many): N chaves em ~1 round-trip
+- Soft/hard TTL com stale-while-revalidate e renovação antecipada
+  probabilística (get_or_fetch, ver revalidation); o soft TTL vai no
+  cabeçalho do payload e a leitura usa o da escrita
 
 Uso:
     cache = ClimateCacheService(prefix="nasa")
@@ -17,32 +24,74 @@ Uso:
     
     # Salvar no cache
     await cache.set("nasa_power", lat, lon, start, end, data)
+    
+    # Stale-while-revalidate: loader só roda em miss ou em segundo plano
+    data = await cache.get_or_fetch("nasa_power", lat, lon, start, end,
+                                    loader=lambda: fetch_upstream())
+    
+    # Lote: uma ida ao Redis para N chaves
+    hits, misses = await cache.get_many(requests)
+    await cache.set_many([(*req, data) for req, data in fetched])
+    
+    # Clientes síncronos (redis.Redis do chamador): mesma chave e formato
+    data = cache.get_sync(redis_client, "nasa_power", lat, lon, start, end)
 """
 
-import pickle
+import asyncio
+import copy
+import time
 from datetime import datetime
-from typing import Any, Optional
+from typing import (Any, Awaitable, Callable, Dict, List, Optional,
+                    Sequence, Set, Tuple)
 
 from loguru import logger
 from redis.asyncio import Redis
 
+from backend.api.services.source_grid import snap_coordinates
+from backend.infrastructure.cache.hot_keys import get_hot_keys
+from backend.infrastructure.cache.local_cache import (
+    INVALIDATION_CHANNEL, NODE_ID, get_invalidation_listener,
+    get_local_cache, invalidation_message, publish_invalidation)
+from backend.infrastructure.cache.revalidation import (REFRESH_LOCK_KEY,
+                                                       REFRESH_LOCK_TTL,
+                                                       RecomputeTimer,
+                                                       freshness, hard_ttl,
+                                                       should_refresh_early)
+from backend.infrastructure.cache.serialization import (decode, encode,
+                                                        is_legacy,
+                                                        stored_soft_ttl)
 from config.settings.app_settings import get_settings
 
 settings = get_settings()
 
+try:
+    from backend.api.middleware.prometheus_metrics import (
+        CACHE_ERRORS, CACHE_HITS, CACHE_LATENCY, CACHE_MISSES,
+        POPULAR_DATA_ACCESSES, cache_source_label)
+    METRICS_ENABLED = True
+except ImportError:  # prometheus_client/middleware indisponível
+    METRICS_ENABLED = False
+
+# (source, lat, lon, start, end): mesmos argumentos de get()
+CacheRequest = Tuple[str, float, float, datetime, datetime]
+Loader = Callable[[], Awaitable[Any]]
+
 
 class ClimateCacheService:
     """
     Serviço de cache para dados climáticos com TTL dinâmico.
     
-    Estratégia de TTL:
+    Estratégia de TTL (soft TTL; o TTL no Redis é o hard TTL, 50% maior,
+    e entre os dois get_or_fetch serve o dado stale e renova em
+    segundo plano):
     - Dados históricos (>30 dias): 30 dias de cache
     - Dados recentes (7-30 dias): 1 dia de cache
     - Dados muito recentes (<7 dias): 12 horas de cache
     - Forecast (futuro): 1 hora de cache
     
     Chave do cache: {prefix}:{source}:{lat}:{lon}:{start}:{end}
-    Exemplo: climate:nasa:48.86:2.35:20241001:20241008
+    Coordenadas ajustadas ao centro da célula nativa da fonte.
+    Exemplo: climate:nasa_power:49.0:2.5:20241001:20241008
     """
     
     # TTL constants (em segundos)
@@ -61,6 +110,15 @@ class ClimateCacheService:
         """
         self.prefix = prefix
         self.redis: Optional[Redis] = None
+        # L1 compartilhado no processo (None = desabilitado)
+        self.local = get_local_cache() if settings.CLIMATE_L1_ENABLED else None
+        self.invalidation = (
+            get_invalidation_listener() if self.local is not None else None
+        )
+        # Tempo típico de busca upstream por fonte (delta do XFetch)
+        self.recompute = RecomputeTimer()
+        self._refreshing: Set[str] = set()
+        self._refresh_tasks: Set[asyncio.Task] = set()
         self._initialize_redis()
     
     def _initialize_redis(self):
@@ -89,7 +147,9 @@ class ClimateCacheService:
         Gera chave única para cache.
         
         Formato: {prefix}:{source}:{lat}:{lon}:{start}:{end}
-        Coordenadas arredondadas para 0.01° (~1km de precisão)
+        Coordenadas ajustadas ao centro da célula da grade nativa da fonte
+        (ex: NASA POWER 0.5° x 0.625°); fontes sem grade declarada usam
+        arredondamento de 0.01° (~1km).
         
         Args:
             source: Nome da fonte de dados (ex: 'nasa_power', 'met_norway')
@@ -101,9 +161,8 @@ class ClimateCacheService:
         Returns:
             str: Chave única formatada
         """
-        # Arredonda coordenadas para reduzir variações mínimas
-        lat_r = round(lat, 2)
-        lon_r = round(lon, 2)
+        # Pontos na mesma célula nativa compartilham a mesma chave
+        lat_r, lon_r = snap_coordinates(source, lat, lon)
         
         # Formata datas como YYYYMMDD
         start_str = start.strftime("%Y%m%d")
@@ -113,7 +172,7 @@ class ClimateCacheService:
     
     def _get_ttl(self, start_date: datetime) -> int:
         """
-        Calcula TTL dinâmico baseado na idade dos dados.
+        Calcula TTL dinâmico (soft) baseado na idade dos dados.
         
         Lógica:
         - Dados futuros (forecast): 1 hora
@@ -143,6 +202,35 @@ class ClimateCacheService:
             # Dados históricos
             return self.TTL_HISTORICAL
     
+    def _freshness(
+        self,
+        data: bytes,
+        pttl: Optional[int],
+        start: datetime
+    ) -> Optional[float]:
+        """
+        Frescor restante (s) com o soft TTL gravado na entrada.
+        
+        Recalcular pelo _get_ttl(start) mudaria de faixa quando os dados
+        cruzam 7/30 dias; só entradas antigas (sem soft TTL no
+        cabeçalho) usam o da idade atual.
+        """
+        return freshness(
+            pttl / 1000 if pttl is not None and pttl >= 0 else None,
+            stored_soft_ttl(data) or self._get_ttl(start)
+        )
+    
+    def _local_ready(self) -> bool:
+        """Inicia a escuta de invalidação; True se o L1 pode responder."""
+        if self.local is None:
+            return False
+        try:
+            self.invalidation.ensure_running()
+        except Exception as e:
+            logger.warning(f"L1 indisponível: {e}")
+            return False
+        return self.invalidation.healthy
+    
     async def get(
         self,
         source: str,
@@ -170,38 +258,268 @@ class ClimateCacheService:
         
         key = self._make_key(source, lat, lon, start, end)
         
+        # L1: sem ida à rede nem desserialização
+        local_ready = self._local_ready()
+        if local_ready:
+            started = time.perf_counter()
+            hit, value = self.local.get(key)
+            if hit:
+                logger.debug(f"🎯 Cache L1 HIT: {key}")
+                self._observe("l1", "get", "hit", started)
+                self._count_hit(source, key, "l1")
+                return copy.copy(value)
+        
+        started = time.perf_counter()
         try:
-            data = await self.redis.get(key)
+            value, fresh = await self._read(key, source, start, local_ready)
             
-            if data:
+            if value is not None and (fresh is None or fresh > 0):
                 logger.info(f"🎯 Cache HIT: {key}")
-                
-                # Incrementa métrica Prometheus
-                try:
-                    from backend.api.middleware.prometheus_metrics import \
-                        CACHE_HITS
-                    CACHE_HITS.labels(key=key).inc()
-                except ImportError:
-                    pass
-                
-                return pickle.loads(data)
-            
-            logger.info(f"❌ Cache MISS: {key}")
-            
-            # Incrementa métrica Prometheus
-            try:
-                from backend.api.middleware.prometheus_metrics import \
-                    CACHE_MISSES
-                CACHE_MISSES.labels(key=key).inc()
-            except ImportError:
-                pass
+                self._observe("redis", "get", "hit", started)
+                self._count_hit(source, key, "redis")
+                return value
             
+            # Stale conta como miss aqui; get_or_fetch o serve e renova
+            outcome = "stale" if value is not None else "miss"
+            logger.info(f"❌ Cache MISS ({outcome}): {key}")
+            self._observe("redis", "get", outcome, started)
+            self._count_miss(source, key)
             return None
         
         except Exception as e:
             logger.error(f"Erro ao buscar cache: {e}")
+            self._observe("redis", "get", "error", started)
+            self._count_error(source, "get")
             return None
     
+    async def _read(
+        self,
+        key: str,
+        source: str,
+        start: datetime,
+        local_ready: bool
+    ) -> Tuple[Optional[Any], Optional[float]]:
+        """
+        GET + PTTL num único round-trip.
+        
+        Entradas frescas entram no L1 com TTL <= frescor restante.
+        
+        Returns:
+            Tuple: (valor ou None, segundos de frescor restantes; <= 0 =
+            stale, None = sem TTL)
+        """
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.get(key)
+        pipe.pttl(key)
+        data, pttl = await pipe.execute()
+        if not data:
+            return None, None
+        
+        value = decode(data)
+        if is_legacy(data):
+            await self._upgrade_legacy(key, source, value)
+        
+        fresh = self._freshness(data, pttl, start)
+        if local_ready and pttl != -2 and (fresh is None or fresh > 0):
+            ttl = self.local.max_ttl if fresh is None else fresh
+            self.local.put(key, value, ttl, size=len(data))
+            value = copy.copy(value)
+        return value, fresh
+    
+    async def get_or_fetch(
+        self,
+        source: str,
+        lat: float,
+        lon: float,
+        start: datetime,
+        end: datetime,
+        loader: Loader
+    ) -> Any:
+        """
+        Busca do cache com stale-while-revalidate.
+        
+        - Fresco: devolve; perto do soft TTL, dispara renovação em
+          segundo plano com probabilidade crescente (XFetch)
+        - Stale (entre soft e hard TTL): devolve e renova em segundo
+          plano
+        - Ausente: aguarda o loader e grava
+        
+        Args:
+            source, lat, lon, start, end: Mesmos argumentos de get()
+            loader: Corrotina sem argumentos que busca os dados upstream
+        
+        Returns:
+            Dados do cache ou do loader (exceções do loader em miss são
+            propagadas)
+        """
+        if not self.redis:
+            return await loader()
+        
+        key = self._make_key(source, lat, lon, start, end)
+        request = (source, lat, lon, start, end)
+        
+        local_ready = self._local_ready()
+        if local_ready:
+            started = time.perf_counter()
+            hit, value = self.local.get(key)
+            if hit:
+                self._observe("l1", "get", "hit", started)
+                self._count_hit(source, key, "l1")
+                return copy.copy(value)
+        
+        started = time.perf_counter()
+        try:
+            value, fresh = await self._read(key, source, start, local_ready)
+        except Exception as e:
+            logger.error(f"Erro ao buscar cache: {e}")
+            self._observe("redis", "get", "error", started)
+            self._count_error(source, "get")
+            value, fresh = None, None
+        
+        if value is not None:
+            if fresh is not None and fresh <= 0:
+                logger.info(f"♻️ Cache STALE: {key} (renovando)")
+                self._observe("redis", "get", "stale", started)
+                self._count_hit(source, key, "stale")
+                self._schedule_refresh(key, request, loader)
+            else:
+                logger.info(f"🎯 Cache HIT: {key}")
+                self._observe("redis", "get", "hit", started)
+                self._count_hit(source, key, "redis")
+                if fresh is not None and should_refresh_early(
+                    fresh, self.recompute.get(source)
+                ):
+                    logger.info(f"⏩ Renovação antecipada: {key}")
+                    self._schedule_refresh(key, request, loader)
+            return value
+        
+        self._observe("redis", "get", "miss", started)
+        self._count_miss(source, key)
+        return await self._load(request, loader)
+    
+    async def _load(self, request: CacheRequest, loader: Loader) -> Any:
+        """Executa o loader, mede o tempo (delta do XFetch) e grava."""
+        started = time.perf_counter()
+        data = await loader()
+        self.recompute.observe(request[0], time.perf_counter() - started)
+        if data:
+            await self.set(*request, data)
+        return data
+    
+    def _schedule_refresh(self, key: str, request: CacheRequest,
+                          loader: Loader) -> None:
+        """Renova a chave em segundo plano (uma vez por processo)."""
+        if key in self._refreshing:
+            return
+        self._refreshing.add(key)
+        task = asyncio.get_running_loop().create_task(
+            self._refresh(key, request, loader)
+        )
+        self._refresh_tasks.add(task)
+        task.add_done_callback(self._refresh_tasks.discard)
+    
+    async def _refresh(self, key: str, request: CacheRequest,
+                       loader: Loader) -> None:
+        lock = REFRESH_LOCK_KEY.format(key=key)
+        try:
+            # Uma renovação por chave entre processos
+            if not await self.redis.set(lock, NODE_ID, nx=True,
+                                        ex=REFRESH_LOCK_TTL):
+                return
+            try:
+                await self._load(request, loader)
+                logger.info(f"🔄 Cache renovado: {key}")
+            finally:
+                await self.redis.delete(lock)
+        except Exception as e:
+            logger.warning(f"⚠️ Falha ao renovar {key}: {e}")
+        finally:
+            self._refreshing.discard(key)
+    
+    async def run_after_refreshes(
+        self,
+        callback: Callable[[], Awaitable[Any]]
+    ) -> None:
+        """
+        Executa callback (ex: fechar o cliente HTTP) sem cortar as
+        renovações em segundo plano em andamento.
+        
+        Sem renovações pendentes, executa imediatamente; senão, agenda
+        para depois delas e retorna.
+        """
+        pending = set(self._refresh_tasks)
+        if not pending:
+            await callback()
+            return
+        
+        async def deferred():
+            await asyncio.wait(pending)
+            await callback()
+        
+        task = asyncio.get_running_loop().create_task(deferred())
+        self._refresh_tasks.add(task)
+        task.add_done_callback(self._refresh_tasks.discard)
+    
+    async def _upgrade_legacy(self, key: str, source: str,
+                              value: Any) -> None:
+        """Regrava entrada pickle antiga no formato novo (mantém o TTL)."""
+        try:
+            await self.redis.set(key, encode(value, source),
+                                 keepttl=True, xx=True)
+            logger.debug(f"♻️ Cache migrado para formato colunar: {key}")
+        except Exception as e:
+            logger.warning(f"Falha ao migrar entrada legada {key}: {e}")
+    
+    def _count_hit(self, source: str, key: str, tier: str) -> None:
+        """Métrica de hit (por fonte e camada) + sketch de chaves quentes."""
+        get_hot_keys().add(key, "hit")
+        if METRICS_ENABLED:
+            CACHE_HITS.labels(
+                source=cache_source_label(source), tier=tier
+            ).inc()
+    
+    def _count_miss(self, source: str, key: str) -> None:
+        """Métrica de miss (por fonte) + sketch de chaves quentes."""
+        get_hot_keys().add(key, "miss")
+        if METRICS_ENABLED:
+            CACHE_MISSES.labels(source=cache_source_label(source)).inc()
+    
+    def _count_save(self, source: str) -> None:
+        """Métrica de gravações (por fonte)."""
+        if METRICS_ENABLED:
+            POPULAR_DATA_ACCESSES.labels(
+                source=cache_source_label(source)
+            ).inc()
+    
+    def _count_error(self, source: str, operation: str) -> None:
+        """Métrica de falhas (por fonte e operação)."""
+        if METRICS_ENABLED:
+            CACHE_ERRORS.labels(
+                source=cache_source_label(source), operation=operation
+            ).inc()
+    
+    def _observe(self, tier: str, operation: str, outcome: str,
+                 started: float) -> None:
+        """Latência da operação por camada."""
+        if METRICS_ENABLED:
+            CACHE_LATENCY.labels(
+                tier=tier, operation=operation, outcome=outcome
+            ).observe(time.perf_counter() - started)
+    
+    async def _invalidate_local(self, key: str, value: Any = None,
+                                ttl: int = 0, size: int = 0) -> None:
+        """Atualiza o L1 local e avisa os demais processos."""
+        if self.local is None:
+            return
+        if value is None:
+            self.local.invalidate(key)
+        else:
+            self.local.put(key, copy.copy(value), ttl, size=size)
+        try:
+            await publish_invalidation(self.redis, key)
+        except Exception as e:
+            logger.warning(f"Falha ao publicar invalidação L1: {e}")
+    
     async def set(
         self,
         source: str,
@@ -220,7 +538,8 @@ class ClimateCacheService:
             lon: Longitude
             start: Data inicial
             end: Data final
-            data: Dados a serem salvos (serão serializados com pickle)
+            data: Dados a serem salvos (formato colunar/comprimido, ver
+                  serialization)
         
         Returns:
             bool: True se salvou com sucesso, False caso contrário
@@ -229,27 +548,284 @@ class ClimateCacheService:
             return False
         
         key = self._make_key(source, lat, lon, start, end)
-        ttl = self._get_ttl(start)
+        soft_ttl = self._get_ttl(start)
+        ttl = hard_ttl(soft_ttl)
         
+        started = time.perf_counter()
         try:
-            serialized = pickle.dumps(data)
+            serialized = encode(data, source, soft_ttl)
             await self.redis.setex(key, ttl, serialized)
+            await self._invalidate_local(key, data, soft_ttl,
+                                         len(serialized))
+            self._observe("redis", "set", "ok", started)
             
-            ttl_hours = ttl / 3600
-            logger.info(f"💾 Cache SAVE: {key} (TTL: {ttl}s / {ttl_hours:.1f}h)")
-            
-            # Incrementa métrica de dados populares
+            ttl_hours = soft_ttl / 3600
+            logger.info(
+                f"💾 Cache SAVE: {key} (TTL: {soft_ttl}s / {ttl_hours:.1f}h, "
+                f"stale até {ttl}s)"
+            )
+            self._count_save(source)
+            return True
+        
+        except Exception as e:
+            logger.error(f"Erro ao salvar cache: {e}")
+            self._observe("redis", "set", "error", started)
+            self._count_error(source, "set")
+            return False
+    
+    async def get_many(
+        self,
+        requests: Sequence[CacheRequest]
+    ) -> Tuple[Dict[CacheRequest, Any], List[CacheRequest]]:
+        """
+        Busca várias entradas num único round-trip.
+        
+        O L1 responde primeiro; as chaves restantes vão ao Redis num
+        pipeline (GET + PTTL por chave). Entradas stale (após o soft TTL)
+        contam como miss, para que o chamador as renove.
+        
+        Args:
+            requests: Tuplas (source, lat, lon, start, end)
+        
+        Returns:
+            Tuple[Dict, List]: (hits {request: dados}, misses [request])
+        """
+        if not requests:
+            return {}, []
+        if not self.redis:
+            logger.warning("Redis indisponível, cache desabilitado")
+            return {}, list(requests)
+        
+        # Pedidos na mesma célula nativa compartilham a chave
+        keys: Dict[str, List[CacheRequest]] = {}
+        sources: Dict[str, str] = {}
+        for req in requests:
+            key = self._make_key(*req)
+            keys.setdefault(key, []).append(req)
+            sources[key] = req[0]
+        
+        found: Dict[str, Any] = {}
+        local_ready = self._local_ready()
+        if local_ready:
+            for key in keys:
+                hit, value = self.local.get(key)
+                if hit:
+                    found[key] = value
+        remote = [key for key in keys if key not in found]
+        local_hits = set(found)
+        
+        if remote:
+            started = time.perf_counter()
             try:
-                from backend.api.middleware.prometheus_metrics import \
-                    POPULAR_DATA_ACCESSES
-                POPULAR_DATA_ACCESSES.labels(key=key).inc()
-            except ImportError:
-                pass
-            
+                pipe = self.redis.pipeline(transaction=False)
+                for key in remote:
+                    pipe.get(key)
+                    pipe.pttl(key)
+                replies = await pipe.execute()
+                payloads, pttls = replies[0::2], replies[1::2]
+                
+                legacy = []
+                for key, data, pttl in zip(remote, payloads, pttls):
+                    if not data:
+                        continue
+                    value = decode(data)
+                    if is_legacy(data):
+                        legacy.append((key, value))
+                    fresh = self._freshness(data, pttl, keys[key][0][3])
+                    if fresh is not None and fresh <= 0:
+                        continue  # stale: o lote trata como miss
+                    found[key] = value
+                    if local_ready and pttl != -2:
+                        ttl = self.local.max_ttl if fresh is None else fresh
+                        self.local.put(key, value, ttl, size=len(data))
+                if legacy:
+                    await self._upgrade_legacy_many(legacy, sources)
+                self._observe("redis", "get_many", "ok", started)
+            except Exception as e:
+                logger.error(f"Erro ao buscar cache em lote: {e}")
+                self._observe("redis", "get_many", "error", started)
+                self._count_error(requests[0][0], "get_many")
+        
+        hits: Dict[CacheRequest, Any] = {}
+        misses: List[CacheRequest] = []
+        for key, reqs in keys.items():
+            if key in found:
+                tier = "l1" if key in local_hits else "redis"
+                self._count_hit(sources[key], key, tier)
+                for req in reqs:
+                    hits[req] = copy.copy(found[key])
+            else:
+                self._count_miss(sources[key], key)
+                misses.extend(reqs)
+        
+        logger.info(
+            f"🎯 Cache em lote: {len(keys) - len(remote)} L1, "
+            f"{len(found)}/{len(keys)} hits"
+        )
+        return hits, misses
+    
+    async def _upgrade_legacy_many(
+        self,
+        entries: List[Tuple[str, Any]],
+        sources: Dict[str, str]
+    ) -> None:
+        """Regrava várias entradas pickle antigas num único pipeline."""
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            for key, value in entries:
+                pipe.set(key, encode(value, sources[key]),
+                         keepttl=True, xx=True)
+            await pipe.execute()
+            logger.debug(
+                f"♻️ {len(entries)} entradas migradas para formato colunar"
+            )
+        except Exception as e:
+            logger.warning(f"Falha ao migrar entradas legadas: {e}")
+    
+    async def set_many(
+        self,
+        items: Sequence[Tuple[str, float, float, datetime, datetime, Any]]
+    ) -> int:
+        """
+        Salva várias entradas num único pipeline (TTL dinâmico por chave).
+        
+        As invalidações do L1 vão no mesmo pipeline.
+        
+        Args:
+            items: Tuplas (source, lat, lon, start, end, data)
+        
+        Returns:
+            int: Número de entradas salvas
+        """
+        if not self.redis:
+            return 0
+        
+        entries = []
+        for source, lat, lon, start, end, data in items:
+            if not data:
+                continue
+            key = self._make_key(source, lat, lon, start, end)
+            soft_ttl = self._get_ttl(start)
+            entries.append((source, key, soft_ttl,
+                            encode(data, source, soft_ttl), data))
+        if not entries:
+            return 0
+        
+        started = time.perf_counter()
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            for _, key, ttl, serialized, _ in entries:
+                pipe.setex(key, hard_ttl(ttl), serialized)
+                if self.local is not None:
+                    pipe.publish(INVALIDATION_CHANNEL,
+                                 invalidation_message(key))
+            await pipe.execute()
+            self._observe("redis", "set_many", "ok", started)
+        except Exception as e:
+            logger.error(f"Erro ao salvar cache em lote: {e}")
+            self._observe("redis", "set_many", "error", started)
+            self._count_error(entries[0][0], "set_many")
+            return 0
+        
+        for source, key, ttl, serialized, data in entries:
+            if self.local is not None:
+                self.local.put(key, copy.copy(data), ttl,
+                               size=len(serialized))
+            self._count_save(source)
+        
+        logger.info(f"💾 Cache SAVE em lote: {len(entries)} chaves")
+        return len(entries)
+    
+    def get_sync(
+        self,
+        redis_client,
+        source: str,
+        lat: float,
+        lon: float,
+        start: datetime,
+        end: datetime
+    ) -> Optional[Any]:
+        """
+        get() para clientes síncronos (ex: NasaPowerAPI no download de
+        ETo), com a conexão Redis síncrona do chamador.
+        
+        Mesma chave, formato e frescor de get(): os dois caminhos leem
+        o que o outro (e o warm-up) gravou. Sem L1 nem renovação em
+        segundo plano; stale conta como miss.
+        
+        Args:
+            redis_client: Cliente redis.Redis (decode_responses=False)
+            source, lat, lon, start, end: Ver get()
+        
+        Returns:
+            Dados deserializados ou None se não existir/stale/erro
+        """
+        key = self._make_key(source, lat, lon, start, end)
+        try:
+            pipe = redis_client.pipeline(transaction=False)
+            pipe.get(key)
+            pipe.pttl(key)
+            data, pttl = pipe.execute()
+            if not data:
+                logger.info(f"❌ Cache MISS: {key}")
+                self._count_miss(source, key)
+                return None
+        
+            fresh = self._freshness(data, pttl, start)
+            if fresh is not None and fresh <= 0:
+                logger.info(f"❌ Cache MISS (stale): {key}")
+                self._count_miss(source, key)
+                return None
+        
+            logger.info(f"🎯 Cache HIT: {key}")
+            self._count_hit(source, key, "redis")
+            return decode(data)
+        
+        except Exception as e:
+            logger.error(f"Erro ao buscar cache: {e}")
+            self._count_error(source, "get")
+            return None
+    
+    def set_sync(
+        self,
+        redis_client,
+        source: str,
+        lat: float,
+        lon: float,
+        start: datetime,
+        end: datetime,
+        data: Any
+    ) -> bool:
+        """
+        set() para clientes síncronos (ver get_sync).
+        
+        TTL dinâmico e formato de set(); a invalidação do L1 vai no
+        mesmo pipeline.
+        
+        Returns:
+            bool: True se salvou com sucesso, False caso contrário
+        """
+        if not data:
+            return False
+        
+        key = self._make_key(source, lat, lon, start, end)
+        soft_ttl = self._get_ttl(start)
+        try:
+            pipe = redis_client.pipeline(transaction=False)
+            pipe.setex(key, hard_ttl(soft_ttl),
+                       encode(data, source, soft_ttl))
+            if self.local is not None:
+                pipe.publish(INVALIDATION_CHANNEL, invalidation_message(key))
+            pipe.execute()
+            if self.local is not None:
+                self.local.invalidate(key)
+            logger.info(f"💾 Cache SAVE: {key} (TTL: {soft_ttl}s)")
+            self._count_save(source)
             return True
         
         except Exception as e:
             logger.error(f"Erro ao salvar cache: {e}")
+            self._count_error(source, "set")
             return False
     
     async def delete(
@@ -280,6 +856,7 @@ class ClimateCacheService:
         
         try:
             await self.redis.delete(key)
+            await self._invalidate_local(key)
             logger.info(f"🗑️ Cache DELETE: {key}")
             return True
         
@@ -2,9 +2,14 @@
 Tasks Celery para pre-carregamento de dados climáticos populares.
 
 Estratégia de pre-fetch:
-- Cidades mundiais populares: 50 cidades, execução diária 03:00 BRT
-- Cidades MATOPIBA: 337 cidades, execução diária 04:00 BRT
-- Dados dos últimos 30 dias para cada localização
+- Células mais pedidas pelos usuários (ranking de popularidade com
+  decaimento, ver popularity), completadas por 50 cidades-semente:
+  execução diária 03:00 BRT, limitada por uma cota de requisições
+- Cidades MATOPIBA: 337 cidades (155 células NASA POWER), execução
+  diária 04:00 BRT
+- Janelas de 8 e 15 dias terminando hoje (as pedidas ao /eto_calculate),
+  no cache lido pelo download de ETo (NasaPowerAPI) e pelos clientes
+  (ClimateClientFactory.get_cache_service, prefixo 'climate')
 
 Benefits:
 - Cache aquecido para requisições futuras
@@ -14,12 +19,13 @@ Benefits:
 """
 
 import asyncio
+import time
 from datetime import datetime, timedelta
 
 from celery import shared_task
 from loguru import logger
 
-# Cidades mundiais mais populares (top 50)
+# Cidades-semente do pre-fetch enquanto o ranking de popularidade é pequeno
 POPULAR_WORLD_CITIES = [
     {"name": "Paris", "lat": 48.8566, "lon": 2.3522, "country": "França"},
     {"name": "London", "lat": 51.5074, "lon": -0.1278, "country": "Reino Unido"},
@@ -81,94 +87,260 @@ POPULAR_WORLD_CITIES = [
 ]
 
 
+# Pre-fetch adaptativo: células mais pedidas, dentro da cota upstream
+PREFETCH_TOP_N = 200
+PREFETCH_UPSTREAM_QUOTA = 100  # requisições NASA POWER por execução
+PREFETCH_CONCURRENCY = 4
+PREFETCH_REQUESTS_PER_SECOND = 2.0
+
+# Janelas aquecidas, terminando hoje, em ordem de prioridade: padrão da
+# página de ETo (8 dias) e máximo aceito pelo /eto_calculate (15 dias).
+# As chaves do cache incluem as datas exatas.
+WARM_WINDOWS = (7, 14)  # dias antes de hoje
+MATOPIBA_WARM_QUOTA = 500  # requisições NASA POWER por execução
+
+
+def _prefetch_elevations(cities):
+    """
+    Resolve a elevação de várias cidades numa única consulta em lote.
+
+    Falhas não interrompem o pre-fetch climático.
+
+    Returns:
+        int: Número de cidades com elevação disponível
+    """
+    try:
+        from backend.api.services.openmeteo import get_openmeteo_elevations
+
+        elevations, _ = get_openmeteo_elevations(
+            [(city["lat"], city["lon"]) for city in cities]
+        )
+        return sum(1 for e in elevations if e is not None)
+    except Exception as e:
+        logger.warning(f"⚠️ Pre-fetch de elevação falhou: {e}")
+        return 0
+
+
+def _prefetch_candidates(cells, top_n):
+    """
+    Células mais populares, completadas pelas cidades-semente.
+
+    As cidades de POPULAR_WORLD_CITIES só entram enquanto o ranking tem
+    menos de top_n células (partida a frio), sem repetir células.
+    """
+    from backend.api.services.source_grid import snap_coordinates
+
+    candidates = [
+        {"name": f"{c['lat']}:{c['lon']}", "lat": c["lat"],
+         "lon": c["lon"], "score": round(c["score"], 3)}
+        for c in cells[:top_n]
+    ]
+    seen = {(c["lat"], c["lon"]) for c in candidates}
+    for city in POPULAR_WORLD_CITIES:
+        if len(candidates) >= top_n:
+            break
+        cell = snap_coordinates("nasa_power", city["lat"], city["lon"])
+        if cell not in seen:
+            seen.add(cell)
+            candidates.append({"name": city["name"], "lat": cell[0],
+                               "lon": cell[1], "score": 0.0})
+    return candidates
+
+
+async def _prefetch_cells(cache, client, cells, start, end, quota,
+                          concurrency, limiter, timings=None):
+    """
+    Aquece o cache NASA POWER de várias células.
+
+    Uma consulta get_many separa o que já está em cache; até `quota`
+    células ausentes vão à API em paralelo (semáforo + token bucket,
+    sem consultar o cache de novo) e tudo é gravado num set_many. As
+    ausentes além da cota ficam para a próxima execução.
+
+    Args:
+        timings: Se informado, recebe {nome: segundos} de cada busca
+            upstream (sem a espera no semáforo/limitador)
+
+    Returns:
+        dict: cached, fetched, deferred, failed (nomes)
+    """
+    requests = [
+        ("nasa_power", cell["lat"], cell["lon"], start, end)
+        for cell in cells
+    ]
+    names = dict(zip(requests, (cell["name"] for cell in cells)))
+    hits, misses = await cache.get_many(requests)
+    to_fetch = misses[:quota]
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch(request):
+        _, lat, lon, _, _ = request
+        async with semaphore:
+            await limiter.acquire()
+            started = time.perf_counter()
+            try:
+                return await client.get_daily_data(
+                    lat=lat, lon=lon, start_date=start, end_date=end,
+                    use_cache=False
+                )
+            finally:
+                if timings is not None:
+                    timings[names[request]] = time.perf_counter() - started
+
+    outcomes = await asyncio.gather(
+        *(fetch(request) for request in to_fetch), return_exceptions=True
+    )
+
+    to_save, failed = [], []
+    for request, outcome in zip(to_fetch, outcomes):
+        if isinstance(outcome, Exception) or not outcome:
+            failed.append(names[request])
+            logger.warning(
+                f"⚠️ Pre-fetch falhou em {names[request]}: "
+                f"{str(outcome)[:100]}"
+            )
+            continue
+        to_save.append((*request, outcome))
+
+    await cache.set_many(to_save)
+    return {
+        "cached": len(requests) - len(misses),
+        "fetched": len(to_save),
+        "deferred": len(misses) - len(to_fetch),
+        "failed": failed,
+    }
+
+
+async def _prefetch_windows(cache, client, cells, quota, concurrency,
+                            limiter, timings=None):
+    """
+    Aquece as janelas de WARM_WINDOWS terminando hoje, a mais usada
+    primeiro, com uma cota upstream única para todas.
+
+    Args:
+        timings: Se informado, acumula {nome: segundos} das buscas
+            upstream de cada célula em todas as janelas
+
+    Returns:
+        dict: {"8d": stats de _prefetch_cells, "15d": ...}
+    """
+    today = datetime.combine(datetime.now().date(), datetime.min.time())
+    windows = {}
+    remaining = quota
+    for days in WARM_WINDOWS:
+        window_timings = {}
+        stats = await _prefetch_cells(
+            cache, client, cells, today - timedelta(days=days), today,
+            remaining, concurrency, limiter, timings=window_timings
+        )
+        remaining -= stats["fetched"] + len(stats["failed"])
+        if timings is not None:
+            for name, seconds in window_timings.items():
+                timings[name] = timings.get(name, 0.0) + seconds
+        windows[f"{days + 1}d"] = stats
+    return windows
+
+
 @shared_task(
     bind=True,
     max_retries=3,
     name="climate.prefetch_nasa_popular_cities"
 )
-def prefetch_nasa_popular_cities(self):
+def prefetch_nasa_popular_cities(
+    self,
+    top_n=PREFETCH_TOP_N,
+    quota=PREFETCH_UPSTREAM_QUOTA,
+    concurrency=PREFETCH_CONCURRENCY
+):
     """
-    Pre-carrega dados NASA POWER para 50 cidades mais populares.
+    Pre-carrega dados NASA POWER das células mais pedidas pelos usuários.
 
     Execução: Diariamente às 03:00 BRT via Celery Beat
-    Período: Últimos 30 dias
+    Seleção: top_n células do ranking de popularidade (ver popularity),
+        completadas pelas 50 cidades-semente enquanto o ranking é pequeno
+    Cota: no máximo `quota` requisições upstream por execução (todas as
+        janelas)
+    Período: Janelas de WARM_WINDOWS terminando hoje (8 e 15 dias)
+    Cache: o dos leitores (ClimateClientFactory.get_cache_service)
     Fontes: NASA POWER (domínio público)
 
     Returns:
         dict: Status e estatísticas do pre-fetch
     """
     try:
-        logger.info("🚀 Iniciando pre-fetch NASA POWER (50 cidades)")
+        logger.info(f"🚀 Iniciando pre-fetch NASA POWER (top {top_n})")
 
         # Importa dentro da task para evitar circular imports
-        from backend.api.services.nasa_power_client import NASAPowerClient
-        from backend.infrastructure.cache.climate_cache import \
-            create_climate_cache
-
-        # Período: últimos 30 dias
-        end = datetime.now()
-        start = end - timedelta(days=30)
-
-        # Cria cache e cliente
-        cache = create_climate_cache("nasa")
-        client = NASAPowerClient(cache=cache)
-
-        success_count = 0
-        failed_cities = []
-
-        # Pre-fetch cada cidade
-        for idx, city in enumerate(POPULAR_WORLD_CITIES, 1):
+        from backend.api.services.climate_factory import \
+            ClimateClientFactory
+        from backend.api.services.rate_limiter import AsyncTokenBucket
+        from backend.infrastructure.cache.popularity import \
+            PopularityTracker
+
+        async def run():
+            cache = ClimateClientFactory.get_cache_service()
+            client = ClimateClientFactory.create_nasa_power()
             try:
-                # Usa asyncio para chamar método async
-                loop = asyncio.get_event_loop()
-                data = loop.run_until_complete(
-                    client.get_daily_data(
-                        lat=city["lat"],
-                        lon=city["lon"],
-                        start_date=start,
-                        end_date=end
-                    )
+                try:
+                    cells = await PopularityTracker(cache.redis).top(top_n)
+                except Exception as e:
+                    logger.warning(f"⚠️ Ranking indisponível: {e}")
+                    cells = []
+                candidates = _prefetch_candidates(cells, top_n)
+                limiter = AsyncTokenBucket(
+                    rate=PREFETCH_REQUESTS_PER_SECOND,
+                    capacity=float(concurrency)
                 )
-
-                if data:
-                    success_count += 1
-                    logger.info(
-                        f"✅ [{idx}/{len(POPULAR_WORLD_CITIES)}] "
-                        f"{city['name']}, {city['country']}"
-                    )
-                else:
-                    failed_cities.append(city["name"])
-                    logger.warning(f"⚠️ Sem dados para {city['name']}")
-
-            except Exception as e:
-                failed_cities.append(city["name"])
-                logger.error(
-                    f"❌ Erro em {city['name']}: {str(e)[:100]}"
+                windows = await _prefetch_windows(
+                    cache, client, candidates, quota, concurrency, limiter
                 )
-
-        # Estatísticas finais
-        total = len(POPULAR_WORLD_CITIES)
-        success_rate = (success_count / total) * 100
+                return cells, candidates, windows
+            finally:
+                await client.close()
+                # Conexões presas a este loop: a próxima execução recria
+                await ClimateClientFactory.close_all()
+
+        cells, candidates, windows = asyncio.run(run())
+
+        # Aquece o cache de elevação de todas as células (1 round-trip)
+        elevations_cached = _prefetch_elevations(candidates)
+
+        # Estatísticas finais (célula x janela)
+        total = len(candidates) * len(windows)
+        cached = sum(w["cached"] for w in windows.values())
+        fetched = sum(w["fetched"] for w in windows.values())
+        deferred = sum(w["deferred"] for w in windows.values())
+        failed = list(dict.fromkeys(
+            name for w in windows.values() for name in w["failed"]
+        ))
+        success_count = cached + fetched
+        success_rate = (success_count / total) * 100 if total else 0.0
 
         result = {
             "status": "success" if success_count > 0 else "failed",
-            "total_cities": total,
+            "total_cities": len(candidates),
+            "tracked_cells": len(cells),
             "success": success_count,
-            "failed": len(failed_cities),
+            "already_cached": cached,
+            "fetched": fetched,
+            "deferred": deferred,
+            "failed": sum(len(w["failed"]) for w in windows.values()),
             "success_rate": f"{success_rate:.1f}%",
-            "failed_cities": failed_cities[:10],  # Primeiras 10
-            "period": f"{start.date()} to {end.date()}"
+            "failed_cities": failed[:10],  # Primeiras 10
+            "elevations_cached": elevations_cached,
+            "quota": quota,
+            "windows": {
+                name: {**stats, "failed": len(stats["failed"])}
+                for name, stats in windows.items()
+            },
         }
 
         logger.info(
             f"🎯 Pre-fetch NASA POWER completo: "
-            f"{success_count}/{total} cidades ({success_rate:.1f}%)"
+            f"{success_count}/{total} células×janelas "
+            f"({success_rate:.1f}%), {deferred} adiadas pela cota"
         )
 
-        # Fecha conexões
-        loop.run_until_complete(cache.close())
-        loop.run_until_complete(client.close())
-
         return result
 
     except Exception as e:
@@ -177,41 +349,154 @@ def prefetch_nasa_popular_cities(self):
         raise self.retry(exc=e, countdown=300)  # 5 minutos
 
 
+def _matopiba_locations():
+    """Cidades MATOPIBA no formato de localização do backfill."""
+    import pandas as pd
+
+    from backend.api.services.openmeteo_matopiba_client import CITIES_FILE
+
+    cities = pd.read_csv(CITIES_FILE, encoding="utf-8")
+    return [
+        {"name": row.CITY, "lat": row.LATITUDE, "lon": row.LONGITUDE}
+        for row in cities.itertuples()
+    ]
+
+
+@shared_task(
+    bind=True,
+    max_retries=3,
+    name="climate.backfill_nasa_power_history"
+)
+def backfill_nasa_power_history(self, chunk_years=10, concurrency=4):
+    """
+    Arquiva a série diária NASA POWER desde 1981 (MATOPIBA + populares).
+
+    Execução: Semanalmente (domingo 01:00 BRT) via Celery Beat
+    Retomável: cada célula continua do último dia arquivado, então a
+    primeira execução faz o backfill completo e as seguintes só
+    acrescentam os dias novos.
+
+    Returns:
+        dict: Estatísticas do backfill
+    """
+    try:
+        from backend.api.services.nasa_power_archive import \
+            backfill_nasa_power
+
+        locations = _matopiba_locations() + [
+            {"name": c["name"], "lat": c["lat"], "lon": c["lon"]}
+            for c in POPULAR_WORLD_CITIES
+        ]
+        return asyncio.run(backfill_nasa_power(
+            locations, chunk_years=chunk_years, concurrency=concurrency
+        ))
+
+    except Exception as e:
+        logger.error(f"💥 Erro crítico no backfill NASA POWER: {e}")
+        raise self.retry(exc=e, countdown=1800)  # 30 minutos
+
+
 @shared_task(
     bind=True,
     max_retries=3,
     name="climate.warm_cache_matopiba"
 )
-def warm_cache_matopiba(self):
+def warm_cache_matopiba(
+    self,
+    quota=MATOPIBA_WARM_QUOTA,
+    concurrency=PREFETCH_CONCURRENCY
+):
     """
     Aquece cache para 337 cidades MATOPIBA.
 
     Execução: Diariamente às 04:00 BRT via Celery Beat
-    Período: Últimos 15 dias (dados mais recentes)
-    Fontes: NASA POWER + Open-Meteo (somente visualização)
-
-    Note:
-        Open-Meteo usado apenas para aquecimento de cache MATOPIBA.
-        Dados não são disponibilizados para download (CC-BY-NC 4.0).
+    Período: Janelas de WARM_WINDOWS terminando hoje (8 e 15 dias), a
+        mais usada primeiro
+    Fonte: NASA POWER, no cache que o download de ETo (NasaPowerAPI) e
+        os clientes leem (ClimateClientFactory.get_cache_service)
+    Cidades na mesma célula nativa compartilham uma única busca; as
+    células ausentes vão à API em paralelo (semáforo + token bucket),
+    limitadas por `quota` requisições, e cada janela é gravada num
+    set_many.
 
     Returns:
-        dict: Status e estatísticas do warm-up
+        dict: Status, estatísticas por janela e tempo por cidade (soma
+        das buscas upstream da sua célula; 0.0 = já estava em cache)
     """
     try:
         logger.info("🚀 Iniciando warm-up cache MATOPIBA (337 cidades)")
 
-        # TODO: Implementar após ter lista de 337 cidades MATOPIBA
-        # Por enquanto, retorna sucesso placeholder
+        from backend.api.services.climate_factory import \
+            ClimateClientFactory
+        from backend.api.services.rate_limiter import AsyncTokenBucket
+        from backend.api.services.source_grid import snap_coordinates
+
+        # Cidades agrupadas por célula NASA POWER
+        city_cells = {}
+        cells = {}
+        for city in _matopiba_locations():
+            lat, lon = snap_coordinates("nasa_power", city["lat"],
+                                        city["lon"])
+            name = f"{lat}:{lon}"
+            city_cells[city["name"]] = name
+            cells[name] = {"name": name, "lat": lat, "lon": lon}
+
+        started = time.perf_counter()
+
+        async def run():
+            cache = ClimateClientFactory.get_cache_service()
+            client = ClimateClientFactory.create_nasa_power()
+            limiter = AsyncTokenBucket(rate=PREFETCH_REQUESTS_PER_SECOND,
+                                       capacity=float(concurrency))
+            timings = {name: 0.0 for name in cells}
+            try:
+                windows = await _prefetch_windows(
+                    cache, client, list(cells.values()), quota,
+                    concurrency, limiter, timings=timings
+                )
+                return windows, timings
+            finally:
+                await client.close()
+                # Conexões presas a este loop: a próxima execução recria
+                await ClimateClientFactory.close_all()
+
+        windows, timings = asyncio.run(run())
+        windows = {
+            name: {**stats, "failed": len(stats["failed"])}
+            for name, stats in windows.items()
+        }
+
+        city_timings = {
+            city: round(timings[cell], 3)
+            for city, cell in city_cells.items()
+        }
+        slowest = sorted(city_timings.items(), key=lambda item: -item[1])
+        fetched = sum(w["fetched"] for w in windows.values())
+        failed = sum(w["failed"] for w in windows.values())
+        deferred = sum(w["deferred"] for w in windows.values())
 
         result = {
-            "status": "not_implemented",
-            "message": "MATOPIBA cities list pending",
-            "total_cities": 337,
-            "success": 0,
-            "failed": 0
+            "status": "success" if failed == 0 else "partial",
+            "total_cities": len(city_cells),
+            "total_cells": len(cells),
+            "success": sum(w["cached"] + w["fetched"]
+                           for w in windows.values()),
+            "fetched": fetched,
+            "deferred": deferred,
+            "failed": failed,
+            "quota": quota,
+            "windows": windows,
+            "duration_seconds": round(time.perf_counter() - started, 1),
+            "slowest_cities": slowest[:10],
+            "city_timings": city_timings,
         }
 
-        logger.warning("⚠️ MATOPIBA warm-up não implementado ainda")
+        logger.info(
+            f"✅ Warm-up MATOPIBA: {len(cells)} células × "
+            f"{len(windows)} janelas, {fetched} buscas, {failed} falhas, "
+            f"{deferred} adiadas pela cota "
+            f"({result['duration_seconds']}s)"
+        )
         return result
 
     except Exception as e:
@@ -219,60 +504,55 @@ def warm_cache_matopiba(self):
         raise self.retry(exc=e, countdown=300)
 
 
+def _maintenance_redis():
+    """Conexão Redis assíncrona para as tasks de manutenção."""
+    from redis.asyncio import Redis
+
+    from config.settings.app_settings import get_settings
+
+    return Redis.from_url(get_settings().REDIS_URL, decode_responses=False)
+
+
 @shared_task(name="climate.cleanup_old_cache")
-def cleanup_old_cache():
+def cleanup_old_cache(time_budget=60.0):
     """
     Remove entradas de cache expiradas antigas.
 
     Execução: Diariamente às 02:00 BRT via Celery Beat
-    Remove: Chaves com padrão 'climate:*' expiradas há mais de 7 dias
+    Remove: Chaves 'climate:*' sem TTL (legado/órfãs). Chaves com TTL
+    não são tocadas: o TTL no Redis é o hard TTL (ver revalidation), e
+    o trecho final dele é a janela stale-while-revalidate; o próprio
+    Redis as expira.
+    Varredura com SCAN em lotes (ver maintenance); se o orçamento de
+    tempo estourar, a próxima execução continua do cursor salvo.
 
     Returns:
         dict: Estatísticas de limpeza
     """
     try:
-        from redis.asyncio import Redis
-
-        from config.settings.app_settings import get_settings
-
-        settings = get_settings()
+        from backend.infrastructure.cache.maintenance import \
+            cleanup_expiring
 
         logger.info("🧹 Iniciando limpeza de cache climático antigo")
 
-        loop = asyncio.get_event_loop()
-        redis = Redis.from_url(settings.REDIS_URL, decode_responses=False)
-
-        # Busca todas as chaves 'climate:*'
-        keys = loop.run_until_complete(
-            redis.keys("climate:*")
-        )
-
-        removed_count = 0
-        kept_count = 0
-
-        for key in keys:
-            ttl = loop.run_until_complete(redis.ttl(key))
+        async def run():
+            redis = _maintenance_redis()
+            try:
+                return await cleanup_expiring(
+                    redis, "climate:*", min_ttl=0,
+                    time_budget=time_budget
+                )
+            finally:
+                await redis.aclose()
 
-            # Remove se TTL expirado (< 0) ou muito baixo (< 1 hora)
-            if ttl < 0 or ttl < 3600:
-                loop.run_until_complete(redis.delete(key))
-                removed_count += 1
-            else:
-                kept_count += 1
+        report = asyncio.run(run())
 
         logger.info(
-            f"✅ Limpeza completa: {removed_count} removidas, "
-            f"{kept_count} mantidas"
+            f"✅ Limpeza completa: {report['removed']} removidas, "
+            f"{report['kept']} mantidas"
         )
 
-        loop.run_until_complete(redis.close())
-
-        return {
-            "status": "success",
-            "removed": removed_count,
-            "kept": kept_count,
-            "total_scanned": len(keys)
-        }
+        return {"status": "success", **report}
 
     except Exception as e:
         logger.error(f"❌ Erro na limpeza de cache: {e}")
@@ -280,53 +560,35 @@ def cleanup_old_cache():
 
 
 @shared_task(name="climate.generate_cache_stats")
-def generate_cache_stats():
+def generate_cache_stats(time_budget=30.0):
     """
     Gera estatísticas de uso do cache.
 
     Execução: A cada hora via Celery Beat
-    Métricas: Hit rate, dados populares, tamanho do cache
+    Métricas: Chaves e memória real (MEMORY USAGE) por fonte
 
     Returns:
         dict: Estatísticas de cache
     """
     try:
-        from redis.asyncio import Redis
-
-        from config.settings.app_settings import get_settings
-
-        settings = get_settings()
-        loop = asyncio.get_event_loop()
-        redis = Redis.from_url(settings.REDIS_URL, decode_responses=False)
+        from backend.infrastructure.cache.maintenance import keyspace_stats
 
-        # Conta chaves por fonte
-        sources = ["nasa", "met", "nws", "openmeteo"]
-        stats = {}
-
-        for source in sources:
-            keys = loop.run_until_complete(
-                redis.keys(f"climate:{source}:*")
-            )
-            stats[source] = {
-                "total_keys": len(keys),
-                "memory_mb": 0  # TODO: calcular tamanho real
-            }
-
-        # Total geral
-        total_keys = loop.run_until_complete(
-            redis.dbsize()
-        )
+        async def run():
+            redis = _maintenance_redis()
+            try:
+                stats = await keyspace_stats(
+                    redis, "climate:*", time_budget=time_budget
+                )
+                stats["total_keys_db"] = await redis.dbsize()
+                return stats
+            finally:
+                await redis.aclose()
 
-        result = {
-            "timestamp": datetime.now().isoformat(),
-            "sources": stats,
-            "total_keys_db": total_keys
-        }
+        result = {"timestamp": datetime.now().isoformat(),
+                  **asyncio.run(run())}
 
         logger.info(f"📊 Cache stats: {result}")
 
-        loop.run_until_complete(redis.close())
-
         return result
 
     except Exception as e:
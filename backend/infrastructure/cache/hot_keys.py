@@ -0,0 +1,90 @@
+"""
+Chaves de cache mais acessadas, em memória limitada.
+
+Substitui os rótulos Prometheus por chave (cardinalidade ilimitada) por
+um sketch Space-Saving: no máximo `capacity` contadores; ao chegar uma
+chave nova com o sketch cheio, ela herda o contador da menos frequente
+(+1) e o valor herdado vira o erro máximo da estimativa. Toda chave com
+frequência real acima de total / capacity está garantidamente no
+sketch.
+
+O sketch é por processo; exposto em /api/debug/cache/hot-keys.
+
+Uso:
+    sketch = get_hot_keys()
+    sketch.add("climate:nasa_power:-16.0:-48.125:20250101:20250131",
+               outcome="hit")
+    sketch.top(20)
+"""
+
+import threading
+from functools import lru_cache
+from typing import Dict, List
+
+DEFAULT_CAPACITY = 512
+
+
+class SpaceSavingSketch:
+    """
+    Top-k aproximado (algoritmo Space-Saving).
+
+    Attributes:
+        capacity: Máximo de chaves monitoradas
+        total: Eventos observados
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        if capacity <= 0:
+            raise ValueError("capacity deve ser positiva")
+        self.capacity = capacity
+        self.total = 0
+        # chave → [contagem, erro, hits]
+        self._counters: Dict[str, List[int]] = {}
+        self._lock = threading.Lock()
+
+    def add(self, key: str, outcome: str = "hit") -> None:
+        """Registra um acesso à chave (outcome: 'hit' ou 'miss')."""
+        hit = 1 if outcome == "hit" else 0
+        with self._lock:
+            self.total += 1
+            counter = self._counters.get(key)
+            if counter is not None:
+                counter[0] += 1
+                counter[2] += hit
+                return
+            if len(self._counters) < self.capacity:
+                self._counters[key] = [1, 0, hit]
+                return
+            victim = min(self._counters, key=lambda k: self._counters[k][0])
+            floor = self._counters.pop(victim)[0]
+            self._counters[key] = [floor + 1, floor, hit]
+
+    def top(self, n: int = 20) -> List[Dict]:
+        """
+        As n chaves mais frequentes.
+
+        Returns:
+            List[Dict]: {"key", "count", "error", "hits"}; a contagem
+            real está entre count - error e count
+        """
+        with self._lock:
+            ranked = sorted(self._counters.items(),
+                            key=lambda item: item[1][0], reverse=True)[:n]
+        return [
+            {"key": key, "count": count, "error": error, "hits": hits}
+            for key, (count, error, hits) in ranked
+        ]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self.total = 0
+
+    def __len__(self) -> int:
+        return len(self._counters)
+
+
+@lru_cache(maxsize=1)
+def get_hot_keys() -> SpaceSavingSketch:
+    """Sketch compartilhado no processo."""
+    return SpaceSavingSketch()
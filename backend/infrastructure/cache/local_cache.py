@@ -0,0 +1,235 @@
+"""
+Cache L1 em memória do processo, na frente do Redis.
+
+Chaves quentes (cidades populares, blob MATOPIBA) são lidas milhares de
+vezes por hora; o L1 evita a ida ao Redis e a desserialização nesses
+casos.
+
+- LRU limitado por número de entradas e por bytes (tamanho do payload
+  serializado)
+- TTL por entrada, nunca maior que o TTL restante da chave no Redis
+- Invalidação entre processos via Redis pub/sub: escritas e remoções
+  publicam a chave em INVALIDATION_CHANNEL e os demais processos a
+  descartam do L1
+- O L1 só responde enquanto a inscrição no canal está ativa; ao
+  (re)inscrever, o L1 é esvaziado (mensagens perdidas no intervalo)
+
+Uso:
+    local = get_local_cache()
+    hit, value = local.get(key)
+    local.put(key, value, ttl=60, size=len(payload))
+"""
+
+import asyncio
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+
+from loguru import logger
+from redis.asyncio import Redis
+
+from config.settings.app_settings import get_settings
+
+settings = get_settings()
+
+INVALIDATION_CHANNEL = "climate:cache:invalidate"
+
+# Identifica mensagens publicadas por este processo
+NODE_ID = uuid.uuid4().hex[:12]
+
+
+class LocalTTLCache:
+    """
+    LRU em memória com TTL por entrada e limite de bytes.
+
+    Attributes:
+        max_entries: Máximo de entradas
+        max_bytes: Soma máxima dos tamanhos declarados
+        max_ttl: TTL máximo de uma entrada (s)
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        max_bytes: int = 64 * 1024 * 1024,
+        max_ttl: float = 300.0
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_ttl = max_ttl
+        self._entries: "OrderedDict[str, Tuple[float, Any, int]]" = (
+            OrderedDict()
+        )
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.stats: Dict[str, int] = {
+            "hits": 0, "misses": 0, "evictions": 0, "invalidations": 0
+        }
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """
+        Busca uma entrada válida.
+
+        Returns:
+            Tuple[bool, Any]: (hit, valor)
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats["misses"] += 1
+                return False, None
+            expires_at, value, _ = entry
+            if expires_at <= time.monotonic():
+                self._remove(key)
+                self.stats["misses"] += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+            return True, value
+
+    def put(self, key: str, value: Any, ttl: float, size: int = 0) -> None:
+        """
+        Armazena uma entrada (TTL limitado a max_ttl).
+
+        Entradas maiores que max_bytes não são armazenadas.
+        """
+        ttl = min(ttl, self.max_ttl)
+        if ttl <= 0 or size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + ttl, value, size)
+            self._bytes += size
+            while (len(self._entries) > self.max_entries
+                   or self._bytes > self.max_bytes):
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.stats["evictions"] += 1
+
+    def invalidate(self, key: str) -> None:
+        """Descarta uma entrada (se existir)."""
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+                self.stats["invalidations"] += 1
+
+    def clear(self) -> None:
+        """Descarta todas as entradas."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _remove(self, key: str) -> None:
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def info(self) -> Dict[str, int]:
+        """Estatísticas e ocupação."""
+        return {**self.stats, "entries": len(self._entries),
+                "bytes": self._bytes}
+
+
+class CacheInvalidationListener:
+    """
+    Assinante do canal de invalidação (uma tarefa por event loop).
+
+    Attributes:
+        cache: L1 a invalidar
+        subscribed: True enquanto a inscrição está ativa
+    """
+
+    def __init__(self, cache: LocalTTLCache, redis_url: str):
+        self.cache = cache
+        self.redis_url = redis_url
+        self.subscribed = False
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def healthy(self) -> bool:
+        """L1 pode responder (inscrição ativa no loop atual)."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+        return (self.subscribed and self._loop is loop
+                and self._task is not None and not self._task.done())
+
+    def ensure_running(self) -> None:
+        """Inicia a escuta no event loop atual, se necessário."""
+        loop = asyncio.get_running_loop()
+        if (self._task is not None and not self._task.done()
+                and self._loop is loop):
+            return
+        # Loop novo (ex: asyncio.run por task Celery) ou escuta encerrada
+        self.subscribed = False
+        self._loop = loop
+        self._task = loop.create_task(self._listen())
+
+    async def _listen(self) -> None:
+        delay = 1.0
+        while True:
+            redis = Redis.from_url(self.redis_url, decode_responses=True)
+            pubsub = redis.pubsub()
+            try:
+                await pubsub.subscribe(INVALIDATION_CHANNEL)
+                self.cache.clear()
+                self.subscribed = True
+                delay = 1.0
+                logger.info(f"✅ L1 inscrito em {INVALIDATION_CHANNEL}")
+                async for message in pubsub.listen():
+                    if message.get("type") == "message":
+                        self.handle(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"⚠️ Invalidação L1 interrompida: {e}")
+            finally:
+                self.subscribed = False
+                self.cache.clear()
+                try:
+                    await pubsub.aclose()
+                    await redis.aclose()
+                except Exception:
+                    pass
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 30.0)
+
+    def handle(self, data: str) -> None:
+        """Processa uma mensagem '<node>|<chave>'."""
+        node, _, key = data.partition("|")
+        if node != NODE_ID:
+            self.cache.invalidate(key)
+
+
+def invalidation_message(key: str) -> str:
+    """Mensagem de invalidação da chave ('<node>|<chave>')."""
+    return f"{NODE_ID}|{key}"
+
+
+async def publish_invalidation(redis: Redis, key: str) -> None:
+    """Avisa os demais processos que a chave mudou."""
+    await redis.publish(INVALIDATION_CHANNEL, invalidation_message(key))
+
+
+@lru_cache(maxsize=1)
+def get_local_cache() -> LocalTTLCache:
+    """L1 compartilhado no processo."""
+    return LocalTTLCache(
+        max_entries=settings.CLIMATE_L1_MAX_ENTRIES,
+        max_bytes=settings.CLIMATE_L1_MAX_BYTES,
+        max_ttl=settings.CLIMATE_L1_MAX_TTL,
+    )
+
+
+@lru_cache(maxsize=1)
+def get_invalidation_listener() -> CacheInvalidationListener:
+    """Assinante de invalidação compartilhado no processo."""
+    return CacheInvalidationListener(get_local_cache(), settings.REDIS_URL)
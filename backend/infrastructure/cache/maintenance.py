@@ -0,0 +1,301 @@
+"""
+Manutenção do Redis sem bloquear o servidor.
+
+KEYS percorre o keyspace inteiro numa única operação e trava o Redis
+durante a varredura; aqui as chaves são percorridas com SCAN em lotes
+limitados (SCAN_COUNT) e cada lote é inspecionado/alterado com um único
+pipeline (TTL + MEMORY USAGE, UNLINK, MGET + ZADD).
+
+- Orçamento de tempo por execução: a varredura para ao estourar o prazo
+  e devolve o cursor; a limpeza guarda o cursor no Redis e a próxima
+  execução continua de onde parou
+- Estatísticas com contagem de chaves e bytes reais por fonte
+  (MEMORY USAGE), em vez de len(KEYS)
+
+Uso:
+    report = await cleanup_expiring(redis, "climate:*", min_ttl=3600)
+    stats = await keyspace_stats(redis, "climate:*")
+"""
+
+import time
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+from loguru import logger
+from redis.asyncio import Redis
+
+# Chaves pedidas por iteração do SCAN (dica para o servidor)
+SCAN_COUNT = 500
+
+# Orçamento padrão de uma execução de manutenção (s)
+DEFAULT_TIME_BUDGET = 30.0
+
+# Cursor persistido entre execuções interrompidas pelo orçamento
+CURSOR_KEY = "cache:maintenance:cursor:{name}"
+CURSOR_TTL = 86400
+
+# Segmento da chave (climate:<segmento>:...) → grupo nas estatísticas
+SOURCE_GROUPS = {
+    "nasa": "nasa",
+    "nasa_power": "nasa",
+    "met": "met",
+    "met_norway": "met",
+    "nws": "nws",
+    "nws_usa": "nws",
+    "openmeteo": "openmeteo",
+}
+
+
+class ScanBudget:
+    """
+    Prazo de uma execução de manutenção.
+
+    Attributes:
+        seconds: Orçamento total (s)
+        exhausted: True se a varredura parou por falta de tempo
+    """
+
+    def __init__(self, seconds: float = DEFAULT_TIME_BUDGET):
+        self.seconds = seconds
+        self.started = time.monotonic()
+        self.exhausted = False
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    def expired(self) -> bool:
+        if self.elapsed >= self.seconds:
+            self.exhausted = True
+        return self.exhausted
+
+
+async def scan_batches(
+    redis: Redis,
+    match: str,
+    budget: ScanBudget,
+    cursor: int = 0,
+    count: int = SCAN_COUNT
+) -> AsyncIterator[Tuple[int, List]]:
+    """
+    Percorre as chaves com SCAN, um lote por iteração.
+
+    Para ao fim do keyspace (cursor 0) ou ao estourar o orçamento.
+
+    Yields:
+        Tuple[int, List]: (cursor após o lote, chaves do lote)
+    """
+    while True:
+        cursor, keys = await redis.scan(cursor=cursor, match=match,
+                                        count=count)
+        cursor = int(cursor)
+        yield cursor, keys
+        if cursor == 0 or budget.expired():
+            return
+
+
+async def probe_keys(
+    redis: Redis,
+    keys: List,
+    memory: bool = True
+) -> List[Tuple[int, int]]:
+    """
+    TTL e bytes ocupados de cada chave num único pipeline.
+
+    Returns:
+        List[Tuple[int, int]]: (ttl em s, bytes) por chave; ttl -2 se a
+        chave sumiu entre o SCAN e a sonda
+    """
+    if not keys:
+        return []
+    pipe = redis.pipeline(transaction=False)
+    for key in keys:
+        pipe.ttl(key)
+        if memory:
+            pipe.memory_usage(key)
+    replies = await pipe.execute()
+    if not memory:
+        return [(ttl, 0) for ttl in replies]
+    return [
+        (ttl, size or 0) for ttl, size in zip(replies[0::2], replies[1::2])
+    ]
+
+
+def source_group(key) -> str:
+    """Grupo de estatística da chave (ex: climate:nasa_power:... → nasa)."""
+    if isinstance(key, bytes):
+        key = key.decode("utf-8", "replace")
+    parts = key.split(":")
+    segment = parts[1] if len(parts) > 1 else ""
+    return SOURCE_GROUPS.get(segment, "other")
+
+
+async def _load_cursor(redis: Redis, name: str) -> int:
+    try:
+        return int(await redis.get(CURSOR_KEY.format(name=name)) or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+async def _save_cursor(redis: Redis, name: str, cursor: int) -> None:
+    key = CURSOR_KEY.format(name=name)
+    if cursor:
+        await redis.setex(key, CURSOR_TTL, cursor)
+    else:
+        await redis.delete(key)
+
+
+async def cleanup_expiring(
+    redis: Redis,
+    match: str,
+    min_ttl: int = 3600,
+    time_budget: float = DEFAULT_TIME_BUDGET,
+    count: int = SCAN_COUNT,
+    name: Optional[str] = None
+) -> Dict:
+    """
+    Remove (UNLINK) chaves sem TTL ou com menos de min_ttl segundos.
+
+    Args:
+        redis: Conexão Redis
+        match: Padrão do SCAN (ex: 'climate:*')
+        min_ttl: TTL mínimo para manter a chave (s)
+        time_budget: Orçamento da execução (s)
+        count: Dica de tamanho do lote do SCAN
+        name: Nome do cursor persistido (padrão: o próprio padrão)
+
+    Returns:
+        dict: removed, kept, total_scanned, complete, elapsed_s
+    """
+    name = name or match
+    budget = ScanBudget(time_budget)
+    cursor = await _load_cursor(redis, name)
+    removed = kept = scanned = 0
+
+    async for cursor, keys in scan_batches(redis, match, budget, cursor,
+                                           count):
+        probes = await probe_keys(redis, keys, memory=False)
+        # -2: chave já expirou entre o SCAN e a sonda
+        doomed = [key for key, (ttl, _) in zip(keys, probes)
+                  if ttl != -2 and ttl < min_ttl]
+        if doomed:
+            await redis.unlink(*doomed)
+        scanned += len(keys)
+        removed += len(doomed)
+        kept += len(keys) - len(doomed)
+
+    await _save_cursor(redis, name, cursor)
+    report = {
+        "removed": removed,
+        "kept": kept,
+        "total_scanned": scanned,
+        "complete": cursor == 0,
+        "elapsed_s": round(budget.elapsed, 3),
+    }
+    if cursor:
+        logger.warning(
+            f"⏱️ Limpeza de {match} interrompida pelo orçamento de "
+            f"{time_budget}s; continua na próxima execução"
+        )
+    return report
+
+
+async def delete_matching(
+    redis: Redis,
+    match: str,
+    time_budget: float = DEFAULT_TIME_BUDGET,
+    count: int = SCAN_COUNT
+) -> int:
+    """
+    Remove (UNLINK) todas as chaves do padrão, lote a lote.
+
+    Returns:
+        int: Chaves removidas
+    """
+    budget = ScanBudget(time_budget)
+    removed = 0
+    async for _, keys in scan_batches(redis, match, budget, count=count):
+        if keys:
+            removed += await redis.unlink(*keys)
+    return removed
+
+
+async def keyspace_stats(
+    redis: Redis,
+    match: str = "climate:*",
+    time_budget: float = DEFAULT_TIME_BUDGET,
+    count: int = SCAN_COUNT
+) -> Dict:
+    """
+    Contagem de chaves e memória real por fonte.
+
+    Args:
+        redis: Conexão Redis
+        match: Padrão do SCAN
+        time_budget: Orçamento da execução (s); se estourar, os números
+            são parciais (complete=False)
+        count: Dica de tamanho do lote do SCAN
+
+    Returns:
+        dict: sources {grupo: total_keys, memory_bytes, memory_mb},
+        total_scanned, complete, elapsed_s
+    """
+    budget = ScanBudget(time_budget)
+    sources: Dict[str, Dict] = {
+        group: {"total_keys": 0, "memory_bytes": 0}
+        for group in sorted(set(SOURCE_GROUPS.values()))
+    }
+    scanned = 0
+    cursor = 0
+
+    async for cursor, keys in scan_batches(redis, match, budget,
+                                           count=count):
+        for key, (ttl, size) in zip(keys, await probe_keys(redis, keys)):
+            if ttl == -2:
+                continue
+            group = sources.setdefault(
+                source_group(key), {"total_keys": 0, "memory_bytes": 0}
+            )
+            group["total_keys"] += 1
+            group["memory_bytes"] += size
+        scanned += len(keys)
+
+    for group in sources.values():
+        group["memory_mb"] = round(group["memory_bytes"] / 1024 ** 2, 3)
+
+    return {
+        "sources": sources,
+        "total_scanned": scanned,
+        "complete": cursor == 0,
+        "elapsed_s": round(budget.elapsed, 3),
+    }
+
+
+async def rebuild_ranking(
+    redis: Redis,
+    match: str = "acessos:*",
+    ranking_key: str = "ranking_acessos",
+    time_budget: float = DEFAULT_TIME_BUDGET,
+    count: int = SCAN_COUNT
+) -> int:
+    """
+    Atualiza o ranking (sorted set) a partir dos contadores de acesso.
+
+    Um MGET e um ZADD por lote do SCAN.
+
+    Returns:
+        int: Contadores lidos
+    """
+    budget = ScanBudget(time_budget)
+    total = 0
+    async for _, keys in scan_batches(redis, match, budget, count=count):
+        if not keys:
+            continue
+        values = await redis.mget(keys)
+        scores = {
+            key.decode() if isinstance(key, bytes) else key: int(value)
+            for key, value in zip(keys, values) if value is not None
+        }
+        if scores:
+            await redis.zadd(ranking_key, scores)
+        total += len(scores)
+    return total
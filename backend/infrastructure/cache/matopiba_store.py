@@ -0,0 +1,745 @@
+"""
+Layout Redis das previsões MATOPIBA, um namespace por execução (run).
+
+Chaves de um run:
+    matopiba:run:{run_id}:meta    HASH metadata/validation (JSON) e
+                                  progresso (written, expected, complete)
+    matopiba:run:{run_id}:index   JSON com a ordem das cidades (códigos,
+                                  nomes, UF, coordenadas), dias e variáveis
+    matopiba:run:{run_id}:cities  HASH código → JSON da cidade
+                                  ({"city_info", "forecast"})
+    matopiba:run:{run_id}:arrays  HASH "{variável}|{dia}" → JSON com os
+                                  valores das cidades na ordem do index
+    matopiba:run:{run_id}:payload HASH resposta completa de /forecasts
+                                  pré-codificada (identity, gzip, br) +
+                                  etag e build_seconds
+    matopiba:run:{run_id}:delta   HASH idem, só o que mudou desde o run
+                                  anterior (campo "since")
+    matopiba:run:{run_id}:rasters HASH "{variável}|{dia}" → PNG interpolado
+    matopiba:run:{run_id}:legends HASH "{variável}|{dia}" → JSON legenda
+                                  (bounds, vmin, vmax, cores)
+    matopiba:run:latest           run_id publicado (sem TTL)
+    matopiba:run:previous         run publicado antes do latest
+    matopiba:run:building         run em gravação (ainda não publicado)
+
+Leitores buscam só o que precisam (HGET de uma cidade, um array de
+variável/dia) e só enxergam runs completos: o escritor grava o run
+novo em chaves próprias (progresso em meta, visível via 'building') e
+só então publica, trocando 'latest' com um GETSET (double buffering).
+O run anterior continua intacto até a troca e é mantido como
+'previous'; o de antes dele é apagado. Runs vivem RUN_RETENTION_SECONDS
+(bem mais que o intervalo da task), então um atraso da task serve o run
+antigo stale em vez de 503.
+
+Uso:
+    store = MatopibaRunStore(redis)
+    store.write_run(run_id, results, metadata, validation, ttl)  # publica
+
+    run_id = store.latest_run()
+    store.cities(run_id, ["1700251"])
+    store.array(run_id, "ETo_EVAonline", "2025-10-09")
+
+    index = store.index(run_id)
+    positions = select_positions(index, ufs=["TO"])
+    store.arrays(run_id, [array_field("ETo_EVAonline", "2025-10-09")])
+"""
+
+import gzip
+import hashlib
+import json
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from loguru import logger
+from redis import Redis
+from redis.exceptions import WatchError
+
+from backend.infrastructure.cache.revalidation import REFRESH_LOCK_KEY
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:  # em requirements.txt; sem ele, só gzip/identity
+    BROTLI_AVAILABLE = False
+
+LATEST_KEY = "matopiba:run:latest"
+PREVIOUS_KEY = "matopiba:run:previous"
+BUILDING_KEY = "matopiba:run:building"
+RUN_KEY = "matopiba:run:{run_id}:{part}"
+
+# Lock da atualização do run: tomado pela rota (renovação) e pela task
+# (beat, manual); o valor é o id da task dona
+REFRESH_LOCK = REFRESH_LOCK_KEY.format(key="matopiba:run")
+# A task leva minutos: o lock dura mais que o de chaves climate:*
+REFRESH_LOCK_TTL = 15 * 60
+
+# Partes de um run (apagadas juntas)
+RUN_PARTS = ("meta", "index", "cities", "arrays", "payload", "delta",
+             "rasters", "legends")
+
+# Vida de um run no Redis: cobre vários ciclos de 6h perdidos
+RUN_RETENTION_SECONDS = 48 * 3600
+
+# Cidades por pipeline de escrita (e por atualização de progresso)
+WRITE_CHUNK = 50
+
+# Codificações pré-calculadas, em ordem de preferência
+PAYLOAD_ENCODINGS = ("br", "gzip", "identity")
+# Campos de cada resposta pré-codificada além das variantes
+PART_FIELDS = {"payload": ("etag", "build_seconds"),
+               "delta": ("etag", "since")}
+
+# Casas decimais das coordenadas no index
+COORD_DECIMALS = 5
+
+# Variação mínima (absoluta) para um valor numérico entrar no delta
+DELTA_TOLERANCE = 0.05
+
+
+def run_key(run_id: str, part: str) -> str:
+    return RUN_KEY.format(run_id=run_id, part=part)
+
+
+def new_run_id(started_at: datetime) -> str:
+    """Identificador do run (ordenável), ex: 20251009T060000."""
+    return started_at.strftime("%Y%m%dT%H%M%S")
+
+
+def array_field(variable: str, day: str) -> str:
+    return f"{variable}|{day}"
+
+
+def _text(value: Any) -> Optional[str]:
+    if isinstance(value, bytes):
+        return value.decode()
+    return value
+
+
+def _coord(value: Optional[float]) -> Optional[float]:
+    # 5 casas (~1 m) bastam para o mapa e encurtam o index
+    return round(value, COORD_DECIMALS) if value is not None else None
+
+
+def build_arrays(
+    results: Dict[str, Dict[str, Any]]
+) -> Tuple[Dict[str, Any], Dict[str, List[Any]]]:
+    """
+    Index e arrays por variável/dia a partir das previsões por cidade.
+
+    Args:
+        results: {código: {"city_info": {...}, "forecast": {dia: {...}}}}
+
+    Returns:
+        Tuple: (index, {"{variável}|{dia}": valores na ordem do index});
+        cidades sem o valor recebem None
+    """
+    codes = sorted(results)
+    dates = sorted({day for city in results.values()
+                    for day in city.get("forecast", {})})
+    variables = sorted({
+        var
+        for city in results.values()
+        for values in city.get("forecast", {}).values()
+        for var, value in values.items()
+        if isinstance(value, (int, float)) and not isinstance(value, bool)
+    })
+
+    arrays = {
+        array_field(var, day): [None] * len(codes)
+        for var in variables for day in dates
+    }
+    for i, code in enumerate(codes):
+        for day, values in results[code].get("forecast", {}).items():
+            for var in variables:
+                if var in values:
+                    arrays[array_field(var, day)][i] = values[var]
+
+    infos = [results[code].get("city_info", {}) for code in codes]
+    index = {
+        "codes": codes,
+        "names": [info.get("name") for info in infos],
+        "uf": [info.get("uf") for info in infos],
+        "lat": [_coord(info.get("latitude")) for info in infos],
+        "lon": [_coord(info.get("longitude")) for info in infos],
+        "dates": dates,
+        "variables": variables,
+    }
+    return index, arrays
+
+
+def select_positions(
+    index: Dict[str, Any],
+    ufs: Optional[Iterable[str]] = None,
+    codes: Optional[Iterable[str]] = None,
+    bbox: Optional[Tuple[float, float, float, float]] = None
+) -> List[int]:
+    """
+    Posições (na ordem do index) das cidades que passam nos filtros.
+
+    Args:
+        ufs: Estados (ex: ["TO", "MA"])
+        codes: Códigos IBGE
+        bbox: (oeste, sul, leste, norte) em graus
+
+    Returns:
+        List[int]: Posições; filtros None não restringem
+    """
+    ufs = {uf.upper() for uf in ufs} if ufs is not None else None
+    codes = set(codes) if codes is not None else None
+    positions = []
+    for i, code in enumerate(index["codes"]):
+        if ufs is not None and (index["uf"][i] or "").upper() not in ufs:
+            continue
+        if codes is not None and code not in codes:
+            continue
+        if bbox is not None:
+            west, south, east, north = bbox
+            lat, lon = index["lat"][i], index["lon"][i]
+            if lat is None or lon is None or not (
+                    south <= lat <= north and west <= lon <= east):
+                continue
+        positions.append(i)
+    return positions
+
+
+def encode_payload(payload: Dict[str, Any]) -> Dict[str, bytes]:
+    """
+    Codifica a resposta uma vez por run.
+
+    Returns:
+        dict: {"identity", "gzip", "br" (se brotli instalado), "etag"}
+    """
+    raw = json.dumps(payload, ensure_ascii=False, default=str).encode()
+    variants = {
+        "identity": raw,
+        # mtime=0: mesmos bytes para o mesmo conteúdo
+        "gzip": gzip.compress(raw, compresslevel=9, mtime=0),
+        "etag": f'"{hashlib.sha256(raw).hexdigest()[:32]}"'.encode(),
+    }
+    if BROTLI_AVAILABLE:
+        variants["br"] = brotli.compress(raw, quality=11)
+    return variants
+
+
+def variant_etag(etag: Optional[str],
+                 encoding: Optional[str]) -> Optional[str]:
+    """
+    ETag de uma variante pré-codificada.
+
+    Os bytes de br/gzip diferem dos de identity, então cada variante tem
+    seu ETag forte: o do conteúdo com o sufixo da codificação.
+    """
+    if not etag or encoding in (None, "identity"):
+        return etag
+    return f'{etag[:-1]}-{encoding}"'
+
+
+def _encodings(accepted: Iterable[str]) -> List[str]:
+    """Variantes aceitas, em ordem de preferência ("identity" sempre)."""
+    accepted = set(accepted) | {"identity"}
+    return [e for e in PAYLOAD_ENCODINGS if e in accepted]
+
+
+def _best_variant(
+    encodings: List[str],
+    values: List[Optional[bytes]]
+) -> Tuple[Optional[str], Optional[bytes]]:
+    for encoding, body in zip(encodings, values):
+        if body is not None:
+            return encoding, body
+    return None, None
+
+
+def _parse_meta(raw: Dict[Any, Any]) -> Optional[Dict[str, Any]]:
+    if not raw:
+        return None
+    raw = {_text(k): _text(v) for k, v in raw.items()}
+    return {
+        "metadata": json.loads(raw.get("metadata") or "{}"),
+        "validation": json.loads(raw.get("validation") or "{}"),
+        "progress": {
+            "written": int(raw.get("written", 0)),
+            "expected": int(raw.get("expected", 0)),
+            "complete": raw.get("complete") == "1",
+        },
+        "published_at": (float(raw["published_at"])
+                         if raw.get("published_at") else None),
+    }
+
+
+def _changed(old: Any, new: Any, tolerance: float) -> bool:
+    numbers = (int, float)
+    if (isinstance(old, numbers) and isinstance(new, numbers)
+            and not isinstance(old, bool) and not isinstance(new, bool)):
+        return abs(new - old) > tolerance
+    return old != new
+
+
+def diff_runs(
+    old: Dict[str, Dict[str, Any]],
+    new: Dict[str, Dict[str, Any]],
+    tolerance: float = DELTA_TOLERANCE
+) -> Dict[str, Any]:
+    """
+    O que mudou entre dois runs.
+
+    Args:
+        old, new: {código: {"city_info", "forecast": {dia: {var: valor}}}}
+        tolerance: Variação numérica ignorada (<=)
+
+    Returns:
+        dict: {"changed": {código: cidade parcial}, "removed": [códigos],
+        "removed_days": [dias]}; cidade parcial tem só os dias/variáveis
+        alterados (cidade nova vem inteira; city_info só se mudou)
+    """
+    changed = {}
+    for code in sorted(new):
+        city, before = new[code], old.get(code)
+        if before is None:
+            changed[code] = city
+            continue
+        partial: Dict[str, Any] = {}
+        if city.get("city_info") != before.get("city_info"):
+            partial["city_info"] = city.get("city_info")
+        old_days = before.get("forecast", {})
+        forecast = {}
+        for day, values in city.get("forecast", {}).items():
+            old_values = old_days.get(day, {})
+            diff = {
+                var: value for var, value in values.items()
+                if var not in old_values
+                or _changed(old_values[var], value, tolerance)
+            }
+            if diff:
+                forecast[day] = diff
+        if forecast:
+            partial["forecast"] = forecast
+        if partial:
+            changed[code] = partial
+
+    new_days = {day for city in new.values()
+                for day in city.get("forecast", {})}
+    return {
+        "changed": changed,
+        "removed": sorted(set(old) - set(new)),
+        "removed_days": sorted({day for city in old.values()
+                                for day in city.get("forecast", {})}
+                               - new_days),
+    }
+
+
+class MatopibaRunStore:
+    """
+    Leitura e escrita de runs MATOPIBA (Redis síncrono).
+
+    Attributes:
+        redis: Conexão Redis (decode_responses indiferente)
+    """
+
+    def __init__(self, redis: Redis):
+        self.redis = redis
+
+    # ------------------------------------------------------------------
+    # Escrita
+    # ------------------------------------------------------------------
+
+    def begin_run(
+        self,
+        run_id: str,
+        index: Dict[str, Any],
+        metadata: Dict[str, Any],
+        validation: Dict[str, Any],
+        ttl: int
+    ) -> None:
+        """Cria meta/index do run e o marca como 'building'."""
+        meta = run_key(run_id, "meta")
+        pipe = self.redis.pipeline(transaction=True)
+        pipe.delete(meta)
+        pipe.hset(meta, mapping={
+            "metadata": json.dumps(metadata, ensure_ascii=False,
+                                   default=str),
+            "validation": json.dumps(validation, default=str),
+            "written": 0,
+            "expected": len(index["codes"]),
+            "complete": 0,
+        })
+        pipe.expire(meta, ttl)
+        pipe.setex(run_key(run_id, "index"), ttl,
+                   json.dumps(index, ensure_ascii=False))
+        pipe.setex(BUILDING_KEY, ttl, run_id)
+        pipe.execute()
+
+    def write_cities(
+        self,
+        run_id: str,
+        cities: Dict[str, Dict[str, Any]],
+        ttl: int
+    ) -> None:
+        """Grava um lote de cidades e soma ao progresso do run."""
+        key = run_key(run_id, "cities")
+        pipe = self.redis.pipeline(transaction=True)
+        pipe.hset(key, mapping={
+            code: json.dumps(city, ensure_ascii=False, default=str)
+            for code, city in cities.items()
+        })
+        pipe.expire(key, ttl)
+        pipe.hincrby(run_key(run_id, "meta"), "written", len(cities))
+        pipe.execute()
+
+    def write_payload(
+        self,
+        run_id: str,
+        variants: Dict[str, bytes],
+        ttl: int,
+        part: str = "payload",
+        **fields: Any
+    ) -> None:
+        """
+        Grava uma resposta pré-codificada (ver encode_payload).
+
+        Args:
+            part: "payload" (resposta completa) ou "delta"
+            fields: Campos extras (build_seconds, since)
+        """
+        key = run_key(run_id, part)
+        pipe = self.redis.pipeline(transaction=True)
+        pipe.delete(key)
+        pipe.hset(key, mapping={**variants, **fields})
+        pipe.expire(key, ttl)
+        pipe.execute()
+
+    def write_rasters(
+        self,
+        run_id: str,
+        rasters: Dict[str, Tuple[bytes, Dict[str, Any]]],
+        ttl: int
+    ) -> None:
+        """Grava PNG e legenda por variável/dia (ver matopiba_raster)."""
+        if not rasters:
+            return
+        pipe = self.redis.pipeline(transaction=True)
+        pipe.hset(run_key(run_id, "rasters"), mapping={
+            field: png for field, (png, _) in rasters.items()
+        })
+        pipe.hset(run_key(run_id, "legends"), mapping={
+            field: json.dumps(legend) for field, (_, legend) in rasters.items()
+        })
+        for part in ("rasters", "legends"):
+            pipe.expire(run_key(run_id, part), ttl)
+        pipe.execute()
+
+    def write_arrays(
+        self,
+        run_id: str,
+        arrays: Dict[str, List[Any]],
+        ttl: int
+    ) -> None:
+        """Grava os arrays por variável/dia e marca o run como completo."""
+        key = run_key(run_id, "arrays")
+        pipe = self.redis.pipeline(transaction=True)
+        if arrays:
+            pipe.hset(key, mapping={
+                field: json.dumps(values) for field, values in arrays.items()
+            })
+            pipe.expire(key, ttl)
+        pipe.hset(run_key(run_id, "meta"), "complete", 1)
+        pipe.execute()
+
+    def write_run(
+        self,
+        run_id: str,
+        results: Dict[str, Dict[str, Any]],
+        metadata: Dict[str, Any],
+        validation: Dict[str, Any],
+        ttl: int,
+        chunk: int = WRITE_CHUNK,
+        rasters: Optional[Dict[str, Tuple[bytes, Dict[str, Any]]]] = None
+    ) -> Dict[str, Any]:
+        """
+        Grava um run completo: meta/index, cidades em lotes, resposta
+        pré-codificada, delta desde o run publicado, rasters (opcionais)
+        e arrays.
+
+        Returns:
+            dict: Index do run
+        """
+        index, arrays = build_arrays(results)
+        self.begin_run(run_id, index, metadata, validation, ttl)
+        codes = index["codes"]
+        for start in range(0, len(codes), chunk):
+            batch = codes[start:start + chunk]
+            self.write_cities(run_id, {c: results[c] for c in batch}, ttl)
+            logger.debug(
+                f"MATOPIBA {run_id}: {start + len(batch)}/{len(codes)} "
+                f"cidades gravadas"
+            )
+        run_metadata = {
+            **metadata,
+            "run_id": run_id,
+            "progress": {"written": len(codes), "expected": len(codes),
+                         "complete": True},
+        }
+        payload = {
+            "forecasts": {code: results[code] for code in codes},
+            "validation": validation,
+            "metadata": run_metadata,
+        }
+        self.write_payload(run_id, encode_payload(payload), ttl,
+                           build_seconds=metadata.get("build_seconds", 0.0))
+
+        # Delta desde o run ainda publicado (clientes com ?since=)
+        since = self.latest_run()
+        if since and since != run_id:
+            delta = {
+                "run_id": run_id,
+                "since": since,
+                "tolerance": DELTA_TOLERANCE,
+                **diff_runs(self.cities(since), results),
+                "validation": validation,
+                "metadata": run_metadata,
+            }
+            self.write_payload(run_id, encode_payload(delta), ttl,
+                               part="delta", since=since)
+            logger.debug(
+                f"MATOPIBA {run_id}: delta desde {since} com "
+                f"{len(delta['changed'])} cidades alteradas"
+            )
+        self.write_rasters(run_id, rasters or {}, ttl)
+        self.write_arrays(run_id, arrays, ttl)
+        self.publish(run_id)
+        return index
+
+    def publish(self, run_id: str) -> Optional[str]:
+        """
+        Publica um run completo: troca atômica de 'latest'.
+
+        O latest anterior vira 'previous' e o previous anterior é apagado.
+
+        Returns:
+            Optional[str]: Run que estava publicado (None se nenhum)
+        """
+        pipe = self.redis.pipeline(transaction=True)
+        pipe.hset(run_key(run_id, "meta"), "published_at", time.time())
+        pipe.getset(LATEST_KEY, run_id)
+        pipe.get(PREVIOUS_KEY)
+        _, replaced, dropped = pipe.execute()
+        replaced, dropped = _text(replaced), _text(dropped)
+
+        pipe = self.redis.pipeline(transaction=True)
+        if replaced and replaced != run_id:
+            pipe.set(PREVIOUS_KEY, replaced)
+        if dropped and dropped not in (run_id, replaced):
+            pipe.delete(*[run_key(dropped, part) for part in RUN_PARTS])
+        if _text(self.redis.get(BUILDING_KEY)) == run_id:
+            pipe.delete(BUILDING_KEY)
+        pipe.execute()
+        logger.info(f"MATOPIBA run {run_id} publicado (anterior: {replaced})")
+        return replaced
+
+    # ------------------------------------------------------------------
+    # Lock de atualização
+    # ------------------------------------------------------------------
+
+    def acquire_refresh(self, token: str,
+                        ttl: int = REFRESH_LOCK_TTL) -> bool:
+        """
+        Toma o lock de atualização para token.
+
+        Se o lock já é de token (ex: tomado pela rota para esta task, ou
+        retry da mesma task), apenas renova o TTL.
+
+        Returns:
+            bool: True se o lock é de token
+        """
+        if self.redis.set(REFRESH_LOCK, token, nx=True, ex=ttl):
+            return True
+        if _text(self.redis.get(REFRESH_LOCK)) != token:
+            return False
+        return bool(self.redis.expire(REFRESH_LOCK, ttl))
+
+    def release_refresh(self, token: str) -> bool:
+        """
+        Libera o lock só se ele ainda é de token (compare-and-delete).
+
+        Returns:
+            bool: True se o lock foi apagado
+        """
+        with self.redis.pipeline(transaction=True) as pipe:
+            try:
+                pipe.watch(REFRESH_LOCK)
+                if _text(pipe.get(REFRESH_LOCK)) != token:
+                    return False
+                pipe.multi()
+                pipe.delete(REFRESH_LOCK)
+                pipe.execute()
+                return True
+            except WatchError:
+                return False
+
+    # ------------------------------------------------------------------
+    # Leitura
+    # ------------------------------------------------------------------
+
+    def latest_run(self) -> Optional[str]:
+        return _text(self.redis.get(LATEST_KEY))
+
+    def building_run(self) -> Optional[str]:
+        return _text(self.redis.get(BUILDING_KEY))
+
+    def meta(self, run_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Metadata, validação, progresso e publicação do run.
+
+        Returns:
+            dict: {"metadata", "validation", "progress", "published_at"}
+            ou None; published_at (epoch) é None se não publicado
+        """
+        return _parse_meta(self.redis.hgetall(run_key(run_id, "meta")))
+
+    def ttl(self, run_id: str) -> int:
+        return self.redis.ttl(run_key(run_id, "meta"))
+
+    def index(self, run_id: str) -> Optional[Dict[str, Any]]:
+        raw = self.redis.get(run_key(run_id, "index"))
+        return json.loads(raw) if raw else None
+
+    def cities(
+        self,
+        run_id: str,
+        codes: Optional[Iterable[str]] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Previsões por cidade (todas, ou só os códigos pedidos).
+
+        Códigos inexistentes são omitidos.
+        """
+        key = run_key(run_id, "cities")
+        if codes is None:
+            raw = self.redis.hgetall(key)
+            return {_text(code): json.loads(city)
+                    for code, city in sorted(raw.items())}
+        codes = list(codes)
+        if not codes:
+            return {}
+        values = self.redis.hmget(key, codes)
+        return {code: json.loads(city)
+                for code, city in zip(codes, values) if city}
+
+    def payload_info(self, run_id: str) -> Tuple[Optional[str], float]:
+        """ETag e build_seconds da resposta pré-codificada (None: ausente)."""
+        etag, build = self.redis.hmget(run_key(run_id, "payload"),
+                                       ["etag", "build_seconds"])
+        return _text(etag), float(build or 0.0)
+
+    def delta_info(self, run_id: str) -> Tuple[Optional[str], Optional[str]]:
+        """ETag e run de base ("since") do delta (None: sem delta)."""
+        etag, since = self.redis.hmget(run_key(run_id, "delta"),
+                                       ["etag", "since"])
+        return _text(etag), _text(since)
+
+    def payload(
+        self,
+        run_id: str,
+        accepted: Iterable[str],
+        part: str = "payload"
+    ) -> Tuple[Optional[str], Optional[bytes]]:
+        """
+        Melhor variante pré-codificada aceita pelo cliente.
+
+        Args:
+            accepted: Codificações aceitas ("identity" sempre é aceita)
+            part: "payload" ou "delta"
+
+        Returns:
+            Tuple: (codificação, bytes) ou (None, None) se ausente
+        """
+        encodings = _encodings(accepted)
+        return _best_variant(
+            encodings, self.redis.hmget(run_key(run_id, part), encodings)
+        )
+
+    def read_run(
+        self,
+        run_id: str,
+        parts: Iterable[str] = (),
+        accepted: Optional[Iterable[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Meta, TTL e respostas pré-codificadas do run num único pipeline.
+
+        De cada parte, um HMGET traz os campos de PART_FIELDS e as
+        variantes aceitas; só a melhor presente é devolvida.
+
+        Args:
+            parts: "payload" e/ou "delta"
+            accepted: Codificações aceitas (None: só os campos, sem bytes)
+
+        Returns:
+            dict: {"meta": ver meta(), "ttl": int, parte: {campos...,
+            "encoding", "body", "etag" (da variante, ver variant_etag)}}
+        """
+        parts = list(parts)
+        encodings = _encodings(accepted) if accepted is not None else []
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.hgetall(run_key(run_id, "meta"))
+        pipe.ttl(run_key(run_id, "meta"))
+        for part in parts:
+            pipe.hmget(run_key(run_id, part),
+                       [*PART_FIELDS[part], *encodings])
+        raw_meta, ttl, *replies = pipe.execute()
+
+        snapshot = {"meta": _parse_meta(raw_meta), "ttl": ttl}
+        for part, values in zip(parts, replies):
+            n_fields = len(PART_FIELDS[part])
+            info = {field: _text(value) for field, value
+                    in zip(PART_FIELDS[part], values[:n_fields])}
+            encoding, body = _best_variant(encodings, values[n_fields:])
+            info.update(encoding=encoding, body=body,
+                        etag=variant_etag(info["etag"], encoding))
+            snapshot[part] = info
+        return snapshot
+
+    def array(
+        self,
+        run_id: str,
+        variable: str,
+        day: str
+    ) -> Optional[List[Any]]:
+        """Valores de uma variável/dia, na ordem do index."""
+        raw = self.redis.hget(run_key(run_id, "arrays"),
+                              array_field(variable, day))
+        return json.loads(raw) if raw else None
+
+    def arrays(
+        self,
+        run_id: str,
+        fields: List[str]
+    ) -> Dict[str, Optional[List[Any]]]:
+        """Vários arrays "{variável}|{dia}" num HMGET (None: ausente)."""
+        if not fields:
+            return {}
+        values = self.redis.hmget(run_key(run_id, "arrays"), fields)
+        return {field: json.loads(raw) if raw else None
+                for field, raw in zip(fields, values)}
+
+    def raster(self, run_id: str, variable: str, day: str) -> Optional[bytes]:
+        """PNG interpolado de uma variável/dia."""
+        return self.redis.hget(run_key(run_id, "rasters"),
+                               array_field(variable, day))
+
+    def has_raster(self, run_id: str, variable: str, day: str) -> bool:
+        """Se o run tem raster da variável/dia (HEXISTS, sem o PNG)."""
+        return bool(self.redis.hexists(run_key(run_id, "rasters"),
+                                       array_field(variable, day)))
+
+    def legend(
+        self,
+        run_id: str,
+        variable: str,
+        day: str
+    ) -> Optional[Dict[str, Any]]:
+        """Legenda do raster de uma variável/dia."""
+        raw = self.redis.hget(run_key(run_id, "legends"),
+                              array_field(variable, day))
+        return json.loads(raw) if raw else None
@@ -0,0 +1,131 @@
+"""
+Popularidade de localizações com decaimento temporal.
+
+Cada requisição real (cálculo de ETo, por exemplo) incrementa a célula
+nativa da fonte num sorted set do Redis. O decaimento é "forward decay":
+o incremento vale 2 ** ((agora - DECAY_EPOCH) / meia-vida), então uma
+requisição de uma meia-vida atrás pesa metade de uma requisição de
+agora sem nunca reescrever os scores antigos. Em float64 isso comporta
+~1000 meias-vidas (~19 anos com a meia-vida padrão de 7 dias).
+
+O pre-fetch usa top() para aquecer as células mais pedidas.
+
+Chave: popularity:{source} (fora de 'climate:*', que a limpeza varre)
+Membro: "{lat}:{lon}" da célula (ver source_grid.snap_coordinates)
+
+Uso:
+    tracker = get_popularity_tracker()
+    await tracker.record(-15.79, -47.88)
+    cells = await tracker.top(100)   # [{"lat", "lon", "score"}, ...]
+"""
+
+import time
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+from loguru import logger
+from redis.asyncio import Redis
+
+from backend.api.services.source_grid import snap_coordinates
+from config.settings.app_settings import get_settings
+
+POPULARITY_KEY = "popularity:{source}"
+DEFAULT_SOURCE = "nasa_power"
+
+DECAY_EPOCH = datetime(2025, 1, 1, tzinfo=timezone.utc).timestamp()
+HALF_LIFE_SECONDS = 7 * 86400
+
+# Células mantidas no ranking (as menos populares são descartadas)
+MAX_CELLS = 20000
+
+
+class PopularityTracker:
+    """
+    Ranking de células por requisições com decaimento exponencial.
+
+    Attributes:
+        redis: Conexão Redis assíncrona
+        source: Fonte cuja grade nativa define as células
+        half_life: Meia-vida do peso de uma requisição (s)
+        max_cells: Tamanho máximo do ranking
+    """
+
+    def __init__(
+        self,
+        redis: Redis,
+        source: str = DEFAULT_SOURCE,
+        half_life: float = HALF_LIFE_SECONDS,
+        max_cells: int = MAX_CELLS
+    ):
+        self.redis = redis
+        self.source = source
+        self.half_life = half_life
+        self.max_cells = max_cells
+        self.key = POPULARITY_KEY.format(source=source)
+
+    def _weight(self, now: Optional[float] = None) -> float:
+        """Peso de uma requisição feita em 'now'."""
+        now = time.time() if now is None else now
+        return 2.0 ** ((now - DECAY_EPOCH) / self.half_life)
+
+    def cell(self, lat: float, lon: float) -> str:
+        """Membro do sorted set para o ponto (célula nativa)."""
+        lat, lon = snap_coordinates(self.source, lat, lon)
+        return f"{lat}:{lon}"
+
+    async def record(
+        self,
+        lat: float,
+        lon: float,
+        now: Optional[float] = None
+    ) -> None:
+        """
+        Registra uma requisição no ponto (1 round-trip).
+
+        Falhas são apenas registradas em log: popularidade nunca deve
+        derrubar a requisição do usuário.
+        """
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.zincrby(self.key, self._weight(now), self.cell(lat, lon))
+            pipe.zremrangebyrank(self.key, 0, -(self.max_cells + 1))
+            await pipe.execute()
+        except Exception as e:
+            logger.warning(f"⚠️ Falha ao registrar popularidade: {e}")
+
+    async def top(
+        self,
+        n: int,
+        now: Optional[float] = None
+    ) -> List[Dict[str, float]]:
+        """
+        Células mais populares.
+
+        Args:
+            n: Quantidade de células
+            now: Instante de referência (padrão: agora)
+
+        Returns:
+            List[Dict]: {"lat", "lon", "score"}, score em requisições
+            equivalentes de agora, em ordem decrescente
+        """
+        entries = await self.redis.zrevrange(self.key, 0, n - 1,
+                                             withscores=True)
+        weight = self._weight(now)
+        cells = []
+        for member, score in entries:
+            if isinstance(member, bytes):
+                member = member.decode()
+            lat, lon = member.split(":")
+            cells.append({"lat": float(lat), "lon": float(lon),
+                          "score": score / weight})
+        return cells
+
+
+@lru_cache(maxsize=1)
+def get_popularity_tracker() -> PopularityTracker:
+    """Tracker compartilhado do processo da API (um event loop)."""
+    redis = Redis.from_url(get_settings().REDIS_URL, decode_responses=False,
+                           socket_connect_timeout=1, socket_timeout=1)
+    return PopularityTracker(redis)
@@ -4,15 +4,56 @@ from sqlalchemy.orm import Session
 from loguru import logger
 from datetime import datetime, timedelta
 import json
-from typing import Optional, Dict, Any
-from backend.api.main import CACHE_HITS, CACHE_MISSES, POPULAR_DATA_ACCESSES
+from typing import Optional, Dict, Any, Iterable
+from backend.api.middleware.prometheus_metrics import (
+    CACHE_HITS, CACHE_MISSES, POPULAR_DATA_ACCESSES)
+from backend.api.services.source_grid import (FALLBACK_DECIMALS,
+                                              get_native_grid,
+                                              snap_coordinates)
+from backend.infrastructure.cache.hot_keys import get_hot_keys
+
+ETO_RESULT_KEY = (
+    "eto:result:{version}:{sources}:{lat}:{lon}:{start}:{end}:{elevation}"
+)
+# ETo quase não varia com a elevação dentro de 10 m (pressão ~0.1%)
+ELEVATION_BUCKET_M = 10
+
+
+def eto_result_key(
+    sources: Iterable[str],
+    lat: float,
+    lon: float,
+    start: str,
+    end: str,
+    elevation: float,
+    version: str
+) -> str:
+    """
+    Chave do resultado final de ETo.
+
+    A localização é ajustada à grade mais fina do conjunto de fontes
+    (mesma célula → mesmos dados de entrada) e a elevação a faixas de
+    ELEVATION_BUCKET_M metros.
+    """
+    sources = sorted(set(sources))
+
+    def step(source: str) -> float:
+        grid = get_native_grid(source)
+        return grid.lat_step if grid else 10 ** -FALLBACK_DECIMALS
+
+    lat, lon = snap_coordinates(min(sources, key=step), lat, lon)
+    bucket = int(round(elevation / ELEVATION_BUCKET_M)) * ELEVATION_BUCKET_M
+    return ETO_RESULT_KEY.format(
+        version=version, sources="+".join(sources), lat=lat, lon=lon,
+        start=start, end=end, elevation=bucket
+    )
 
 
 class CacheManager:
     def __init__(
         self,
         redis_client: Redis,
-        db_session: Session,
+        db_session: Optional[Session] = None,
         eto_expiry: int = 86400,
         user_data_expiry: int = 2592000,
     ):
@@ -25,25 +66,39 @@ class CacheManager:
         data = await self._get_from_redis(key)
         if data:
             logger.info(f"Cache hit para key: {key}")
-            CACHE_HITS.labels(key=key).inc()
-            POPULAR_DATA_ACCESSES.labels(key=key).inc()
+            CACHE_HITS.labels(source="eto", tier="redis").inc()
+            POPULAR_DATA_ACCESSES.labels(source="eto").inc()
+            get_hot_keys().add(key, "hit")
             return data
 
+        CACHE_MISSES.labels(source="eto").inc()
+        get_hot_keys().add(key, "miss")
+        # Sem sessão: cache apenas em Redis
+        if self.db is None:
+            logger.info(f"Cache miss para key: {key}")
+            return None
+
         logger.info(f"Cache miss para key: {key}, buscando no PostgreSQL")
-        CACHE_MISSES.labels(key=key).inc()
         data = await self._get_from_postgres(key)
         if data:
             await self._set_in_redis(key, data, self.eto_expiry)
-            POPULAR_DATA_ACCESSES.labels(key=key).inc()
+            CACHE_HITS.labels(source="eto", tier="postgres").inc()
+            POPULAR_DATA_ACCESSES.labels(source="eto").inc()
             return data
         return None
 
-    async def save_eto_data(self, key: str, data: Dict[str, Any]):
+    async def save_eto_data(
+        self,
+        key: str,
+        data: Dict[str, Any],
+        expiry: Optional[int] = None
+    ):
         try:
-            await self._set_in_redis(key, data, self.eto_expiry)
-            await self._save_to_postgres(key, data)
+            await self._set_in_redis(key, data, expiry or self.eto_expiry)
+            if self.db is not None:
+                await self._save_to_postgres(key, data)
             logger.info(f"Dados salvos com sucesso para key: {key}")
-            POPULAR_DATA_ACCESSES.labels(key=key).inc()
+            POPULAR_DATA_ACCESSES.labels(source="eto").inc()
         except Exception as e:
             logger.error(f"Erro ao salvar dados: {str(e)}")
             raise
@@ -58,7 +113,7 @@ class CacheManager:
 
     async def _set_in_redis(self, key: str, data: Dict[str, Any], expiry: int):
         try:
-            await self.redis.setex(key, expiry, json.dumps(data))
+            await self.redis.setex(key, expiry, json.dumps(data, default=str))
         except Exception as e:
             logger.error(f"Erro ao salvar no Redis: {str(e)}")
             raise
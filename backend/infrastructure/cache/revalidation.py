@@ -0,0 +1,112 @@
+"""
+Stale-while-revalidate com renovação antecipada probabilística (XFetch).
+
+Cada entrada tem dois prazos:
+- soft TTL: até aqui o dado é fresco; gravado com a entrada (a leitura
+  usa o da escrita, não um recalculado)
+- hard TTL: TTL real no Redis = soft * (1 + STALE_GRACE_FACTOR); entre
+  os dois o dado é servido "stale" enquanto uma renovação roda em
+  segundo plano
+
+Renovação antecipada (Vattani et al., "Optimal Probabilistic Cache
+Stampede Prevention"): um leitor dispara a renovação antes do soft TTL
+com probabilidade crescente conforme ele se aproxima:
+
+    renovar se  -delta * beta * ln(U) >= frescor restante,  U ~ (0, 1]
+
+onde delta é o tempo típico de recomputação. Chaves quentes são
+renovadas antes de expirar; chaves frias raramente.
+
+Um lock curto no Redis (SET NX EX) garante uma renovação por chave
+entre processos.
+
+Uso:
+    soft = 3600
+    payload = encode(data, soft_ttl=soft)
+    redis.setex(key, hard_ttl(soft), payload)
+    left = freshness(remaining_ttl, stored_soft_ttl(payload))
+    if left <= 0 or should_refresh_early(left, delta):
+        ...renova em segundo plano
+"""
+
+import math
+import random
+import threading
+from typing import Callable, Dict, Optional
+
+# Janela stale = fração do soft TTL
+STALE_GRACE_FACTOR = 0.5
+
+# beta > 1 antecipa mais; beta < 1, menos
+XFETCH_BETA = 1.0
+
+# Lock de renovação (uma por chave entre processos)
+REFRESH_LOCK_KEY = "refresh:lock:{key}"
+REFRESH_LOCK_TTL = 60
+
+
+def hard_ttl(soft_ttl: float) -> int:
+    """TTL real no Redis para um soft TTL."""
+    return int(soft_ttl * (1 + STALE_GRACE_FACTOR))
+
+
+def freshness(remaining_ttl: Optional[float], soft_ttl: float) -> Optional[float]:
+    """
+    Segundos de frescor restantes (<= 0: stale).
+
+    Args:
+        remaining_ttl: TTL restante no Redis (s); None/negativo = sem TTL
+        soft_ttl: Soft TTL gravado com a entrada (s)
+
+    Returns:
+        Optional[float]: None se a entrada não tem TTL conhecido
+    """
+    if remaining_ttl is None or remaining_ttl < 0:
+        return None
+    return remaining_ttl - (hard_ttl(soft_ttl) - soft_ttl)
+
+
+def should_refresh_early(
+    fresh_left: float,
+    delta: float,
+    beta: float = XFETCH_BETA,
+    rand: Callable[[], float] = random.random
+) -> bool:
+    """
+    Decisão XFetch de renovar antes do soft TTL.
+
+    Args:
+        fresh_left: Frescor restante (s)
+        delta: Tempo típico de recomputação (s)
+        beta: Agressividade da antecipação
+        rand: Fonte de aleatoriedade em [0, 1)
+    """
+    if fresh_left <= 0:
+        return True
+    return -delta * beta * math.log(1.0 - rand()) >= fresh_left
+
+
+class RecomputeTimer:
+    """
+    Tempo típico de recomputação por nome (média móvel exponencial).
+
+    Attributes:
+        default: Estimativa antes da primeira medição (s)
+        alpha: Peso da medição mais recente
+    """
+
+    def __init__(self, default: float = 2.0, alpha: float = 0.2):
+        self.default = default
+        self.alpha = alpha
+        self._values: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, name: str, seconds: float) -> None:
+        with self._lock:
+            current = self._values.get(name)
+            self._values[name] = seconds if current is None else (
+                current + self.alpha * (seconds - current)
+            )
+
+    def get(self, name: str) -> float:
+        return self._values.get(name, self.default)
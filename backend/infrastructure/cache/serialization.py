@@ -0,0 +1,273 @@
+"""
+Serialização compacta e versionada dos payloads do ClimateCacheService.
+
+Substitui o pickle de listas de modelos pydantic (NASAPowerData,
+METNorwayData, NWSData) por colunas tipadas + cabeçalho pequeno:
+
+    b"EVC" | versão (1 byte) | formato (1 byte) | codec (1 byte)
+           | soft TTL (uint32 LE, s; 0 = desconhecido) | corpo
+
+    O soft TTL é o da escrita: a leitura calcula o frescor com ele, não
+    com o TTL que a idade dos dados daria hoje (ver stored_soft_ttl).
+
+    formato COLUMNAR: corpo = uint32 LE tamanho do cabeçalho JSON
+                      + cabeçalho {"model", "n", "columns"}
+                      + colunas concatenadas (float64 c/ NaN = None,
+                        ou strings utf-8 separadas por '\\n')
+    formato PICKLE:   corpo = pickle (payloads sem modelo registrado)
+
+O corpo é comprimido com o codec da fonte (SOURCE_CODECS): zstd para
+séries longas, lz4 para forecasts curtos (lz4 e zstandard estão em
+requirements.txt); se a biblioteca faltar no ambiente, cai para zlib
+(stdlib). O codec usado fica no cabeçalho.
+
+Migração: entradas antigas (pickle puro, sem o prefixo EVC) continuam
+legíveis por decode(); is_legacy() permite regravá-las no formato novo.
+Payloads da versão 1 (sem soft TTL no cabeçalho) também são lidos.
+
+Uso:
+    payload = encode(records, source="nasa_power", soft_ttl=43200)
+    records = decode(payload)
+    soft = stored_soft_ttl(payload)  # 43200 (None se não gravado)
+"""
+
+import importlib
+import json
+import pickle
+import struct
+import zlib
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:  # em requirements.txt; sem ele, zlib
+    lz4_frame = None
+
+try:
+    import zstandard
+except ImportError:  # em requirements.txt; sem ele, zlib
+    zstandard = None
+
+MAGIC = b"EVC"
+VERSION = 2
+
+# Tamanho do cabeçalho por versão legível (a 1 não tinha o soft TTL)
+HEADER_SIZES = {1: 6, 2: 10}
+
+FORMAT_COLUMNAR = 1
+FORMAT_PICKLE = 2
+
+CODEC_NONE = 0
+CODEC_ZLIB = 1
+CODEC_LZ4 = 2
+CODEC_ZSTD = 3
+CODEC_NAMES = {"none": CODEC_NONE, "zlib": CODEC_ZLIB,
+               "lz4": CODEC_LZ4, "zstd": CODEC_ZSTD}
+
+# Codec preferido por fonte (séries históricas longas x forecasts curtos)
+SOURCE_CODECS = {
+    "nasa_power": "zstd",
+    "met_norway": "lz4",
+    "nws": "lz4",
+    "nws_usa": "lz4",
+}
+DEFAULT_CODEC = "zlib"
+
+# Payloads menores que isso não compensam compressão
+MIN_COMPRESS_BYTES = 256
+
+# Modelos com codificação colunar (nome no cabeçalho → import tardio)
+MODELS = {
+    "NASAPowerData": "backend.api.services.nasa_power_client",
+    "METNorwayData": "backend.api.services.met_norway_client",
+    "NWSData": "backend.api.services.nws_client",
+}
+
+_KIND_FLOAT = "f8"
+_KIND_STR = "str"
+
+
+def _available(codec: int) -> bool:
+    if codec == CODEC_LZ4:
+        return lz4_frame is not None
+    if codec == CODEC_ZSTD:
+        return zstandard is not None
+    return True
+
+
+def codec_for(source: Optional[str]) -> int:
+    """Codec efetivo da fonte (com fallback para zlib)."""
+    codec = CODEC_NAMES[SOURCE_CODECS.get(source, DEFAULT_CODEC)]
+    return codec if _available(codec) else CODEC_ZLIB
+
+
+def _compress(body: bytes, codec: int) -> bytes:
+    if codec == CODEC_ZLIB:
+        return zlib.compress(body, 6)
+    if codec == CODEC_LZ4:
+        return lz4_frame.compress(body)
+    if codec == CODEC_ZSTD:
+        return zstandard.ZstdCompressor(level=3).compress(body)
+    return body
+
+
+def _decompress(body: bytes, codec: int) -> bytes:
+    if codec == CODEC_ZLIB:
+        return zlib.decompress(body)
+    if codec == CODEC_LZ4:
+        if lz4_frame is None:
+            raise ValueError("Payload lz4, mas lz4 não está instalado")
+        return lz4_frame.decompress(body)
+    if codec == CODEC_ZSTD:
+        if zstandard is None:
+            raise ValueError("Payload zstd, mas zstandard não está instalado")
+        return zstandard.ZstdDecompressor().decompress(body)
+    return body
+
+
+def _columnar_body(data: Any) -> Optional[bytes]:
+    """Corpo colunar, ou None se o payload não é lista de modelo registrado."""
+    if not isinstance(data, list) or not data:
+        return None
+    model = type(data[0])
+    if model.__name__ not in MODELS or not all(
+        type(item) is model for item in data
+    ):
+        return None
+
+    columns: List[Tuple[str, str, int]] = []
+    blobs: List[bytes] = []
+    for name in model.model_fields:
+        values = [getattr(item, name) for item in data]
+        if all(isinstance(v, str) for v in values) and not any(
+            "\n" in v for v in values
+        ):
+            blob = "\n".join(values).encode("utf-8")
+            kind = _KIND_STR
+        elif all(v is None or (isinstance(v, (int, float))
+                               and not isinstance(v, bool))
+                 for v in values):
+            blob = np.array(
+                [np.nan if v is None else v for v in values],
+                dtype="<f8"
+            ).tobytes()
+            kind = _KIND_FLOAT
+        else:
+            return None
+        columns.append((name, kind, len(blob)))
+        blobs.append(blob)
+
+    header = json.dumps({
+        "model": model.__name__, "n": len(data), "columns": columns,
+    }, separators=(",", ":")).encode("utf-8")
+    return struct.pack("<I", len(header)) + header + b"".join(blobs)
+
+
+def encode(
+    data: Any,
+    source: Optional[str] = None,
+    soft_ttl: Optional[float] = None
+) -> bytes:
+    """
+    Serializa um payload no formato versionado.
+
+    Args:
+        data: Lista de modelos registrados (colunar) ou qualquer objeto
+            serializável com pickle
+        source: Fonte dos dados (seleciona o codec)
+        soft_ttl: Soft TTL da entrada (s), gravado no cabeçalho
+
+    Returns:
+        bytes: Payload pronto para o Redis
+    """
+    body = _columnar_body(data)
+    fmt = FORMAT_COLUMNAR
+    if body is None:
+        body = pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+        fmt = FORMAT_PICKLE
+
+    codec = codec_for(source) if len(body) >= MIN_COMPRESS_BYTES else (
+        CODEC_NONE
+    )
+    return (MAGIC + bytes((VERSION, fmt, codec))
+            + struct.pack("<I", int(soft_ttl or 0)) + _compress(body, codec))
+
+
+def is_legacy(payload: bytes) -> bool:
+    """True se o payload é pickle puro (formato anterior ao versionado)."""
+    return not payload.startswith(MAGIC)
+
+
+def stored_soft_ttl(payload: bytes) -> Optional[int]:
+    """
+    Soft TTL gravado com a entrada (s), sem desserializar o corpo.
+
+    Returns:
+        Optional[int]: None para pickle legado, versão 1 ou soft TTL
+        não informado na escrita
+    """
+    if is_legacy(payload) or payload[3] < 2:
+        return None
+    (soft_ttl,) = struct.unpack_from("<I", payload, 6)
+    return soft_ttl or None
+
+
+def _model_class(name: str):
+    module = importlib.import_module(MODELS[name])
+    return getattr(module, name)
+
+
+def _decode_columnar(body: bytes) -> List[Any]:
+    (header_len,) = struct.unpack_from("<I", body)
+    header: Dict = json.loads(body[4:4 + header_len])
+    model = _model_class(header["model"])
+    n = header["n"]
+
+    offset = 4 + header_len
+    columns: Dict[str, List] = {}
+    for name, kind, size in header["columns"]:
+        blob = body[offset:offset + size]
+        offset += size
+        if kind == _KIND_STR:
+            columns[name] = blob.decode("utf-8").split("\n") if n else []
+        else:
+            values = np.frombuffer(blob, dtype="<f8").tolist()
+            columns[name] = [None if v != v else v for v in values]
+
+    names = list(columns)
+    fields_set = set(names)
+    # Dados já validados na escrita: monta as instâncias como o
+    # __setstate__ do pydantic faz no unpickle, sem validação
+    new, set_attr = model.__new__, object.__setattr__
+    records = []
+    for row in zip(*(columns[name] for name in names)):
+        record = new(model)
+        set_attr(record, "__dict__", dict(zip(names, row)))
+        set_attr(record, "__pydantic_fields_set__", set(fields_set))
+        set_attr(record, "__pydantic_extra__", None)
+        set_attr(record, "__pydantic_private__", None)
+        records.append(record)
+    return records
+
+
+def decode(payload: bytes) -> Any:
+    """
+    Desserializa um payload (formato versionado ou pickle legado).
+
+    Raises:
+        ValueError: Versão/formato desconhecido ou codec indisponível
+    """
+    if is_legacy(payload):
+        return pickle.loads(payload)
+
+    version, fmt, codec = payload[3], payload[4], payload[5]
+    if version not in HEADER_SIZES:
+        raise ValueError(f"Versão de payload desconhecida: {version}")
+    body = _decompress(payload[HEADER_SIZES[version]:], codec)
+    if fmt == FORMAT_COLUMNAR:
+        return _decode_columnar(body)
+    if fmt == FORMAT_PICKLE:
+        return pickle.loads(body)
+    raise ValueError(f"Formato de payload desconhecido: {fmt}")
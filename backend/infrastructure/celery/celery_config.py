@@ -108,6 +108,11 @@ celery_app.conf.beat_schedule = {
         "task": "climate.prefetch_nasa_popular_cities",
         "schedule": crontab(hour=3, minute=0),
     },
+    # Arquivo histórico NASA POWER, retomável (domingo 01:00 BRT)
+    "backfill-nasa-power-history": {
+        "task": "climate.backfill_nasa_power_history",
+        "schedule": crontab(hour=1, minute=0, day_of_week=0),
+    },
     # Atualização MATOPIBA - 4x por dia (00h, 06h, 12h, 18h BRT)
     "update-matopiba-forecasts-00h": {
         "task": "update_matopiba_forecasts",
@@ -129,11 +134,12 @@ celery_app.conf.beat_schedule = {
         "schedule": crontab(hour=18, minute=0),  # 18:00 BRT
         "options": {"queue": "eto_processing"},
     },
-    # Warm-up cache MATOPIBA (04:00 BRT) - DEPRECATED: usar update-matopiba-forecasts
-    # "warm-cache-matopiba": {
-    #     "task": "climate.warm_cache_matopiba",
-    #     "schedule": crontab(hour=4, minute=0),
-    # },
+    # Warm-up histórico NASA POWER das cidades MATOPIBA (04:00 BRT);
+    # previsões ficam com update-matopiba-forecasts
+    "warm-cache-matopiba": {
+        "task": "climate.warm_cache_matopiba",
+        "schedule": crontab(hour=4, minute=0),
+    },
     # Estatísticas de cache (a cada hora)
     "generate-cache-stats": {
         "task": "climate.generate_cache_stats",
@@ -3,10 +3,12 @@ Celery Task para atualização periódica de previsões MATOPIBA.
 (Atualizado: +PostgreSQL histórico, cleanup automático, run scheduling)
 
 Pipeline:
-- Busca de previsões Open-Meteo para 337 cidades (2-5 min)
+- Busca de previsões Open-Meteo para 337 cidades (lotes concorrentes, segundos)
 - Cálculo de ETo EVAonline (Penman-Monteith)
 - Validação com ETo Open-Meteo (R², RMSE, Bias) - não bloqueante
-- Redis cache "quente" (TTL 6h) → latência <100ms
+- Redis cache "quente" (soft TTL 6h + janela stale) → latência <100ms,
+  um namespace por run com uma entrada por cidade e arrays por
+  variável/dia (ver matopiba_store)
 - PostgreSQL histórico → auditoria/recovery
 - Execução: 00h, 06h, 12h, 18h UTC (crontab)
 
@@ -16,8 +18,10 @@ Data: 2025-10-10
 
 import json
 import os
+import time
 from datetime import datetime, timedelta
-from typing import Dict, List
+from typing import Dict, List, Optional
+from uuid import uuid4
 
 from celery import shared_task
 from loguru import logger
@@ -25,10 +29,16 @@ from redis import Redis
 from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker
 
+from backend.api.services.climate_factory import ClimateClientFactory
 from backend.api.services.openmeteo_matopiba_client import \
     OpenMeteoMatopibaClient
 from backend.core.eto_calculation.eto_matopiba import \
     calculate_eto_matopiba_batch
+from backend.core.map_results.matopiba_raster import build_rasters
+from backend.infrastructure.cache.matopiba_store import (RUN_RETENTION_SECONDS,
+                                                         MatopibaRunStore,
+                                                         build_arrays,
+                                                         new_run_id)
 
 # Configuração do logging
 logger.add(
@@ -52,10 +62,15 @@ if REDIS_PASSWORD:
 else:
     REDIS_URL = f"redis://{REDIS_HOST}:{REDIS_PORT}/{REDIS_DB}"
 
-# Redis Keys (mudança: :latest para sempre apontar pro run atual)
-REDIS_KEY_FORECASTS = "matopiba:forecasts:latest"
-REDIS_KEY_METADATA = "matopiba:metadata:latest"
+# Chaves do formato anterior (um blob JSON), removidas ao gravar um run
+LEGACY_KEY_PATTERNS = ("matopiba:forecasts:*", "matopiba:metadata:*")
+# Frescor do run publicado: após ele a rota /forecasts serve o run
+# "stale" e dispara esta task (lock REFRESH_LOCK). No Redis o run vive
+# RUN_RETENTION_SECONDS, então atrasos da task não esvaziam o cache
 CACHE_TTL_HOURS = 6
+# Run publicado há menos que isso não é recalculado (ex: beat logo após
+# uma renovação antecipada disparada pela rota), salvo force=True
+MIN_RUN_AGE_SECONDS = 60 * 60
 
 # PostgreSQL Engine
 try:
@@ -74,12 +89,17 @@ except Exception as e:
     max_retries=3,
     default_retry_delay=300  # 5 minutos
 )
-def update_matopiba_forecasts(self):
+def update_matopiba_forecasts(self, force: bool = False):
     """
     Task Celery para atualização de previsões MATOPIBA.
     
+    Uma execução por vez: toma o lock REFRESH_LOCK com o próprio id (a
+    rota o toma com esse id antes de enfileirar a renovação) e o libera
+    só se ainda é dono dele. Sem o lock, ou com o run publicado há menos
+    de MIN_RUN_AGE_SECONDS, retorna SKIPPED.
+    
     Pipeline:
-    1. Buscar previsões Open-Meteo (337 cidades × 2 dias) → 2-5 min
+    1. Buscar previsões Open-Meteo (337 cidades × 2 dias) → segundos
     2. Calcular ETo EVAonline
     3. Validar com ETo Open-Meteo (R²/RMSE/Bias) - não bloqueante
     4. Salvar Redis (cache quente, TTL 6h) → latência <100ms
@@ -87,6 +107,9 @@ def update_matopiba_forecasts(self):
     
     Execução: Automática 00h, 06h, 12h, 18h UTC (crontab)
     
+    Args:
+        force: Recalcula mesmo com o run publicado recente (/refresh)
+    
     Returns:
         Dict com resumo da execução
     
@@ -117,6 +140,19 @@ def update_matopiba_forecasts(self):
         logger.error(msg)
         raise Exception(msg)
     
+    store = MatopibaRunStore(redis_client)
+    lock_token = task_id or uuid4().hex
+    skip_reason = _skip_reason(store, lock_token, force)
+    if skip_reason:
+        logger.info("⏭️ %s ignorado: %s", run_label, skip_reason)
+        redis_client.close()
+        return {
+            'status': 'SKIPPED',
+            'reason': skip_reason,
+            'task_id': task_id,
+            'run_label': run_label
+        }
+    
     # Conectar ao PostgreSQL (opcional)
     db_session = None
     if SessionLocal:
@@ -126,6 +162,7 @@ def update_matopiba_forecasts(self):
         except Exception as e:
             logger.warning("⚠️ PostgreSQL não disponível: %s", e)
     
+    retrying = False
     try:
         
         # ===================================================================
@@ -133,7 +170,10 @@ def update_matopiba_forecasts(self):
         # ===================================================================
         logger.info("STEP 1/5: Buscando previsões Open-Meteo para %s...", run_label)
         
-        client = OpenMeteoMatopibaClient(forecast_days=2)  # Hoje + Amanhã
+        client = OpenMeteoMatopibaClient(
+            forecast_days=2,  # Hoje + Amanhã
+            transport=ClimateClientFactory.create_http_transport()
+        )
         forecasts_raw, warnings_fetch = client.get_forecasts_all_cities()
         
         n_cities_fetched = len(forecasts_raw)
@@ -205,11 +245,11 @@ def update_matopiba_forecasts(self):
         # ===================================================================
         logger.info("STEP 4/5: Salvando Redis (cache quente)...")
         
-        # Preparar dados para Redis
+        run_id = new_run_id(start_time)
         cache_data = {
-            'forecasts': results,  # {code_city: {today: {eto, precip, ...}, tomorrow: {...}}}
             'validation': validation_metrics,
             'metadata': {
+                'run_id': run_id,
                 'run_label': run_label,  # NOVO: Ex: "Run 00h UTC"
                 'updated_at': start_time.isoformat(),
                 'next_update': (start_time + timedelta(hours=6)).isoformat(),
@@ -218,38 +258,46 @@ def update_matopiba_forecasts(self):
                 'success_rate': round((n_cities_calculated / 337) * 100, 1),
                 'quality': quality,  # NOVO: EXCELENTE/ACEITÁVEL/ABAIXO
                 'task_id': task_id,
+                # Tempo de recomputação (delta da renovação antecipada)
+                'build_seconds': round(
+                    (datetime.now() - start_time).total_seconds(), 1
+                ),
                 'version': '1.0.0'
             }
         }
         
-        # Serializar e salvar
+        # Rasters interpolados por variável/dia (overlays do heatmap)
+        # - NÃO BLOQUEIA CACHE
         try:
-            # Usar JSON em vez de pickle para compatibilidade com frontend
-            serialized = json.dumps(cache_data, ensure_ascii=False, default=str)
-            ttl_seconds = CACHE_TTL_HOURS * 3600
-            
-            # Salvar dados principais (key :latest sempre aponta pro run atual)
-            redis_client.setex(
-                REDIS_KEY_FORECASTS,
-                ttl_seconds,
-                serialized
-            )
-            
-            # Salvar metadata separadamente (para acesso rápido)
-            redis_client.setex(
-                REDIS_KEY_METADATA,
+            rasters = build_rasters(*build_arrays(results))
+        except Exception as e:
+            logger.warning("⚠️  Falha ao gerar rasters MATOPIBA: %s", e)
+            rasters = {}
+        
+        # Gravar run em chaves próprias (cidades em lotes, arrays) e só
+        # então publicar; até lá os leitores seguem no run anterior
+        try:
+            ttl_seconds = RUN_RETENTION_SECONDS
+            store.write_run(
+                run_id,
+                results,  # {code_city: {city_info, forecast: {dia: {...}}}}
+                cache_data['metadata'],
+                validation_metrics,
                 ttl_seconds,
-                json.dumps(cache_data['metadata'])
+                rasters=rasters
             )
-            
-            # 🧹 CLEANUP: Deleta chaves antigas se existirem
-            old_keys_pattern = "matopiba:forecasts:previous*"
-            old_keys = redis_client.keys(old_keys_pattern)
+            # 🧹 CLEANUP: Deleta chaves do formato antigo, se existirem
+            old_keys = [
+                key
+                for pattern in LEGACY_KEY_PATTERNS
+                for key in redis_client.scan_iter(match=pattern, count=500)
+            ]
             if old_keys:
-                redis_client.delete(*old_keys)
+                redis_client.unlink(*old_keys)
                 logger.info("🧹 Cleanup: %d chaves antigas deletadas", len(old_keys))
             
-            logger.info("✅ Redis salvo (TTL: %dh, key: %s)", CACHE_TTL_HOURS, REDIS_KEY_FORECASTS)
+            logger.info("✅ Redis salvo e publicado (run: %s, retenção: %dh)",
+                        run_id, ttl_seconds // 3600)
             
         except Exception as e:
             msg = f"Erro ao salvar no Redis: {e}"
@@ -347,6 +395,8 @@ def update_matopiba_forecasts(self):
                 "Tentando novamente em 5 minutos... (tentativa %d/%d)",
                 self.request.retries + 1, self.max_retries
             )
+            # O retry (mesmo id) mantém o lock
+            retrying = True
             raise self.retry(exc=e)
         
         # Falha definitiva
@@ -361,6 +411,12 @@ def update_matopiba_forecasts(self):
         }
     
     finally:
+        try:
+            if not retrying:
+                store.release_refresh(lock_token)
+        except Exception as e:
+            logger.warning("⚠️ Falha ao liberar lock MATOPIBA: %s", e)
+        
         # Fechar conexões
         try:
             if 'redis_client' in locals():
@@ -377,6 +433,30 @@ def update_matopiba_forecasts(self):
             pass
 
 
+def _skip_reason(store: MatopibaRunStore, lock_token: str,
+                 force: bool) -> Optional[str]:
+    """
+    Motivo para não executar a atualização (None: executar).
+    
+    Toma o lock de atualização; se o run publicado ainda é recente (e
+    não é force), libera-o e pula.
+    """
+    if not store.acquire_refresh(lock_token):
+        return "atualização MATOPIBA em andamento"
+    if force:
+        return None
+    run_id = store.latest_run()
+    meta = store.meta(run_id) if run_id else None
+    published_at = (meta or {}).get('published_at')
+    if published_at is None:
+        return None
+    age = time.time() - published_at
+    if age >= MIN_RUN_AGE_SECONDS:
+        return None
+    store.release_refresh(lock_token)
+    return f"run {run_id} publicado há {age / 60:.0f} min"
+
+
 @shared_task(name="get_matopiba_cache_status")
 def get_matopiba_cache_status():
     """
@@ -389,29 +469,36 @@ def get_matopiba_cache_status():
         redis_client = Redis.from_url(REDIS_URL, decode_responses=True)
         redis_client.ping()
         
-        # Verificar se existe cache
-        exists = redis_client.exists(REDIS_KEY_FORECASTS)
+        store = MatopibaRunStore(redis_client)
+        run_id = store.latest_run()
+        meta = store.meta(run_id) if run_id else None
         
-        if not exists:
+        # Run em gravação (ainda não publicado)
+        building_id = store.building_run()
+        building = store.meta(building_id) if building_id else None
+        building = {
+            'run_id': building_id,
+            'progress': building['progress']
+        } if building else None
+        
+        if not meta:
             return {
                 'status': 'EMPTY',
-                'message': 'Cache vazio - aguardando primeira atualização'
+                'message': 'Cache vazio - aguardando primeira atualização',
+                'building': building
             }
         
-        # Obter TTL
-        ttl_seconds = redis_client.ttl(REDIS_KEY_FORECASTS)
-        
-        # Obter metadata
-        metadata_raw = redis_client.get(REDIS_KEY_METADATA)
-        if metadata_raw:
-            metadata = json.loads(metadata_raw)
-        else:
-            metadata = {}
+        ttl_seconds = store.ttl(run_id)
+        metadata = meta['metadata']
         
         return {
             'status': 'ACTIVE',
+            'run_id': run_id,
+            'progress': meta['progress'],
+            'published_at': meta['published_at'],
             'ttl_seconds': ttl_seconds,
             'ttl_minutes': ttl_seconds / 60,
+            'building': building,
             'metadata': metadata
         }
         
@@ -5,6 +5,7 @@ This module contains pytest fixtures that can be used across all test modules
 in the backend test suite.
 """
 
+import fnmatch
 import sys
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -12,6 +13,7 @@ from unittest.mock import Mock
 
 import pandas as pd
 import pytest
+from redis.exceptions import WatchError
 
 # Add backend to Python path
 backend_path = Path(__file__).parent.parent
@@ -159,6 +161,328 @@ def mock_redis_for_all_tests(monkeypatch):
     )
 
 
+class FakeRedis:
+    """
+    In-memory Redis double shared by the cache tests.
+
+    Keys are kept as ``str`` and values are stored the way Redis would
+    return them (``bytes``, or ``str`` with ``decode_responses=True``);
+    TTLs are plain seconds in ``ttls`` and never elapse on their own.
+    Every direct command and every pipeline execution is appended to
+    ``calls``, so tests can assert round trips.
+    """
+
+    def __init__(self, decode_responses=False):
+        self.decode_responses = decode_responses
+        self.data = {}
+        self.ttls = {}
+        self.zsets = {}
+        self.published = []
+        self.calls = []
+        self._snapshot = []
+
+    @property
+    def round_trips(self):
+        return len(self.calls)
+
+    def __getattr__(self, name):
+        command = getattr(type(self), f"_{name}", None)
+        if command is None or name.startswith("_"):
+            raise AttributeError(name)
+
+        def call(*args, **kwargs):
+            self.calls.append(name)
+            return command(self, *args, **kwargs)
+        return call
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    # Helpers
+
+    @staticmethod
+    def _key(key):
+        return key.decode() if isinstance(key, bytes) else key
+
+    def _value(self, value):
+        if not isinstance(value, bytes):
+            value = str(value).encode()
+        return value.decode() if self.decode_responses else value
+
+    def _keys_reply(self, keys):
+        return keys if self.decode_responses else [k.encode() for k in keys]
+
+    # Strings and keys
+
+    def _ping(self):
+        return True
+
+    def _close(self):
+        pass
+
+    def _get(self, key):
+        return self.data.get(self._key(key))
+
+    def _mget(self, keys, *more):
+        keys = list(keys) if isinstance(keys, (list, tuple)) else [keys]
+        return [self._get(k) for k in keys + list(more)]
+
+    def _set(self, key, value, ex=None, px=None, nx=False, xx=False,
+             keepttl=False):
+        key = self._key(key)
+        if (nx and key in self.data) or (xx and key not in self.data):
+            return None
+        self.data[key] = self._value(value)
+        if ex is not None or px is not None:
+            self.ttls[key] = ex if ex is not None else px // 1000
+        elif not keepttl:
+            self.ttls.pop(key, None)
+        return True
+
+    def _setex(self, key, ttl, value):
+        return self._set(key, value, ex=ttl)
+
+    def _getset(self, key, value):
+        old = self._get(key)
+        self._set(key, value)
+        return old
+
+    def _delete(self, *keys):
+        removed = 0
+        for key in map(self._key, keys):
+            removed += self.data.pop(key, None) is not None
+            self.ttls.pop(key, None)
+            self.zsets.pop(key, None)
+        return removed
+
+    _unlink = _delete
+
+    def _exists(self, *keys):
+        return sum(self._key(k) in self.data for k in keys)
+
+    def _expire(self, key, seconds):
+        key = self._key(key)
+        if key not in self.data:
+            return False
+        self.ttls[key] = seconds
+        return True
+
+    def _ttl(self, key):
+        key = self._key(key)
+        if key not in self.data:
+            return -2
+        return self.ttls.get(key, -1)
+
+    def _pttl(self, key):
+        ttl = self._ttl(key)
+        return ttl * 1000 if ttl >= 0 else ttl
+
+    def _memory_usage(self, key):
+        value = self.data.get(self._key(key))
+        return None if value is None else len(value) + 50
+
+    def _scan(self, cursor=0, match="*", count=10):
+        """Pages over a snapshot taken at cursor 0 (like a real SCAN)."""
+        if cursor == 0 or not self._snapshot:
+            self._snapshot = list(self.data)
+        keys = self._snapshot
+        page = [k for k in keys[cursor:cursor + count]
+                if k in self.data and fnmatch.fnmatchcase(k, match or "*")]
+        following = cursor + count
+        return (following if following < len(keys) else 0,
+                self._keys_reply(page))
+
+    def _keys(self, pattern="*"):
+        raise AssertionError("KEYS blocks the server; use SCAN")
+
+    def _publish(self, channel, message):
+        self.published.append(message)
+        return 0
+
+    # Hashes
+
+    def _hset(self, key, field=None, value=None, mapping=None):
+        h = self.data.setdefault(self._key(key), {})
+        items = dict(mapping or {})
+        if field is not None:
+            items[field] = value
+        for f, v in items.items():
+            h[self._key(f)] = self._value(v)
+        return len(items)
+
+    def _hget(self, key, field):
+        return self.data.get(self._key(key), {}).get(self._key(field))
+
+    def _hexists(self, key, field):
+        return int(self._key(field) in self.data.get(self._key(key), {}))
+
+    def _hmget(self, key, fields, *more):
+        fields = list(fields) if isinstance(fields, (list, tuple)) else [fields]
+        return [self._hget(key, f) for f in fields + list(more)]
+
+    def _hgetall(self, key):
+        h = self.data.get(self._key(key), {})
+        return dict(zip(self._keys_reply(list(h)), h.values()))
+
+    def _hincrby(self, key, field, amount=1):
+        value = int(self._hget(key, field) or 0) + amount
+        self._hset(key, field, value)
+        return value
+
+    # Sorted sets
+
+    def _zadd(self, name, mapping):
+        self.zsets.setdefault(self._key(name), {}).update(mapping)
+        return len(mapping)
+
+    def _zincrby(self, name, amount, member):
+        zset = self.zsets.setdefault(self._key(name), {})
+        zset[member] = zset.get(member, 0.0) + amount
+        return zset[member]
+
+    def _zremrangebyrank(self, name, start, stop):
+        zset = self.zsets.get(self._key(name), {})
+        ranked = sorted(zset.items(), key=lambda kv: kv[1])
+        stop = len(ranked) + stop if stop < 0 else stop
+        for member, _ in ranked[start:stop + 1]:
+            del zset[member]
+        return max(0, stop + 1 - start)
+
+    def _zrevrange(self, name, start, stop, withscores=False):
+        ranked = sorted(self.zsets.get(self._key(name), {}).items(),
+                        key=lambda kv: -kv[1])
+        ranked = ranked[start:None if stop == -1 else stop + 1]
+        return ranked if withscores else [m for m, _ in ranked]
+
+
+class FakePipeline:
+    """
+    Queues commands and runs them in one ``execute`` (one round trip).
+
+    ``watch`` switches to immediate mode until ``multi``, and ``execute``
+    raises ``WatchError`` if a watched key changed, as in redis-py.
+    """
+
+    def __init__(self, redis):
+        self.redis = redis
+        self.ops = []
+        self.watched = None
+        self._multi = False
+
+    def __getattr__(self, name):
+        command = getattr(type(self.redis), f"_{name}", None)
+        if command is None or name.startswith("_"):
+            raise AttributeError(name)
+
+        def queue(*args, **kwargs):
+            if self.watched is not None and not self._multi:
+                return command(self.redis, *args, **kwargs)
+            self.ops.append((command, args, kwargs))
+            return self
+        return queue
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.reset()
+
+    def watch(self, *keys):
+        self.watched = {k: self.redis._get(k) for k in keys}
+        self._multi = False
+
+    def multi(self):
+        self._multi = True
+
+    def reset(self):
+        self.ops, self.watched, self._multi = [], None, False
+
+    def execute(self):
+        self.redis.calls.append("pipeline")
+        ops, watched = self.ops, self.watched
+        self.reset()
+        if watched and any(self.redis._get(k) != v
+                           for k, v in watched.items()):
+            raise WatchError("Watched variable changed.")
+        return [command(self.redis, *args, **kwargs)
+                for command, args, kwargs in ops]
+
+
+class AsyncFakeRedis(FakeRedis):
+    """FakeRedis with the redis.asyncio call signature (awaitable commands)."""
+
+    def __getattr__(self, name):
+        call = super().__getattr__(name)
+
+        async def run(*args, **kwargs):
+            return call(*args, **kwargs)
+        return run
+
+    def pipeline(self, transaction=True):
+        return AsyncFakePipeline(self)
+
+
+class AsyncFakePipeline(FakePipeline):
+    def __getattr__(self, name):
+        queue = super().__getattr__(name)
+        if self.watched is None or self._multi:
+            return queue
+
+        async def immediate(*args, **kwargs):
+            return queue(*args, **kwargs)
+        return immediate
+
+    async def watch(self, *keys):
+        FakePipeline.watch(self, *keys)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        self.reset()
+
+    async def execute(self):
+        return FakePipeline.execute(self)
+
+
+class ReadyListener:
+    """Invalidation listener stand-in that is always subscribed."""
+
+    healthy = True
+
+    def ensure_running(self):
+        pass
+
+
+@pytest.fixture
+def fake_redis():
+    """Synchronous in-memory Redis (redis.Redis API)."""
+    return FakeRedis()
+
+
+@pytest.fixture
+def async_fake_redis():
+    """In-memory Redis with the redis.asyncio API."""
+    return AsyncFakeRedis()
+
+
+@pytest.fixture
+def ready_listener():
+    return ReadyListener()
+
+
+@pytest.fixture
+def cache_service(async_fake_redis):
+    """ClimateCacheService on AsyncFakeRedis, without L1 or pub/sub."""
+    from backend.infrastructure.cache.climate_cache import ClimateCacheService
+
+    cache = ClimateCacheService(prefix="test")
+    cache.redis = async_fake_redis
+    cache.local = None
+    cache.invalidation = None
+    return cache
+
+
 # Test configuration
 def pytest_configure(config):
     """Configure pytest with custom markers."""
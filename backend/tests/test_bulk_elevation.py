@@ -0,0 +1,68 @@
+"""Unit tests for the bulk elevation lookup."""
+
+import pytest
+
+from backend.api.services import openmeteo
+from backend.api.services.elevation_grid import ElevationGrid
+
+
+class FakeResponse:
+    def __init__(self, elevations):
+        self.elevations = elevations
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return {"elevation": self.elevations}
+
+
+@pytest.fixture
+def api_calls(tmp_path, monkeypatch):
+    calls = []
+
+    def fake_get(session, url, params=None, timeout=None):
+        lats = params["latitude"].split(",")
+        calls.append(len(lats))
+        return FakeResponse([float(lat) * -10 for lat in lats])
+
+    monkeypatch.setattr(openmeteo, "get_elevation_grid",
+                        lambda: ElevationGrid(tmp_path))
+    monkeypatch.setattr(openmeteo.requests.Session, "get", fake_get)
+    return calls
+
+
+def test_snapped_duplicates_resolved_once_in_input_order(api_calls,
+                                                         fake_redis,
+                                                         monkeypatch):
+    redis = fake_redis
+    monkeypatch.setattr(openmeteo, "_get_redis_client", lambda: redis)
+
+    coords = [(-10.0, -45.0), (-20.0, -46.0), (-10.00001, -45.00001)]
+    elevations, warnings = openmeteo.get_openmeteo_elevations(coords)
+
+    assert elevations == [100.0, 200.0, 100.0]
+    assert warnings == []
+    assert api_calls == [2]
+    assert redis.calls.count("mget") == 1
+    assert len(redis.data) == 2
+
+
+def test_cached_points_skip_api_and_misses_use_max_batches(api_calls,
+                                                          fake_redis,
+                                                          monkeypatch):
+    redis = fake_redis
+    redis.set(openmeteo.elevation_cache_key(-1.0, -45.0), "42.0")
+    monkeypatch.setattr(openmeteo, "_get_redis_client", lambda: redis)
+
+    coords = [(-1.0 - i * 0.01, -45.0) for i in range(251)]
+    elevations, _ = openmeteo.get_openmeteo_elevations(coords)
+
+    assert elevations[0] == 42.0
+    assert elevations[1] == pytest.approx(10.1)
+    assert api_calls == [100, 100, 50]
+
+
+def test_rejects_invalid_coordinates():
+    with pytest.raises(ValueError):
+        openmeteo.get_openmeteo_elevations([(0.0, 0.0), (95.0, 0.0)])
@@ -0,0 +1,73 @@
+"""Unit tests for the pipelined batch API of ClimateCacheService."""
+
+import asyncio
+import pickle
+from datetime import datetime, timedelta
+
+from backend.infrastructure.cache.local_cache import LocalTTLCache
+from backend.infrastructure.cache.revalidation import hard_ttl
+from backend.infrastructure.cache.serialization import decode, is_legacy
+
+
+START = datetime(2024, 1, 1)
+END = datetime(2024, 1, 31)
+
+
+def _requests(n):
+    return [("nasa_power", -10.0 - i, -45.0, START, END) for i in range(n)]
+
+
+def test_set_many_and_get_many_cost_one_round_trip_each(cache_service):
+    requests = _requests(20)
+    saved = asyncio.run(cache_service.set_many(
+        [(*req, [{"i": i}]) for i, req in enumerate(requests[:15])]
+    ))
+    assert saved == 15 and cache_service.redis.round_trips == 1
+    assert all(ttl == hard_ttl(cache_service.TTL_HISTORICAL)
+               for ttl in cache_service.redis.ttls.values())
+
+    hits, misses = asyncio.run(cache_service.get_many(requests))
+
+    assert cache_service.redis.round_trips == 2
+    assert misses == requests[15:]
+    assert hits[requests[3]] == [{"i": 3}]
+
+
+def test_set_many_uses_per_key_ttl(cache_service):
+    recent = datetime.now() - timedelta(days=2)
+    asyncio.run(cache_service.set_many([
+        ("nasa_power", 0.0, 0.0, START, END, [1]),
+        ("met_norway", 0.0, 0.0, recent, recent, [2]),
+        ("met_norway", 0.0, 0.0, recent, recent, []),
+    ]))
+    assert sorted(cache_service.redis.ttls.values()) == [
+        hard_ttl(cache_service.TTL_VERY_RECENT),
+        hard_ttl(cache_service.TTL_HISTORICAL),
+    ]
+
+
+def test_get_many_serves_l1_and_migrates_legacy(cache_service,
+                                                ready_listener):
+    cache_service.local = LocalTTLCache()
+    cache_service.invalidation = ready_listener
+    first, second = _requests(2)
+    asyncio.run(cache_service.set_many([(*first, [1])]))
+    legacy_key = cache_service._make_key(*second)
+    cache_service.redis.data[legacy_key] = pickle.dumps([2])
+    cache_service.redis.ttls[legacy_key] = hard_ttl(
+        cache_service.TTL_HISTORICAL)
+
+    hits, misses = asyncio.run(cache_service.get_many([first, second]))
+
+    assert hits == {first: [1], second: [2]} and misses == []
+    # first veio do L1 (gravado pelo set_many); second, do pipeline
+    assert cache_service.local.stats["hits"] == 1
+    assert not is_legacy(cache_service.redis.data[legacy_key])
+    assert decode(cache_service.redis.data[legacy_key]) == [2]
+    assert len(cache_service.redis.published) == 1
+
+
+def test_get_many_degrades_to_misses_without_redis(cache_service):
+    cache_service.redis = None
+    requests = _requests(3)
+    assert asyncio.run(cache_service.get_many(requests)) == ({}, requests)
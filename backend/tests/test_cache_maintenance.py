@@ -0,0 +1,83 @@
+"""Unit tests for the SCAN-based cache maintenance helpers."""
+
+import asyncio
+
+from backend.infrastructure.cache.maintenance import (cleanup_expiring,
+                                                      keyspace_stats,
+                                                      rebuild_ranking)
+
+
+def _fill(redis):
+    for i in range(10):
+        redis.data[f"climate:nasa_power:{i}"] = b"x" * 100
+        redis.ttls[f"climate:nasa_power:{i}"] = 7200
+    for i in range(5):
+        redis.data[f"climate:met:met_norway:{i}"] = b"y" * 30
+        redis.ttls[f"climate:met:met_norway:{i}"] = 60
+    redis.data["climate:nws:0"] = b"z"
+
+
+def test_cleanup_removes_short_ttl_in_pipelined_batches(async_fake_redis):
+    redis = async_fake_redis
+    _fill(redis)
+
+    report = asyncio.run(cleanup_expiring(redis, "climate:*", count=4))
+
+    assert report["removed"] == 6 and report["kept"] == 10
+    assert report["complete"] is True
+    assert all(k.startswith("climate:nasa_power") for k in redis.data)
+    # 1 pipeline de TTL por lote do SCAN, nunca 1 ida por chave
+    assert redis.calls.count("pipeline") == redis.calls.count("scan") == 4
+
+
+def test_cleanup_with_zero_min_ttl_only_removes_keys_without_ttl(async_fake_redis):
+    redis = async_fake_redis
+    _fill(redis)
+
+    report = asyncio.run(cleanup_expiring(redis, "climate:*", min_ttl=0))
+
+    # Entradas em janela stale (TTL curto) ficam; só a sem TTL sai
+    assert report["removed"] == 1 and report["kept"] == 15
+    assert "climate:nws:0" not in redis.data
+
+
+def test_cleanup_resumes_from_saved_cursor_when_budget_expires(async_fake_redis):
+    redis = async_fake_redis
+    _fill(redis)
+
+    first = asyncio.run(cleanup_expiring(redis, "climate:*", count=4,
+                                         time_budget=0, name="t"))
+    assert first["complete"] is False and first["total_scanned"] == 4
+    assert "cache:maintenance:cursor:t" in redis.data
+
+    second = asyncio.run(cleanup_expiring(redis, "climate:*", count=100,
+                                          name="t"))
+    assert second["complete"] is True
+    assert first["total_scanned"] + second["total_scanned"] == 16
+    assert "cache:maintenance:cursor:t" not in redis.data
+
+
+def test_keyspace_stats_reports_keys_and_bytes_per_source(async_fake_redis):
+    redis = async_fake_redis
+    _fill(redis)
+
+    stats = asyncio.run(keyspace_stats(redis, "climate:*", count=3))
+
+    assert stats["sources"]["nasa"]["total_keys"] == 10
+    assert stats["sources"]["nasa"]["memory_bytes"] == 10 * 150
+    assert stats["sources"]["met"]["total_keys"] == 5
+    assert stats["sources"]["nws"]["memory_bytes"] == 51
+    assert stats["sources"]["openmeteo"]["total_keys"] == 0
+
+
+def test_rebuild_ranking_uses_one_mget_per_batch(async_fake_redis):
+    redis = async_fake_redis
+    for i in range(3):
+        redis.data[f"acessos:{i}"] = str(i * 10).encode()
+
+    total = asyncio.run(rebuild_ranking(redis, count=2))
+
+    assert total == 3 and redis.calls.count("mget") == 2
+    assert redis.zsets["ranking_acessos"] == {
+        "acessos:0": 0, "acessos:1": 10, "acessos:2": 20
+    }
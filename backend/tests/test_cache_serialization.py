@@ -0,0 +1,84 @@
+"""Unit tests for the versioned columnar cache payload format."""
+
+import pickle
+
+import pytest
+
+from backend.api.services.met_norway_client import METNorwayData
+from backend.api.services.nasa_power_client import NASAPowerData
+from backend.infrastructure.cache import serialization
+from backend.infrastructure.cache.serialization import (CODEC_ZLIB, decode,
+                                                        encode, is_legacy,
+                                                        stored_soft_ttl)
+
+
+def _nasa_records(n=30):
+    return [
+        NASAPowerData(date=f"2024-01-{i % 28 + 1:02d}", temp_max=30.25 + i,
+                      temp_min=None if i % 7 == 0 else 18.4,
+                      solar_radiation=20.5 * 3.6, precipitation=0.0)
+        for i in range(n)
+    ]
+
+
+def test_columnar_roundtrip_preserves_values_and_none():
+    records = _nasa_records()
+    decoded = decode(encode(records, source="nasa_power"))
+    assert [r.model_dump() for r in decoded] == [
+        r.model_dump() for r in records
+    ]
+    assert isinstance(decoded[0], NASAPowerData)
+
+
+def test_columnar_payload_is_smaller_than_pickle():
+    records = _nasa_records(365)
+    assert len(encode(records, "nasa_power")) < len(pickle.dumps(records)) / 3
+
+
+def test_hourly_forecast_roundtrip():
+    records = [METNorwayData(timestamp=f"2024-05-01T{h:02d}:00:00Z",
+                             temp_celsius=10.0 + h / 10)
+               for h in range(24)]
+    decoded = decode(encode(records, "met_norway"))
+    assert decoded[5].timestamp == "2024-05-01T05:00:00Z"
+    assert decoded[5].pressure_hpa is None
+
+
+def test_legacy_pickle_entries_still_readable():
+    legacy = pickle.dumps(_nasa_records(3))
+    assert is_legacy(legacy)
+    assert decode(legacy)[0].temp_max == 30.25
+    assert not is_legacy(encode(_nasa_records(3)))
+
+
+def test_other_payloads_fall_back_to_pickle():
+    payload = {"cities": ["Balsas"], "values": [1, 2]}
+    assert decode(encode(payload)) == payload
+
+
+def test_missing_codec_falls_back_to_zlib(monkeypatch):
+    monkeypatch.setattr(serialization, "zstandard", None)
+    payload = encode(_nasa_records(), source="nasa_power")
+    assert payload[5] == CODEC_ZLIB
+    assert len(decode(payload)) == 30
+
+
+def test_unknown_version_rejected():
+    payload = bytearray(encode(_nasa_records()))
+    payload[3] = 99
+    with pytest.raises(ValueError):
+        decode(bytes(payload))
+
+
+def test_soft_ttl_is_stored_in_the_header_and_v1_still_reads():
+    payload = encode(_nasa_records(), "nasa_power", soft_ttl=43200)
+    assert stored_soft_ttl(payload) == 43200
+    assert stored_soft_ttl(encode(_nasa_records())) is None
+    assert stored_soft_ttl(pickle.dumps(_nasa_records(3))) is None
+
+    # Versão 1: mesmo cabeçalho sem o soft TTL
+    v1 = payload[:3] + bytes((1,)) + payload[4:6] + payload[10:]
+    assert stored_soft_ttl(v1) is None
+    assert [r.model_dump() for r in decode(v1)] == [
+        r.model_dump() for r in decode(payload)
+    ]
@@ -0,0 +1,66 @@
+"""Unit tests for the offline memory-mapped elevation grid."""
+
+import numpy as np
+import pytest
+
+from backend.api.services import openmeteo
+from backend.api.services.elevation_grid import (NODATA, ElevationGrid,
+                                                 write_tiles)
+
+
+@pytest.fixture
+def grid(tmp_path):
+    # Plano inclinado: elevação = 100 * lat + 10 * lon (exato na bilinear)
+    step = 0.5
+    lats = np.arange(0.0, -5.5, -step)
+    lons = np.arange(-50.0, -44.5, step)
+    plane = 100 * lats[:, None] + 10 * lons[None, :] + 2000
+    write_tiles(plane, 0.0, -50.0, step, tmp_path, "brazil", tile_size=4)
+
+    coarse = np.full((3, 3), 7.0)
+    coarse[1, 1] = np.nan
+    write_tiles(coarse, 10.0, -60.0, 10.0, tmp_path, "global")
+    return ElevationGrid(tmp_path)
+
+
+def test_bilinear_lookup_across_tile_borders(grid):
+    assert len(grid.tiles) > 2
+    # Ponto na borda entre tiles e ponto interno
+    for lat, lon in [(-1.5, -48.5), (-2.3, -46.1), (-4.9, -45.2)]:
+        expected = 100 * lat + 10 * lon + 2000
+        assert grid.lookup(lat, lon) == pytest.approx(expected, abs=0.1)
+
+
+def test_finer_tiles_win_and_nodata_is_skipped(grid):
+    # Dentro dos tiles finos: não usa a grade grosseira (7 m)
+    assert grid.lookup(-1.0, -49.0) != 7.0
+    # Fora dos tiles finos: nó central sem dado é ignorado
+    assert grid.lookup(-5.0, -55.0) == 7.0
+    assert np.isnan(grid.lookup_many([50.0], [0.0])[0])
+
+
+def test_nodata_sentinel_written(tmp_path):
+    write_tiles(np.array([[np.nan, 1.0], [2.0, 3.0]]), 1.0, 0.0, 1.0,
+                tmp_path, "t")
+    raw = np.fromfile(tmp_path / "t_r000000_c000000.i16", dtype="<i2")
+    assert raw[0] == NODATA
+
+
+def test_elevation_uses_local_grid_before_network(grid, monkeypatch):
+    monkeypatch.setattr(openmeteo, "get_elevation_grid", lambda: grid)
+
+    def no_network(*args, **kwargs):
+        raise AssertionError("API de elevação não deveria ser chamada")
+
+    monkeypatch.setattr(openmeteo.requests, "get", no_network)
+    monkeypatch.setattr(openmeteo, "_get_redis_client", no_network)
+
+    elevation, warnings = openmeteo.get_openmeteo_elevation(-2.0, -47.0)
+    assert elevation == pytest.approx(1330.0)
+    assert warnings == []
+
+
+def test_elevation_cache_key_is_snapped():
+    assert openmeteo.elevation_cache_key(-22.29641, -48.55779) == (
+        openmeteo.elevation_cache_key(-22.29639, -48.55781)
+    )
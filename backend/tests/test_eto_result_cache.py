@@ -0,0 +1,38 @@
+"""Unit tests for the final ETo result cache."""
+
+import asyncio
+
+from backend.infrastructure.cache.redis_manager import (CacheManager,
+                                                        eto_result_key)
+
+SOURCES = ["nasa_power", "met_norway"]
+PERIOD = ("2025-01-01", "2025-01-10")
+
+
+def test_key_snaps_to_finest_grid_and_buckets_elevation():
+    key = eto_result_key(SOURCES, -15.7801, -47.9299, *PERIOD, 1172.0, "v1")
+    same = eto_result_key(reversed(SOURCES), -15.7870, -47.9201, *PERIOD,
+                          1168.4, "v1")
+    assert key == same
+    assert key == ("eto:result:v1:met_norway+nasa_power:-15.775:-47.925:"
+                   "2025-01-01:2025-01-10:1170")
+    # Outra célula, faixa de elevação ou versão → outra chave
+    assert eto_result_key(SOURCES, -15.813, -47.93, *PERIOD, 1172.0,
+                          "v1") != key
+    assert eto_result_key(SOURCES, -15.78, -47.93, *PERIOD, 1190.0,
+                          "v1") != key
+    assert eto_result_key(SOURCES, -15.78, -47.93, *PERIOD, 1172.0,
+                          "v2") != key
+
+
+def test_redis_only_manager_round_trip(async_fake_redis):
+    redis = async_fake_redis
+    manager = CacheManager(redis)
+    key = eto_result_key(SOURCES, -15.78, -47.93, *PERIOD, 1172.0, "v1")
+    payload = {"result": {"data": [{"ETo": 4.2}]}, "warnings": ["w"]}
+
+    assert asyncio.run(manager.get_eto_data(key)) is None
+    asyncio.run(manager.save_eto_data(key, payload, expiry=600))
+
+    assert redis.ttls[key] == 600
+    assert asyncio.run(manager.get_eto_data(key)) == payload
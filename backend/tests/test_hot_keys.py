@@ -0,0 +1,41 @@
+"""Unit tests for the bounded top-k sketch of hot cache keys."""
+
+import random
+
+import pytest
+
+from backend.infrastructure.cache.hot_keys import SpaceSavingSketch
+
+
+def test_sketch_keeps_heavy_hitters_in_bounded_memory():
+    sketch = SpaceSavingSketch(capacity=50)
+    rng = random.Random(42)
+    events = ["hot:a"] * 3000 + ["hot:b"] * 2000 + [
+        f"cold:{rng.randrange(100_000)}" for _ in range(10_000)
+    ]
+    rng.shuffle(events)
+    for key in events:
+        sketch.add(key, outcome="hit" if key == "hot:a" else "miss")
+
+    top = sketch.top(2)
+
+    assert len(sketch) == 50 and sketch.total == len(events)
+    assert [entry["key"] for entry in top] == ["hot:a", "hot:b"]
+    for entry, true_count in zip(top, (3000, 2000)):
+        assert entry["count"] - entry["error"] <= true_count <= entry["count"]
+    assert top[0]["hits"] == 3000 and top[1]["hits"] == 0
+
+
+def test_new_key_inherits_minimum_as_error():
+    sketch = SpaceSavingSketch(capacity=2)
+    for key in ("a", "a", "a", "b", "c"):
+        sketch.add(key)
+    assert sketch.top() == [
+        {"key": "a", "count": 3, "error": 0, "hits": 3},
+        {"key": "c", "count": 2, "error": 1, "hits": 1},
+    ]
+
+
+def test_capacity_must_be_positive():
+    with pytest.raises(ValueError):
+        SpaceSavingSketch(capacity=0)
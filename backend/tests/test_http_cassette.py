@@ -0,0 +1,120 @@
+"""Unit tests for the record/replay transport and the mock climate server."""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+
+from backend.api.services.http_cassette import (CassetteMissError,
+                                                CassetteTransport)
+from backend.api.services.mock_climate_server import (MockServerConfig,
+                                                      MockSourceConfig,
+                                                      create_mock_app)
+from backend.api.services.nasa_power_client import NASAPowerClient
+
+NASA_URL = "https://power.larc.nasa.gov/api/temporal/daily/point"
+NASA_PARAMS = {
+    "parameters": "T2M_MAX,T2M_MIN",
+    "latitude": -10.0,
+    "longitude": -45.0,
+    "start": "20240101",
+    "end": "20240103",
+}
+
+
+async def _get(transport, url, params=None):
+    async with httpx.AsyncClient(transport=transport) as client:
+        return await client.get(url, params=params)
+
+
+def test_record_then_replay_without_upstream(tmp_path):
+    mock = httpx.ASGITransport(app=create_mock_app(MockServerConfig()))
+    recorder = CassetteTransport(tmp_path, mode="record", inner=mock)
+    recorded = asyncio.run(_get(recorder, NASA_URL, NASA_PARAMS))
+
+    # Parâmetros em outra ordem → mesma gravação
+    player = CassetteTransport(tmp_path, mode="replay")
+    params = dict(reversed(list(NASA_PARAMS.items())))
+    replayed = asyncio.run(_get(player, NASA_URL, params))
+
+    assert recorder.recorded == 1 and player.hits == 1
+    assert replayed.status_code == 200
+    assert replayed.json() == recorded.json()
+    assert list(tmp_path.rglob("*.json.gz"))
+
+
+def test_replay_miss_raises(tmp_path):
+    player = CassetteTransport(tmp_path, mode="replay")
+    with pytest.raises(CassetteMissError):
+        asyncio.run(_get(player, NASA_URL, NASA_PARAMS))
+
+
+def test_nasa_client_against_mock_server():
+    transport = httpx.ASGITransport(app=create_mock_app(MockServerConfig()))
+
+    async def run():
+        client = NASAPowerClient(transport=transport)
+        try:
+            return await client.get_daily_data(
+                -10.0, -45.0, datetime(2024, 1, 1), datetime(2024, 1, 5)
+            )
+        finally:
+            await client.close()
+
+    data = asyncio.run(run())
+    assert len(data) == 5
+    assert all(d.temp_max >= d.temp_min for d in data)
+
+
+def test_mock_server_simulates_errors_and_rate_limits():
+    config = MockServerConfig(sources={
+        "elevation": MockSourceConfig(
+            rate_limit_per_second=0.001, rate_limit_burst=2
+        ),
+        "nasa_power": MockSourceConfig(error_rate=1.0),
+    })
+    transport = httpx.ASGITransport(app=create_mock_app(config))
+    url = "https://api.open-meteo.com/v1/elevation"
+
+    async def run():
+        first = await _get(transport, url, {
+            "latitude": "-10,-11", "longitude": "-45,-46"
+        })
+        second = await _get(transport, url, {
+            "latitude": "-10", "longitude": "-45"
+        })
+        failed = await _get(transport, NASA_URL, NASA_PARAMS)
+        return first, second, failed
+
+    first, second, failed = asyncio.run(run())
+    assert len(first.json()["elevation"]) == 2
+    assert second.status_code == 429 and "Retry-After" in second.headers
+    assert failed.status_code == 503
+
+
+def test_legacy_nasa_client_runs_against_mock_server(monkeypatch, fake_redis):
+    from backend.api.services import nasapower
+    from backend.api.services.climate_factory import ClimateClientFactory
+    from config.settings.app_settings import get_settings
+
+    monkeypatch.setattr(get_settings(), "CLIMATE_HTTP_MODE", "mock")
+    monkeypatch.setattr(ClimateClientFactory, "_mock_app", None)
+    monkeypatch.setattr(nasapower.Redis, "from_url",
+                        lambda *args, **kwargs: fake_redis)
+    end = datetime.now().date() - timedelta(days=1)
+
+    async def route():
+        # calculate_eto_pipeline chama o download de dentro do loop
+        api = nasapower.NasaPowerAPI(
+            start=end - timedelta(days=9), end=end, long=-45.0, lat=-10.0
+        )
+        return api.get_weather_sync()
+
+    df, warnings = asyncio.run(route())
+
+    # requests.get está bloqueado no conftest: tudo veio do mock
+    assert warnings == [] and len(df) == 10
+    assert (df["T2M_MAX"] >= df["T2M_MIN"]).all()
+    counts = ClimateClientFactory._mock_app.state.request_counts
+    assert counts["nasa_power"] == 1
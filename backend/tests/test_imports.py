@@ -0,0 +1,35 @@
+"""Each module must import on its own, in a fresh interpreter."""
+
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[2]
+
+MODULES = [
+    "backend.api.services.nasapower",
+    "backend.api.services.openmeteo",
+    "backend.api.services.climate_factory",
+    "backend.core.eto_calculation.eto_calculation",
+]
+
+
+@pytest.mark.parametrize("module", MODULES)
+def test_module_imports_in_a_fresh_interpreter(module, tmp_path):
+    path = os.pathsep.join(filter(None, [str(ROOT),
+                                         os.environ.get("PYTHONPATH")]))
+    result = subprocess.run(
+        [sys.executable, "-c", f"import {module}"], cwd=tmp_path,
+        env={**os.environ, "PYTHONPATH": path},
+        capture_output=True, text=True, timeout=120
+    )
+
+    missing = re.search(r"No module named '([\w.]+)'", result.stderr)
+    if (result.returncode and missing and not missing.group(1)
+            .startswith(("backend", "config", "frontend"))):
+        pytest.skip(f"dependency not installed: {missing.group(1)}")
+    assert result.returncode == 0, result.stderr
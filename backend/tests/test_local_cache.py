@@ -0,0 +1,90 @@
+"""Unit tests for the in-process L1 cache in front of Redis."""
+
+import asyncio
+import pickle
+from datetime import datetime
+
+import pytest
+
+from backend.infrastructure.cache import local_cache
+from backend.infrastructure.cache.local_cache import (
+    CacheInvalidationListener, LocalTTLCache)
+from backend.infrastructure.cache.revalidation import hard_ttl
+from backend.infrastructure.cache.serialization import encode
+
+
+@pytest.fixture
+def service(cache_service, ready_listener):
+    cache_service.local = LocalTTLCache(max_entries=8)
+    cache_service.invalidation = ready_listener
+    return cache_service
+
+
+ARGS = ("nasa_power", -15.79, -47.88, datetime(2024, 1, 1),
+        datetime(2024, 1, 8))
+
+
+def test_lru_evicts_by_count_and_bytes():
+    cache = LocalTTLCache(max_entries=2, max_bytes=100)
+    cache.put("a", 1, ttl=60, size=10)
+    cache.put("b", 2, ttl=60, size=10)
+    cache.get("a")
+    cache.put("c", 3, ttl=60, size=10)
+    assert cache.get("b") == (False, None)
+    cache.put("d", 4, ttl=60, size=95)
+    assert len(cache) == 1 and cache.get("d") == (True, 4)
+    cache.put("huge", 5, ttl=60, size=101)
+    assert cache.get("huge") == (False, None)
+
+
+def test_ttl_is_capped_and_expires(monkeypatch):
+    cache = LocalTTLCache(max_ttl=10)
+    now = [1000.0]
+    monkeypatch.setattr(local_cache.time, "monotonic", lambda: now[0])
+    cache.put("k", "v", ttl=3600)
+    now[0] += 11
+    assert cache.get("k") == (False, None)
+
+
+def test_hot_reads_skip_redis(service):
+    key = service._make_key(*ARGS)
+    service.redis.data[key] = encode([1, 2, 3], "nasa_power")
+    # Entrada recém-gravada: ainda dentro do soft TTL
+    service.redis.ttls[key] = hard_ttl(service.TTL_HISTORICAL)
+
+    async def run():
+        first = await service.get(*ARGS)
+        second = await service.get(*ARGS)
+        return first, second
+
+    assert asyncio.run(run()) == ([1, 2, 3], [1, 2, 3])
+    assert service.redis.round_trips == 1
+
+
+def test_l1_bypassed_when_redis_key_expired(service):
+    key = service._make_key(*ARGS)
+    service.redis.data[key] = pickle.dumps("v")
+    service.redis.ttls[key] = -2  # expirou entre o GET e o PTTL
+    asyncio.run(service.get(*ARGS))
+    assert len(service.local) == 0
+
+
+def test_writes_publish_and_remote_invalidation(service):
+    asyncio.run(service.set(*ARGS, data=["x"]))
+    key = service._make_key(*ARGS)
+    node, _, published_key = service.redis.published[0].partition("|")
+    assert published_key == key and node == local_cache.NODE_ID
+
+    listener = CacheInvalidationListener(service.local, "redis://unused")
+    listener.handle(service.redis.published[0])  # própria mensagem
+    assert service.local.get(key)[0]
+    listener.handle(f"other-node|{key}")
+    assert service.local.get(key) == (False, None)
+
+
+def test_unsubscribed_listener_disables_l1(service):
+    service.invalidation = CacheInvalidationListener(service.local,
+                                                     "redis://unused")
+    service.invalidation.ensure_running = lambda: None
+    service.local.put(service._make_key(*ARGS), "stale", ttl=60)
+    assert asyncio.run(service.get(*ARGS)) is None
@@ -0,0 +1,63 @@
+"""Unit tests for the interpolated MATOPIBA raster overlays."""
+
+import io
+
+import numpy as np
+import pytest
+
+pytest.importorskip("PIL")
+
+from PIL import Image  # noqa: E402
+
+from backend.core.map_results.matopiba_raster import (  # noqa: E402
+    OVERLAY_ALPHA, RasterGrid, build_rasters, idw, load_grid, render_raster)
+
+SQUARE = [np.array([[0.0, 0.0], [1.0, 0.0], [1.0, 1.0], [0.0, 1.0],
+                    [0.0, 0.0]])]
+
+
+def test_idw_hits_points_exactly_and_stays_within_range():
+    lat = np.array([0.0, 0.0, 1.0])
+    lon = np.array([0.0, 1.0, 0.0])
+    values = np.array([1.0, 2.0, 5.0])
+
+    out = idw(lat, lon, values, np.array([0.0, 0.5, 0.2]),
+              np.array([1.0, 0.5, 0.1]), neighbors=2)
+
+    assert out[0] == 2.0
+    assert values.min() <= out[1:].min() and out[1:].max() <= values.max()
+
+
+def test_render_masks_outside_perimeter():
+    grid = RasterGrid(SQUARE + [np.array([[0.4, 0.4], [0.6, 0.4],
+                                          [0.6, 0.6], [0.4, 0.6]])],
+                      resolution=0.1)
+    # 2 valores < MIN_POINTS
+    assert render_raster([0.1, 0.9, 0.9], [0.1, 0.1, 0.9],
+                         [1.0, 3.0, None], grid) is None
+
+    png, legend = render_raster([0.1, 0.9, 0.9], [0.1, 0.1, 0.9],
+                                [1.0, 3.0, 2.0], grid)
+    image = np.asarray(Image.open(io.BytesIO(png)))
+
+    assert image.shape == (10, 10, 4)
+    assert image[0, 0, 3] == OVERLAY_ALPHA
+    assert image[5, 5, 3] == 0  # buraco do polígono
+    assert legend["bounds"] == [[0.0, 0.0], [1.0, 1.0]]
+    assert (legend["vmin"], legend["vmax"], legend["n_points"]) == (1, 3, 3)
+
+
+def test_perimeter_grid_covers_matopiba():
+    grid = load_grid()
+    assert grid.mask.any() and not grid.mask.all()
+    # Palmas (TO) dentro; canto noroeste da grade (Pará) fora
+    row = np.abs(grid.lat - (-10.18)).argmin()
+    col = np.abs(grid.lon - (-48.33)).argmin()
+    assert grid.mask[row, col] and not grid.mask[0, 0]
+
+    rasters = build_rasters(
+        {"lat": [-10.18, -7.2, -12.1], "lon": [-48.33, -47.5, -45.0]},
+        {"ETo_EVAonline|2025-10-09": [4.0, 5.0, 6.0],
+         "T2M_MAX|2025-10-09": [None, None, 30.0]}
+    )
+    assert list(rasters) == ["ETo_EVAonline|2025-10-09"]
@@ -0,0 +1,64 @@
+"""Unit tests for the MATOPIBA routes served from the per-run store."""
+
+import asyncio
+
+import pytest
+
+# backend.api.routes importa o pipeline de ETo (data_fusion -> sklearn)
+pytest.importorskip("sklearn")
+
+from fastapi import FastAPI  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from backend.api.routes import matopiba  # noqa: E402
+from backend.infrastructure.cache.matopiba_store import (  # noqa: E402
+    MatopibaRunStore)
+from backend.tests.test_matopiba_store import RESULTS  # noqa: E402
+
+
+@pytest.fixture
+def client(monkeypatch, fake_redis):
+    MatopibaRunStore(fake_redis).write_run("r1", RESULTS, {}, {}, ttl=600)
+    monkeypatch.setattr(matopiba, "get_redis_client", lambda: fake_redis)
+    app = FastAPI()
+    app.include_router(matopiba.matopiba_router)
+    return TestClient(app)
+
+
+def test_city_and_array_endpoints_run_in_the_threadpool(client):
+    # Redis síncrono: endpoints def, fora do event loop
+    for endpoint in (matopiba.get_matopiba_city_forecast,
+                     matopiba.get_matopiba_array):
+        assert not asyncio.iscoroutinefunction(endpoint)
+
+    city = client.get("/matopiba/forecasts/3").json()
+    assert city["run_id"] == "r1" and city["city_info"]["name"] == "C"
+    array = client.get("/matopiba/arrays/T2M_MAX/2025-10-09").json()
+    assert array["codes"] == ["1", "2", "3"]
+    assert array["values"] == [35.0, None, 36.5]
+    assert client.get("/matopiba/forecasts/404").status_code == 404
+
+
+def test_raster_revalidation_requires_an_existing_raster(client, fake_redis):
+    MatopibaRunStore(fake_redis).write_rasters(
+        "r1", {"ETo_EVAonline|2025-10-09": (b"png", {"vmin": 1.0})}, ttl=600
+    )
+    for endpoint in (matopiba.get_matopiba_raster,
+                     matopiba.get_matopiba_raster_legend):
+        assert not asyncio.iscoroutinefunction(endpoint)
+    url = "/matopiba/rasters/{}/2025-10-09.png"
+
+    response = client.get(url.format("ETo_EVAonline"))
+    assert response.content == b"png"
+    etag = response.headers["etag"]
+    assert client.get(url.format("ETo_EVAonline"),
+                      headers={"If-None-Match": etag}).status_code == 304
+
+    # ETag bem formado, mas sem raster da variável no run: 404, não 304
+    missing = client.get(url.format("T2M_MAX"),
+                         headers={"If-None-Match": '"r1-T2M_MAX-2025-10-09"'})
+    assert missing.status_code == 404
+
+    legend = client.get("/matopiba/rasters/ETo_EVAonline/2025-10-09/legend")
+    assert legend.json()["vmin"] == 1.0
+    assert legend.json()["url"].endswith(url.format("ETo_EVAonline"))
@@ -0,0 +1,222 @@
+"""Unit tests for the per-run MATOPIBA Redis layout."""
+
+import gzip
+import json
+
+from backend.infrastructure.cache.matopiba_store import (BUILDING_KEY,
+                                                         LATEST_KEY,
+                                                         PREVIOUS_KEY,
+                                                         REFRESH_LOCK,
+                                                         REFRESH_LOCK_TTL,
+                                                         MatopibaRunStore,
+                                                         build_arrays,
+                                                         diff_runs,
+                                                         encode_payload,
+                                                         run_key,
+                                                         select_positions,
+                                                         variant_etag)
+
+
+def _city(code, name, eto, tmax=None):
+    day = {"ETo_EVAonline": eto, "label": "x"}
+    if tmax is not None:
+        day["T2M_MAX"] = tmax
+    return {"city_info": {"code": code, "name": name, "uf": "TO",
+                          "latitude": -10.0, "longitude": -48.0},
+            "forecast": {"2025-10-09": day}}
+
+
+RESULTS = {
+    "2": _city("2", "B", 5.1),
+    "1": _city("1", "A", 4.2, tmax=35.0),
+    "3": _city("3", "C", 6.0, tmax=36.5),
+}
+
+
+def test_arrays_follow_index_order_with_gaps():
+    index, arrays = build_arrays(RESULTS)
+    assert index["codes"] == ["1", "2", "3"]
+    assert index["variables"] == ["ETo_EVAonline", "T2M_MAX"]
+    assert arrays["ETo_EVAonline|2025-10-09"] == [4.2, 5.1, 6.0]
+    assert arrays["T2M_MAX|2025-10-09"] == [35.0, None, 36.5]
+
+
+def test_run_is_written_in_chunks_and_read_selectively(fake_redis):
+    redis = fake_redis
+    store = MatopibaRunStore(redis)
+    store.write_run("r1", RESULTS, {"n_cities": 3}, {"r2": 0.9}, ttl=600,
+                    chunk=2)
+
+    # begin + 2 lotes de cidades + payload + arrays + publicação (2)
+    assert redis.calls.count("pipeline") == 7
+    assert store.latest_run() == "r1" and LATEST_KEY not in redis.ttls
+    assert store.building_run() is None
+    meta = store.meta("r1")
+    assert meta["metadata"] == {"n_cities": 3}
+    assert meta["progress"] == {"written": 3, "expected": 3,
+                                "complete": True}
+    assert store.cities("r1", ["3", "404"]) == {"3": RESULTS["3"]}
+    assert list(store.cities("r1")) == ["1", "2", "3"]
+    assert store.array("r1", "T2M_MAX", "2025-10-09") == [35.0, None, 36.5]
+    assert store.array("r1", "T2M_MAX", "2025-10-10") is None
+    assert redis.ttls[run_key("r1", "arrays")] == 600
+
+
+def test_partial_run_reports_progress(fake_redis):
+    redis = fake_redis
+    store = MatopibaRunStore(redis)
+    index, _ = build_arrays(RESULTS)
+    store.begin_run("r2", index, {}, {}, ttl=600)
+    store.write_cities("r2", {"1": RESULTS["1"]}, ttl=600)
+
+    assert store.meta("r2")["progress"] == {"written": 1, "expected": 3,
+                                            "complete": False}
+    assert store.meta("r2")["published_at"] is None
+    assert store.meta("missing") is None
+    # Não publicado: leitores não o enxergam
+    assert store.latest_run() is None and store.building_run() == "r2"
+
+
+def test_publish_swaps_latest_only_when_complete_and_keeps_previous(fake_redis):
+    redis = fake_redis
+    store = MatopibaRunStore(redis)
+    store.write_run("r1", RESULTS, {}, {}, ttl=600)
+
+    index, _ = build_arrays(RESULTS)
+    store.begin_run("r2", index, {}, {}, ttl=600)
+    store.write_cities("r2", {"1": RESULTS["1"]}, ttl=600)
+    # r2 em gravação: r1 segue publicado e inteiro
+    assert store.latest_run() == "r1"
+    assert list(store.cities("r1")) == ["1", "2", "3"]
+
+    store.write_run("r2", RESULTS, {}, {}, ttl=600)
+    assert store.latest_run() == "r2" and redis.get(PREVIOUS_KEY) == b"r1"
+    assert store.meta("r2")["published_at"] is not None
+    assert BUILDING_KEY not in redis.data
+
+    store.write_run("r3", RESULTS, {}, {}, ttl=600)
+    assert redis.get(PREVIOUS_KEY) == b"r2"
+    assert store.meta("r1") is None and store.cities("r1") == {}
+    assert store.meta("r2") is not None
+
+
+def test_payload_is_encoded_once_and_negotiated(fake_redis):
+    redis = fake_redis
+    store = MatopibaRunStore(redis)
+    store.write_run("r3", RESULTS, {"build_seconds": 42.0}, {}, ttl=600)
+
+    etag, build_seconds = store.payload_info("r3")
+    assert build_seconds == 42.0
+    assert etag == encode_payload(json.loads(
+        store.payload("r3", [])[1]
+    ))["etag"].decode()
+
+    encoding, body = store.payload("r3", {"gzip", "deflate"})
+    assert encoding == "gzip"
+    payload = json.loads(gzip.decompress(body))
+    assert list(payload["forecasts"]) == ["1", "2", "3"]
+    assert payload["metadata"]["run_id"] == "r3"
+
+    assert store.payload("r3", [])[0] == "identity"
+    assert store.payload_info("missing") == (None, 0.0)
+    assert store.payload("missing", ["gzip"]) == (None, None)
+
+
+def test_diff_keeps_only_changes_beyond_tolerance():
+    old = {code: json.loads(json.dumps(city)) for code, city in RESULTS.items()}
+    old["9"] = _city("9", "Z", 1.0)
+    old["1"]["forecast"]["2025-10-08"] = {"ETo_EVAonline": 3.0}
+    new = json.loads(json.dumps(RESULTS))
+    new["1"]["forecast"]["2025-10-09"]["ETo_EVAonline"] = 4.24  # < 0.05
+    new["2"]["forecast"]["2025-10-09"]["ETo_EVAonline"] = 5.3
+    new["3"]["forecast"]["2025-10-10"] = {"ETo_EVAonline": 6.1}
+    new["4"] = _city("4", "D", 2.0)
+
+    diff = diff_runs(old, new)
+
+    assert diff["changed"] == {
+        "2": {"forecast": {"2025-10-09": {"ETo_EVAonline": 5.3}}},
+        "3": {"forecast": {"2025-10-10": {"ETo_EVAonline": 6.1}}},
+        "4": new["4"],
+    }
+    assert diff["removed"] == ["9"]
+    assert diff["removed_days"] == ["2025-10-08"]
+
+
+def test_delta_since_published_run_is_stored_with_new_run(fake_redis):
+    redis = fake_redis
+    store = MatopibaRunStore(redis)
+    store.write_run("r1", RESULTS, {}, {}, ttl=600)
+    assert store.delta_info("r1") == (None, None)
+
+    changed = json.loads(json.dumps(RESULTS))
+    changed["3"]["forecast"]["2025-10-09"]["T2M_MAX"] = 38.0
+    store.write_run("r2", changed, {}, {}, ttl=600)
+
+    etag, since = store.delta_info("r2")
+    encoding, body = store.payload("r2", ["gzip"], part="delta")
+    delta = json.loads(gzip.decompress(body))
+    assert since == "r1" and etag and encoding == "gzip"
+    assert (delta["run_id"], delta["since"]) == ("r2", "r1")
+    assert delta["changed"] == {
+        "3": {"forecast": {"2025-10-09": {"T2M_MAX": 38.0}}}
+    }
+    assert delta["metadata"]["run_id"] == "r2"
+
+
+def test_filters_select_index_positions_and_arrays_in_one_read(fake_redis):
+    index = {"codes": ["1", "2", "3"], "uf": ["TO", "MA", "PI"],
+             "lat": [-10.0, -5.0, None], "lon": [-48.0, -45.0, -43.0]}
+    assert select_positions(index) == [0, 1, 2]
+    assert select_positions(index, ufs=["to", "PI"]) == [0, 2]
+    assert select_positions(index, codes=["2", "404"]) == [1]
+    assert select_positions(index, bbox=(-46, -6, -44, -4)) == [1]
+    assert select_positions(index, ufs=["MA"], codes=["1"]) == []
+
+    store = MatopibaRunStore(fake_redis)
+    store.write_run("r1", RESULTS, {}, {}, ttl=600)
+    assert store.arrays("r1", ["T2M_MAX|2025-10-09",
+                               "T2M_MAX|2025-10-10"]) == {
+        "T2M_MAX|2025-10-09": [35.0, None, 36.5],
+        "T2M_MAX|2025-10-10": None,
+    }
+
+
+def test_refresh_lock_is_released_only_by_its_owner(fake_redis):
+    store = MatopibaRunStore(fake_redis)
+    assert store.acquire_refresh("route-task")
+
+    # Beat concorrente: não executa nem apaga o lock alheio
+    assert not store.acquire_refresh("beat-task")
+    assert not store.release_refresh("beat-task")
+    assert fake_redis.get(REFRESH_LOCK) == b"route-task"
+
+    # A task enfileirada pela rota (ou seu retry) assume e renova o lock
+    fake_redis.expire(REFRESH_LOCK, 5)
+    assert store.acquire_refresh("route-task")
+    assert fake_redis.ttl(REFRESH_LOCK) == REFRESH_LOCK_TTL
+    assert store.release_refresh("route-task")
+    assert REFRESH_LOCK not in fake_redis.data
+
+
+def test_read_run_fetches_meta_ttl_and_variant_in_one_pipeline(fake_redis):
+    store = MatopibaRunStore(fake_redis)
+    store.write_run("r1", RESULTS, {"build_seconds": 42.0}, {}, ttl=600)
+    store.write_run("r2", RESULTS, {}, {}, ttl=600)
+    fake_redis.calls.clear()
+
+    snapshot = store.read_run("r2", ["payload", "delta"], {"gzip"})
+
+    assert fake_redis.calls == ["pipeline"]
+    assert snapshot["meta"]["progress"]["complete"] is True
+    assert snapshot["ttl"] == 600
+    payload, delta = snapshot["payload"], snapshot["delta"]
+    assert payload["encoding"] == "gzip" and delta["since"] == "r1"
+    assert json.loads(gzip.decompress(payload["body"]))["forecasts"]
+
+    # ETag forte por codificação; identity mantém o do conteúdo
+    etag, _ = store.payload_info("r2")
+    assert payload["etag"] == variant_etag(etag, "gzip") != etag
+    assert store.read_run("r2", ["payload"], [])["payload"]["etag"] == etag
+    info = store.read_run("r2", ["payload"])["payload"]
+    assert info["body"] is None and info["etag"] == etag
@@ -0,0 +1,186 @@
+"""Unit tests for the NASA POWER local archive and resumable backfill."""
+
+import asyncio
+from datetime import date, datetime, timedelta
+
+import httpx
+import numpy as np
+
+from backend.api.services import nasapower
+from backend.api.services.nasa_power_archive import (ARCHIVE_START,
+                                                     NASAPowerArchive,
+                                                     backfill_nasa_power)
+from backend.api.services.nasa_power_client import (NASAPowerClient,
+                                                    NASAPowerConfig,
+                                                    NASAPowerData)
+from backend.api.services.rate_limiter import AsyncTokenBucket
+
+UNTIL = date(1984, 12, 31)
+LOCATIONS = [
+    {"name": "Balsas", "lat": -7.5312, "lon": -46.0390},
+    {"name": "Balsas (vizinha)", "lat": -7.55, "lon": -46.05},
+    {"name": "Paris", "lat": 48.8566, "lon": 2.3522},
+]
+
+
+def _power_handler(requests, fail_after=None, fill_day="0101"):
+    def handler(request):
+        requests.append(request)
+        if fail_after is not None and len(requests) > fail_after:
+            return httpx.Response(404)
+        start = datetime.strptime(request.url.params["start"], "%Y%m%d")
+        end = datetime.strptime(request.url.params["end"], "%Y%m%d")
+        days = [(start + timedelta(days=i)).strftime("%Y%m%d")
+                for i in range((end - start).days + 1)]
+        parameter = {
+            name: {d: (-999.0 if d.endswith(fill_day) else 20.5) for d in days}
+            for name in ("T2M_MAX", "T2M_MIN", "T2M", "RH2M", "WS2M",
+                         "ALLSKY_SFC_SW_DWN", "PRECTOTCORR")
+        }
+        return httpx.Response(
+            200, json={"properties": {"parameter": parameter}}
+        )
+    return handler
+
+
+def _client(handler):
+    return NASAPowerClient(
+        config=NASAPowerConfig(use_archive=False, retry_attempts=1),
+        transport=httpx.MockTransport(handler)
+    )
+
+
+class _Session:
+    """requests-like session answering through a NASA POWER handler."""
+
+    def __init__(self, handler):
+        self.handler = handler
+
+    def get(self, url, timeout=None):
+        request = httpx.Request("GET", url)
+        response = self.handler(request)
+        response.request = request
+        return response
+
+
+def _run(archive, client):
+    return asyncio.run(backfill_nasa_power(
+        LOCATIONS, archive=archive, client=client, until=UNTIL,
+        chunk_years=2, limiter=AsyncTokenBucket(rate=1000, capacity=1000)
+    ))
+
+
+def test_backfill_resumes_from_checkpoint(tmp_path):
+    archive = NASAPowerArchive(tmp_path)
+    requests = []
+
+    # 1ª execução: só 2 requisições passam (um bloco por célula)
+    result = _run(archive, _client(_power_handler(requests, fail_after=2)))
+    assert result["cells"] == 2
+    assert result["status"] == "partial"
+
+    requests.clear()
+    result = _run(archive, _client(_power_handler(requests)))
+    assert result["status"] == "success"
+    assert result["complete_cells"] == 2
+    # Cada célula só baixa o bloco que faltava (1983-1984)
+    assert len(requests) == 2
+    assert all(r.url.params["start"] == "19830101" for r in requests)
+    assert archive.coverage(-7.5312, -46.0390) == (date(1981, 1, 1), UNTIL)
+    assert (tmp_path / "manifest.json").exists()
+
+
+def test_archived_period_served_without_upstream(tmp_path, monkeypatch):
+    archive = NASAPowerArchive(tmp_path)
+    _run(archive, _client(_power_handler([])))
+
+    def no_network(request):
+        raise AssertionError("NASA POWER não deveria ser chamada")
+
+    client = _client(no_network)
+    client.archive = archive
+    records = asyncio.run(client.get_daily_data(
+        -7.5312, -46.0390, datetime(1982, 1, 1), datetime(1982, 1, 10)
+    ))
+    assert len(records) == 10
+    assert records[0].date == "1982-01-01"
+    assert records[0].temp_max is None      # fill value -999
+    assert records[1].temp_max == 20.5
+    assert records[1].solar_radiation == 20.5  # AG: já em MJ/m²/day
+
+    # Período além do arquivado: não serve do arquivo
+    assert archive.read(-7.5312, -46.0390, UNTIL, UNTIL + timedelta(1)) is None
+
+
+def test_legacy_api_serves_archived_period_without_upstream(
+    tmp_path, monkeypatch, fake_redis
+):
+    archive = NASAPowerArchive(tmp_path)
+    last = date.today() - timedelta(days=2)
+    archive.append(-7.5312, -46.0390, [
+        NASAPowerData(date=(ARCHIVE_START + timedelta(i)).isoformat(),
+                      temp_max=31.0, temp_min=19.0, temp_mean=25.0,
+                      humidity=60.0, wind_speed=2.0, solar_radiation=22.5,
+                      precipitation=0.0)
+        for i in range((last - ARCHIVE_START).days + 1)
+    ])
+
+    class NoNetwork:
+        def get(self, *args, **kwargs):
+            raise AssertionError("NASA POWER não deveria ser chamada")
+
+    monkeypatch.setattr(nasapower.Redis, "from_url",
+                        lambda *args, **kwargs: fake_redis)
+    api = nasapower.NasaPowerAPI(
+        start=last - timedelta(days=9), end=last, long=-46.05, lat=-7.55,
+        session=NoNetwork()
+    )
+    api.archive = archive
+    fake_redis.calls.clear()
+
+    df, warnings = api.get_weather_sync()
+
+    assert warnings == [] and len(df) == 10
+    assert list(df.columns) == nasapower.NasaPowerAPI.VALID_PARAMETERS
+    assert df["ALLSKY_SFC_SW_DWN"].eq(22.5).all()
+    assert fake_redis.round_trips == 0
+
+
+def test_archive_and_upstream_agree_on_radiation(
+    tmp_path, monkeypatch, fake_redis
+):
+    archive = NASAPowerArchive(tmp_path)
+    last = date.today() - timedelta(days=10)
+    handler = _power_handler([], fill_day="never")
+    asyncio.run(backfill_nasa_power(
+        LOCATIONS[:1], archive=archive, client=_client(handler), until=last,
+        chunk_years=100, limiter=AsyncTokenBucket(rate=1000, capacity=1000)
+    ))
+    monkeypatch.setattr(nasapower.Redis, "from_url",
+                        lambda *args, **kwargs: fake_redis)
+
+    def fetch(archive):
+        api = nasapower.NasaPowerAPI(
+            start=last - timedelta(days=8), end=last,
+            long=-46.05, lat=-7.55, session=_Session(handler)
+        )
+        api.archive = archive
+        df, warnings = api.get_weather_sync()
+        assert warnings == []
+        return df["ALLSKY_SFC_SW_DWN"].tolist()
+
+    assert fetch(archive) == fetch(None) == [20.5] * 9
+
+
+def test_cells_archived_with_the_old_radiation_unit_are_corrected(tmp_path):
+    archive = NASAPowerArchive(tmp_path)
+    _run(archive, _client(_power_handler([])))
+    path = archive.cell_path(-7.5312, -46.0390)
+    with np.load(path) as npz:
+        columns = {key: npz[key] for key in npz.files if key != "version"}
+    columns["solar_radiation"] = columns["solar_radiation"] * np.float32(3.6)
+    np.savez_compressed(path, **columns)
+
+    records = archive.read(-7.5312, -46.0390, date(1982, 1, 2),
+                           date(1982, 1, 2))
+    assert records[0].solar_radiation == 20.5
@@ -112,8 +112,9 @@ class TestOpenMeteoForecastAPI:
             url = api_client._build_request()
 
             assert "https://api.open-meteo.com/v1/forecast?" in url
-            assert "latitude=-22.2964" in url
-            assert "longitude=-48.5578" in url
+            # Snapped to the ~0.1° cell center of (-22.2964, -48.5578)
+            assert "latitude=-22.3&" in url
+            assert "longitude=-48.6&" in url
             assert "hourly=" in url
             assert "models=best_match" in url
             assert "format=json" in url
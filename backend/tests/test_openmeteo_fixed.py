@@ -91,12 +91,18 @@ class TestOpenMeteoForecastAPI:
             url = api_client._build_request()
 
             assert "https://api.open-meteo.com/v1/forecast?" in url
-            assert "latitude=-22.2964" in url
-            assert "longitude=-48.5578" in url
+            # Snapped to the ~0.1° cell center of (-22.2964, -48.5578)
+            assert "latitude=-22.3&" in url
+            assert "longitude=-48.6&" in url
             assert "hourly=" in url
             assert "models=best_match" in url
             assert "format=json" in url
 
+        def test_nearby_points_share_forecast_cell(self, api_client):
+            """Points in the same ~0.1° cell request the same grid point."""
+            other = OpenMeteoForecastAPI(lat=-22.31, long=-48.58, days_ahead=1)
+            assert other._build_request() == api_client._build_request()
+
         def test_hourly_parameters_in_url(self, api_client):
             """Test that all required hourly parameters are in URL."""
             url = api_client._build_request()
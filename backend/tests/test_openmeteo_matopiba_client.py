@@ -0,0 +1,100 @@
+"""Unit tests for the concurrent Open-Meteo MATOPIBA fetch."""
+
+import asyncio
+from urllib.parse import parse_qs, urlparse
+
+import httpx
+
+from backend.api.services import openmeteo_matopiba_client as om
+from backend.api.services.rate_limiter import (AsyncTokenBucket,
+                                               parse_retry_after)
+
+
+def _location_payload(n_hours=48):
+    times = [f"2025-10-09T{h % 24:02d}:00" if h < 24
+             else f"2025-10-10T{h % 24:02d}:00" for h in range(n_hours)]
+    hourly = {"time": times}
+    for var in om.HOURLY_VARIABLES:
+        hourly[var] = [1.0] * n_hours
+    return {"latitude": -10.0, "longitude": -45.0, "hourly": hourly}
+
+
+def _n_locations(request):
+    query = parse_qs(urlparse(str(request.url)).query)
+    return len(query["latitude"][0].split(","))
+
+
+def test_plan_batches_respects_url_and_batch_limits(monkeypatch):
+    client = om.OpenMeteoMatopibaClient()
+    monkeypatch.setattr(om, "MAX_URL_LENGTH", 1200)
+
+    batches = client._plan_batches(client.cities_df)
+
+    assert sum(len(b) for b in batches) == len(client.cities_df)
+    for batch in batches:
+        assert len(batch) <= om.MAX_BATCH_SIZE
+        url = client._build_batch_url(
+            batch["LATITUDE"].tolist(), batch["LONGITUDE"].tolist()
+        )
+        assert len(url) <= 1200
+
+
+def test_only_failed_batches_are_retried(monkeypatch):
+    monkeypatch.setattr(om, "RETRY_BASE_DELAY", 0.0)
+    monkeypatch.setattr(om, "DEFAULT_RETRY_AFTER", 0.0)
+    calls = []
+
+    def handler(request):
+        calls.append(_n_locations(request))
+        # First request is throttled once, everything else succeeds
+        if len(calls) == 1:
+            return httpx.Response(429, headers={"Retry-After": "0"})
+        return httpx.Response(
+            200, json=[_location_payload()] * _n_locations(request)
+        )
+
+    client = om.OpenMeteoMatopibaClient(
+        transport=httpx.MockTransport(handler)
+    )
+    n_batches = len(client._plan_batches(client.cities_df))
+
+    forecasts, warnings = client.get_forecasts_all_cities()
+
+    assert len(forecasts) == len(client.cities_df)
+    assert len(calls) == n_batches + 1
+    assert warnings == []
+
+
+def test_token_bucket_waits_when_empty():
+    async def run():
+        bucket = AsyncTokenBucket(rate=100.0, capacity=1.0)
+        await bucket.acquire()
+        return await bucket.acquire()
+
+    assert asyncio.run(run()) > 0
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("120") == 120.0
+    assert parse_retry_after(None, 5.0) == 5.0
+    assert parse_retry_after("invalid", 5.0) == 5.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+
+
+def test_cube_daily_aggregates_whole_batch():
+    client = om.OpenMeteoMatopibaClient()
+    batch = client.cities_df.iloc[:2]
+    first, second = _location_payload(), _location_payload()
+    second["hourly"]["temperature_2m"] = list(range(48))
+    second["hourly"]["shortwave_radiation"] = [500.0] * 48
+    second["hourly"]["precipitation"] = [None] * 47 + [2.0]
+
+    results = client._parse_batch_payload([first, second], batch)
+
+    day1, day2 = results[str(batch.iloc[1]["CODE_CITY"])]["forecast"].values()
+    assert day1["T2M_MIN"] == 0.0 and day1["T2M_MAX"] == 23.0
+    assert day2["T2M"] == 35.5
+    assert abs(day1["ALLSKY_SFC_SW_DWN"] - 500 * 24 * 0.0036) < 1e-6
+    assert day1["PRECTOTCORR"] == 0.0 and day2["PRECTOTCORR"] == 2.0
+    hourly = results[str(batch.iloc[1]["CODE_CITY"])]["hourly_data"]
+    assert hourly["temperature_2m"] is second["hourly"]["temperature_2m"]
@@ -0,0 +1,246 @@
+"""Unit tests for the popularity tracker and the adaptive prefetch."""
+
+import asyncio
+from datetime import date, datetime, timedelta
+
+import httpx
+import pytest
+
+from backend.api.services import nasapower
+from backend.api.services.climate_factory import ClimateClientFactory
+from backend.api.services.nasa_power_client import (NASAPowerClient,
+                                                    NASAPowerConfig)
+from backend.api.services.rate_limiter import AsyncTokenBucket
+from backend.infrastructure.cache import climate_tasks
+from backend.infrastructure.cache.climate_tasks import (WARM_WINDOWS,
+                                                        _prefetch_candidates,
+                                                        _prefetch_cells)
+from backend.infrastructure.cache.popularity import (HALF_LIFE_SECONDS,
+                                                     PopularityTracker)
+
+
+def test_old_requests_decay_and_cells_are_snapped(async_fake_redis):
+    tracker = PopularityTracker(async_fake_redis)
+    now = datetime(2026, 1, 1).timestamp()
+    old = now - 2 * HALF_LIFE_SECONDS
+
+    for _ in range(3):
+        asyncio.run(tracker.record(-15.79, -47.88, now=old))
+    asyncio.run(tracker.record(-15.80, -47.90, now=now))  # mesma célula
+    asyncio.run(tracker.record(40.71, -74.00, now=now))
+    asyncio.run(tracker.record(40.72, -74.01, now=now))
+
+    top = asyncio.run(tracker.top(10, now=now))
+
+    assert [round(c["score"], 6) for c in top] == [2.0, 1.75]
+    assert (top[0]["lat"], top[0]["lon"]) == (40.5, -73.75)
+
+
+def test_ranking_is_trimmed_to_max_cells(async_fake_redis):
+    tracker = PopularityTracker(async_fake_redis, max_cells=2)
+    for lat in (0.0, 10.0, 10.0, 20.0, 20.0):
+        asyncio.run(tracker.record(lat, 0.0))
+    top = asyncio.run(tracker.top(10))
+    assert [c["lat"] for c in top] == [20.0, 10.0]
+
+
+def test_candidates_fill_cold_start_with_seed_cities():
+    cells = [{"lat": 49.0, "lon": 2.5, "score": 9.0}]
+    candidates = _prefetch_candidates(cells, top_n=3)
+    # Paris já está no ranking (mesma célula): não é repetida
+    assert [c["name"] for c in candidates] == ["49.0:2.5", "London",
+                                               "New York"]
+
+
+class FakeCache:
+    def __init__(self, cached):
+        self.cached = cached
+        self.saved = []
+
+    async def get_many(self, requests):
+        hits = {r: [1] for r in requests if r[1] in self.cached}
+        return hits, [r for r in requests if r not in hits]
+
+    async def set_many(self, items):
+        self.saved.extend(items)
+        return len(items)
+
+
+class FakeClient:
+    def __init__(self):
+        self.active = self.peak = 0
+        self.calls = []
+
+    async def get_daily_data(self, lat, lon, start_date, end_date,
+                             use_cache=True):
+        assert use_cache is False
+        self.calls.append(lat)
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+        if lat == 3:
+            raise RuntimeError("upstream 500")
+        return [lat]
+
+
+def test_prefetch_respects_quota_and_runs_concurrently():
+    cells = [{"name": str(i), "lat": i, "lon": 0.0} for i in range(10)]
+    cache, client = FakeCache(cached={0, 1}), FakeClient()
+    limiter = AsyncTokenBucket(rate=1000.0, capacity=10.0)
+
+    stats = asyncio.run(_prefetch_cells(
+        cache, client, cells, datetime(2025, 1, 1), datetime(2025, 1, 31),
+        quota=5, concurrency=3, limiter=limiter
+    ))
+
+    assert sorted(client.calls) == [2, 3, 4, 5, 6]
+    assert client.peak == 3
+    assert stats == {"cached": 2, "fetched": 4, "deferred": 3,
+                     "failed": ["3"]}
+    assert len(cache.saved) == 4
+
+
+def test_prefetch_reports_upstream_time_per_cell():
+    cells = [{"name": str(i), "lat": i, "lon": 0.0} for i in range(4)]
+    cache, client = FakeCache(cached={0}), FakeClient()
+    timings = {}
+
+    asyncio.run(_prefetch_cells(
+        cache, client, cells, datetime(2025, 1, 1), datetime(2025, 1, 31),
+        quota=10, concurrency=2,
+        limiter=AsyncTokenBucket(rate=1000.0, capacity=10.0),
+        timings=timings
+    ))
+
+    # Célula em cache não aparece; a que falhou também é medida
+    assert sorted(timings) == ["1", "2", "3"]
+    assert all(seconds >= 0.01 for seconds in timings.values())
+
+
+class NasaUpstream:
+    """
+    NASA POWER (community=AG) stand-in: every parameter is VALUE daily.
+
+    Serves NASAPowerClient through httpx.MockTransport and NasaPowerAPI
+    as a requests-like session.
+    """
+
+    VALUE = 20.5
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, request):
+        self.calls += 1
+        params = request.url.params
+        start = datetime.strptime(params["start"], "%Y%m%d")
+        end = datetime.strptime(params["end"], "%Y%m%d")
+        days = [(start + timedelta(days=i)).strftime("%Y%m%d")
+                for i in range((end - start).days + 1)]
+        parameter = {name: {d: self.VALUE for d in days}
+                     for name in params["parameters"].split(",")}
+        return httpx.Response(
+            200, json={"properties": {"parameter": parameter}},
+            request=request
+        )
+
+    def get(self, url, timeout=None):
+        return self(httpx.Request("GET", url))
+
+    def client(self, cache):
+        return NASAPowerClient(
+            config=NASAPowerConfig(use_archive=False, retry_attempts=1),
+            cache=cache, transport=httpx.MockTransport(self)
+        )
+
+
+class NoNetwork:
+    def get(self, *args, **kwargs):
+        raise AssertionError("NASA POWER não deveria ser chamada")
+
+
+@pytest.fixture
+def warm_cache(monkeypatch, cache_service, fake_redis):
+    """
+    The readers' cache (factory singleton) and a NASA POWER stand-in on
+    the fake Redis; fake_redis is the ETo download's sync view of it.
+    """
+    cache_service.prefix = "climate"
+    upstream = NasaUpstream()
+    monkeypatch.setattr(ClimateClientFactory, "_cache_service",
+                        cache_service)
+    monkeypatch.setattr(ClimateClientFactory, "create_nasa_power",
+                        lambda: upstream.client(cache_service))
+    monkeypatch.setattr(climate_tasks, "_prefetch_elevations",
+                        lambda cities: 0)
+    monkeypatch.setattr(climate_tasks, "PREFETCH_REQUESTS_PER_SECOND", 1e6)
+    monkeypatch.setattr(nasapower.Redis, "from_url",
+                        lambda *args, **kwargs: fake_redis)
+    fake_redis.data = cache_service.redis.data
+    fake_redis.ttls = cache_service.redis.ttls
+    return upstream
+
+
+def download(lat, lon, days):
+    """NASA POWER fetch as download_weather_data does it, ending today."""
+    today = date.today()
+    api = nasapower.NasaPowerAPI(
+        start=today - timedelta(days=days), end=today, long=lon, lat=lat,
+        session=NoNetwork()
+    )
+    api.archive = None
+    return api.get_weather_sync()
+
+
+def test_prefetched_windows_are_hits_on_the_eto_download_path(warm_cache):
+    result = climate_tasks.prefetch_nasa_popular_cities(top_n=3, quota=10)
+
+    assert list(result["windows"]) == ["8d", "15d"]
+    assert result["fetched"] == warm_cache.calls == 3 * len(WARM_WINDOWS)
+    for days in WARM_WINDOWS:
+        df, warnings = download(48.8566, 2.3522, days)  # Paris
+        assert warnings == [] and len(df) == days + 1
+        assert df["ALLSKY_SFC_SW_DWN"].eq(NasaUpstream.VALUE).all()
+
+
+def test_eto_download_miss_fills_the_readers_cache(warm_cache, cache_service):
+    today = datetime.combine(date.today(), datetime.min.time())
+    api = nasapower.NasaPowerAPI(start=today - timedelta(days=7), end=today,
+                                 long=-46.05, lat=-7.55, session=warm_cache)
+    api.archive = None
+    df, _ = api.get_weather_sync()
+
+    records = asyncio.run(cache_service.get(
+        "nasa_power", -7.55, -46.05, today - timedelta(days=7), today
+    ))
+    assert len(df) == len(records) == 8
+    assert records[0].solar_radiation == NasaUpstream.VALUE
+
+
+def test_prefetched_entry_reads_like_the_upstream_eto_download(warm_cache):
+    climate_tasks.prefetch_nasa_popular_cities(top_n=3, quota=10)
+    cached, _ = download(48.8566, 2.3522, 7)  # Paris
+
+    today = date.today()
+    api = nasapower.NasaPowerAPI(start=today - timedelta(days=7), end=today,
+                                 long=2.3522, lat=48.8566, session=warm_cache)
+    api.archive, api.redis_client = None, None  # direto do upstream
+    upstream, _ = api.get_weather_sync()
+
+    assert len(cached) == 8
+    assert cached["ALLSKY_SFC_SW_DWN"].tolist() == \
+        upstream["ALLSKY_SFC_SW_DWN"].tolist()
+
+
+def test_matopiba_warmed_cell_is_a_hit_on_the_eto_download_path(warm_cache):
+    result = climate_tasks.warm_cache_matopiba(quota=1000)
+    city = climate_tasks._matopiba_locations()[0]
+
+    assert list(result["windows"]) == ["8d", "15d"]
+    assert result["failed"] == result["deferred"] == 0
+    assert warm_cache.calls == result["total_cells"] * len(WARM_WINDOWS)
+    for days in WARM_WINDOWS:
+        df, warnings = download(city["lat"], city["lon"], days)
+        assert warnings == [] and len(df) == days + 1
+        assert df["ALLSKY_SFC_SW_DWN"].eq(NasaUpstream.VALUE).all()
@@ -0,0 +1,107 @@
+"""Unit tests for stale-while-revalidate and XFetch early refresh."""
+
+import asyncio
+from datetime import datetime
+
+from backend.infrastructure.cache.revalidation import (RecomputeTimer,
+                                                       freshness, hard_ttl,
+                                                       should_refresh_early)
+from backend.infrastructure.cache.serialization import encode
+
+
+START = datetime(2024, 1, 1)
+END = datetime(2024, 1, 31)
+REQUEST = ("nasa_power", -10.0, -45.0, START, END)
+
+
+def _store(cache_service, value, remaining):
+    key = cache_service._make_key(*REQUEST)
+    cache_service.redis.data[key] = encode(value, "nasa_power")
+    cache_service.redis.ttls[key] = remaining
+    return key
+
+
+def test_freshness_subtracts_the_stale_window():
+    assert hard_ttl(3600) == 5400
+    assert freshness(5400, 3600) == 3600
+    assert freshness(1000, 3600) == -800
+    assert freshness(-1, 3600) is None
+
+
+def test_freshness_uses_the_soft_ttl_stored_at_write(cache_service):
+    # Gravada como "muito recente" (12h); hoje START já cai na faixa de 30d
+    soft = cache_service.TTL_VERY_RECENT
+    key = cache_service._make_key(*REQUEST)
+    cache_service.redis.data[key] = encode([{"v": 1}], "nasa_power", soft)
+    cache_service.redis.ttls[key] = hard_ttl(soft) - 3600
+
+    assert asyncio.run(cache_service.get(*REQUEST)) == [{"v": 1}]
+    hits, _ = asyncio.run(cache_service.get_many([REQUEST]))
+    assert hits[REQUEST] == [{"v": 1}]
+
+    # Passou do soft TTL da escrita: stale, mesmo com a faixa atual maior
+    cache_service.redis.ttls[key] = soft // 4
+    assert asyncio.run(cache_service.get(*REQUEST)) is None
+
+
+def test_early_refresh_probability_grows_near_expiry():
+    rand = iter([0.5, 0.5, 0.999]).__next__
+    assert not should_refresh_early(600, delta=2.0, rand=rand)
+    assert should_refresh_early(1.0, delta=2.0, rand=rand)
+    assert should_refresh_early(10.0, delta=2.0, rand=rand)
+    assert should_refresh_early(0, delta=2.0)
+
+
+def test_recompute_timer_tracks_moving_average():
+    timer = RecomputeTimer(default=5.0, alpha=0.5)
+    assert timer.get("nasa_power") == 5.0
+    timer.observe("nasa_power", 2.0)
+    timer.observe("nasa_power", 4.0)
+    assert timer.get("nasa_power") == 3.0
+
+
+def test_stale_entry_is_served_and_refreshed_in_background(cache_service):
+    soft = cache_service._get_ttl(START)
+    key = _store(cache_service, [{"old": 1}], remaining=soft // 4)
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        return [{"new": 1}]
+
+    async def scenario():
+        first = await cache_service.get_or_fetch(*REQUEST, loader=loader)
+        assert calls == []  # o leitor não espera o upstream
+        await asyncio.gather(*cache_service._refresh_tasks)
+        return first
+
+    assert asyncio.run(scenario()) == [{"old": 1}]
+    assert calls == [1]
+    assert cache_service.redis.ttls[key] == hard_ttl(soft)
+    assert "refresh:lock:" + key not in cache_service.redis.data
+    assert asyncio.run(cache_service.get(*REQUEST)) == [{"new": 1}]
+
+
+def test_miss_waits_for_loader_and_refresh_lock_is_shared(cache_service):
+    async def loader():
+        return [{"v": 1}]
+
+    value = asyncio.run(cache_service.get_or_fetch(*REQUEST, loader=loader))
+    assert value == [{"v": 1}]
+
+    # Outro processo já renovando: o stale é servido sem nova busca
+    soft = cache_service._get_ttl(START)
+    key = _store(cache_service, [{"old": 1}], remaining=10)
+    cache_service.redis.data["refresh:lock:" + key] = b"other"
+
+    async def failing_loader():
+        raise AssertionError("não deveria buscar")
+
+    async def scenario():
+        value = await cache_service.get_or_fetch(*REQUEST,
+                                                 loader=failing_loader)
+        await asyncio.gather(*cache_service._refresh_tasks)
+        return value
+
+    assert asyncio.run(scenario()) == [{"old": 1}]
+    assert cache_service.redis.ttls[key] == 10 and soft > 10
@@ -0,0 +1,64 @@
+"""Unit tests for the polygon-footprint source coverage index."""
+
+import numpy as np
+import pytest
+
+from backend.api.services.climate_source_manager import ClimateSourceManager
+from backend.api.services.source_coverage import (MIXED, CoverageIndex,
+                                                  get_coverage_index,
+                                                  points_in_polygon)
+
+SQUARE = [(0.0, 0.0), (10.0, 0.0), (10.0, 10.0), (0.0, 10.0)]
+
+
+def test_points_in_polygon_even_odd():
+    inside = points_in_polygon(np.array([5.0, 5.0, -1.0]),
+                               np.array([5.0, 11.0, 5.0]), SQUARE)
+    assert inside.tolist() == [True, False, False]
+
+
+def test_grid_agrees_with_exact_test():
+    index = CoverageIndex(("region", "global"), {"region": [SQUARE]},
+                          cell_size=1.0)
+    assert (index.footprints["region"].cells == MIXED).any()
+
+    rng = np.random.default_rng(0)
+    lats = rng.uniform(-5, 15, 2000)
+    lons = rng.uniform(-5, 15, 2000)
+    result = index.sources_many(lats, lons)
+    snapped = np.rint(lats / 0.01) * 0.01, np.rint(lons / 0.01) * 0.01
+    expected = points_in_polygon(*snapped, SQUARE)
+    assert [("region" in r) for r in result] == expected.tolist()
+    assert all("global" in r for r in result)
+
+
+def test_batch_is_memoized_per_cell():
+    index = CoverageIndex(("region",), {"region": [SQUARE]})
+    index.sources_many([5.0, 5.001], [5.0, 5.0])
+    assert index.memo_hits == 0
+    assert index.sources_at(5.0, 5.0) == ("region",)
+    assert index.memo_hits == 1
+
+
+@pytest.mark.parametrize("lat, lon, expected", [
+    (48.8566, 2.3522, ("met_norway", "nasa_power")),   # Paris
+    (36.8065, 10.1815, ("nasa_power",)),               # Túnis (no bbox)
+    (40.7128, -74.0060, ("nws", "nasa_power")),        # Nova York
+    (43.6532, -79.3832, ("nasa_power",)),              # Toronto (no bbox)
+    (-15.7939, -47.8828, ("nasa_power",)),             # Brasília
+])
+def test_real_footprints(lat, lon, expected):
+    assert get_coverage_index().sources_at(lat, lon) == expected
+
+
+def test_manager_batch_sorted_by_priority():
+    manager = ClimateSourceManager()
+    result = manager.get_available_sources_many(
+        [(48.8566, 2.3522), (-15.7939, -47.8828)],
+        exclude_non_commercial=True
+    )
+    assert "met_norway" in result[0] and "nasa_power" in result[0]
+    assert result[1] == ["nasa_power"]
+    assert manager.get_available_sources_for_location(
+        36.8065, 10.1815
+    )["met_norway"]["available"] is False
@@ -0,0 +1,39 @@
+"""Unit tests for source-native grid snapping."""
+
+import pytest
+
+from backend.api.services.source_grid import (NativeGrid, describe_snap,
+                                              snap_coordinates)
+
+
+def test_nasa_power_snaps_to_merra2_cell_center():
+    assert snap_coordinates("nasa_power", -15.7939, -47.8828) == (
+        -16.0, -48.125
+    )
+
+
+def test_nearby_points_share_cell():
+    # ~2 km apart, same NASA POWER cell
+    a = snap_coordinates("nasa_power", -15.7939, -47.8828)
+    b = snap_coordinates("nasa_power", -15.8100, -47.8700)
+    assert a == b
+
+
+def test_unknown_source_falls_back_to_hundredths():
+    assert snap_coordinates("unknown", 48.85661, 2.35222) == (48.86, 2.35)
+
+
+def test_snap_keeps_coordinates_in_range():
+    grid = NativeGrid(lat_step=0.5, lon_step=0.625, lat_origin=-90.0,
+                      lon_origin=-180.0)
+    lat, lon = grid.snap(89.99, 179.99)
+    assert lat <= 90.0
+    assert -180.0 <= lon <= 180.0
+
+
+@pytest.mark.parametrize("source", ["met_norway", "nws", "openmeteo"])
+def test_describe_snap_reports_grid(source):
+    info = describe_snap(source, 40.7128, -74.0060)
+    assert info["requested"] == {"lat": 40.7128, "lon": -74.0060}
+    assert info["grid"]["lat_step"] > 0
+    assert abs(info["snapped"]["lat"] - 40.7128) <= info["grid"]["lat_step"]
@@ -0,0 +1,102 @@
+"""Unit tests for the per-source circuit breaker and resilient GET."""
+
+import asyncio
+
+import httpx
+import pytest
+
+from backend.api.services.source_health import (OPEN, CircuitOpenError,
+                                                HealthConfig, SourceHealth,
+                                                backoff_delay, resilient_get)
+
+URL = "https://upstream.test/data"
+
+
+def _config(**overrides):
+    params = dict(consecutive_failures=2, backoff_base=0.0, min_samples=1,
+                  redis_sync_interval=0.0, max_timeout=5.0)
+    params.update(overrides)
+    return HealthConfig(**params)
+
+
+def test_breaker_opens_and_is_shared_through_redis(async_fake_redis):
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(503)
+
+    health = SourceHealth("nasa_power", _config(), redis=async_fake_redis)
+    other_worker = SourceHealth("nasa_power", _config(),
+                                redis=async_fake_redis)
+
+    async def run():
+        async with httpx.AsyncClient(
+            transport=httpx.MockTransport(handler)
+        ) as client:
+            with pytest.raises(httpx.HTTPStatusError):
+                await resilient_get(client, URL, health, retry_attempts=2)
+            with pytest.raises(CircuitOpenError):
+                await resilient_get(client, URL, health)
+        with pytest.raises(CircuitOpenError):
+            await other_worker.before_request()
+
+    asyncio.run(run())
+    assert health.state == OPEN
+    assert len(calls) == 2
+
+
+def test_client_errors_are_not_retried():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(404)
+
+    health = SourceHealth("nws", _config())
+
+    async def run():
+        async with httpx.AsyncClient(
+            transport=httpx.MockTransport(handler)
+        ) as client:
+            await resilient_get(client, URL, health, retry_attempts=3)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(run())
+    assert len(calls) == 1
+
+
+def test_adaptive_timeout_follows_p99():
+    health = SourceHealth("met_norway", _config(min_timeout=0.1))
+    assert health.timeout() == 5.0
+    for _ in range(10):
+        health.window.add(0.2, True)
+    assert health.timeout() == pytest.approx(0.6)
+
+
+def test_backoff_honors_retry_after():
+    config = HealthConfig(backoff_base=0.5, backoff_cap=2.0)
+    assert backoff_delay(0, config, retry_after=7.0) == 7.0
+    assert 0.0 <= backoff_delay(10, config) <= 2.0
+
+
+def test_hedged_request_wins_over_slow_first_attempt():
+    attempts = []
+
+    class SlowFirstTransport(httpx.AsyncBaseTransport):
+        async def handle_async_request(self, request):
+            attempts.append(request)
+            if len(attempts) == 1:
+                await asyncio.sleep(2.0)
+            return httpx.Response(200, json={"attempt": len(attempts)})
+
+    health = SourceHealth("openmeteo", _config())
+    health.window.add(0.01, True)
+
+    async def run():
+        async with httpx.AsyncClient(transport=SlowFirstTransport()) as client:
+            return await resilient_get(client, URL, health, hedge=True)
+
+    response = asyncio.run(run())
+    assert response.json() == {"attempt": 2}
+    assert health.hedged == 1
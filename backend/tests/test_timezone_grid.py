@@ -0,0 +1,53 @@
+"""Unit tests for the grid-based timezone resolver."""
+
+import pytest
+
+from backend.api.services.timezone_grid import (BORDER, TimezoneGrid,
+                                                build_timezone_grid)
+
+
+class FakeFinder:
+    """Two zones split at lon -45.1; ocean (None) north of lat 0."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def timezone_at(self, lng, lat):
+        self.calls += 1
+        if lat > 0:
+            return None
+        return "America/Sao_Paulo" if lng > -45.1 else "America/Cuiaba"
+
+
+@pytest.fixture
+def grid(tmp_path):
+    build_timezone_grid(FakeFinder(), tmp_path, step=1.0, lat_max=2.0,
+                        lat_min=-10.0, lon_min=-50.0, lon_max=-40.0)
+    return TimezoneGrid(tmp_path, finder=FakeFinder())
+
+
+def test_interior_cells_resolve_without_polygon_search(grid):
+    assert grid.timezone_at(-5.5, -42.5) == "America/Sao_Paulo"
+    assert grid.timezone_at(-5.5, -48.5) == "America/Cuiaba"
+    assert grid.timezone_at(1.5, -48.5) is None
+    assert grid._finder.calls == 0
+
+
+def test_border_cells_use_exact_lookup_once(grid):
+    assert grid.cell_value(-5.5, -45.5) == BORDER
+    for _ in range(3):
+        assert grid.timezone_at(-5.5, -45.05) == "America/Sao_Paulo"
+    assert grid._finder.calls == 1
+    assert grid.cache_info().hits == 2
+
+
+def test_outside_grid_falls_back_to_finder(grid):
+    assert grid.timezone_at(-20.0, -42.0) == "America/Sao_Paulo"
+    assert grid.stats == {"grid": 0, "exact": 1}
+
+
+def test_missing_grid_without_finder(tmp_path):
+    resolver = TimezoneGrid(tmp_path / "missing")
+    resolver._finder_loaded = True
+    assert not resolver.available
+    assert resolver.timezone_at(-15.0, -47.0) is None
@@ -59,6 +59,26 @@ class Settings(BaseSettings):
     # Configurações de Cache
     CACHE_TTL: int = 60 * 60 * 24  # 24 horas
     
+    # Cache L1 em memória (na frente do Redis, invalidado via pub/sub)
+    CLIMATE_L1_ENABLED: bool = (
+        os.getenv("CLIMATE_L1_ENABLED", "true").lower() == "true"
+    )
+    CLIMATE_L1_MAX_ENTRIES: int = int(
+        os.getenv("CLIMATE_L1_MAX_ENTRIES", 1024)
+    )
+    CLIMATE_L1_MAX_BYTES: int = int(
+        os.getenv("CLIMATE_L1_MAX_BYTES", 64 * 1024 * 1024)
+    )
+    CLIMATE_L1_MAX_TTL: float = float(os.getenv("CLIMATE_L1_MAX_TTL", 300))
+    
+    # Transporte HTTP das APIs climáticas
+    # live: APIs reais | record/replay/auto: gravação em disco (cassettes)
+    # mock: servidor simulado in-process (mock_climate_server)
+    CLIMATE_HTTP_MODE: str = os.getenv("CLIMATE_HTTP_MODE", "live")
+    CLIMATE_CASSETTE_DIR: str = os.getenv(
+        "CLIMATE_CASSETTE_DIR", "data/cassettes"
+    )
+    
     class Config:
         case_sensitive = True
 
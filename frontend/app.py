@@ -17,9 +17,9 @@ import pytz
 from dash import dcc, html
 from dash.dependencies import ALL, Input, Output, State
 from loguru import logger
-from timezonefinderL import TimezoneFinder
 
 from backend.api.services.openmeteo import get_openmeteo_elevation
+from backend.api.services.timezone_grid import resolve_timezone
 from backend.core.map_results.map_results import create_world_real_map
 from backend.core.map_results.matopiba_forecasts import (
     create_matopiba_forecast_section, fetch_forecast_data, render_maps,
@@ -430,8 +430,7 @@ def create_dash_app() -> dash.Dash:
         alt = f"{elevation:.1f} m" if elevation is not None else "N/A"
         
         # Buscar fuso horário e hora local
-        tf = TimezoneFinder()
-        tz_name = tf.timezone_at(lng=lng, lat=lat)
+        tz_name = resolve_timezone(lat, lng)
         
         # Criar popup com componentes Dash serializáveis e mais informações
         lat_fmt, lng_fmt = format_coordinates(lat, lng)
@@ -543,8 +542,7 @@ def create_dash_app() -> dash.Dash:
             lat_fmt, lng_fmt = format_coordinates(lat, lng)
             
             # Buscar fuso horário e hora local
-            tf = TimezoneFinder()
-            tz_name = tf.timezone_at(lng=lng, lat=lat)
+            tz_name = resolve_timezone(lat, lng)
             
             if tz_name:
                 tz = pytz.timezone(tz_name)
@@ -666,8 +664,7 @@ def create_dash_app() -> dash.Dash:
             lat_fmt, lng_fmt = format_coordinates(lat, lon)
             
             # Buscar fuso horário
-            tf = TimezoneFinder()
-            tz_name = tf.timezone_at(lng=lon, lat=lat)
+            tz_name = resolve_timezone(lat, lon)
             
             if tz_name:
                 tz = pytz.timezone(tz_name)
@@ -0,0 +1,120 @@
+"""
+Gera os tiles de elevação local usados por backend/api/services/elevation_grid.
+
+Duas camadas:
+1. Brasil em alta resolução, a partir de um GeoTIFF de DEM
+   (ex: Copernicus GLO-90 / SRTM mosaicado). Requer rasterio.
+2. Grade global grosseira, consultando a API de elevação Open-Meteo em
+   lotes de 100 pontos (cobre o resto do mundo sem rasterio).
+
+Exemplos:
+    # Brasil a partir de um mosaico SRTM/Copernicus (recorta BRAZIL_BBOX)
+    python scripts/build_elevation_tiles.py brazil --geotiff dem_brasil.tif
+
+    # Grade global de 0.25° (~1M pontos, respeita o rate limit)
+    python scripts/build_elevation_tiles.py global --step 0.25
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import requests
+
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir))
+
+from backend.api.services.elevation_grid import (BRAZIL_BBOX,  # noqa: E402
+                                                 ELEVATION_GRID_DIR,
+                                                 write_tiles)
+from backend.api.services.openmeteo import \
+    OPENMETEO_ELEVATION_URL  # noqa: E402
+
+POINTS_PER_REQUEST = 100
+
+
+def build_brazil(geotiff: str, out_dir: str, tile_size: int) -> None:
+    """Recorta o DEM ao Brasil e grava tiles int16."""
+    try:
+        import rasterio
+        from rasterio.windows import from_bounds
+    except ImportError:
+        sys.exit("❌ rasterio não instalado: pip install rasterio")
+
+    with rasterio.open(geotiff) as src:
+        window = from_bounds(
+            BRAZIL_BBOX["lon_min"], BRAZIL_BBOX["lat_min"],
+            BRAZIL_BBOX["lon_max"], BRAZIL_BBOX["lat_max"],
+            transform=src.transform,
+        )
+        data = src.read(1, window=window, masked=True)
+        transform = src.window_transform(window)
+
+    step = abs(transform.a)
+    # Centro do pixel superior esquerdo = nó (0, 0)
+    lat_max = transform.f - step / 2
+    lon_min = transform.c + step / 2
+    elevation = data.astype(np.float64).filled(np.nan)
+
+    write_tiles(elevation, lat_max, lon_min, step, out_dir, "brazil",
+                tile_size=tile_size)
+
+
+def build_global(step: float, out_dir: str, pause: float) -> None:
+    """Amostra a API Open-Meteo numa grade global regular."""
+    lats = np.arange(90.0, -90.0 - step / 2, -step)
+    lons = np.arange(-180.0, 180.0 + step / 2, step)
+    grid_lat, grid_lon = np.meshgrid(lats, lons, indexing="ij")
+    flat_lat, flat_lon = grid_lat.ravel(), grid_lon.ravel()
+    values = np.full(flat_lat.shape, np.nan)
+
+    session = requests.Session()
+    total = len(flat_lat)
+    for start in range(0, total, POINTS_PER_REQUEST):
+        sl = slice(start, start + POINTS_PER_REQUEST)
+        params = {
+            "latitude": ",".join(f"{v:.4f}" for v in flat_lat[sl]),
+            "longitude": ",".join(f"{v:.4f}" for v in flat_lon[sl]),
+        }
+        while True:
+            response = session.get(
+                OPENMETEO_ELEVATION_URL, params=params, timeout=30
+            )
+            if response.status_code != 429:
+                break
+            time.sleep(float(response.headers.get("Retry-After", 60)))
+        response.raise_for_status()
+        values[sl] = response.json()["elevation"]
+
+        if start // POINTS_PER_REQUEST % 50 == 0:
+            print(f"  {start + POINTS_PER_REQUEST}/{total} pontos")
+        time.sleep(pause)
+
+    write_tiles(values.reshape(grid_lat.shape), 90.0, -180.0, step,
+                out_dir, "global")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("layer", choices=["brazil", "global"])
+    parser.add_argument("--geotiff", help="DEM GeoTIFF (camada brazil)")
+    parser.add_argument("--step", type=float, default=0.25,
+                        help="Espaçamento da grade global (graus)")
+    parser.add_argument("--pause", type=float, default=0.2,
+                        help="Pausa entre requisições (s)")
+    parser.add_argument("--tile-size", type=int, default=1200)
+    parser.add_argument("--out", default=ELEVATION_GRID_DIR)
+    args = parser.parse_args()
+
+    if args.layer == "brazil":
+        if not args.geotiff:
+            parser.error("--geotiff é obrigatório para a camada brazil")
+        build_brazil(args.geotiff, args.out, args.tile_size)
+    else:
+        build_global(args.step, args.out, args.pause)
+
+
+if __name__ == "__main__":
+    main()
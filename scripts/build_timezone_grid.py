@@ -0,0 +1,52 @@
+"""
+Gera a grade de fusos horários usada por backend/api/services/timezone_grid.
+
+Amostra o timezonefinderL numa sub-grade de cada célula; células com um
+único fuso são resolvidas em tempo de execução sem busca por polígono.
+
+Exemplos:
+    # Grade global de 0.25° (3x3 amostras por célula, alguns minutos)
+    python scripts/build_timezone_grid.py --step 0.25
+
+    # Grade mais fina, só para o Brasil
+    python scripts/build_timezone_grid.py --step 0.1 \\
+        --bbox -34 6 -74 -34
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir))
+
+from backend.api.services.timezone_grid import (  # noqa: E402
+    TIMEZONE_GRID_DIR, build_timezone_grid)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--step", type=float, default=0.25,
+                        help="Tamanho da célula (graus)")
+    parser.add_argument("--samples", type=int, default=3,
+                        help="Amostras por lado de cada célula")
+    parser.add_argument("--bbox", type=float, nargs=4,
+                        metavar=("LAT_MIN", "LAT_MAX", "LON_MIN", "LON_MAX"),
+                        default=(-90.0, 90.0, -180.0, 180.0))
+    parser.add_argument("--out", default=TIMEZONE_GRID_DIR)
+    args = parser.parse_args()
+
+    try:
+        from timezonefinderL import TimezoneFinder
+    except ImportError:
+        sys.exit("❌ timezonefinderL não instalado: pip install timezonefinderL")
+
+    lat_min, lat_max, lon_min, lon_max = args.bbox
+    build_timezone_grid(
+        TimezoneFinder(), args.out, step=args.step, samples=args.samples,
+        lat_max=lat_max, lat_min=lat_min, lon_min=lon_min, lon_max=lon_max,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -39,7 +39,8 @@ from sqlalchemy.exc import OperationalError
 backend_path = Path(__file__).parent.parent.parent / "backend"
 sys.path.insert(0, str(backend_path))
 
-from backend.api.services.openmeteo import get_openmeteo_elevation
+from backend.api.services.openmeteo import (elevation_cache_key,
+                                            get_openmeteo_elevation)
 from backend.database.connection import DATABASE_URL, engine, get_db_context
 
 # ============================================================================
@@ -325,7 +326,7 @@ class TestOpenMeteoIntegration:
         location = sample_locations["jaú_sp"]
         
         # Limpar cache anterior
-        cache_key = f"elevation:{location['lat']}:{location['long']}"
+        cache_key = elevation_cache_key(location['lat'], location['long'])
         redis_client.delete(cache_key)
         
         # Primeira chamada: Cache MISS (vai para API)
@@ -480,7 +481,7 @@ class TestFullIntegration:
         logger.info(f"⛰️ Elevação: {elevation}m")
         
         # Step 2: Verificar se foi cacheado
-        cache_key = f"elevation:{location['lat']}:{location['long']}"
+        cache_key = elevation_cache_key(location['lat'], location['long'])
         cached = redis_client.get(cache_key)
         assert cached is not None
         logger.info(f"💾 Cache: Dados salvos no Redis")
@@ -565,7 +566,7 @@ class TestPerformance:
     ):
         """Compara performance API vs Cache."""
         location = sample_locations["cuiabá_mt"]
-        cache_key = f"elevation:{location['lat']}:{location['long']}"
+        cache_key = elevation_cache_key(location['lat'], location['long'])
         
         # Limpar cache
         redis_client.delete(cache_key)